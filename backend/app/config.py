@@ -1,10 +1,12 @@
 """Configuration models and persistence for TENSI Trossen Studio."""
 
 import json
+import os
+import re
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 def get_config_path() -> Path:
@@ -154,6 +156,84 @@ class ReplayConfig(BaseModel):
     episode: int = Field(description="Episode index to replay", default=0)
 
 
+class StreamingConfig(BaseModel):
+    """Camera stream viewer limits."""
+
+    max_viewers_per_camera: int = Field(description="Maximum concurrent stream viewers per camera", default=4)
+    max_viewers_total: int = Field(description="Maximum concurrent stream viewers across all cameras", default=12)
+    degrade_load_fraction: float = Field(
+        description="Viewer load (fraction of a cap) from which studio/remote viewers get a smaller rendition and lower fps",
+        default=0.5,
+    )
+    h264_bitrate_kbps: int = Field(description="Target bitrate of software H.264 streams for remote viewers", default=600)
+    mosaic_fps: float = Field(description="Composite and encode rate of the multi-camera mosaic stream", default=10.0)
+    mosaic_tile_width: int = Field(description="Width of one camera tile in the mosaic", default=320)
+    mosaic_tile_height: int = Field(description="Height of one camera tile in the mosaic", default=240)
+
+
+class DvrConfig(BaseModel):
+    """Rolling camera recorder (DVR) settings."""
+
+    enabled: bool = Field(description="Record all running cameras into rolling segment files", default=False)
+    directory: str = Field(
+        description="Root directory for DVR segments (one subdirectory per camera)",
+        default_factory=lambda: str(Path.home() / ".tensi_trossen_studio" / "dvr"),
+    )
+    segment_s: int = Field(description="Segment length in seconds", default=60)
+    max_age_hours: float = Field(description="Delete segments older than this", default=24.0)
+    max_total_mb: int = Field(description="Delete oldest segments while all segments exceed this size", default=10240)
+    min_free_mb: int = Field(description="Delete oldest segments while free disk space is below this", default=2048)
+
+
+class ErrorRuleConfig(BaseModel):
+    """A log pattern that diagnoses a process failure."""
+
+    id: str = Field(description="Rule id; a built-in rule with the same id is replaced")
+    pattern: str = Field(description="Regular expression matched against each output line")
+    message: str = Field(description="Message shown when the process fails; may use {name} for named groups")
+    priority: int = Field(description="Higher priority wins when several rules matched", default=50)
+    ignore_case: bool = Field(description="Match case-insensitively", default=False)
+
+
+class JobsConfig(BaseModel):
+    """Job queue scheduling limits."""
+
+    directory: str = Field(
+        description="Directory for the saved job queue and per-job logs",
+        default_factory=lambda: str(Path.home() / ".tensi_trossen_studio" / "jobs"),
+    )
+    cpu_core_budget: int = Field(
+        description="Cores shared by concurrently running CPU-only jobs",
+        default_factory=lambda: os.cpu_count() or 4,
+    )
+    gpu_slots: int = Field(description="GPU jobs allowed at once, including an interactive training run", default=1)
+
+
+class ResourcesConfig(BaseModel):
+    """Process resource sampling settings."""
+
+    sample_interval_s: float = Field(
+        description="How often the CPU, memory and I/O usage of the running process tree is sampled",
+        default=1.0,
+    )
+
+
+# Station made of the top-level robot/dataset/replay sections
+DEFAULT_STATION = "default"
+_STATION_ID = re.compile(r"[A-Za-z0-9_-]+")
+# Camera keys of other stations are "<station>.<key>" (the default station's are bare)
+STATION_CAMERA_SEPARATOR = "."
+
+
+class StationConfig(BaseModel):
+    """An additional robot cell: its own leader/follower pair, cameras and recording settings."""
+
+    name: str = Field(description="Display name", default="")
+    robot: RobotConfig = Field(description="Arms and cameras of this station")
+    dataset: DatasetConfig = Field(default_factory=DatasetConfig)
+    replay: ReplayConfig = Field(default_factory=ReplayConfig)
+
+
 class AppConfig(BaseModel):
     """Full application configuration."""
 
@@ -161,11 +241,70 @@ class AppConfig(BaseModel):
     dataset: DatasetConfig = Field(default_factory=DatasetConfig)
     train: TrainConfig = Field(default_factory=TrainConfig)
     replay: ReplayConfig = Field(default_factory=ReplayConfig)
+    streaming: StreamingConfig = Field(default_factory=StreamingConfig)
+    dvr: DvrConfig = Field(default_factory=DvrConfig)
+    jobs: JobsConfig = Field(default_factory=JobsConfig)
+    resources: ResourcesConfig = Field(default_factory=ResourcesConfig)
+    stations: dict[str, StationConfig] = Field(
+        description="Additional stations by id; robot/dataset/replay above are the 'default' station",
+        default_factory=dict,
+    )
+    error_rules: list[ErrorRuleConfig] = Field(
+        description="Extra process error diagnosis rules",
+        default_factory=list,
+    )
     lerobot_trossen_path: str = Field(
         description="Path to lerobot_trossen repository",
         default_factory=lambda: str(Path.home() / "lerobot_trossen"),
     )
 
+    @field_validator("stations")
+    @classmethod
+    def _check_station_ids(cls, stations: dict[str, StationConfig]) -> dict[str, StationConfig]:
+        for station_id in stations:
+            if station_id == DEFAULT_STATION or not _STATION_ID.fullmatch(station_id):
+                raise ValueError(
+                    f"Invalid station id '{station_id}': use letters, digits, '_' or '-' (and not '{DEFAULT_STATION}')"
+                )
+        return stations
+
+
+def station_ids(config: AppConfig) -> list[str]:
+    """All station ids, the default station first."""
+    return [DEFAULT_STATION, *config.stations]
+
+
+def station_config(config: AppConfig, station_id: str) -> AppConfig:
+    """Config as one station sees it: its robot/dataset/replay sections in place of the top-level ones.
+
+    Raises:
+        KeyError: unknown station
+    """
+    if station_id == DEFAULT_STATION:
+        return config
+    station = config.stations[station_id]
+    return config.model_copy(update={"robot": station.robot, "dataset": station.dataset, "replay": station.replay})
+
+
+def station_camera_key(station_id: str, key: str) -> str:
+    """CameraManager key of a station's camera."""
+    return key if station_id == DEFAULT_STATION else f"{station_id}{STATION_CAMERA_SEPARATOR}{key}"
+
+
+def split_camera_key(camera_key: str) -> tuple[str, str]:
+    """(station id, camera key within the station) of a CameraManager key."""
+    station_id, sep, key = camera_key.partition(STATION_CAMERA_SEPARATOR)
+    return (station_id, key) if sep else (DEFAULT_STATION, camera_key)
+
+
+def all_cameras(config: AppConfig) -> dict[str, dict[str, Any]]:
+    """Teleop camera configs of every station, by CameraManager key."""
+    cameras = dict(config.robot.cameras or {})
+    for station_id, station in config.stations.items():
+        for key, camera in (station.robot.cameras or {}).items():
+            cameras[station_camera_key(station_id, key)] = camera
+    return cameras
+
 
 DEFAULT_CAMERAS = {
     "left_wrist": {
@@ -3,19 +3,22 @@
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import load_config
-from app.routes import config_routes, process_routes, camera_routes, leader_service_routes
+from app.routes import config_routes, process_routes, camera_routes, leader_service_routes, job_routes, station_routes
 from app.services.camera_manager import CameraManager
+from app.services.job_queue import JobQueue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown."""
-    # Startup
+    # Startup - resume scheduling queued jobs
+    JobQueue.get_instance().start()
     yield
+    JobQueue.get_instance().shutdown()
     # Shutdown - only shutdown local cameras if managed by this instance
     config = load_config()
     if config.robot.enable_local_cameras:
@@ -39,9 +42,17 @@ app.add_middleware(
 )
 
 app.include_router(config_routes.router, prefix="/api/config")
-app.include_router(process_routes.router)
+app.include_router(process_routes.router, prefix="/api")
 app.include_router(camera_routes.router)
 app.include_router(leader_service_routes.router)
+app.include_router(job_routes.router)
+app.include_router(station_routes.router)
+app.include_router(
+    process_routes.router,
+    prefix="/api/stations/{station_id}",
+    tags=["stations"],
+    dependencies=[Depends(process_routes.require_station)],
+)
 
 
 @app.get("/")
@@ -1,26 +1,67 @@
 """Camera streaming API routes."""
 
+import asyncio
+import contextlib
 import logging
 import os
+import struct
 import time
+from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 
-from app.config import load_config
-from app.services.camera_manager import CameraManager
+from app.config import (
+    DEFAULT_STATION,
+    AppConfig,
+    all_cameras,
+    load_config,
+    split_camera_key,
+    station_camera_key,
+    station_config,
+)
+from app.services.camera_manager import RENDITION_SCALES, CameraManager
 from app.services.camera_streamer import CameraStreamer
+from app.services.device_inventory import HAS_REALSENSE, DeviceInventory
+from app.services.dvr_recorder import RetentionPolicy
+from app.services.h264_stream import H264Subscriber, h264_available
+from app.services.viewer_registry import ViewerPriority
 
 router = APIRouter(prefix="/api/cameras", tags=["cameras"])
 logger = logging.getLogger(__name__)
 
+_LOCAL_HOSTS = {"127.0.0.1", "::1", "localhost", "testclient"}
+
+# WebSocket frame header: version, frame seq, capture time (epoch s), encode ms; JPEG bytes follow
+WS_FRAME_HEADER = struct.Struct("<BIdf")
+WS_HEADER_VERSION = 1
+# How often a socket waiting for a frame looks the frame pool up again (a camera (re)start replaces it)
+WS_RECHECK_S = 0.5
+
+# Snapshot long-poll: longest wait for a newer frame, and how often a waiting request
+# looks the frame pool up again (a camera (re)start replaces it)
+SNAPSHOT_MAX_WAIT_S = 10.0
+SNAPSHOT_RECHECK_S = 0.5
+
+
+def _viewer_priority(viewer: str | None, client_host: str | None) -> ViewerPriority:
+    """Resolve the viewer class: explicit ?viewer=operator|studio|remote, else local clients are studio."""
+    if viewer:
+        try:
+            return ViewerPriority[viewer.upper()]
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"Unknown viewer '{viewer}' (use operator, studio or remote)")
+    if client_host in _LOCAL_HOSTS:
+        return ViewerPriority.STUDIO
+    return ViewerPriority.REMOTE
+
 
 @router.get("/status")
 def camera_status() -> dict:
     """Return status of all cameras including any hardware errors."""
     config = load_config()
-    cameras = config.robot.cameras or {}
-    
+
     # Check if we should proxy to remote camera service
     camera_service_url = os.getenv("CAMERA_SERVICE_URL")
     if camera_service_url:
@@ -35,50 +76,58 @@ def camera_status() -> dict:
     
     # Local camera status (teleop cameras + operator if configured)
     manager = CameraManager.get_instance()
-    status = {}
-    for key in cameras:
-        status[key] = manager.get_camera_status(key)
-    if config.robot.operator_camera:
-        status["operator"] = manager.get_camera_status("operator")
-    return {"cameras": status}
+    return {"cameras": station_camera_status(config, DEFAULT_STATION), "viewers": manager.viewers.snapshot()}
+
+
+def station_camera_status(config: AppConfig, station_id: str) -> dict:
+    """Status of a station's cameras (teleop cameras + operator if configured), by key within the station.
+
+    Raises:
+        KeyError: unknown station
+    """
+    robot = station_config(config, station_id).robot
+    keys = list(robot.cameras or {})
+    if robot.operator_camera:
+        keys.append("operator")
+    manager = CameraManager.get_instance()
+    return {key: manager.get_camera_status(station_camera_key(station_id, key)) for key in keys}
+
+
+@router.get("/supervisor")
+def camera_supervisor() -> dict:
+    """Return cameras currently being restarted and recent time-to-recover per incident."""
+    return CameraManager.get_instance().get_supervisor_status()
+
+
+@router.get("/quality")
+def camera_quality() -> dict:
+    """Latest exposure/blur/frozen metrics and quality flags of every running camera."""
+    return CameraManager.get_instance().get_quality()
+
+
+@router.get("/quality/{camera_key}")
+def camera_quality_series(camera_key: str, seconds: float | None = None) -> dict:
+    """Quality metrics time series of one camera (optionally only the last `seconds`)."""
+    quality = CameraManager.get_instance().get_quality(camera_key, seconds)
+    if not quality:
+        raise HTTPException(status_code=404, detail=f"Camera '{camera_key}' is not running")
+    return quality
 
 
 @router.get("/usb-devices")
-def list_usb_video_devices() -> dict:
-    """List USB video devices (e.g. for operator view camera). Returns index, path, and name."""
-    devices = []
-    try:
-        import glob
-        # Linux: /dev/video0, /dev/video1, ...
-        video_glob = "/dev/video*"
-        paths = sorted(glob.glob(video_glob), key=lambda p: (len(p), p))
-        for path in paths:
-            try:
-                base = os.path.basename(path)
-                if not base.startswith("video"):
-                    continue
-                idx_str = base.replace("video", "")
-                if not idx_str.isdigit():
-                    continue
-                index = int(idx_str)
-                name = ""
-                sys_name = f"/sys/class/video4linux/{base}/name"
-                if os.path.exists(sys_name):
-                    try:
-                        name = open(sys_name).read().strip()
-                    except Exception:
-                        pass
-                devices.append({"index": index, "path": path, "name": name or path})
-            except Exception:
-                continue
-    except Exception as e:
-        logger.warning(f"Failed to list USB video devices: {e}")
-        return {"devices": [], "error": str(e)}
-    return {"devices": devices}
+def list_usb_video_devices(refresh: bool = False) -> dict:
+    """List USB video devices (e.g. for operator view camera). Returns index, path, and name.
+
+    Served from the hot-plug-maintained device inventory; `refresh=true` forces a rescan.
+    """
+    inventory = DeviceInventory.get_instance()
+    if refresh:
+        inventory.refresh()
+    return {"devices": inventory.video_devices()}
 
 
 @router.get("/detect")
-def detect_cameras() -> dict:
+def detect_cameras(refresh: bool = False) -> dict:
     """List detected RealSense cameras. Use to verify serial numbers in config."""
     # Check if we should proxy to remote camera service
     camera_service_url = os.getenv("CAMERA_SERVICE_URL")
@@ -91,21 +140,16 @@ def detect_cameras() -> dict:
         except Exception as e:
             logger.warning(f"Failed to detect cameras from remote service: {e}")
             # Fall back to local detection
-    
-    # Local camera detection
-    try:
-        import pyrealsense2 as rs
-    except ImportError:
+
+    # Local detection, from the inventory (no RealSense query per request)
+    if not HAS_REALSENSE:
         return {"detected": [], "message": "pyrealsense2 not installed"}
-    devices = []
-    try:
-        ctx = rs.context()
-        for d in ctx.query_devices():
-            serial = d.get_info(rs.camera_info.serial_number)
-            name = d.get_info(rs.camera_info.name)
-            devices.append({"serial": serial, "name": name})
-    except Exception as e:
-        return {"detected": [], "error": str(e)}
+    inventory = DeviceInventory.get_instance()
+    if refresh:
+        inventory.refresh()
+    if inventory.realsense_error:
+        return {"detected": [], "error": inventory.realsense_error}
+    devices = [{"serial": d["serial"], "name": d["name"]} for d in inventory.realsense_devices()]
     config = load_config()
     configured = {
         k: c.get("serial_number_or_name", "?")
@@ -114,6 +158,24 @@ def detect_cameras() -> dict:
     return {"detected": devices, "configured": configured}
 
 
+@router.get("/bandwidth-plan")
+def bandwidth_plan() -> dict:
+    """Plan per-camera RealSense modes against the USB bus each camera sits on."""
+    camera_service_url = os.getenv("CAMERA_SERVICE_URL")
+    if camera_service_url:
+        try:
+            import requests
+            response = requests.get(f"{camera_service_url}/api/cameras/bandwidth-plan", timeout=5)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.warning(f"Failed to get bandwidth plan from remote camera service: {e}")
+            # Fall back to local planning
+
+    config = load_config()
+    return CameraManager.get_instance().plan_bandwidth(all_cameras(config))
+
+
 @router.post("/shutdown")
 def shutdown_cameras() -> dict:
     """Shutdown only teleop cameras (robot.cameras); operator camera stays on."""
@@ -126,33 +188,231 @@ def shutdown_cameras() -> dict:
     return {"status": "shutdown", "cameras_released": to_release}
 
 
+def _camera_config(config: AppConfig, camera_key: str) -> dict | None:
+    """Config dict for a streamable camera key (teleop cameras or the operator camera), or None.
+
+    Cameras of other stations are addressed as "<station>.<key>", e.g. "cell2.top".
+    """
+    station_id, key = split_camera_key(camera_key)
+    try:
+        robot = station_config(config, station_id).robot
+    except KeyError:
+        return None
+    if key == "operator":
+        return robot.operator_camera or None
+    return (robot.cameras or {}).get(key)
+
+
+def _is_operator_camera(camera_key: str) -> bool:
+    """Whether a camera key names a station's operator camera ("operator", "cell2.operator")."""
+    return split_camera_key(camera_key)[1] == "operator"
+
+
+def _admit_viewer(manager: CameraManager, config: AppConfig, camera_key: str, priority: ViewerPriority, client: str):
+    """Apply configured viewer limits and admit a viewer; returns the ticket or None."""
+    streaming = config.streaming
+    manager.viewers.configure(
+        streaming.max_viewers_per_camera,
+        streaming.max_viewers_total,
+        streaming.degrade_load_fraction,
+    )
+    return manager.viewers.admit(camera_key, priority, client)
+
+
+def _start_dvr(manager: CameraManager, config: AppConfig) -> None:
+    """Start (or reconfigure) the DVR from the dvr config section."""
+    dvr = config.dvr
+    manager.dvr.start(
+        Path(dvr.directory),
+        dvr.segment_s,
+        RetentionPolicy(
+            max_age_s=dvr.max_age_hours * 3600,
+            max_total_bytes=dvr.max_total_mb * 1024 * 1024,
+            min_free_bytes=dvr.min_free_mb * 1024 * 1024,
+        ),
+    )
+
+
+def _ensure_camera_started(manager: CameraManager, config: AppConfig, camera_key: str, camera_config: dict) -> None:
+    """Lazy init camera if not already started."""
+    manager.set_processing(camera_key, camera_config.get("processing"))
+    if camera_key in manager.cameras and manager.cameras[camera_key].is_running:
+        return
+    if config.dvr.enabled and not manager.dvr.running:
+        _start_dvr(manager, config)
+    width = int(camera_config.get("width", 640))
+    height = int(camera_config.get("height", 480))
+    fps = int(camera_config.get("fps", 30))
+    if _is_operator_camera(camera_key):
+        device_index = int(camera_config.get("device_index", 0))
+        manager.initialize_usb_camera(camera_key, device_index, width, height, fps)
+    else:
+        if not manager.bandwidth_plan:
+            manager.plan_bandwidth(all_cameras(config))
+        serial = str(camera_config.get("serial_number_or_name", ""))
+        manager.initialize_camera(camera_key, serial, width, height, fps)
+
+
+@router.get("/dvr")
+def dvr_status() -> dict:
+    """DVR state, counters and the segments on disk per camera."""
+    manager = CameraManager.get_instance()
+    return {**manager.dvr.status(), "segments": manager.dvr.list_segments()}
+
+
+@router.post("/dvr/start")
+def dvr_start() -> dict:
+    """Start recording all running cameras with the configured segment length and retention."""
+    manager = CameraManager.get_instance()
+    _start_dvr(manager, load_config())
+    return manager.dvr.status()
+
+
+@router.post("/dvr/stop")
+def dvr_stop() -> dict:
+    """Stop recording; open segments are flushed and closed."""
+    manager = CameraManager.get_instance()
+    manager.dvr.stop()
+    return manager.dvr.status()
+
+
+@router.get("/dvr/frame/{camera_key}")
+def dvr_frame(camera_key: str, at: float) -> Response:
+    """Recorded JPEG of a camera at or just before `at` (epoch seconds)."""
+    found = CameraManager.get_instance().dvr.frame_at(camera_key, at)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"No recording of '{camera_key}' at {at}")
+    data, captured_at = found
+    return Response(content=data, media_type="image/jpeg", headers={"X-Captured-At": f"{captured_at:.3f}"})
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an If-None-Match header lists `etag` (weak comparison) or is `*`."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+
+@router.get("/snapshot/{camera_key}")
+async def camera_snapshot(
+    camera_key: str,
+    request: Request,
+    rendition: str = "full",
+    wait_newer_than: int | None = None,
+    timeout: float = SNAPSHOT_MAX_WAIT_S,
+) -> Response:
+    """Latest JPEG of a camera, with an ETag derived from its frame sequence number.
+
+    A matching If-None-Match returns 304 without reading the frame. With
+    `wait_newer_than=<seq>` (the X-Frame-Seq of the last snapshot) the request
+    waits up to `timeout` seconds for a different frame.
+    """
+    config = load_config()
+    camera_config = _camera_config(config, camera_key)
+    if camera_config is None:
+        raise HTTPException(status_code=404, detail=f"Camera '{camera_key}' not in config")
+
+    camera_service_url = os.getenv("CAMERA_SERVICE_URL")
+    if camera_service_url and not _is_operator_camera(camera_key):
+        import httpx
+
+        params = {"rendition": rendition, "timeout": timeout}
+        if wait_newer_than is not None:
+            params["wait_newer_than"] = wait_newer_than
+        headers = {}
+        if request.headers.get("if-none-match"):
+            headers["If-None-Match"] = request.headers["if-none-match"]
+        try:
+            async with httpx.AsyncClient(timeout=timeout + 5.0) as client:
+                response = await client.get(
+                    f"{camera_service_url}/api/cameras/snapshot/{camera_key}",
+                    params=params,
+                    headers=headers,
+                )
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Camera service unreachable: {e}")
+        passed = {k: v for k, v in response.headers.items() if k.lower() in ("etag", "cache-control", "x-frame-seq", "x-captured-at")}
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            headers=passed,
+            media_type=response.headers.get("content-type"),
+        )
+
+    manager = CameraManager.get_instance()
+    await run_in_threadpool(_ensure_camera_started, manager, config, camera_key, camera_config)
+
+    pool = manager.get_frame_pool(camera_key, rendition)
+    if wait_newer_than is not None:
+        deadline = time.monotonic() + max(0.0, min(timeout, SNAPSHOT_MAX_WAIT_S))
+        # Any other seq is newer: after a camera restart the sequence starts again from 1
+        while pool is None or not pool.has_frame() or pool.seq == wait_newer_than:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_s = min(remaining, SNAPSHOT_RECHECK_S)
+            if pool is None:
+                await asyncio.sleep(wait_s)
+            else:
+                # Woken by the capture thread's publish(); no polling per waiting client
+                await pool.wait_newer(wait_newer_than, wait_s)
+            pool = manager.get_frame_pool(camera_key, rendition)
+    if pool is None or not pool.has_frame():
+        raise HTTPException(status_code=503, detail=f"Camera '{camera_key}' has no frame yet")
+
+    if_none_match = request.headers.get("if-none-match")
+    etag = f'"{pool.epoch}-{pool.seq}"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    with pool.acquire() as frame:
+        body = bytes(frame.data)
+        seq, captured_at = frame.seq, frame.captured_at
+    return Response(
+        content=body,
+        media_type="image/jpeg",
+        headers={
+            "ETag": f'"{pool.epoch}-{seq}"',
+            "Cache-Control": "no-cache",
+            "X-Frame-Seq": str(seq),
+            "X-Captured-At": f"{captured_at:.3f}",
+        },
+    )
+
+
 @router.get("/stream/{camera_key}")
-async def stream_camera(camera_key: str) -> StreamingResponse:
-    """Stream MJPEG feed for the specified camera (wrist, top, operator, etc.)."""
+async def stream_camera(camera_key: str, request: Request, viewer: str | None = None) -> StreamingResponse:
+    """Stream MJPEG feed for the specified camera (wrist, top, operator, etc.).
+
+    `viewer` (operator, studio, remote) sets admission priority; it defaults to
+    studio for local clients and remote otherwise.
+    """
+    client_host = request.client.host if request.client else None
+    priority = _viewer_priority(viewer, client_host)
     config = load_config()
-    cameras = config.robot.cameras or {}
-    operator_camera = config.robot.operator_camera
 
     # Operator stream: allowed when operator_camera is set
-    if camera_key == "operator":
-        if not operator_camera:
+    camera_config = _camera_config(config, camera_key)
+    if camera_config is None:
+        if _is_operator_camera(camera_key):
             raise HTTPException(status_code=404, detail="Operator camera not configured")
-        camera_config = operator_camera
-    elif camera_key in cameras:
-        camera_config = cameras[camera_key]
-    else:
         raise HTTPException(status_code=404, detail=f"Camera '{camera_key}' not in config")
 
     # Check if we should proxy to remote camera service (only for teleop cameras, not operator)
     camera_service_url = os.getenv("CAMERA_SERVICE_URL")
-    if camera_service_url and camera_key != "operator":
+    if camera_service_url and not _is_operator_camera(camera_key):
         try:
             import httpx
 
             async def proxy_stream():
                 async with httpx.AsyncClient(timeout=30.0) as client:
                     url = f"{camera_service_url}/api/cameras/stream/{camera_key}"
-                    async with client.stream("GET", url) as response:
+                    params = {"viewer": priority.name.lower()}
+                    async with client.stream("GET", url, params=params) as response:
                         response.raise_for_status()
                         async for chunk in response.aiter_bytes():
                             yield chunk
@@ -166,36 +426,321 @@ async def stream_camera(camera_key: str) -> StreamingResponse:
 
     # Local camera streaming
     manager = CameraManager.get_instance()
+    ticket = _admit_viewer(manager, config, camera_key, priority, client_host or "")
+    if ticket is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Viewer limit reached for camera '{camera_key}'; close other Studio tabs and retry",
+        )
 
-    # Lazy init camera if not already started
-    if camera_key not in manager.cameras or not manager.cameras[camera_key].is_running:
-        if camera_key == "operator":
-            device_index = int(camera_config.get("device_index", 0))
-            width = int(camera_config.get("width", 640))
-            height = int(camera_config.get("height", 480))
-            fps = int(camera_config.get("fps", 30))
-            manager.initialize_usb_camera(camera_key, device_index, width, height, fps)
-        else:
-            serial = str(camera_config.get("serial_number_or_name", ""))
-            width = int(camera_config.get("width", 640))
-            height = int(camera_config.get("height", 480))
-            fps = int(camera_config.get("fps", 30))
-            manager.initialize_camera(camera_key, serial, width, height, fps)
+    try:
+        # Bandwidth planning, resets and the start stagger block: keep them off the event loop
+        await run_in_threadpool(_ensure_camera_started, manager, config, camera_key, camera_config)
+    except Exception:
+        # generate() never runs, so its finally would not free the slot
+        manager.viewers.release(ticket)
+        raise
 
     fps_val = int(camera_config.get("fps", 30))
     frame_delay = 1.0 / fps_val
 
     def generate():
-        while True:
-            frame = manager.get_latest_frame(camera_key)
-            if frame:
-                yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
-            else:
-                placeholder = CameraStreamer._placeholder_frame()
-                yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + placeholder + b"\r\n"
-            time.sleep(frame_delay)
+        try:
+            # Stops when a more important viewer displaces this one
+            while not ticket.evicted:
+                # Build the part while the pooled frame is pinned; the pin is released before yielding
+                with manager.acquire_frame(camera_key, ticket.rendition) as frame:
+                    jpeg = frame.data if frame is not None else CameraStreamer._placeholder_frame()
+                    part = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpeg + b"\r\n"
+                yield part
+                time.sleep(frame_delay * ticket.fps_divisor)
+        finally:
+            manager.viewers.release(ticket)
+
+    return StreamingResponse(
+        generate(),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+    )
+
+
+@router.get("/mosaic")
+async def stream_mosaic(request: Request, viewer: str | None = None) -> StreamingResponse:
+    """MJPEG grid of all configured cameras (teleop cameras, then operator), composited and encoded once.
+
+    Every mosaic viewer shares one encode at `streaming.mosaic_fps`; viewers are
+    admitted under the pseudo-camera key "mosaic".
+    """
+    client_host = request.client.host if request.client else None
+    priority = _viewer_priority(viewer, client_host)
+    config = load_config()
+    keys = list(config.robot.cameras or {})
+    if config.robot.operator_camera:
+        keys.append("operator")
+    if not keys:
+        raise HTTPException(status_code=404, detail="No cameras configured")
+
+    camera_service_url = os.getenv("CAMERA_SERVICE_URL")
+    if camera_service_url:
+        try:
+            import httpx
+
+            async def proxy_stream():
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    url = f"{camera_service_url}/api/cameras/mosaic"
+                    params = {"viewer": priority.name.lower()}
+                    async with client.stream("GET", url, params=params) as response:
+                        response.raise_for_status()
+                        async for chunk in response.aiter_bytes():
+                            yield chunk
+
+            return StreamingResponse(
+                proxy_stream(),
+                media_type="multipart/x-mixed-replace; boundary=frame",
+            )
+        except Exception as e:
+            logger.error(f"Failed to proxy mosaic stream from remote service: {e}")
+
+    manager = CameraManager.get_instance()
+    ticket = _admit_viewer(manager, config, "mosaic", priority, client_host or "")
+    if ticket is None:
+        raise HTTPException(status_code=503, detail="Viewer limit reached for the mosaic; close other Studio tabs and retry")
+
+    for key in keys:
+        try:
+            await run_in_threadpool(_ensure_camera_started, manager, config, key, _camera_config(config, key))
+        except Exception as e:
+            # A dead camera just leaves its tile blank
+            logger.warning(f"Mosaic: camera {key} did not start: {e}")
+
+    streaming = config.streaming
+    try:
+        mosaic = manager.open_mosaic(
+            keys,
+            (streaming.mosaic_tile_width, streaming.mosaic_tile_height),
+            streaming.mosaic_fps,
+        )
+    except Exception:
+        manager.viewers.release(ticket)
+        raise
+    frame_delay = 1.0 / mosaic.fps
+
+    def generate():
+        try:
+            while not ticket.evicted:
+                with mosaic.frames.acquire() as frame:
+                    jpeg = frame.data if frame is not None else CameraStreamer._placeholder_frame()
+                    part = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpeg + b"\r\n"
+                yield part
+                time.sleep(frame_delay * ticket.fps_divisor)
+        finally:
+            manager.close_mosaic(mosaic)
+            manager.viewers.release(ticket)
 
     return StreamingResponse(
         generate(),
         media_type="multipart/x-mixed-replace; boundary=frame",
     )
+
+
+async def _open_camera_socket(websocket: WebSocket, camera_key: str, viewer: str | None):
+    """Validate, admit and accept a camera WebSocket, starting the camera if needed.
+
+    Returns:
+        (config, camera_config, manager, ticket), or None if the socket was closed instead
+    """
+    client_host = websocket.client.host if websocket.client else None
+    config = load_config()
+    camera_config = _camera_config(config, camera_key)
+    if camera_config is None:
+        await websocket.close(code=1008, reason=f"Camera '{camera_key}' not in config")
+        return None
+    if os.getenv("CAMERA_SERVICE_URL") and not _is_operator_camera(camera_key):
+        await websocket.close(code=1008, reason="Cameras are served by the camera service; connect to it directly")
+        return None
+    try:
+        priority = _viewer_priority(viewer, client_host)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return None
+
+    manager = CameraManager.get_instance()
+    ticket = _admit_viewer(manager, config, camera_key, priority, client_host or "")
+    if ticket is None:
+        await websocket.close(code=1013, reason="Viewer limit reached")
+        return None
+    try:
+        await websocket.accept()
+        await run_in_threadpool(_ensure_camera_started, manager, config, camera_key, camera_config)
+    except Exception:
+        # The caller's finally only runs once this returns
+        manager.viewers.release(ticket)
+        raise
+    return config, camera_config, manager, ticket
+
+
+@router.websocket("/ws/{camera_key}")
+async def camera_websocket(
+    websocket: WebSocket,
+    camera_key: str,
+    viewer: str | None = None,
+    rendition: str = "full",
+    credits: int = 1,
+) -> None:
+    """Binary JPEG frames over WebSocket with credit-based flow control.
+
+    Each binary message is WS_FRAME_HEADER (version, seq, capture time, encode
+    ms) followed by the JPEG. A frame is only sent while the client holds
+    credit; every frame costs one. The client grants more with text messages
+    `{"ack": <seq>}` (one credit) or `{"credits": n}` (an integer; negative
+    grants count as 0, anything else closes the socket with 1008), and can
+    switch rendition mid-stream with `{"rendition": "full" | "low"}`.
+    """
+    opened = await _open_camera_socket(websocket, camera_key, viewer)
+    if opened is None:
+        return
+    _, camera_config, manager, ticket = opened
+
+    try:
+        state = {"credits": max(0, credits), "rendition": rendition}
+        credit_available = asyncio.Event()
+        if state["credits"] > 0:
+            credit_available.set()
+
+        async def receive_control() -> None:
+            while True:
+                message = await websocket.receive_json()
+                if "ack" in message or "credits" in message:
+                    grant = message.get("credits", 1)
+                    if not isinstance(grant, int) or isinstance(grant, bool):
+                        await websocket.close(code=1008, reason="credits must be an integer")
+                        return
+                    state["credits"] += max(0, grant)
+                    if state["credits"] > 0:
+                        credit_available.set()
+                if "rendition" in message:
+                    state["rendition"] = str(message["rendition"])
+
+        receiver = asyncio.create_task(receive_control())
+        frame_s = 1.0 / int(camera_config.get("fps", 30))
+        last_seq = None
+        try:
+            while not ticket.evicted and not receiver.done():
+                if state["credits"] <= 0:
+                    try:
+                        await asyncio.wait_for(credit_available.wait(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                # Load-based degradation overrides a client asking for full size
+                wanted = "low" if ticket.rendition == "low" else state["rendition"]
+                message = None
+                with manager.acquire_frame(camera_key, wanted) as frame:
+                    if frame is not None and frame.seq != last_seq:
+                        last_seq = frame.seq
+                        header = WS_FRAME_HEADER.pack(
+                            WS_HEADER_VERSION, frame.seq & 0xFFFFFFFF, frame.captured_at, frame.encode_ms
+                        )
+                        message = header + frame.data
+                if message is None:
+                    pool = manager.get_frame_pool(camera_key, wanted)
+                    if pool is None:
+                        await asyncio.sleep(WS_RECHECK_S)
+                    else:
+                        # Woken by the capture thread's publish(), like the snapshot long-poll
+                        await pool.wait_newer(-1 if last_seq is None else last_seq, WS_RECHECK_S)
+                    continue
+                await websocket.send_bytes(message)
+                state["credits"] -= 1
+                if state["credits"] <= 0:
+                    credit_available.clear()
+                if ticket.fps_divisor > 1:
+                    await asyncio.sleep(frame_s * (ticket.fps_divisor - 1))
+        finally:
+            receiver.cancel()
+            with contextlib.suppress(BaseException):
+                await receiver
+        if ticket.evicted:
+            await websocket.close(code=1013, reason="Displaced by a higher-priority viewer")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.viewers.release(ticket)
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """Return once the client disconnects (for send-only sockets that must notice a silent close)."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.get("/h264/stats")
+def h264_stats() -> dict:
+    """Bitrate, encode latency and subscriber counts of running H.264 encoders."""
+    return {"available": h264_available(), "encoders": CameraManager.get_instance().h264.stats()}
+
+
+@router.websocket("/h264/{camera_key}")
+async def camera_h264(
+    websocket: WebSocket,
+    camera_key: str,
+    viewer: str | None = None,
+    rendition: str = "low",
+) -> None:
+    """Low-bitrate H.264 (Annex-B) over WebSocket for remote viewers.
+
+    The first message is JSON describing the stream (codec, size, fps); binary
+    messages that follow are Annex-B byte stream starting at an SPS. One
+    encoder per camera rendition is shared by all viewers.
+    """
+    if not h264_available():
+        await websocket.close(code=1011, reason="ffmpeg is not installed on the camera host")
+        return
+    opened = await _open_camera_socket(websocket, camera_key, viewer)
+    if opened is None:
+        return
+    config, _, manager, ticket = opened
+
+    encoder = None
+    subscriber = H264Subscriber(asyncio.get_running_loop())
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        camera = manager.cameras.get(camera_key)
+        if camera is None:
+            await websocket.close(code=1011, reason=f"Camera '{camera_key}' failed to start")
+            return
+        scale = RENDITION_SCALES.get(rendition, 1.0)
+        # Spawns ffmpeg and takes the camera manager's lock: keep it off the event loop
+        encoder = await run_in_threadpool(
+            manager.h264.subscribe,
+            camera_key,
+            rendition,
+            (int(camera.width * scale), int(camera.height * scale)),
+            camera.fps,
+            config.streaming.h264_bitrate_kbps,
+            lambda sink: manager.add_frame_sink(camera_key, sink),
+            lambda sink: manager.remove_frame_sink(camera_key, sink),
+            subscriber,
+        )
+        await websocket.send_json({
+            "codec": "h264",
+            "format": "annexb",
+            "width": encoder.width,
+            "height": encoder.height,
+            "fps": encoder.fps,
+        })
+        while not ticket.evicted and not disconnected.done() and not encoder.exited:
+            chunk = await subscriber.next_chunk(timeout=1.0)
+            if chunk:
+                await websocket.send_bytes(chunk)
+        if ticket.evicted:
+            await websocket.close(code=1013, reason="Displaced by a higher-priority viewer")
+        elif encoder.exited and not disconnected.done():
+            # The viewer reconnects and gets a fresh encoder
+            await websocket.close(code=1011, reason="H.264 encoder stopped")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        if encoder is not None:
+            await run_in_threadpool(manager.h264.unsubscribe, encoder, subscriber)
+        manager.viewers.release(ticket)
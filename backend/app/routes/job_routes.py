@@ -0,0 +1,150 @@
+"""Job queue API routes - queue training/replay runs and parameter sweeps."""
+
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.config import DEFAULT_STATION, AppConfig, ReplayConfig, TrainConfig, load_config, station_config
+from app.services.job_queue import JobQueue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+# Job parameters accepted per kind, beyond which a request is rejected
+_TRAIN_PARAMS = set(TrainConfig.model_fields) | {"device"}
+_REPLAY_PARAMS = set(ReplayConfig.model_fields)
+
+
+def _queue(config: AppConfig) -> JobQueue:
+    """The job queue with the current config's limits applied."""
+    queue = JobQueue.get_instance()
+    queue.configure(config.jobs.cpu_core_budget, config.jobs.gpu_slots, Path(config.lerobot_trossen_path))
+    return queue
+
+
+def _job_params(kind: str, params: dict, config: AppConfig, station_id: str = DEFAULT_STATION) -> dict:
+    """Complete job parameters: the config section's values overridden by `params`.
+
+    The result is stored with the job, so a queued job runs as submitted even
+    if Settings change before it starts. Replay settings and the follower arm
+    come from the job's station (404 for an unknown station).
+    """
+    try:
+        station = station_config(config, station_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Station '{station_id}' not found")
+    if kind == "train":
+        unknown = set(params) - _TRAIN_PARAMS
+        base = {**config.train.model_dump(), "device": "cuda"}
+    elif kind == "replay":
+        unknown = set(params) - _REPLAY_PARAMS
+        base = {**station.replay.model_dump(), "follower_ip": station.robot.follower_ip}
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{kind}'")
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {kind} parameters: {', '.join(sorted(unknown))}")
+    return {**base, **params}
+
+
+def _get_job(queue: JobQueue, job_id: str) -> dict:
+    try:
+        return queue.get(job_id).to_dict()
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+
+@router.get("")
+def list_jobs() -> dict:
+    """All jobs (queued, running and finished) plus the scheduling limits."""
+    queue = _queue(load_config())
+    return {
+        "jobs": [job.to_dict() for job in queue.jobs()],
+        "cpu_core_budget": queue.cpu_core_budget,
+        "gpu_slots": queue.gpu_slots,
+    }
+
+
+@router.post("")
+def submit_job(body: dict) -> dict:
+    """Queue a job.
+
+    Body: `kind` ("train" or "replay"), `params` (overrides of the train or
+    replay settings; train also takes `device`), and optionally `station`
+    (whose arm a replay drives, default station if omitted), `priority`,
+    `resource_class` ("robot", "gpu", "cpu") and `cores`.
+    """
+    config = load_config()
+    kind = body.get("kind", "train")
+    params = _job_params(kind, body.get("params") or {}, config, body.get("station") or DEFAULT_STATION)
+    try:
+        job = _queue(config).submit(
+            kind,
+            params,
+            priority=int(body.get("priority", 0)),
+            resource_class=body.get("resource_class"),
+            cores=int(body.get("cores", 1)),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return job.to_dict()
+
+
+@router.post("/sweep")
+def submit_sweep(body: dict) -> dict:
+    """Queue one training job per combination of `grid` values.
+
+    Body: `grid` (TrainConfig field or `device` -> list of values), `params`
+    (overrides shared by all runs), and optionally `priority`,
+    `resource_class` and `cores`.
+    """
+    config = load_config()
+    base = _job_params("train", body.get("params") or {}, config)
+    try:
+        jobs = _queue(config).submit_sweep(
+            base,
+            body.get("grid") or {},
+            priority=int(body.get("priority", 0)),
+            resource_class=body.get("resource_class"),
+            cores=int(body.get("cores", 1)),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"sweep_id": jobs[0].sweep_id, "jobs": [job.to_dict() for job in jobs]}
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str) -> dict:
+    return _get_job(JobQueue.get_instance(), job_id)
+
+
+@router.post("/{job_id}/cancel")
+def cancel_job(job_id: str) -> dict:
+    """Cancel a queued job or stop a running one (gracefully, like Stop)."""
+    try:
+        return JobQueue.get_instance().cancel(job_id).to_dict()
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+
+@router.delete("/{job_id}")
+def delete_job(job_id: str) -> dict:
+    """Remove a finished job and its log."""
+    try:
+        JobQueue.get_instance().remove(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": "deleted"}
+
+
+@router.get("/{job_id}/logs")
+def get_job_logs(
+    job_id: str,
+    since: int | None = Query(None, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+) -> dict:
+    """Output of a job: lines after `since` while it runs, the last `limit` lines of its log once finished."""
+    try:
+        return JobQueue.get_instance().read_logs(job_id, since, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
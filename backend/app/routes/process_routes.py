@@ -1,67 +1,195 @@
 """Process control API routes."""
 
+import asyncio
+import functools
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Iterator
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
-from app.config import load_config
+from app.config import DEFAULT_STATION, AppConfig, load_config, station_camera_key, station_config
 from app.services.camera_manager import CameraManager
-from app.services.process_manager import ProcessManager, ProcessStatus
-
-router = APIRouter(prefix="/api", tags=["process"])
+from app.services.error_rules import ErrorRule
+from app.services.job_queue import JobQueue
+from app.services.log_buffer import LogRing, LogSubscriber
+from app.services.process_manager import ProcessManager, ProcessMode, ProcessStatus
+from app.services.realsense_reset import reset_wedged_devices
+from app.services.startup_trace import StartupTrace
+
+# Mounted twice by main: under /api for the default station and under
+# /api/stations/{station_id} for any station (every route takes `station_id`)
+router = APIRouter(tags=["process"])
 logger = logging.getLogger(__name__)
 
+# Log stream: most lines per event (a client further behind skips the older ones),
+# and idle time before a keepalive comment
+LOG_STREAM_MAX_BATCH = 500
+LOG_STREAM_KEEPALIVE_S = 15.0
+
 
-def _reset_realsense_cameras() -> None:
-    """Hardware-reset RealSense cameras so lerobot gets a clean connection."""
+def _reset_realsense_cameras(serials: set[str] | None = None) -> dict:
+    """Reset only the RealSense devices that are wedged, so lerobot gets a clean connection.
+
+    Devices Studio was streaming cleanly right before the handover are trusted;
+    the rest are probed and only failing ones are reset (see realsense_reset).
+    """
     try:
-        import pyrealsense2 as rs
-        import time
-        ctx = rs.context()
-        devices = ctx.query_devices()
-        if len(devices) == 0:
-            return
-        for dev in devices:
-            sn = dev.get_info(rs.camera_info.serial_number)
-            dev.hardware_reset()
-            logger.info(f"Hardware-reset RealSense {sn}")
-        time.sleep(3)
+        known_healthy = CameraManager.get_instance().known_healthy_serials()
+        return reset_wedged_devices(serials, known_healthy)
     except Exception as e:
         logger.warning(f"Camera reset failed (non-fatal): {e}")
+        return {"error": str(e)}
 
 
-def _shutdown_cameras_for_process(teleop_keys: set[str] | None = None) -> None:
-    """Shutdown only the given teleop camera keys (or all configured if None). Operator camera stays on."""
+def _shutdown_remote_cameras(camera_service_url: str) -> None:
+    """Ask the remote camera service to release its teleop cameras (non-fatal)."""
+    try:
+        import requests
+        response = requests.post(
+            f"{camera_service_url}/api/cameras/shutdown",
+            timeout=5
+        )
+        response.raise_for_status()
+        logger.info(f"Remote cameras shutdown successfully: {response.json()}")
+    except Exception as e:
+        logger.warning(f"Failed to shutdown remote cameras at {camera_service_url}: {e}")
+        # Continue anyway - cameras might not be in use
+
+
+def _shutdown_cameras_for_process(
+    teleop_keys: set[str] | None = None,
+    serials: set[str] | None = None,
+    trace: StartupTrace | None = None,
+) -> None:
+    """Shutdown only the given teleop camera keys (or all configured if None). Operator camera stays on.
+
+    The remote camera service is released in parallel with the local
+    shutdown and RealSense reset, which depend on each other.
+
+    Args:
+        teleop_keys: Camera keys handed to the process
+        serials: RealSense serials of those cameras, for the reset policy (None: every attached device)
+        trace: Startup trace receiving one span per stage
+    """
+    trace = trace or StartupTrace("handover")
     if teleop_keys is None:
         config = load_config()
         teleop_keys = set(config.robot.cameras or {})
-    CameraManager.get_instance().shutdown_cameras_for_teleop(teleop_keys)
 
-    # Hardware-reset RealSense only when we are handing cameras to the process (avoid disrupting Studio viewer)
-    if teleop_keys:
-        _reset_realsense_cameras()
-
-    # If remote camera service is configured, shutdown remote cameras
     camera_service_url = os.getenv("CAMERA_SERVICE_URL")
-    if camera_service_url:
-        try:
-            import requests
-            response = requests.post(
-                f"{camera_service_url}/api/cameras/shutdown",
-                timeout=5
-            )
-            response.raise_for_status()
-            logger.info(f"Remote cameras shutdown successfully: {response.json()}")
-        except Exception as e:
-            logger.warning(f"Failed to shutdown remote cameras at {camera_service_url}: {e}")
-            # Continue anyway - cameras might not be in use
-
-
-def _robot_config(use_top_camera_only: bool | None = None) -> dict:
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="remote-cameras") as pool:
+        remote = None
+        if camera_service_url:
+            def release_remote() -> None:
+                with trace.span("remote_camera_shutdown"):
+                    _shutdown_remote_cameras(camera_service_url)
+
+            remote = pool.submit(release_remote)
+
+        with trace.span("local_camera_shutdown"):
+            CameraManager.get_instance().shutdown_cameras_for_teleop(teleop_keys)
+
+        # Reset wedged RealSense only when we are handing cameras to the process (avoid disrupting Studio viewer)
+        if teleop_keys:
+            with trace.span("realsense_reset") as span:
+                report = _reset_realsense_cameras(serials)
+                span["reset"] = sorted(report.get("wedged", {}))
+
+        if remote is not None:
+            remote.result()
+
+
+def _camera_handover(robot_cfg: dict, station_id: str, trace: StartupTrace) -> Callable[[], None]:
+    """Release the cameras sent to lerobot (others stay available in Studio), run right before the spawn.
+
+    The ProcessManager calls it only once a previous process has stopped, so
+    the RealSense probe/reset never sees devices that process still holds.
+    """
+    return functools.partial(
+        _shutdown_cameras_for_process,
+        teleop_keys={station_camera_key(station_id, key) for key in robot_cfg["cameras"]},
+        serials=_camera_serials(robot_cfg),
+        trace=trace,
+    )
+
+
+def _station_config(station_id: str = DEFAULT_STATION) -> AppConfig:
+    """Config as seen by a station (404 for an unknown station)."""
+    try:
+        return station_config(load_config(), station_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Station '{station_id}' not found")
+
+
+def _process_manager(station_id: str = DEFAULT_STATION) -> ProcessManager:
+    """Process slot of a station (404 for an unknown station)."""
+    if station_id != DEFAULT_STATION:
+        _station_config(station_id)
+    return ProcessManager.for_station(station_id)
+
+
+def require_station(station_id: str) -> None:
+    """Dependency of the /api/stations/{station_id} mount: 404 before any handler runs for an unknown station."""
+    if station_id != DEFAULT_STATION:
+        _station_config(station_id)
+
+
+def _stop_process(station_id: str = DEFAULT_STATION) -> dict:
+    """Begin stopping the running process; the robot's return to rest continues in the background."""
+    pm = _process_manager(station_id)
+    pm.stop()
+    return {"status": "stopping" if pm.stopping else "stopped"}
+
+
+def _started(pm: ProcessManager, mode: str) -> dict:
+    """Start response; `queued` when the start waits for the previous process to stop."""
+    return {"status": "queued" if pm.stopping else "started", "mode": mode}
+
+
+# What an interactive start reserves in the job queue, for the 409 message
+_RESERVED_NAMES = {"robot": "The robot", "gpu": "The GPU"}
+
+
+@contextmanager
+def _reserved(resource_class: str) -> Iterator[None]:
+    """Hold the robot or a GPU slot against queued jobs until the interactive start has registered its process.
+
+    The job scheduler checks the same reservation under the queue's lock, so
+    a job cannot start in between. 409 while queued jobs hold the resource.
+    Robot jobs count robot processes of every station, so every station
+    reserves.
+    """
+    queue = JobQueue.get_instance()
+    job = queue.claim(resource_class)
+    if job is not None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"{_RESERVED_NAMES[resource_class]} is in use by queued {job.kind} job {job.id}. Cancel it in Jobs first.",
+        )
+    try:
+        yield
+    finally:
+        queue.release(resource_class)
+
+
+def _error_rules(config: AppConfig) -> list[ErrorRule]:
+    """Error diagnosis rules from config."""
+    return [ErrorRule(**rule.model_dump()) for rule in config.error_rules]
+
+
+# Camera config keys used only by Studio (viewer selection, display processing)
+_STUDIO_ONLY_CAMERA_KEYS = {"use_in_teleop", "processing"}
+
+
+def _robot_config(use_top_camera_only: bool | None = None, station_id: str = DEFAULT_STATION) -> dict:
     """Get robot config as dict for process manager. Only cameras with use_in_teleop != False are sent to Trossen."""
-    cfg = load_config()
+    cfg = _station_config(station_id)
     use_top_only = use_top_camera_only if use_top_camera_only is not None else getattr(cfg.robot, "use_top_camera_only", True)
     cameras = cfg.robot.cameras or {}
     # Only include cameras that are selected for teleoperation (default True)
@@ -69,9 +197,9 @@ def _robot_config(use_top_camera_only: bool | None = None) -> dict:
     if use_top_only and "top" in cameras:
         # Pass top camera as "wrist" key - widowxai_follower may expect wrist slot
         cameras = {"wrist": cameras["top"]}
-    # Strip use_in_teleop so lerobot does not see it
+    # Strip Studio-only keys so lerobot does not see them
     cameras_clean = {
-        k: {kk: vv for kk, vv in v.items() if kk != "use_in_teleop"}
+        k: {kk: vv for kk, vv in v.items() if kk not in _STUDIO_ONLY_CAMERA_KEYS}
         for k, v in cameras.items()
     }
     result = {"leader_ip": cfg.robot.leader_ip, "follower_ip": cfg.robot.follower_ip, "cameras": cameras_clean}
@@ -82,9 +210,18 @@ def _robot_config(use_top_camera_only: bool | None = None) -> dict:
     return result
 
 
-def _dataset_config() -> dict:
+def _camera_serials(robot_cfg: dict) -> set[str]:
+    """RealSense serials of the cameras in a robot config."""
+    return {
+        str(c["serial_number_or_name"])
+        for c in robot_cfg["cameras"].values()
+        if c.get("type", "intelrealsense") == "intelrealsense" and c.get("serial_number_or_name")
+    }
+
+
+def _dataset_config(station_id: str = DEFAULT_STATION) -> dict:
     """Get dataset config as dict."""
-    cfg = load_config()
+    cfg = _station_config(station_id)
     return cfg.dataset.model_dump()
 
 
@@ -94,9 +231,9 @@ def _train_config() -> dict:
     return cfg.train.model_dump()
 
 
-def _replay_config(repo_id: str | None = None, episode: int | None = None) -> dict:
+def _replay_config(repo_id: str | None = None, episode: int | None = None, station_id: str = DEFAULT_STATION) -> dict:
     """Get replay config as dict, with optional overrides."""
-    cfg = load_config()
+    cfg = _station_config(station_id)
     return {
         "repo_id": repo_id if repo_id is not None else cfg.replay.repo_id,
         "episode": episode if episode is not None else cfg.replay.episode,
@@ -104,29 +241,39 @@ def _replay_config(repo_id: str | None = None, episode: int | None = None) -> di
 
 
 @router.post("/teleoperate/start")
-def start_teleoperate(display_data: bool = True, use_top_camera_only: bool | None = None) -> dict:
-    """Start lerobot-teleoperate."""
-    robot_cfg = _robot_config(use_top_camera_only=use_top_camera_only)
+def start_teleoperate(
+    display_data: bool = True,
+    use_top_camera_only: bool | None = None,
+    station_id: str = DEFAULT_STATION,
+) -> dict:
+    """Start lerobot-teleoperate (timed per stage; see "startup" in /process/status)."""
+    trace = StartupTrace(ProcessMode.TELEOPERATE.value)
+    with trace.span("robot_config"):
+        robot_cfg = _robot_config(use_top_camera_only=use_top_camera_only, station_id=station_id)
     if not robot_cfg["cameras"]:
         raise HTTPException(
             status_code=400,
             detail="At least one camera must be used in teleoperation. Enable 'Use in teleoperation' for left wrist, right wrist, or top camera in Settings.",
         )
-    # Only release cameras that we send to Trossen; others stay available in Studio
-    _shutdown_cameras_for_process(teleop_keys=set(robot_cfg["cameras"].keys()))
-
-    pm = ProcessManager()
+    pm = _process_manager(station_id)
     config = load_config()
     pm.set_lerobot_path(Path(config.lerobot_trossen_path))
-    pm.start_teleoperate(robot_cfg, display_data=display_data)
-    return {"status": "started", "mode": "teleoperate"}
+    pm.set_error_rules(_error_rules(config))
+    pm.set_resource_interval(config.resources.sample_interval_s)
+    with _reserved("robot"):
+        pm.start_teleoperate(
+            robot_cfg,
+            display_data=display_data,
+            trace=trace,
+            prepare=_camera_handover(robot_cfg, station_id, trace),
+        )
+    return _started(pm, "teleoperate")
 
 
 @router.post("/teleoperate/stop")
-def stop_teleoperate() -> dict:
+def stop_teleoperate(station_id: str = DEFAULT_STATION) -> dict:
     """Stop teleoperate process."""
-    ProcessManager().stop()
-    return {"status": "stopped"}
+    return _stop_process(station_id)
 
 
 @router.post("/record/start")
@@ -137,20 +284,23 @@ def start_record(
     single_task: str | None = None,
     push_to_hub: bool | None = None,
     use_top_camera_only: bool | None = None,
+    station_id: str = DEFAULT_STATION,
 ) -> dict:
-    """Start lerobot-record."""
-    robot_cfg = _robot_config(use_top_camera_only=use_top_camera_only)
+    """Start lerobot-record (timed per stage; see "startup" in /process/status)."""
+    trace = StartupTrace(ProcessMode.RECORD.value)
+    with trace.span("robot_config"):
+        robot_cfg = _robot_config(use_top_camera_only=use_top_camera_only, station_id=station_id)
     if not robot_cfg["cameras"]:
         raise HTTPException(
             status_code=400,
             detail="At least one camera must be used in recording. Enable 'Use in teleoperation' for left wrist, right wrist, or top camera in Settings.",
         )
-    _shutdown_cameras_for_process(teleop_keys=set(robot_cfg["cameras"].keys()))
-
-    pm = ProcessManager()
+    pm = _process_manager(station_id)
     config = load_config()
     pm.set_lerobot_path(Path(config.lerobot_trossen_path))
-    dataset = _dataset_config()
+    pm.set_error_rules(_error_rules(config))
+    pm.set_resource_interval(config.resources.sample_interval_s)
+    dataset = _dataset_config(station_id)
     if repo_id is not None:
         dataset["repo_id"] = repo_id
     if num_episodes is not None:
@@ -161,15 +311,15 @@ def start_record(
         dataset["single_task"] = single_task
     if push_to_hub is not None:
         dataset["push_to_hub"] = push_to_hub
-    pm.start_record(robot_cfg, dataset)
-    return {"status": "started", "mode": "record"}
+    with _reserved("robot"):
+        pm.start_record(robot_cfg, dataset, trace=trace, prepare=_camera_handover(robot_cfg, station_id, trace))
+    return _started(pm, "record")
 
 
 @router.post("/record/stop")
-def stop_record() -> dict:
+def stop_record(station_id: str = DEFAULT_STATION) -> dict:
     """Stop record process."""
-    ProcessManager().stop()
-    return {"status": "stopped"}
+    return _stop_process(station_id)
 
 
 @router.post("/train/start")
@@ -178,11 +328,14 @@ def start_train(
     policy_type: str | None = None,
     output_dir: str | None = None,
     job_name: str | None = None,
+    station_id: str = DEFAULT_STATION,
 ) -> dict:
     """Start lerobot-train."""
-    pm = ProcessManager()
+    pm = _process_manager(station_id)
     config = load_config()
     pm.set_lerobot_path(Path(config.lerobot_trossen_path))
+    pm.set_error_rules(_error_rules(config))
+    pm.set_resource_interval(config.resources.sample_interval_s)
     train = _train_config()
     if dataset_repo_id is not None:
         train["dataset_repo_id"] = dataset_repo_id
@@ -192,49 +345,165 @@ def start_train(
         train["output_dir"] = output_dir
     if job_name is not None:
         train["job_name"] = job_name
-    pm.start_train(train)
-    return {"status": "started", "mode": "train"}
+    with _reserved("gpu"):
+        pm.start_train(train)
+    return _started(pm, "train")
 
 
 @router.post("/train/stop")
-def stop_train() -> dict:
+def stop_train(station_id: str = DEFAULT_STATION) -> dict:
     """Stop train process."""
-    ProcessManager().stop()
-    return {"status": "stopped"}
+    return _stop_process(station_id)
 
 
 @router.post("/replay/start")
-def start_replay(repo_id: str | None = None, episode: int | None = None) -> dict:
+def start_replay(repo_id: str | None = None, episode: int | None = None, station_id: str = DEFAULT_STATION) -> dict:
     """Start lerobot-replay."""
-    pm = ProcessManager()
+    pm = _process_manager(station_id)
     config = load_config()
     pm.set_lerobot_path(Path(config.lerobot_trossen_path))
-    pm.start_replay(_robot_config(), _replay_config(repo_id=repo_id, episode=episode))
-    return {"status": "started", "mode": "replay"}
+    pm.set_error_rules(_error_rules(config))
+    pm.set_resource_interval(config.resources.sample_interval_s)
+    with _reserved("robot"):
+        pm.start_replay(
+            _robot_config(station_id=station_id),
+            _replay_config(repo_id=repo_id, episode=episode, station_id=station_id),
+        )
+    return _started(pm, "replay")
 
 
 @router.post("/replay/stop")
-def stop_replay() -> dict:
+def stop_replay(station_id: str = DEFAULT_STATION) -> dict:
     """Stop replay process."""
-    ProcessManager().stop()
-    return {"status": "stopped"}
+    return _stop_process(station_id)
 
 
 @router.post("/process/stop")
-def stop_process() -> dict:
+def stop_process(station_id: str = DEFAULT_STATION) -> dict:
     """Stop any running process."""
-    ProcessManager().stop()
-    return {"status": "stopped"}
+    return _stop_process(station_id)
 
 
 @router.get("/process/status")
-def get_process_status() -> dict:
-    """Get current process status and logs."""
-    status: ProcessStatus = ProcessManager().get_status()
-    return {
+def get_process_status(since: int | None = Query(None, ge=0), station_id: str = DEFAULT_STATION) -> dict:
+    """Get current process status and logs.
+
+    Pass the last `log_seq` as `since` to receive only lines added after it.
+    When `log_start_seq` changes a new run has started and `logs` holds that
+    run's tail instead, so the client replaces its lines rather than appending.
+    """
+    pm = _process_manager(station_id)
+    status: ProcessStatus = pm.get_status(since)
+    result = {
         "mode": status.mode.value,
         "running": status.running,
         "pid": status.pid,
         "logs": status.logs,
+        "log_seq": status.log_seq,
+        "log_start_seq": status.log_start_seq,
+        "progress": status.progress,
+        "diagnostics": status.diagnostics,
+        "control_loop": status.control_loop,
+        "stopping": status.stopping,
+        "stop": status.stop,
         "error": status.error,
+        "startup": status.startup,
+        "resources": status.resources,
     }
+    if status.running and status.mode == ProcessMode.RECORD:
+        # Sampled from the frames lerobot writes into the dataset, per recorded camera
+        result["camera_quality"] = pm.get_recorded_quality()
+    return result
+
+
+@router.get("/process/metrics")
+def get_process_metrics(max_points: int = Query(500, ge=10, le=5000), station_id: str = DEFAULT_STATION) -> dict:
+    """Training and recording metrics of the current run as time series.
+
+    Train series: step, samples, loss, grad_norm, lr, update_s, data_s and
+    samples_per_s. Record series: episode and phase (index into `phases`).
+    Long runs are downsampled to at most `max_points` points.
+    """
+    return _process_manager(station_id).get_metrics(max_points)
+
+
+@router.get("/process/resources")
+def get_process_resources(max_points: int = Query(500, ge=10, le=5000), station_id: str = DEFAULT_STATION) -> dict:
+    """CPU, memory, I/O and context-switch series of the running process tree and of the backend.
+
+    The process tree is the spawned `uv run` and all its descendants. Fields:
+    cpu_percent, rss_mb, swap_mb, major_faults_ps, read_bps, write_bps,
+    ctx_voluntary_ps, ctx_involuntary_ps, threads, processes. Long runs are
+    downsampled to at most `max_points` points.
+    """
+    resources = _process_manager(station_id).get_resources(max_points)
+    if resources is None:
+        raise HTTPException(status_code=501, detail="Resource sampling needs /proc (Linux)")
+    return resources
+
+
+async def _log_events(
+    ring: LogRing,
+    since: int | None,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    """SSE events with the lines after `since`, one event per wake-up.
+
+    Lines appended while the client is busy are coalesced into the next
+    event, and a client more than LOG_STREAM_MAX_BATCH lines behind gets only
+    the newest ones with a `skipped` count.
+    """
+    subscriber = LogSubscriber(asyncio.get_running_loop())
+    ring.subscribe(subscriber)
+    cursor = since
+    run_start = None
+    progress = None
+    idle_s = 0.0
+    try:
+        while not await is_disconnected():
+            batch = ring.read(cursor, limit=LOG_STREAM_MAX_BATCH)
+            if batch.lines or batch.run_start_seq != run_start or batch.progress != progress:
+                payload = {
+                    "lines": batch.lines,
+                    "log_seq": batch.last_seq,
+                    "log_start_seq": batch.run_start_seq,
+                    "skipped": batch.skipped,
+                    "progress": batch.progress,
+                }
+                yield f"id: {batch.last_seq}\nevent: log\ndata: {json.dumps(payload)}\n\n"
+                cursor = batch.last_seq
+                run_start = batch.run_start_seq
+                progress = batch.progress
+                idle_s = 0.0
+            if await subscriber.wait(timeout=1.0):
+                continue
+            idle_s += 1.0
+            if idle_s >= LOG_STREAM_KEEPALIVE_S:
+                yield ": keepalive\n\n"
+                idle_s = 0.0
+    finally:
+        ring.unsubscribe(subscriber)
+
+
+@router.get("/process/logs/stream")
+async def stream_process_logs(
+    request: Request,
+    since: int | None = Query(None, ge=0),
+    last_event_id: str | None = Header(None),
+    station_id: str = DEFAULT_STATION,
+) -> StreamingResponse:
+    """Process output as Server-Sent Events.
+
+    Each `log` event carries the new lines of the current run and the
+    current progress-bar text as JSON, and has the last line's sequence
+    number as its id, so a reconnecting EventSource resumes via Last-Event-ID. When `log_start_seq` changes a new run has
+    started and the client should drop the lines it has.
+    """
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    return StreamingResponse(
+        _log_events(_process_manager(station_id).logs, since, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
@@ -0,0 +1,52 @@
+"""Station API routes - list robot cells and their cameras.
+
+A station is one leader/follower pair with its own cameras and its own
+process slot. The top-level robot/dataset/replay config sections are the
+"default" station; config `stations` adds more. Process control for a
+station lives at /api/stations/{station_id}/... (see process_routes), and
+its cameras stream under /api/cameras with "<station>.<key>" keys.
+"""
+
+from fastapi import APIRouter, HTTPException
+
+from app.config import load_config, station_camera_key, station_config, station_ids
+from app.routes.camera_routes import station_camera_status
+from app.services.process_manager import ProcessManager
+
+router = APIRouter(prefix="/api/stations", tags=["stations"])
+
+
+@router.get("")
+def list_stations() -> dict:
+    """All stations with their arms, camera stream keys and process state."""
+    config = load_config()
+    stations = []
+    for station_id in station_ids(config):
+        robot = station_config(config, station_id).robot
+        pm = ProcessManager.for_station(station_id)
+        # Cursor at the newest line: no log lines in the summary
+        status = pm.get_status(since=pm.logs.last_seq)
+        stations.append({
+            "id": station_id,
+            "name": config.stations[station_id].name if station_id in config.stations else "",
+            "leader_ip": robot.leader_ip,
+            "follower_ip": robot.follower_ip,
+            "cameras": {key: station_camera_key(station_id, key) for key in robot.cameras or {}},
+            "process": {"mode": status.mode.value, "running": status.running, "stopping": status.stopping},
+        })
+    return {"stations": stations}
+
+
+@router.get("/{station_id}/cameras")
+def get_station_cameras(station_id: str) -> dict:
+    """Status of a station's cameras, by camera key within the station."""
+    try:
+        cameras = station_camera_status(load_config(), station_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Station '{station_id}' not found")
+    return {
+        "cameras": {
+            key: {**status, "stream_key": station_camera_key(station_id, key)}
+            for key, status in cameras.items()
+        }
+    }
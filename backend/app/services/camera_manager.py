@@ -2,12 +2,25 @@
 
 import logging
 import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
 from threading import Event, Lock, Thread
-from typing import Any
+from typing import Any, Callable, Iterator
 
 import cv2
 import numpy as np
 
+from app.services.dvr_recorder import DvrRecorder
+from app.services.frame_buffer import FrameBufferPool, PinnedFrame
+from app.services.frame_pipeline import TIMING_EMA_ALPHA, FramePipeline, build_pipeline
+from app.services.frame_quality import FrameQualityMonitor
+from app.services.h264_stream import H264Hub
+from app.services.mosaic import MosaicCompositor
+from app.services.realsense_reset import hardware_reset
+from app.services.usb_bandwidth import STAGGER_DELAY_S, discover_realsense_topology, plan_bandwidth
+from app.services.viewer_registry import ViewerRegistry
+
 logger = logging.getLogger(__name__)
 
 # Optional: pyrealsense2 for Intel RealSense
@@ -18,8 +31,168 @@ except ImportError:
     HAS_REALSENSE = False
     logger.warning("pyrealsense2 not installed - RealSense cameras will not work")
 
+# Supervisor: how often dead capture threads are checked and how restarts back off
+SUPERVISOR_INTERVAL_S = 1.0
+RESTART_BACKOFF_BASE_S = 1.0
+RESTART_BACKOFF_MAX_S = 30.0
+MAX_RESTARTS_PER_INCIDENT = 6
+# Restart attempt from which RealSense devices are hardware-reset before reopening
+HARDWARE_RESET_FROM_ATTEMPT = 2
+MAX_INCIDENT_HISTORY = 50
+# A camera counts as healthy at shutdown if its last frame is at most this old;
+# that verdict lets the reset policy skip probing it for HEALTH_TRUST_S
+HEALTHY_FRAME_AGE_S = 1.0
+HEALTH_TRUST_S = 60.0
+
+JPEG_QUALITY = 85
+
+# Downscaled renditions, encoded alongside the full frame only while someone reads them
+RENDITION_SCALES: dict[str, float] = {"low": 0.5}
+# A rendition stops being encoded this long after its last read
+RENDITION_IDLE_S = 2.0
+
+
+class _CaptureCamera:
+    """Frame publishing shared by RealSense and USB cameras.
+
+    Each captured image is encoded once per rendition into a pooled buffer
+    that all readers share.
+    """
+
+    def __init__(self, key: str, width: int, height: int, fps: int):
+        self.key = key
+        self.width = width
+        self.height = height
+        self.fps = fps
 
-class ManagedCamera:
+        # Thread state
+        self.thread: Thread | None = None
+        self.stop_event = Event()
+
+        # Encoded frames: full size plus on-demand downscaled renditions
+        self.frames = FrameBufferPool()
+        self.rendition_frames = {name: FrameBufferPool() for name in RENDITION_SCALES}
+        self._rendition_demand: dict[str, float] = {}
+        self._rendition_bufs: dict[str, np.ndarray] = {}
+        self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+        # Raw-frame consumers (e.g. H.264 encoders); shared with CameraManager so they survive restarts
+        self.frame_sinks: list[Callable[[np.ndarray, float], None]] = []
+        # Rolling DVR fed with the encoded full-size frames (set by CameraManager)
+        self.recorder: DvrRecorder | None = None
+        # Crop/rotate/flip/overlay applied before encoding (set by CameraManager)
+        self.processing: FramePipeline | None = None
+        self._encode_ms_avg: float | None = None
+        # Exposure/blur/frozen metrics of the captured (unprocessed) image
+        self.quality = FrameQualityMonitor()
+
+        # Error tracking
+        self.error: str | None = None
+        self.error_lock = Lock()
+
+        # Status
+        self.is_running = False
+
+    def _encode(self, img: np.ndarray) -> tuple[np.ndarray, float]:
+        """JPEG-encode an image; returns (encoded array, encode time in ms)."""
+        start = time.perf_counter()
+        jpeg = cv2.imencode(".jpg", img, self._encode_params)[1]
+        return jpeg, (time.perf_counter() - start) * 1000
+
+    def _publish_image(self, img: np.ndarray, captured_at: float | None = None) -> None:
+        """Encode a captured image into the full-size pool and every rendition in demand.
+
+        Args:
+            img: Captured BGR image
+            captured_at: Wall-clock capture time (defaults to now)
+        """
+        if captured_at is None:
+            captured_at = time.time()
+        self.quality.update(img, captured_at)
+        processing = self.processing
+        if processing is not None:
+            img = processing.process(img, captured_at)
+        # imencode's output is a temporary, freed once copied into the pool (and written by the DVR)
+        jpeg, encode_ms = self._encode(img)
+        self.frames.publish(jpeg, captured_at, encode_ms)
+        if self._encode_ms_avg is None:
+            self._encode_ms_avg = encode_ms
+        else:
+            self._encode_ms_avg += TIMING_EMA_ALPHA * (encode_ms - self._encode_ms_avg)
+        if self.recorder is not None:
+            self.recorder.record(self.key, jpeg, captured_at)
+        del jpeg
+        for sink in tuple(self.frame_sinks):
+            try:
+                sink(img, captured_at)
+            except Exception as e:
+                logger.warning(f"Camera {self.key} frame sink failed: {e}")
+        now = time.monotonic()
+        for name, scale in RENDITION_SCALES.items():
+            if now - self._rendition_demand.get(name, float("-inf")) > RENDITION_IDLE_S:
+                continue
+            h, w = img.shape[:2]
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            buf = self._rendition_bufs.get(name)
+            if buf is None or buf.shape[1::-1] != size or buf.shape[2:] != img.shape[2:]:
+                buf = self._rendition_bufs[name] = np.empty((size[1], size[0], *img.shape[2:]), dtype=img.dtype)
+            start = time.perf_counter()
+            cv2.resize(img, size, dst=buf, interpolation=cv2.INTER_AREA)
+            jpeg, _ = self._encode(buf)
+            self.rendition_frames[name].publish(jpeg, captured_at, (time.perf_counter() - start) * 1000)
+            del jpeg
+
+    def get_frames(self, rendition: str = "full") -> FrameBufferPool:
+        """Return the frame pool for a rendition, marking the rendition as wanted.
+
+        Args:
+            rendition: "full" or a key of RENDITION_SCALES
+
+        Returns:
+            The pool holding that rendition's latest encoded frame
+        """
+        if rendition == "full" or rendition not in self.rendition_frames:
+            return self.frames
+        self._rendition_demand[rendition] = time.monotonic()
+        return self.rendition_frames[rendition]
+
+    def get_latest_frame(self) -> bytes | None:
+        """Get a copy of the latest captured frame (non-blocking).
+
+        Streaming readers should use `frames.acquire()` instead to avoid the copy.
+        
+        Returns:
+            JPEG-encoded frame bytes, or None if no frame available
+        """
+        return self.frames.latest_bytes()
+
+    def has_frame(self) -> bool:
+        """True once the camera has captured at least one frame."""
+        return self.frames.has_frame()
+
+    def is_healthy(self) -> bool:
+        """True if the camera is running without error and delivered a frame within HEALTHY_FRAME_AGE_S."""
+        if not self.is_running or self.get_error() or not self.has_frame():
+            return False
+        return time.time() - self.quality.latest.get("t", 0.0) <= HEALTHY_FRAME_AGE_S
+
+    def stage_timings(self) -> dict[str, float]:
+        """Average milliseconds per frame spent in each processing stage and in the full-size encode."""
+        timings = dict(self.processing.stage_ms) if self.processing is not None else {}
+        if self._encode_ms_avg is not None:
+            timings["encode"] = self._encode_ms_avg
+        return {name: round(ms, 3) for name, ms in timings.items()}
+
+    def get_error(self) -> str | None:
+        """Get the current error state.
+        
+        Returns:
+            Error message if camera has failed, None otherwise
+        """
+        with self.error_lock:
+            return self.error
+
+
+class ManagedCamera(_CaptureCamera):
     """Wrapper for a single RealSense camera with background capture thread."""
 
     def __init__(
@@ -39,29 +212,13 @@ class ManagedCamera:
             height: Frame height in pixels
             fps: Frames per second
         """
-        self.key = key
+        super().__init__(key, width, height, fps)
         self.serial = serial
-        self.width = width
-        self.height = height
-        self.fps = fps
 
         # Pipeline state
         self.pipeline: rs.pipeline | None = None
         self.profile: rs.pipeline_profile | None = None
 
-        # Thread state
-        self.thread: Thread | None = None
-        self.stop_event = Event()
-        self.frame_lock = Lock()
-        self.latest_frame: bytes | None = None
-
-        # Error tracking
-        self.error: str | None = None
-        self.error_lock = Lock()
-        
-        # Status
-        self.is_running = False
-
     def start(self) -> None:
         """Start the camera pipeline and background capture thread."""
         if not HAS_REALSENSE:
@@ -135,11 +292,14 @@ class ManagedCamera:
         while not self.stop_event.is_set():
             try:
                 if self.pipeline is None:
+                    with self.error_lock:
+                        self.error = "Pipeline closed"
                     logger.error(f"Camera {self.key}: pipeline is None in capture loop")
                     break
 
                 # Wait for frames with timeout
                 frames = self.pipeline.wait_for_frames(timeout_ms=2000)
+                captured_at = time.time()
                 color_frame = frames.get_color_frame()
 
                 if not color_frame:
@@ -155,14 +315,8 @@ class ManagedCamera:
                 # Reset failure counter on success
                 consecutive_failures = 0
 
-                # Convert to numpy array and encode as JPEG
-                img = np.asanyarray(color_frame.get_data())
-                _, jpeg = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                jpeg_bytes = jpeg.tobytes()
-
-                # Update buffer
-                with self.frame_lock:
-                    self.latest_frame = jpeg_bytes
+                # Zero-copy view of the frame, encoded straight into pooled buffers
+                self._publish_image(np.asanyarray(color_frame.get_data()), captured_at)
 
                 # Clear any previous errors
                 with self.error_lock:
@@ -190,27 +344,9 @@ class ManagedCamera:
         logger.info(f"Capture loop stopped for camera {self.key}")
         self.is_running = False
 
-    def get_latest_frame(self) -> bytes | None:
-        """Get the latest captured frame (non-blocking).
-        
-        Returns:
-            JPEG-encoded frame bytes, or None if no frame available
-        """
-        with self.frame_lock:
-            return self.latest_frame
-
-    def get_error(self) -> str | None:
-        """Get the current error state.
-        
-        Returns:
-            Error message if camera has failed, None otherwise
-        """
-        with self.error_lock:
-            return self.error
-
     def stop(self) -> None:
-        """Stop the capture thread and close the pipeline."""
-        if not self.is_running:
+        """Stop the capture thread and close the pipeline (also after the capture loop died)."""
+        if not self.is_running and self.pipeline is None:
             return
 
         logger.info(f"Stopping camera {self.key}")
@@ -238,7 +374,7 @@ class ManagedCamera:
         logger.info(f"Camera {self.key} stopped")
 
 
-class ManagedUSBCamera:
+class ManagedUSBCamera(_CaptureCamera):
     """Wrapper for a USB camera (OpenCV) with background capture thread.
     Same interface as ManagedCamera: start(), stop(), get_latest_frame(), get_error(), is_running.
     """
@@ -251,22 +387,14 @@ class ManagedUSBCamera:
         height: int,
         fps: int,
     ):
-        self.key = key
+        super().__init__(key, width, height, fps)
         self.device_index = device_index
-        self.width = width
-        self.height = height
-        self.fps = fps
         # For status compatibility with ManagedCamera
         self.serial = f"USB:{device_index}"
 
         self.cap: cv2.VideoCapture | None = None
-        self.thread: Thread | None = None
-        self.stop_event = Event()
-        self.frame_lock = Lock()
-        self.latest_frame: bytes | None = None
-        self.error: str | None = None
-        self.error_lock = Lock()
-        self.is_running = False
+        # Reused by cap.read() so OpenCV decodes into the same array every frame
+        self._frame_buf: np.ndarray | None = None
 
     def start(self) -> None:
         """Start the USB camera and background capture thread."""
@@ -305,8 +433,11 @@ class ManagedUSBCamera:
         while not self.stop_event.is_set():
             try:
                 if self.cap is None or not self.cap.isOpened():
+                    with self.error_lock:
+                        self.error = "Capture device closed"
                     break
-                ret, frame = self.cap.read()
+                ret, frame = self.cap.read(self._frame_buf)
+                captured_at = time.time()
                 if not ret or frame is None:
                     consecutive_failures += 1
                     if consecutive_failures >= max_consecutive_failures:
@@ -317,10 +448,8 @@ class ManagedUSBCamera:
                     time.sleep(0.1)
                     continue
                 consecutive_failures = 0
-                _, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                jpeg_bytes = jpeg.tobytes()
-                with self.frame_lock:
-                    self.latest_frame = jpeg_bytes
+                self._frame_buf = frame
+                self._publish_image(frame, captured_at)
                 with self.error_lock:
                     if self.error:
                         self.error = None
@@ -336,16 +465,8 @@ class ManagedUSBCamera:
         logger.info(f"Capture loop stopped for USB camera {self.key}")
         self.is_running = False
 
-    def get_latest_frame(self) -> bytes | None:
-        with self.frame_lock:
-            return self.latest_frame
-
-    def get_error(self) -> str | None:
-        with self.error_lock:
-            return self.error
-
     def stop(self) -> None:
-        if not self.is_running:
+        if not self.is_running and self.cap is None:
             return
         logger.info(f"Stopping USB camera {self.key}")
         self.stop_event.set()
@@ -361,6 +482,17 @@ class ManagedUSBCamera:
         logger.info(f"USB camera {self.key} stopped")
 
 
+@dataclass
+class _RestartState:
+    """Supervisor bookkeeping for one camera incident (dead capture thread until first new frame)."""
+
+    started: float
+    started_wall: float
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    gave_up: bool = False
+
+
 class CameraManager:
     """Singleton manager for RealSense and USB cameras with background capture threads."""
 
@@ -371,6 +503,24 @@ class CameraManager:
         """Initialize the camera manager (use get_instance() instead)."""
         self.cameras: dict[str, ManagedCamera | ManagedUSBCamera] = {}
         self.manager_lock = Lock()
+        self.bandwidth_plan: dict[str, Any] = {}
+        self.viewers = ViewerRegistry()
+        self.frame_sinks: dict[str, list[Callable[[np.ndarray, float], None]]] = {}
+        self.h264 = H264Hub()
+        self.dvr = DvrRecorder()
+        self.processing: dict[str, FramePipeline] = {}
+        self.mosaics: list[MosaicCompositor] = []
+        self._mosaic_lock = Lock()
+        self._last_start_by_bus: dict[str, float] = {}
+
+        # Supervisor state
+        self._restart_state: dict[str, _RestartState] = {}
+        self.incidents: deque[dict[str, Any]] = deque(maxlen=MAX_INCIDENT_HISTORY)
+        self._supervisor_thread: Thread | None = None
+        self._supervisor_stop = Event()
+
+        # Last known RealSense health by serial: (healthy, monotonic time observed)
+        self.device_health: dict[str, tuple[bool, float]] = {}
         logger.info("CameraManager initialized")
 
     @classmethod
@@ -388,19 +538,184 @@ class CameraManager:
 
     @staticmethod
     def _hardware_reset_device(serial: str) -> None:
-        """Hardware-reset a specific RealSense device by serial number."""
-        if not HAS_REALSENSE:
+        """Hardware-reset a specific RealSense device and wait until it re-enumerates."""
+        hardware_reset({serial})
+
+    def _record_health(self, camera: "ManagedCamera | ManagedUSBCamera") -> None:
+        """Remember whether a RealSense camera was streaming cleanly (USB cameras are not tracked)."""
+        if isinstance(camera, ManagedUSBCamera):
             return
-        try:
-            ctx = rs.context()
-            for dev in ctx.query_devices():
-                if dev.get_info(rs.camera_info.serial_number) == serial:
-                    dev.hardware_reset()
-                    logger.info(f"Hardware-reset RealSense {serial}")
-                    time.sleep(3)
-                    return
-        except Exception as e:
-            logger.warning(f"Hardware reset failed for {serial}: {e}")
+        self.device_health[camera.serial] = (camera.is_healthy(), time.monotonic())
+
+    def known_healthy_serials(self, max_age_s: float = HEALTH_TRUST_S) -> set[str]:
+        """RealSense serials seen streaming cleanly within `max_age_s` (safe to skip probing)."""
+        now = time.monotonic()
+        return {s for s, (healthy, seen) in self.device_health.items() if healthy and now - seen <= max_age_s}
+
+    def _known_wedged(self, serial: str, max_age_s: float = HEALTH_TRUST_S) -> bool:
+        """True if the device was last seen failing within `max_age_s`."""
+        healthy, seen = self.device_health.get(serial, (True, 0.0))
+        return not healthy and time.monotonic() - seen <= max_age_s
+
+    def plan_bandwidth(self, cameras: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        """Build and store a USB bandwidth plan for the given RealSense cameras.
+
+        Args:
+            cameras: Camera config dicts keyed by camera key
+
+        Returns:
+            The plan (see usb_bandwidth.plan_bandwidth)
+        """
+        realsense = {
+            k: c for k, c in cameras.items()
+            if c.get("type", "intelrealsense") == "intelrealsense"
+        }
+        plan = plan_bandwidth(realsense, discover_realsense_topology())
+        with self.manager_lock:
+            self.bandwidth_plan = plan
+        for key, cam in plan["cameras"].items():
+            if cam["downgraded"]:
+                logger.info(f"Bandwidth plan: camera {key} {cam['requested']} -> {cam['assigned']} on {cam['bus']}")
+        return plan
+
+    def _apply_bandwidth_plan(
+        self, key: str, serial: str, width: int, height: int, fps: int
+    ) -> tuple[int, int, int, str | None]:
+        """Return the planned (width, height, fps, bus) for a camera, or the requested mode if unplanned."""
+        planned = self.bandwidth_plan.get("cameras", {}).get(key)
+        if not planned or planned["serial"] != serial or tuple(planned["requested"]) != (width, height, fps):
+            return width, height, fps, None
+        w, h, f = planned["assigned"]
+        return w, h, f, planned["bus"]
+
+    def _stagger_delay(self, bus: str | None) -> float:
+        """Reserve the next start slot on `bus`; returns how long to wait before starting (caller holds manager_lock).
+
+        Pipeline starts on the same bus are kept at least STAGGER_DELAY_S apart.
+        """
+        if bus is None:
+            return 0.0
+        now = time.monotonic()
+        last = self._last_start_by_bus.get(bus)
+        start_at = now if last is None else max(now, last + STAGGER_DELAY_S)
+        self._last_start_by_bus[bus] = start_at
+        return start_at - now
+
+    def _ensure_supervisor(self) -> None:
+        """Start the supervisor thread if it is not already running."""
+        if self._supervisor_thread and self._supervisor_thread.is_alive():
+            return
+        self._supervisor_stop.clear()
+        self._supervisor_thread = Thread(target=self._supervisor_loop, daemon=True, name="Camera-supervisor")
+        self._supervisor_thread.start()
+
+    def _supervisor_loop(self) -> None:
+        """Background thread that restarts cameras whose capture thread died."""
+        while not self._supervisor_stop.wait(SUPERVISOR_INTERVAL_S):
+            try:
+                self._supervise_once()
+            except Exception as e:
+                logger.warning(f"Camera supervisor error: {e}")
+
+    @staticmethod
+    def _is_dead(camera: "ManagedCamera | ManagedUSBCamera") -> bool:
+        """A camera is dead when it failed on its own (not stopped on purpose)."""
+        return (
+            not camera.is_running
+            and not camera.stop_event.is_set()
+            and camera.get_error() is not None
+        )
+
+    def _supervise_once(self) -> None:
+        """Check every camera once: restart dead ones with backoff, close recovered incidents.
+
+        The restart state is read and updated under manager_lock (initialize and
+        stop clear it there); the restart itself runs outside the lock.
+        """
+        now = time.monotonic()
+        with self.manager_lock:
+            snapshot = list(self.cameras.items())
+        for key, camera in snapshot:
+            dead = self._is_dead(camera)
+            if dead:
+                self._record_health(camera)
+            hardware_reset = None
+            with self.manager_lock:
+                if self.cameras.get(key) is not camera:
+                    # Re-initialized or shut down since the snapshot; its restart state was reset
+                    continue
+                state = self._restart_state.get(key)
+                if dead:
+                    if state is None:
+                        state = _RestartState(
+                            started=now,
+                            started_wall=time.time(),
+                            next_attempt_at=now + RESTART_BACKOFF_BASE_S,
+                        )
+                        self._restart_state[key] = state
+                        logger.warning(f"Camera {key} capture died: {camera.get_error()}")
+                    if state.gave_up or now < state.next_attempt_at:
+                        continue
+                    if state.attempts >= MAX_RESTARTS_PER_INCIDENT:
+                        state.gave_up = True
+                        logger.error(f"Camera {key}: giving up after {state.attempts} restart attempts")
+                        continue
+                    state.attempts += 1
+                    state.next_attempt_at = now + min(
+                        RESTART_BACKOFF_BASE_S * 2 ** state.attempts, RESTART_BACKOFF_MAX_S
+                    )
+                    hardware_reset = state.attempts >= HARDWARE_RESET_FROM_ATTEMPT
+                elif state is not None and camera.is_running and camera.has_frame():
+                    recovery_s = time.monotonic() - state.started
+                    self.incidents.append({
+                        "camera": key,
+                        "started_at": state.started_wall,
+                        "restarts": state.attempts,
+                        "time_to_recover_s": round(recovery_s, 2),
+                    })
+                    del self._restart_state[key]
+                    logger.info(f"Camera {key} recovered after {state.attempts} restart(s) in {recovery_s:.1f}s")
+            if hardware_reset is not None:
+                self._restart_camera(key, camera, hardware_reset=hardware_reset)
+
+    def _restart_camera(
+        self,
+        key: str,
+        camera: "ManagedCamera | ManagedUSBCamera",
+        hardware_reset: bool = False,
+    ) -> None:
+        """Replace a dead camera with a fresh instance (outside manager_lock so streams keep serving)."""
+        logger.info(f"Restarting camera {key} (hardware_reset={hardware_reset})")
+        camera.stop()
+        if isinstance(camera, ManagedUSBCamera):
+            new_camera = ManagedUSBCamera(key, camera.device_index, camera.width, camera.height, camera.fps)
+        else:
+            if hardware_reset:
+                self._hardware_reset_device(camera.serial)
+            new_camera = ManagedCamera(key, camera.serial, camera.width, camera.height, camera.fps)
+        self._attach_consumers(key, new_camera)
+        with self.manager_lock:
+            if self.cameras.get(key) is not camera:
+                # Re-initialized or shut down meanwhile; drop the restart
+                return
+            self.cameras[key] = new_camera
+        new_camera.start()
+
+    def get_supervisor_status(self) -> dict[str, Any]:
+        """Return open restart incidents and the recent recovery history."""
+        now = time.monotonic()
+        with self.manager_lock:
+            states = list(self._restart_state.items())
+        active = {
+            key: {
+                "restarts": state.attempts,
+                "down_for_s": round(now - state.started, 1),
+                "next_retry_in_s": None if state.gave_up else round(max(0.0, state.next_attempt_at - now), 1),
+                "gave_up": state.gave_up,
+            }
+            for key, state in states
+        }
+        return {"active": active, "incidents": list(self.incidents)}
 
     def initialize_camera(
         self,
@@ -426,13 +741,33 @@ class CameraManager:
                 self.cameras[key].stop()
                 del self.cameras[key]
 
-            # Hardware-reset the device to clear stale USB state
-            self._hardware_reset_device(serial)
+            # Hardware-reset only a device that was recently seen wedged; a failed start is
+            # handled by the supervisor, which resets from its second restart attempt
+            if self._known_wedged(serial):
+                self._hardware_reset_device(serial)
+
+            # Use the bandwidth-planned mode and avoid simultaneous starts on one bus
+            width, height, fps, bus = self._apply_bandwidth_plan(key, serial, width, height, fps)
+            delay = self._stagger_delay(bus)
+
+        # Wait out the stagger without the lock, so other cameras and streams are not held up
+        if delay > 0:
+            time.sleep(delay)
+
+        with self.manager_lock:
+            if key in self.cameras:
+                # Started by another caller while this one waited
+                logger.info(f"Camera {key} already exists, stopping old instance")
+                self.cameras[key].stop()
+                del self.cameras[key]
 
             # Create and start new camera
             camera = ManagedCamera(key, serial, width, height, fps)
+            self._attach_consumers(key, camera)
             self.cameras[key] = camera
+            self._restart_state.pop(key, None)
             camera.start()
+        self._ensure_supervisor()
 
     def initialize_usb_camera(
         self,
@@ -457,8 +792,87 @@ class CameraManager:
                 self.cameras[key].stop()
                 del self.cameras[key]
             camera = ManagedUSBCamera(key, device_index, width, height, fps)
+            self._attach_consumers(key, camera)
             self.cameras[key] = camera
+            self._restart_state.pop(key, None)
             camera.start()
+        self._ensure_supervisor()
+
+    def _attach_consumers(self, key: str, camera: "ManagedCamera | ManagedUSBCamera") -> None:
+        """Connect a (new) camera instance to its frame sinks and the DVR."""
+        camera.frame_sinks = self.frame_sinks.setdefault(key, [])
+        camera.recorder = self.dvr
+        camera.processing = self.processing.get(key)
+
+    def set_processing(self, key: str, spec: dict[str, Any] | None) -> None:
+        """Set a camera's processing stages from its `processing` config; applies to the running camera.
+
+        Args:
+            key: Camera identifier
+            spec: Processing config (crop, rotate, flip, overlay), or None to disable
+        """
+        with self.manager_lock:
+            current = self.processing.get(key)
+            if (current.spec if current is not None else None) == (spec or None):
+                return
+            pipeline = build_pipeline(key, spec)
+            if pipeline is None:
+                self.processing.pop(key, None)
+            else:
+                self.processing[key] = pipeline
+            camera = self.cameras.get(key)
+            if camera is not None:
+                camera.processing = pipeline
+
+    def add_frame_sink(self, key: str, sink: Callable[[np.ndarray, float], None]) -> None:
+        """Register a raw-frame consumer for a camera; it keeps receiving frames across restarts.
+
+        Args:
+            key: Camera identifier
+            sink: Called from the capture thread with (BGR image, capture time); must copy what it keeps
+        """
+        with self.manager_lock:
+            sinks = self.frame_sinks.setdefault(key, [])
+            sinks.append(sink)
+            camera = self.cameras.get(key)
+            if camera is not None:
+                camera.frame_sinks = sinks
+
+    def remove_frame_sink(self, key: str, sink: Callable[[np.ndarray, float], None]) -> None:
+        """Unregister a raw-frame consumer."""
+        with self.manager_lock:
+            sinks = self.frame_sinks.get(key, [])
+            if sink in sinks:
+                sinks.remove(sink)
+
+    def open_mosaic(self, keys: list[str], tile_size: tuple[int, int], fps: float) -> MosaicCompositor:
+        """Join (or start) the shared mosaic for a camera set; pair with close_mosaic().
+
+        Args:
+            keys: Cameras in grid order
+            tile_size: (width, height) of one tile
+            fps: Mosaic rate
+
+        Returns:
+            The running compositor whose `frames` pool holds the latest mosaic JPEG
+        """
+        with self._mosaic_lock:
+            mosaic = next((m for m in self.mosaics if m.matches(keys, tile_size, fps)), None)
+            if mosaic is None:
+                mosaic = MosaicCompositor(keys, tile_size, fps)
+                mosaic.start(self.add_frame_sink)
+                self.mosaics.append(mosaic)
+            mosaic.viewers += 1
+            return mosaic
+
+    def close_mosaic(self, mosaic: MosaicCompositor) -> None:
+        """Leave a mosaic; it stops compositing when its last viewer leaves."""
+        with self._mosaic_lock:
+            mosaic.viewers -= 1
+            if mosaic.viewers > 0 or mosaic not in self.mosaics:
+                return
+            self.mosaics.remove(mosaic)
+        mosaic.stop(self.remove_frame_sink)
 
     def get_latest_frame(self, key: str) -> bytes | None:
         """Get the latest frame from a camera (non-blocking).
@@ -475,6 +889,63 @@ class CameraManager:
                 return None
             return camera.get_latest_frame()
 
+    @contextmanager
+    def acquire_frame(self, key: str, rendition: str = "full") -> Iterator[PinnedFrame | None]:
+        """Pin a camera's latest frame and yield a read-only view of it (no copy).
+
+        Args:
+            key: Camera identifier
+            rendition: "full" or a downscaled rendition name (e.g. "low")
+
+        Yields:
+            The pinned JPEG frame with its metadata, or None if camera not found or no frame available
+        """
+        pool = self.get_frame_pool(key, rendition)
+        if pool is None:
+            yield None
+            return
+        with pool.acquire() as frame:
+            yield frame
+
+    def get_frame_pool(self, key: str, rendition: str = "full") -> FrameBufferPool | None:
+        """Frame pool serving a camera rendition (full size until the rendition has its first frame).
+
+        Args:
+            key: Camera identifier
+            rendition: "full" or a downscaled rendition name (e.g. "low")
+
+        Returns:
+            The pool, or None if the camera is not initialized
+        """
+        with self.manager_lock:
+            camera = self.cameras.get(key)
+        if camera is None:
+            return None
+        pool = camera.get_frames(rendition)
+        if not pool.has_frame():
+            # Rendition just requested; serve full size until its first encode
+            pool = camera.frames
+        return pool
+
+    def get_quality(self, key: str | None = None, seconds: float | None = None) -> dict[str, Any]:
+        """Image quality per camera: latest metrics and flags, plus the time series for a single camera.
+
+        Args:
+            key: Camera identifier, or None for a summary of every camera
+            seconds: Limit the time series to the most recent seconds
+
+        Returns:
+            {key: summary} for all cameras, or the camera's summary with a "series" entry
+        """
+        with self.manager_lock:
+            cameras = dict(self.cameras)
+        if key is None:
+            return {k: camera.quality.summary() for k, camera in cameras.items()}
+        camera = cameras.get(key)
+        if camera is None:
+            return {}
+        return {**camera.quality.summary(), "series": camera.quality.series(seconds)}
+
     def get_camera_status(self, key: str) -> dict[str, Any]:
         """Get status information for a camera.
         
@@ -491,21 +962,26 @@ class CameraManager:
 
             error = camera.get_error()
             if error:
+                details = {
+                    "serial": camera.serial,
+                    "error": error,
+                }
+                state = self._restart_state.get(key)
+                if state is not None:
+                    details["restarts"] = state.attempts
+                    details["gave_up"] = state.gave_up
                 return {
                     "status": "error",
                     "error_type": "hardware_timeout",
                     "message": "Camera opened but failed to capture frames. Check USB bandwidth/power. In Settings, try 'Use top camera only' or use different USB ports.",
-                    "details": {
-                        "serial": camera.serial,
-                        "error": error,
-                    },
+                    "details": details,
                 }
             elif not camera.is_running:
                 return {
                     "status": "stopped",
                     "details": {"serial": camera.serial},
                 }
-            elif camera.get_latest_frame() is None:
+            elif not camera.has_frame():
                 return {
                     "status": "warming_up",
                     "details": {"serial": camera.serial},
@@ -513,7 +989,11 @@ class CameraManager:
             else:
                 return {
                     "status": "running",
-                    "details": {"serial": camera.serial},
+                    "details": {
+                        "serial": camera.serial,
+                        "stage_ms": camera.stage_timings(),
+                        "quality_flags": camera.quality.flags(),
+                    },
                 }
 
     def shutdown_camera(self, key: str) -> None:
@@ -525,17 +1005,29 @@ class CameraManager:
         with self.manager_lock:
             camera = self.cameras.get(key)
             if camera:
+                self._record_health(camera)
                 camera.stop()
                 del self.cameras[key]
+                self._restart_state.pop(key, None)
                 logger.info(f"Camera {key} shut down")
 
     def shutdown_all(self) -> None:
         """Stop and remove all cameras."""
+        with self._mosaic_lock:
+            mosaics, self.mosaics = self.mosaics, []
+        for mosaic in mosaics:
+            mosaic.stop(self.remove_frame_sink)
+        # Before manager_lock: stopping encoders detaches their frame sinks, which takes it
+        self.h264.stop_all()
         with self.manager_lock:
             logger.info("Shutting down all cameras")
+            self._supervisor_stop.set()
+            self.dvr.stop()
             for key, camera in list(self.cameras.items()):
+                self._record_health(camera)
                 camera.stop()
             self.cameras.clear()
+            self._restart_state.clear()
             logger.info("All cameras shut down")
 
     def shutdown_cameras_for_teleop(self, keys: set[str]) -> None:
@@ -544,6 +1036,8 @@ class CameraManager:
         with self.manager_lock:
             for key in list(self.cameras.keys()):
                 if key in keys:
+                    self._record_health(self.cameras[key])
                     self.cameras[key].stop()
                     del self.cameras[key]
+                    self._restart_state.pop(key, None)
                     logger.info(f"Camera {key} shut down for teleop")
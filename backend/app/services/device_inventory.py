@@ -0,0 +1,294 @@
+"""Cached inventory of USB video and RealSense devices with hot-plug updates.
+
+The device lists are built once and then kept current incrementally:
+`/dev` is watched with inotify (falling back to a cheap directory diff when
+inotify is unavailable) and RealSense arrivals/removals come from the
+librealsense devices-changed callback. API requests read the lists from
+memory instead of rescanning, so they never open a RealSense context while
+cameras are streaming.
+
+Only the standard library is required at import time, so the launcher can
+reuse `scan_video_devices()`.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyrealsense2 as rs
+    HAS_REALSENSE = True
+except ImportError:
+    HAS_REALSENSE = False
+
+# inotify (linux/inotify.h)
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# Directory-diff fallback interval when inotify is not available
+POLL_INTERVAL_S = 2.0
+
+
+def _video_index(name: str) -> int | None:
+    """Index of a /dev/videoN node name, or None for other names."""
+    if not name.startswith("video"):
+        return None
+    idx = name[len("video"):]
+    return int(idx) if idx.isdigit() else None
+
+
+def read_video_device(name: str, dev_root: Path = Path("/dev"), sysfs_root: Path = Path("/sys")) -> dict[str, Any] | None:
+    """Describe one /dev/videoN node as {index, path, name}, or None if `name` is not a video node."""
+    index = _video_index(name)
+    if index is None:
+        return None
+    path = str(dev_root / name)
+    label = ""
+    try:
+        label = (sysfs_root / "class" / "video4linux" / name / "name").read_text().strip()
+    except OSError:
+        pass
+    return {"index": index, "path": path, "name": label or path}
+
+
+def scan_video_devices(dev_root: Path = Path("/dev"), sysfs_root: Path = Path("/sys")) -> list[dict[str, Any]]:
+    """List USB video devices (Linux /dev/video*) as {index, path, name}, ordered by index."""
+    try:
+        names = os.listdir(dev_root)
+    except OSError:
+        return []
+    devices = [d for d in (read_video_device(n, dev_root, sysfs_root) for n in names) if d is not None]
+    return sorted(devices, key=lambda d: d["index"])
+
+
+def _describe_realsense(dev) -> dict[str, Any]:
+    """Serial, name and USB location of a RealSense device."""
+    info: dict[str, Any] = {
+        "serial": dev.get_info(rs.camera_info.serial_number),
+        "name": dev.get_info(rs.camera_info.name),
+    }
+    for key, field in (("physical_port", "physical_port"), ("usb_type", "usb_type_descriptor")):
+        camera_info = getattr(rs.camera_info, field, None)
+        if camera_info is not None and dev.supports(camera_info):
+            info[key] = dev.get_info(camera_info)
+    return info
+
+
+class DeviceInventory:
+    """Singleton holding the current USB video and RealSense device lists."""
+
+    _instance: "DeviceInventory | None" = None
+    _lock = Lock()
+
+    def __init__(self, dev_root: Path = Path("/dev"), sysfs_root: Path = Path("/sys")):
+        """Create an empty inventory (use get_instance() instead)."""
+        self.dev_root = dev_root
+        self.sysfs_root = sysfs_root
+        self._data_lock = Lock()
+        self._video: dict[str, dict[str, Any]] = {}
+        self._realsense: dict[str, dict[str, Any]] = {}
+        self._rs_devices: dict[str, Any] = {}
+        self._rs_ctx = None
+        self.realsense_error: str | None = None
+        self.generation = 0
+        self.updated_at = 0.0
+        self.watch_mode = "none"
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    @classmethod
+    def get_instance(cls) -> "DeviceInventory":
+        """Get the started singleton inventory (thread-safe)."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    inventory = DeviceInventory()
+                    inventory.start()
+                    cls._instance = inventory
+        return cls._instance
+
+    def start(self) -> None:
+        """Build the lists and start watching for hot-plug events."""
+        self.refresh()
+        self._start_realsense_watch()
+        self._stop.clear()
+        self._thread = Thread(target=self._watch_dev, daemon=True, name="device-inventory")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching (lists keep their last state)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _changed(self) -> None:
+        """Bump the generation after an update (caller holds the data lock)."""
+        self.generation += 1
+        self.updated_at = time.time()
+
+    def refresh(self) -> None:
+        """Full rescan of both device lists."""
+        video = {d["path"]: d for d in scan_video_devices(self.dev_root, self.sysfs_root)}
+        realsense, rs_devices = self._query_realsense()
+        with self._data_lock:
+            self._video = video
+            if realsense is not None:
+                self._realsense = realsense
+                self._rs_devices = rs_devices
+            self._changed()
+
+    # --- USB video (/dev) ---
+
+    def _video_added(self, name: str) -> None:
+        device = read_video_device(name, self.dev_root, self.sysfs_root)
+        if device is None:
+            return
+        with self._data_lock:
+            self._video[device["path"]] = device
+            self._changed()
+        logger.info(f"Video device added: {device['path']} ({device['name']})")
+
+    def _video_removed(self, name: str) -> None:
+        if _video_index(name) is None:
+            return
+        path = str(self.dev_root / name)
+        with self._data_lock:
+            if self._video.pop(path, None) is None:
+                return
+            self._changed()
+        logger.info(f"Video device removed: {path}")
+
+    def _watch_dev(self) -> None:
+        """Apply /dev changes incrementally via inotify, or by diffing the directory listing."""
+        fd = self._inotify_open()
+        if fd is None:
+            self.watch_mode = "poll"
+            self._poll_dev()
+            return
+        self.watch_mode = "inotify"
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    buf = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                offset = 0
+                while offset + _INOTIFY_EVENT.size <= len(buf):
+                    _, mask, _, length = _INOTIFY_EVENT.unpack_from(buf, offset)
+                    start = offset + _INOTIFY_EVENT.size
+                    name = buf[start:start + length].rstrip(b"\0").decode(errors="replace")
+                    offset = start + length
+                    if mask & _IN_CREATE:
+                        self._video_added(name)
+                    elif mask & _IN_DELETE:
+                        self._video_removed(name)
+        finally:
+            os.close(fd)
+
+    def _inotify_open(self) -> int | None:
+        """inotify fd watching dev_root for created/deleted entries, or None if unsupported."""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                return None
+            if libc.inotify_add_watch(fd, os.fsencode(str(self.dev_root)), _IN_CREATE | _IN_DELETE) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _poll_dev(self) -> None:
+        """Fallback watcher: diff the video node names in dev_root."""
+        known = {Path(p).name for p in self._video}
+        while not self._stop.wait(POLL_INTERVAL_S):
+            try:
+                current = {n for n in os.listdir(self.dev_root) if _video_index(n) is not None}
+            except OSError:
+                continue
+            for name in current - known:
+                self._video_added(name)
+            for name in known - current:
+                self._video_removed(name)
+            known = current
+
+    # --- RealSense ---
+
+    def _query_realsense(self) -> tuple[dict[str, dict[str, Any]] | None, dict[str, Any]]:
+        """Describe attached RealSense devices (None if the query failed)."""
+        if not HAS_REALSENSE:
+            return {}, {}
+        try:
+            if self._rs_ctx is None:
+                self._rs_ctx = rs.context()
+            found, devices = {}, {}
+            for dev in self._rs_ctx.query_devices():
+                info = _describe_realsense(dev)
+                found[info["serial"]] = info
+                devices[info["serial"]] = dev
+            self.realsense_error = None
+            return found, devices
+        except Exception as e:
+            self.realsense_error = str(e)
+            logger.warning(f"RealSense query failed: {e}")
+            return None, {}
+
+    def _start_realsense_watch(self) -> None:
+        """Subscribe to librealsense device arrival/removal events."""
+        if not HAS_REALSENSE or self._rs_ctx is None:
+            return
+        try:
+            self._rs_ctx.set_devices_changed_callback(self._on_realsense_changed)
+        except Exception as e:
+            logger.warning(f"RealSense hot-plug callback unavailable: {e}")
+
+    def _on_realsense_changed(self, event) -> None:
+        """librealsense callback: drop removed devices and describe new ones."""
+        try:
+            with self._data_lock:
+                removed = [s for s, dev in self._rs_devices.items() if event.was_removed(dev)]
+            added = [(_describe_realsense(dev), dev) for dev in event.get_new_devices()]
+        except Exception as e:
+            logger.warning(f"RealSense hot-plug event failed: {e}")
+            return
+        with self._data_lock:
+            for serial in removed:
+                self._realsense.pop(serial, None)
+                self._rs_devices.pop(serial, None)
+            for info, dev in added:
+                self._realsense[info["serial"]] = info
+                self._rs_devices[info["serial"]] = dev
+            self._changed()
+        for serial in removed:
+            logger.info(f"RealSense removed: {serial}")
+        for info, _ in added:
+            logger.info(f"RealSense added: {info['serial']} ({info['name']})")
+
+    # --- Readers ---
+
+    def video_devices(self) -> list[dict[str, Any]]:
+        """Current USB video devices, ordered by index."""
+        with self._data_lock:
+            return sorted((dict(d) for d in self._video.values()), key=lambda d: d["index"])
+
+    def realsense_devices(self) -> list[dict[str, Any]]:
+        """Current RealSense devices, ordered by serial."""
+        with self._data_lock:
+            return [dict(self._realsense[s]) for s in sorted(self._realsense)]
@@ -0,0 +1,293 @@
+"""Rolling DVR recorder for camera streams.
+
+Every camera's already-encoded JPEG frames are appended to fixed-length
+segment files (concatenated JPEGs, `.mjpeg`) with a sidecar index (`.idx`)
+of fixed-size records: capture time, byte offset and length of each frame.
+Segments roll over on wall-clock boundaries that are multiples of the
+segment length, so all cameras switch files together. Old segments are
+deleted by age, total size and free disk space.
+
+The capture thread only hands the encoded frame to a queue; a single writer
+thread does all file I/O through large append buffers.
+"""
+
+import bisect
+import logging
+import shutil
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Condition, Thread
+from typing import Any, BinaryIO
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Index record: capture time (epoch s), offset in the segment, JPEG length
+INDEX_RECORD = struct.Struct("<dQI")
+SEGMENT_SUFFIX = ".mjpeg"
+INDEX_SUFFIX = ".idx"
+SEGMENT_NAME_FORMAT = "%Y%m%d-%H%M%S"
+
+# Frames waiting for the writer; beyond this new frames are dropped (disk too slow)
+MAX_QUEUED_FRAMES = 256
+WRITE_BUFFER_BYTES = 1024 * 1024
+# Buffered data is flushed at least this often, so a crash loses little footage
+FLUSH_INTERVAL_S = 2.0
+
+
+@dataclass
+class RetentionPolicy:
+    """Limits applied to finished segments."""
+
+    max_age_s: float = 24 * 3600
+    max_total_bytes: int = 10 * 1024**3
+    min_free_bytes: int = 2 * 1024**3
+
+
+class _OpenSegment:
+    """The segment a camera is currently writing."""
+
+    def __init__(self, directory: Path, start: float):
+        self.start = start
+        self.path = directory / (time.strftime(SEGMENT_NAME_FORMAT, time.localtime(start)) + SEGMENT_SUFFIX)
+        self.data: BinaryIO = open(self.path, "ab", buffering=WRITE_BUFFER_BYTES)
+        self.index: BinaryIO = open(self.path.with_suffix(INDEX_SUFFIX), "ab", buffering=64 * 1024)
+        self.offset = self.data.tell()
+
+    def append(self, jpeg: np.ndarray, captured_at: float) -> int:
+        """Append one frame and its index record; returns the bytes written."""
+        size = jpeg.nbytes
+        self.data.write(memoryview(jpeg).cast("B"))
+        self.index.write(INDEX_RECORD.pack(captured_at, self.offset, size))
+        self.offset += size
+        return size
+
+    def flush(self) -> None:
+        self.data.flush()
+        self.index.flush()
+
+    def close(self) -> None:
+        self.data.close()
+        self.index.close()
+
+
+def read_index(index_path: Path) -> list[tuple[float, int, int]]:
+    """Read a segment index as (capture time, offset, length) records; a torn last record is ignored."""
+    raw = index_path.read_bytes()
+    usable = len(raw) - len(raw) % INDEX_RECORD.size
+    return [rec for rec in INDEX_RECORD.iter_unpack(raw[:usable])]
+
+
+class DvrRecorder:
+    """Background writer of rolling per-camera segment files."""
+
+    def __init__(self):
+        self._cond = Condition()
+        self._queue: deque[tuple[str, np.ndarray, float]] = deque()
+        self._thread: Thread | None = None
+        self._segments: dict[str, _OpenSegment] = {}
+        self.running = False
+        self.directory: Path | None = None
+        self.segment_s = 60.0
+        self.retention = RetentionPolicy()
+
+        # Metrics
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.frames_dropped = 0
+        self.segments_deleted = 0
+        self.last_error: str | None = None
+
+    def start(self, directory: Path, segment_s: float, retention: RetentionPolicy) -> None:
+        """Start recording (or apply new settings to a running recorder).
+
+        Args:
+            directory: Root directory; each camera gets a subdirectory
+            segment_s: Segment length in seconds
+            retention: Limits for deleting old segments
+        """
+        with self._cond:
+            self.directory = Path(directory).expanduser()
+            self.segment_s = max(1.0, float(segment_s))
+            self.retention = retention
+            self.running = True
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._write_loop, name="dvr-writer", daemon=True)
+                self._thread.start()
+        logger.info(f"DVR recording to {self.directory} in {self.segment_s:.0f}s segments")
+
+    def stop(self) -> None:
+        """Stop recording; queued frames are written and open segments closed first."""
+        with self._cond:
+            if not self.running:
+                return
+            self.running = False
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=10.0)
+        self._thread = None
+        logger.info("DVR recording stopped")
+
+    def record(self, key: str, jpeg: np.ndarray, captured_at: float) -> None:
+        """Queue an encoded frame (capture thread; never blocks on I/O).
+
+        The recorder keeps a reference to `jpeg`, so the caller must not reuse that array.
+        """
+        if not self.running:
+            return
+        with self._cond:
+            if len(self._queue) >= MAX_QUEUED_FRAMES:
+                self.frames_dropped += 1
+                return
+            self._queue.append((key, jpeg, captured_at))
+            self._cond.notify()
+
+    def _write_loop(self) -> None:
+        """Writer thread: drain the queue into segment files, roll over and apply retention."""
+        last_flush = time.monotonic()
+        try:
+            self._apply_retention()
+            while True:
+                with self._cond:
+                    while not self._queue and self.running:
+                        self._cond.wait(timeout=FLUSH_INTERVAL_S)
+                        if time.monotonic() - last_flush >= FLUSH_INTERVAL_S:
+                            break
+                    batch = list(self._queue)
+                    self._queue.clear()
+                    running = self.running
+                for key, jpeg, captured_at in batch:
+                    self._write(key, jpeg, captured_at)
+                del batch
+                if time.monotonic() - last_flush >= FLUSH_INTERVAL_S:
+                    for segment in self._segments.values():
+                        segment.flush()
+                    last_flush = time.monotonic()
+                if not running:
+                    break
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"DVR writer failed: {e}")
+            self.running = False
+        finally:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments.clear()
+
+    def _write(self, key: str, jpeg: np.ndarray, captured_at: float) -> None:
+        """Append a frame to the camera's current segment, rolling over at segment boundaries."""
+        start = captured_at - captured_at % self.segment_s
+        segment = self._segments.get(key)
+        if segment is None or segment.start != start:
+            if segment is not None:
+                segment.close()
+            directory = self.directory / key
+            directory.mkdir(parents=True, exist_ok=True)
+            segment = self._segments[key] = _OpenSegment(directory, start)
+            self._apply_retention()
+        self.bytes_written += segment.append(jpeg, captured_at)
+        self.frames_written += 1
+
+    def _finished_segments(self) -> list[tuple[float, Path, int]]:
+        """Closed segments on disk as (mtime, path, size incl. index), oldest first."""
+        if self.directory is None or not self.directory.exists():
+            return []
+        open_paths = {segment.path for segment in self._segments.values()}
+        found = []
+        for path in self.directory.glob(f"*/*{SEGMENT_SUFFIX}"):
+            if path in open_paths:
+                continue
+            try:
+                stat = path.stat()
+                index = path.with_suffix(INDEX_SUFFIX)
+                size = stat.st_size + (index.stat().st_size if index.exists() else 0)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path, size))
+        found.sort()
+        return found
+
+    def _apply_retention(self) -> None:
+        """Delete finished segments that are too old, or oldest-first while over the size or free-space limits."""
+        segments = self._finished_segments()
+        if not segments:
+            return
+        policy = self.retention
+        cutoff = time.time() - policy.max_age_s
+        total = sum(size for _, _, size in segments)
+        free = shutil.disk_usage(self.directory).free
+        for mtime, path, size in segments:
+            if mtime >= cutoff and total <= policy.max_total_bytes and free >= policy.min_free_bytes:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(INDEX_SUFFIX).unlink(missing_ok=True)
+            total -= size
+            free += size
+            self.segments_deleted += 1
+            logger.info(f"DVR retention removed {path.parent.name}/{path.name}")
+
+    def list_segments(self) -> dict[str, list[dict[str, Any]]]:
+        """Segments on disk per camera: name, start time, size, and whether it is being written."""
+        if self.directory is None or not self.directory.exists():
+            return {}
+        open_paths = {segment.path for segment in list(self._segments.values())}
+        result: dict[str, list[dict[str, Any]]] = {}
+        for path in sorted(self.directory.glob(f"*/*{SEGMENT_SUFFIX}")):
+            try:
+                start = time.mktime(time.strptime(path.stem, SEGMENT_NAME_FORMAT))
+                size = path.stat().st_size
+            except (OSError, ValueError):
+                continue
+            result.setdefault(path.parent.name, []).append({
+                "segment": path.name,
+                "start": start,
+                "bytes": size,
+                "open": path in open_paths,
+            })
+        return result
+
+    def frame_at(self, key: str, at: float) -> tuple[bytes, float] | None:
+        """Recorded frame of a camera closest at or before `at` (epoch s).
+
+        Returns:
+            (JPEG bytes, capture time), or None if nothing was recorded by then
+        """
+        if self.directory is None:
+            return None
+        directory = self.directory / key
+        stamp = time.strftime(SEGMENT_NAME_FORMAT, time.localtime(at))
+        candidates = sorted(p for p in directory.glob(f"*{SEGMENT_SUFFIX}") if p.stem <= stamp)
+        for path in reversed(candidates):
+            index_path = path.with_suffix(INDEX_SUFFIX)
+            if not index_path.exists():
+                continue
+            records = read_index(index_path)
+            i = bisect.bisect_right([rec[0] for rec in records], at)
+            if i == 0:
+                continue
+            captured_at, offset, size = records[i - 1]
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(size)
+            if len(data) == size:
+                return data, captured_at
+        return None
+
+    def status(self) -> dict[str, Any]:
+        """Recorder state and counters."""
+        return {
+            "running": self.running,
+            "directory": str(self.directory) if self.directory else None,
+            "segment_s": self.segment_s,
+            "queued": len(self._queue),
+            "frames_written": self.frames_written,
+            "bytes_written": self.bytes_written,
+            "frames_dropped": self.frames_dropped,
+            "segments_deleted": self.segments_deleted,
+            "error": self.last_error,
+        }
@@ -0,0 +1,198 @@
+"""Incremental error diagnosis of process output.
+
+Each output line is matched against compiled rules as it is ingested. A
+rule hit is recorded with the line's sequence number and time, and the
+highest-priority hit (the most recent one on ties) is kept as the current
+diagnosis, so reading it at status time costs nothing and is not limited
+to a window of recent lines.
+
+Built-in rules cover the failures seen on the rig; config `error_rules`
+entries add rules or replace a built-in one with the same id. Messages may
+use named groups of the pattern, e.g. `{module}`.
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ErrorRule:
+    """A log pattern and the user-facing message it stands for."""
+
+    id: str
+    pattern: str
+    message: str
+    priority: int = 50
+    ignore_case: bool = False
+
+    def compile(self) -> re.Pattern:
+        return re.compile(self.pattern, re.IGNORECASE if self.ignore_case else 0)
+
+
+@dataclass
+class RuleHit:
+    """Matches of one rule in the current run."""
+
+    rule_id: str
+    message: str
+    priority: int
+    count: int
+    first_seq: int
+    last_seq: int
+    last_line: str
+    first_at: float
+    last_at: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rule": self.rule_id,
+            "message": self.message,
+            "count": self.count,
+            "first_seq": self.first_seq,
+            "last_seq": self.last_seq,
+            "line": self.last_line,
+            "first_at": self.first_at,
+            "last_at": self.last_at,
+        }
+
+
+DEFAULT_RULES = [
+    ErrorRule(
+        "camera_timeout",
+        r"Timed out waiting for frame|TimeoutError.*(?i:camera)|(?i:camera).*TimeoutError",
+        "Teleoperation stopped: camera timed out. "
+        "Try Settings -> Use top camera only to reduce USB load, or use different USB ports for each camera.",
+        priority=80,
+    ),
+    ErrorRule(
+        "joint_limit",
+        r"Joint limit exceeded|(?i:velocity limit exceeded)",
+        "Teleoperation stopped: joint/velocity limit exceeded on the follower arm. "
+        "Move leader and follower to a similar rest pose before starting, then Start Teleoperation again.",
+        priority=70,
+    ),
+    ErrorRule(
+        "cuda_oom",
+        r"CUDA out of memory|OutOfMemoryError",
+        "Training ran out of GPU memory. Reduce the batch size or close other GPU processes.",
+        priority=75,
+    ),
+    ErrorRule(
+        "cuda_unavailable",
+        r"Torch not compiled with CUDA enabled|No CUDA GPUs are available|CUDA driver version is insufficient",
+        "CUDA is not available to lerobot. Check the NVIDIA driver and that torch was installed with CUDA support.",
+        priority=70,
+    ),
+    ErrorRule(
+        "dataset_not_found",
+        r"RepositoryNotFoundError|(?i:dataset).*(?:not found|does not exist)|No such file or directory.*(?i:dataset)",
+        "Dataset not found. Check the dataset repo ID, or record the dataset first.",
+        priority=65,
+    ),
+    ErrorRule(
+        "leader_connection_refused",
+        r"ConnectionRefusedError|Connection refused",
+        "Connection refused. If using a remote leader, make sure the leader service is running on PC2 "
+        "(Settings -> Leader Service) and the host/port are correct.",
+        priority=60,
+    ),
+    ErrorRule(
+        "arm_unreachable",
+        r"(?:No route to host|Network is unreachable|Host is unreachable)",
+        "Robot arm not reachable on the network. Check the arm is powered on and its IP address in Settings.",
+        priority=60,
+    ),
+    ErrorRule(
+        "module_missing",
+        r"ModuleNotFoundError: No module named '(?P<module>[^']+)'",
+        "The lerobot environment is missing the Python module '{module}'. Run `uv sync` in lerobot_trossen.",
+        priority=55,
+    ),
+    ErrorRule(
+        "device_permission",
+        r"Permission denied: '(?P<device>/dev/[^']+)'",
+        "Permission denied opening {device}. Add your user to the video/dialout group or fix the udev rules.",
+        priority=55,
+    ),
+    ErrorRule(
+        "timeout",
+        r"TimeoutError",
+        "Process stopped due to a timeout. Check the log for details.",
+        priority=10,
+    ),
+]
+
+
+def merge_rules(base: Iterable[ErrorRule], overrides: Iterable[ErrorRule]) -> list[ErrorRule]:
+    """Rules of `base` with `overrides` replacing same-id rules and adding the rest."""
+    rules = {rule.id: rule for rule in base}
+    rules.update({rule.id: rule for rule in overrides})
+    return list(rules.values())
+
+
+class ErrorRuleEngine:
+    """Matches output lines against compiled rules and keeps the current diagnosis."""
+
+    def __init__(self, rules: Iterable[ErrorRule] = DEFAULT_RULES):
+        self._lock = threading.Lock()
+        self._hits: dict[str, RuleHit] = {}
+        self._best: RuleHit | None = None
+        self.set_rules(rules)
+
+    def set_rules(self, rules: Iterable[ErrorRule]) -> None:
+        """Compile rules, highest priority first; rules with invalid patterns are skipped."""
+        compiled = []
+        for rule in sorted(rules, key=lambda r: -r.priority):
+            try:
+                compiled.append((rule, rule.compile()))
+            except re.error as e:
+                logger.warning(f"Ignoring error rule '{rule.id}': invalid pattern: {e}")
+        with self._lock:
+            self._rules = compiled
+
+    def reset(self) -> None:
+        """Forget the hits of the previous run."""
+        with self._lock:
+            self._hits = {}
+            self._best = None
+
+    def observe(self, line: str, seq: int) -> None:
+        """Match one ingested line (reader thread)."""
+        for rule, pattern in self._rules:
+            match = pattern.search(line)
+            if match is None:
+                continue
+            now = time.time()
+            with self._lock:
+                hit = self._hits.get(rule.id)
+                if hit is None:
+                    hit = self._hits[rule.id] = RuleHit(
+                        rule.id, "", rule.priority, 0, seq, seq, line, now, now,
+                    )
+                try:
+                    hit.message = rule.message.format(**match.groupdict(default=""))
+                except (KeyError, IndexError, ValueError):
+                    hit.message = rule.message
+                hit.count += 1
+                hit.last_seq = seq
+                hit.last_line = line
+                hit.last_at = now
+                if self._best is None or hit.priority >= self._best.priority:
+                    self._best = hit
+
+    def diagnosis(self) -> str | None:
+        """Message of the highest-priority rule hit in this run."""
+        best = self._best
+        return best.message if best is not None else None
+
+    def hits(self) -> list[dict[str, Any]]:
+        """All rule hits of this run, most recent first."""
+        with self._lock:
+            hits = sorted(self._hits.values(), key=lambda h: -h.last_seq)
+        return [h.to_dict() for h in hits]
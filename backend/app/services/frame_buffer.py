@@ -0,0 +1,172 @@
+"""Pooled storage for encoded camera frames.
+
+The capture thread copies each encoded JPEG into a reusable slot instead of
+allocating a new `bytes` object per frame. Readers pin the slot they are
+reading through `acquire()`, so it is not overwritten until the last reader
+releases it. Async readers can wait for the next frame with `wait_newer()`;
+`publish()` wakes them on their event loop.
+"""
+
+import asyncio
+import uuid
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator, NamedTuple
+
+DEFAULT_SLOTS = 3
+DEFAULT_SLOT_CAPACITY = 256 * 1024
+
+
+class FrameSlot:
+    """One reusable frame buffer."""
+
+    __slots__ = ("buf", "size", "refs", "seq", "captured_at", "encode_ms")
+
+    def __init__(self, capacity: int):
+        self.buf = bytearray(capacity)
+        self.size = 0
+        self.refs = 0
+        self.seq = 0
+        self.captured_at = 0.0
+        self.encode_ms = 0.0
+
+
+class PinnedFrame(NamedTuple):
+    """A reader's view of a pinned frame; `data` is only valid inside `acquire()`."""
+
+    data: memoryview
+    seq: int
+    captured_at: float
+    encode_ms: float
+
+
+class FrameBufferPool:
+    """Small pool of reusable buffers holding the latest encoded frame."""
+
+    def __init__(self, slots: int = DEFAULT_SLOTS, capacity: int = DEFAULT_SLOT_CAPACITY):
+        """Preallocate the pool.
+
+        Args:
+            slots: Number of preallocated slots (latest frame + frames pinned by readers)
+            capacity: Initial size of each slot in bytes; slots grow if a frame is larger
+        """
+        self._slots = [FrameSlot(capacity) for _ in range(slots)]
+        self._lock = Lock()
+        self._latest: FrameSlot | None = None
+        self._seq = 0
+        # Async readers waiting for the next publish: (their loop, event to set)
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        # Distinguishes this pool's sequence numbers from those of a restarted camera's pool
+        self.epoch = uuid.uuid4().hex[:8]
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest published frame (0 before the first frame)."""
+        return self._seq
+
+    @property
+    def slot_count(self) -> int:
+        """Number of slots currently in the pool."""
+        return len(self._slots)
+
+    def _free_slot(self) -> FrameSlot:
+        """Return a slot that is neither the latest frame nor pinned by a reader (caller holds the lock)."""
+        for slot in self._slots:
+            if slot.refs == 0 and slot is not self._latest:
+                return slot
+        # Every slot is pinned by a slow reader: grow the pool rather than block the capture thread
+        capacity = len(self._latest.buf) if self._latest else DEFAULT_SLOT_CAPACITY
+        slot = FrameSlot(capacity)
+        self._slots.append(slot)
+        return slot
+
+    def publish(self, data, captured_at: float = 0.0, encode_ms: float = 0.0) -> int:
+        """Copy an encoded frame (bytes or uint8 ndarray) into a free slot and make it the latest.
+
+        Args:
+            data: Encoded frame
+            captured_at: Wall-clock capture time (epoch seconds)
+            encode_ms: Time spent encoding the frame
+
+        Returns:
+            The new frame sequence number
+        """
+        src = memoryview(data).cast("B")
+        size = src.nbytes
+        with self._lock:
+            slot = self._free_slot()
+            if len(slot.buf) < size:
+                slot.buf = bytearray(size * 2)
+            # memoryview slice assignment is a plain memcpy; bytearray slice assignment
+            # would first copy a non-bytearray source into a temporary bytearray
+            with memoryview(slot.buf) as dst:
+                dst[:size] = src
+            slot.size = size
+            slot.captured_at = captured_at
+            slot.encode_ms = encode_ms
+            self._seq += 1
+            slot.seq = seq = self._seq
+            self._latest = slot
+            waiters, self._waiters = self._waiters, []
+        src.release()
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Reader's event loop already closed
+                pass
+        return seq
+
+    async def wait_newer(self, seq: int, timeout: float) -> bool:
+        """Wait until the latest frame is not `seq` (any other seq counts as newer).
+
+        Returns:
+            True once such a frame is published, False on timeout
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._lock:
+            if self._latest is not None and self._seq != seq:
+                return True
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    @contextmanager
+    def acquire(self) -> Iterator[PinnedFrame | None]:
+        """Pin the latest frame and yield a read-only view of it with its metadata (None if no frame yet)."""
+        with self._lock:
+            slot = self._latest
+            if slot is not None:
+                slot.refs += 1
+        if slot is None:
+            yield None
+            return
+        view = memoryview(slot.buf)[: slot.size].toreadonly()
+        try:
+            yield PinnedFrame(view, slot.seq, slot.captured_at, slot.encode_ms)
+        finally:
+            view.release()
+            with self._lock:
+                slot.refs -= 1
+
+    def latest_bytes(self) -> bytes | None:
+        """Return a copy of the latest frame, for callers that need an owned `bytes` object."""
+        with self.acquire() as frame:
+            return None if frame is None else bytes(frame.data)
+
+    def has_frame(self) -> bool:
+        """True once at least one frame has been published."""
+        return self._latest is not None
+
+    def clear(self) -> None:
+        """Forget the latest frame (buffers are kept for reuse)."""
+        with self._lock:
+            self._latest = None
@@ -0,0 +1,167 @@
+"""Per-camera frame processing applied once per captured frame, before encoding.
+
+A pipeline is built from the optional `processing` section of a camera's
+config, e.g.::
+
+    {"crop": [80, 0, 480, 480], "rotate": 90, "flip": "horizontal",
+     "overlay": "{key} {time}"}
+
+Stages always run in the order crop, rotate, flip, overlay. Crop is a view
+(no copy); the other stages write into buffers owned by the pipeline that
+are reused every frame. The processed image is what every consumer (JPEG
+renditions, H.264, DVR) sees.
+"""
+
+import logging
+import time
+from typing import Any
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_ROTATIONS = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+_FLIPS = {"horizontal": 1, "vertical": 0, "both": -1}
+
+OVERLAY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+OVERLAY_SCALE = 0.5
+OVERLAY_MARGIN = 6
+# Weight of the newest sample in per-stage timing averages
+TIMING_EMA_ALPHA = 0.1
+
+
+class FramePipeline:
+    """Crop / rotate / flip / text-overlay stages for one camera."""
+
+    def __init__(self, key: str, spec: dict[str, Any]):
+        """Validate a processing spec.
+
+        Args:
+            key: Camera identifier (available to overlays as {key})
+            spec: Camera `processing` config; unknown keys are ignored
+
+        Raises:
+            ValueError: If a stage is misconfigured
+        """
+        self.key = key
+        self.spec = dict(spec)
+        self.crop: tuple[int, int, int, int] | None = None
+        self.rotate: int | None = None
+        self.flip: int | None = None
+        self.overlay: str | None = None
+
+        if spec.get("crop"):
+            crop = tuple(int(v) for v in spec["crop"])
+            if len(crop) != 4 or crop[2] <= 0 or crop[3] <= 0:
+                raise ValueError(f"Camera {key}: crop must be [x, y, width, height], got {spec['crop']}")
+            self.crop = crop
+        rotate = int(spec.get("rotate") or 0) % 360
+        if rotate:
+            if rotate not in _ROTATIONS:
+                raise ValueError(f"Camera {key}: rotate must be 0, 90, 180 or 270, got {spec['rotate']}")
+            self.rotate = _ROTATIONS[rotate]
+        if spec.get("flip"):
+            if spec["flip"] not in _FLIPS:
+                raise ValueError(f"Camera {key}: flip must be one of {sorted(_FLIPS)}, got {spec['flip']}")
+            self.flip = _FLIPS[spec["flip"]]
+        if spec.get("overlay"):
+            self.overlay = str(spec["overlay"])
+
+        self.stages = [
+            name for name, enabled in (
+                ("crop", self.crop is not None),
+                ("rotate", self.rotate is not None),
+                ("flip", self.flip is not None),
+                ("overlay", self.overlay is not None),
+            ) if enabled
+        ]
+        self._bufs: dict[str, np.ndarray] = {}
+        self.stage_ms: dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.stages)
+
+    def _buffer(self, name: str, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """Reusable output buffer of a stage, reallocated only when the frame shape changes."""
+        buf = self._bufs.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = self._bufs[name] = np.empty(shape, dtype=dtype)
+        return buf
+
+    def _time(self, name: str, start: float) -> float:
+        """Fold the elapsed time of a stage into its running average; returns now."""
+        now = time.perf_counter()
+        ms = (now - start) * 1000
+        prev = self.stage_ms.get(name)
+        self.stage_ms[name] = ms if prev is None else prev + TIMING_EMA_ALPHA * (ms - prev)
+        return now
+
+    def process(self, img: np.ndarray, captured_at: float) -> np.ndarray:
+        """Run all stages on a captured image.
+
+        The input is never modified. The result may be a view of the input or
+        a pipeline buffer that is overwritten by the next call, so consumers
+        must copy what they keep.
+        """
+        t = time.perf_counter()
+        out = img
+        owned = False
+
+        if self.crop is not None:
+            x, y, w, h = self.crop
+            cropped = out[max(0, y):max(0, y + h), max(0, x):max(0, x + w)]
+            if cropped.size:
+                out = cropped
+            t = self._time("crop", t)
+        if self.rotate is not None:
+            h, w = out.shape[:2]
+            if self.rotate == cv2.ROTATE_180:
+                shape = out.shape
+            else:
+                shape = (w, h, *out.shape[2:])
+            out = cv2.rotate(out, self.rotate, dst=self._buffer("rotate", shape, out.dtype))
+            owned = True
+            t = self._time("rotate", t)
+        if self.flip is not None:
+            out = cv2.flip(out, self.flip, dst=self._buffer("flip", out.shape, out.dtype))
+            owned = True
+            t = self._time("flip", t)
+        if self.overlay is not None:
+            if not owned:
+                # Never draw into the capture buffer (it may belong to the camera driver)
+                buf = self._buffer("overlay", out.shape, out.dtype)
+                np.copyto(buf, out)
+                out = buf
+            self._draw_overlay(out, captured_at)
+            self._time("overlay", t)
+        return out
+
+    def _draw_overlay(self, img: np.ndarray, captured_at: float) -> None:
+        """Draw the overlay text with a dark backing box in the top-left corner."""
+        stamp = time.strftime("%H:%M:%S", time.localtime(captured_at)) + f".{int(captured_at * 1000) % 1000:03d}"
+        try:
+            text = self.overlay.format(key=self.key, time=stamp, date=time.strftime("%Y-%m-%d", time.localtime(captured_at)))
+        except (KeyError, IndexError, ValueError):
+            text = self.overlay
+        (tw, th), baseline = cv2.getTextSize(text, OVERLAY_FONT, OVERLAY_SCALE, 1)
+        x = y = OVERLAY_MARGIN
+        cv2.rectangle(img, (x - 3, y - 3), (x + tw + 3, y + th + baseline + 3), (0, 0, 0), -1)
+        cv2.putText(img, text, (x, y + th), OVERLAY_FONT, OVERLAY_SCALE, (255, 255, 255), 1, cv2.LINE_AA)
+
+
+def build_pipeline(key: str, spec: dict[str, Any] | None) -> FramePipeline | None:
+    """Pipeline for a camera's processing config, or None if nothing is configured or it is invalid."""
+    if not spec:
+        return None
+    try:
+        pipeline = FramePipeline(key, spec)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Ignoring processing config: {e}")
+        return None
+    return pipeline if pipeline.enabled else None
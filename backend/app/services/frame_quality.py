@@ -0,0 +1,243 @@
+"""Cheap per-frame image quality metrics: exposure, blur and frozen feed.
+
+Metrics are computed on a decimated grayscale copy of each frame (about
+160 px wide) held in preallocated buffers, which keeps the cost well under a
+millisecond per frame. Samples go into fixed-size ring arrays so a camera's
+recent history can be served as a time series.
+
+Cameras handed over to lerobot-record are not captured by Studio;
+RecordedFrameTap samples the frame images lerobot writes into the dataset
+instead, so the frames going into a recording are checked too.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any
+
+import cv2
+import numpy as np
+
+# Width of the decimated frame the metrics are computed on
+ANALYSIS_WIDTH = 160
+# Ring capacity per camera (about one minute at 30 fps)
+HISTORY_SAMPLES = 1800
+
+# Pixel values counted as clipped (8-bit gray)
+CLIP_LOW = 5
+CLIP_HIGH = 250
+OVEREXPOSED_CLIPPED = 0.25
+UNDEREXPOSED_MEAN = 20.0
+# Laplacian variance below this (on the decimated frame) is flagged as blurry
+BLUR_THRESHOLD = 15.0
+# Mean absolute difference to the previous frame treated as "unchanged"
+FROZEN_DIFF = 0.1
+FROZEN_AFTER_S = 1.0
+
+METRICS = ("t", "mean", "clipped_low", "clipped_high", "blur", "diff")
+
+# How often the recording tap looks for a newly written frame per camera
+TAP_INTERVAL_S = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+class FrameQualityMonitor:
+    """Per-camera quality metrics with a bounded history."""
+
+    def __init__(self, history: int = HISTORY_SAMPLES):
+        self._lock = Lock()
+        self._history = np.zeros((history, len(METRICS)), dtype=np.float64)
+        self._count = 0
+        self._small: np.ndarray | None = None
+        self._gray: np.ndarray | None = None
+        self._prev: np.ndarray | None = None
+        self._diff: np.ndarray | None = None
+        self._mask: np.ndarray | None = None
+        self._lap: np.ndarray | None = None
+        self._unchanged_since: float | None = None
+        self.latest: dict[str, float] = {}
+        self.compute_ms = 0.0
+
+    def _buffers(self, img: np.ndarray) -> None:
+        """(Re)allocate analysis buffers for the frame size."""
+        h, w = img.shape[:2]
+        scale = min(1.0, ANALYSIS_WIDTH / w)
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        if self._gray is not None and self._gray.shape[::-1] == size and self._small.shape[2:] == img.shape[2:]:
+            return
+        self._small = np.empty((size[1], size[0], *img.shape[2:]), dtype=np.uint8)
+        self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._prev = None
+        self._diff = np.empty_like(self._gray)
+        self._mask = np.empty_like(self._gray)
+        self._lap = np.empty(self._gray.shape, dtype=np.float32)
+
+    def update(self, img: np.ndarray, captured_at: float) -> dict[str, float]:
+        """Compute metrics for one BGR (or gray) frame and append them to the history."""
+        start = time.perf_counter()
+        self._buffers(img)
+        # Plain decimation (nearest): keeps fine detail for the blur score and is ~15x cheaper than INTER_AREA
+        cv2.resize(img, self._gray.shape[::-1], dst=self._small, interpolation=cv2.INTER_NEAREST)
+        if self._small.ndim == 3:
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        else:
+            np.copyto(self._gray, self._small)
+        gray = self._gray
+        n = gray.size
+
+        mean = float(cv2.mean(gray)[0])
+        clipped_low = cv2.countNonZero(cv2.compare(gray, CLIP_LOW, cv2.CMP_LE, dst=self._mask)) / n
+        clipped_high = cv2.countNonZero(cv2.compare(gray, CLIP_HIGH, cv2.CMP_GE, dst=self._mask)) / n
+        cv2.Laplacian(gray, cv2.CV_32F, dst=self._lap)
+        _, std = cv2.meanStdDev(self._lap)
+        blur = float(std[0, 0]) ** 2
+        if self._prev is None:
+            self._prev = gray.copy()
+            diff = float("nan")
+        else:
+            cv2.absdiff(gray, self._prev, dst=self._diff)
+            diff = float(cv2.mean(self._diff)[0])
+            np.copyto(self._prev, gray)
+
+        if diff == diff and diff < FROZEN_DIFF:
+            if self._unchanged_since is None:
+                self._unchanged_since = captured_at
+        else:
+            self._unchanged_since = None
+
+        sample = (captured_at, mean, clipped_low, clipped_high, blur, diff)
+        with self._lock:
+            self._history[self._count % len(self._history)] = sample
+            self._count += 1
+            self.latest = dict(zip(METRICS, sample))
+        self.compute_ms = (time.perf_counter() - start) * 1000
+        return self.latest
+
+    def flags(self) -> list[str]:
+        """Active problems: overexposed, underexposed, blurry, frozen (same image) or stalled (no new frames)."""
+        latest = self.latest
+        if not latest:
+            return []
+        flags = []
+        if latest["clipped_high"] >= OVEREXPOSED_CLIPPED:
+            flags.append("overexposed")
+        if latest["mean"] <= UNDEREXPOSED_MEAN:
+            flags.append("underexposed")
+        if latest["blur"] < BLUR_THRESHOLD:
+            flags.append("blurry")
+        if self._unchanged_since is not None and latest["t"] - self._unchanged_since >= FROZEN_AFTER_S:
+            flags.append("frozen")
+        if time.time() - latest["t"] >= FROZEN_AFTER_S:
+            flags.append("stalled")
+        return flags
+
+    def series(self, seconds: float | None = None) -> dict[str, list[float | None]]:
+        """Recorded samples, oldest first, as one list per metric (optionally only the last `seconds`)."""
+        with self._lock:
+            count = min(self._count, len(self._history))
+            end = self._count % len(self._history)
+            if self._count <= len(self._history):
+                rows = self._history[:count].copy()
+            else:
+                rows = np.concatenate((self._history[end:], self._history[:end]))
+        if seconds is not None and len(rows):
+            rows = rows[rows[:, 0] >= rows[-1, 0] - seconds]
+        return {
+            name: [None if v != v else round(float(v), 4) for v in rows[:, i]]
+            for i, name in enumerate(METRICS)
+        }
+
+    def summary(self) -> dict[str, Any]:
+        """Latest metrics, active flags and the cost of the last computation."""
+        latest = {k: (None if v != v else round(v, 4)) for k, v in self.latest.items()}
+        return {"latest": latest, "flags": self.flags(), "compute_ms": round(self.compute_ms, 3)}
+
+
+def lerobot_dataset_root(repo_id: str) -> Path:
+    """Local directory lerobot uses for a dataset (HF_LEROBOT_HOME, else $HF_HOME/lerobot)."""
+    home = os.environ.get("HF_LEROBOT_HOME")
+    if home is None:
+        home = Path(os.environ.get("HF_HOME", Path.home() / ".cache" / "huggingface")) / "lerobot"
+    return Path(home).expanduser() / repo_id
+
+
+class RecordedFrameTap:
+    """Quality of the frames lerobot-record writes, sampled from the dataset's image files.
+
+    While an episode is recorded, lerobot saves every camera frame as
+    images/observation.images.<camera>/episode_NNNNNN/frame_NNNNNN.png under
+    the dataset root (and encodes them to video after the episode). The
+    newest file per camera is decoded every TAP_INTERVAL_S and run through a
+    FrameQualityMonitor. Between episodes nothing is written, so "stalled"
+    is not reported here; lerobot's own log covers camera timeouts.
+    """
+
+    def __init__(self, dataset_root: Path, cameras: list[str], interval_s: float = TAP_INTERVAL_S):
+        self.dataset_root = Path(dataset_root)
+        self.interval_s = interval_s
+        self.monitors = {camera: FrameQualityMonitor(history=HISTORY_SAMPLES // 15) for camera in cameras}
+        self._last: dict[str, Path] = {}
+        # Frames left over from an earlier session of the same dataset are ignored
+        self._since = time.time()
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._loop, daemon=True, name="recorded-frame-tap")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.sample_once()
+            except Exception as e:
+                logger.warning(f"Recorded frame quality sampling failed: {e}")
+
+    def _newest_frame(self, camera: str) -> Path | None:
+        """Newest frame file lerobot wrote for `camera` in this session."""
+        camera_dir = self.dataset_root / "images" / f"observation.images.{camera}"
+        try:
+            episodes = sorted(d.name for d in os.scandir(camera_dir) if d.name.startswith("episode_"))
+            if not episodes:
+                return None
+            frames = sorted(f.name for f in os.scandir(camera_dir / episodes[-1]) if f.name.startswith("frame_"))
+        except OSError:
+            return None
+        if not frames:
+            return None
+        # The newest file may still be being written; the one before it is complete
+        path = camera_dir / episodes[-1] / frames[-2 if len(frames) > 1 else -1]
+        try:
+            if path.stat().st_mtime < self._since:
+                return None
+        except OSError:
+            return None
+        return path
+
+    def sample_once(self) -> None:
+        """Decode each camera's newest recorded frame (if new) into its monitor."""
+        for camera, monitor in self.monitors.items():
+            path = self._newest_frame(camera)
+            if path is None or path == self._last.get(camera):
+                continue
+            img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if img is None:
+                continue
+            self._last[camera] = path
+            monitor.update(img, path.stat().st_mtime)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Latest metrics and flags per recorded camera (no flags before its first frame)."""
+        result = {}
+        for camera, monitor in self.monitors.items():
+            summary = monitor.summary()
+            summary["flags"] = [f for f in summary["flags"] if f != "stalled"]
+            summary["frame"] = self._last[camera].name if camera in self._last else None
+            result[camera] = summary
+        return result
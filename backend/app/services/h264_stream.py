@@ -0,0 +1,416 @@
+"""Software H.264 streams for low-bitrate remote viewers.
+
+One ffmpeg/libx264 subprocess per camera rendition encodes raw frames tapped
+from the capture thread (`ultrafast`/`zerolatency`). Its Annex-B output is
+shared by every subscriber; a subscriber joining mid-stream (or one that fell
+behind) starts at the next SPS, which x264 repeats before each keyframe.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import time
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Any, Callable
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BITRATE_KBPS = 600
+# Keyframe interval in seconds; bounds how long a new viewer waits for a picture
+KEYFRAME_INTERVAL_S = 2
+# Chunks a subscriber may have queued before it is dropped back to the next keyframe
+SUBSCRIBER_MAX_QUEUED = 60
+METRICS_WINDOW_S = 5.0
+READ_CHUNK = 64 * 1024
+
+NAL_SLICE = 1
+NAL_IDR = 5
+NAL_SPS = 7
+ANNEXB_START = b"\x00\x00\x00\x01"
+
+
+def h264_available() -> bool:
+    """True if an ffmpeg binary is on PATH."""
+    return shutil.which("ffmpeg") is not None
+
+
+class NalScanner:
+    """Finds NAL unit headers in an Annex-B stream delivered in arbitrary chunks."""
+
+    def __init__(self):
+        self._tail = b""
+
+    def scan(self, chunk: bytes) -> tuple[bytes, list[tuple[int, int, bool]]]:
+        """Scan the next chunk.
+
+        Returns:
+            (data, nals): `data` is the unscanned tail of the previous chunk plus
+            this chunk; each nal is (index of its header byte in data, nal type,
+            first slice of a picture).
+        """
+        data = self._tail + chunk
+        nals: list[tuple[int, int, bool]] = []
+        i = data.find(b"\x00\x00\x01")
+        last_complete = 0
+        while i != -1:
+            header = i + 3
+            if header + 1 >= len(data):
+                # Header or first slice byte not here yet; rescan from this start code next time
+                break
+            nal_type = data[header] & 0x1F
+            # first_mb_in_slice is ue(v); it is 0 (a new picture) iff its first bit is 1
+            first_slice = nal_type in (NAL_SLICE, NAL_IDR) and bool(data[header + 1] & 0x80)
+            nals.append((header, nal_type, first_slice))
+            last_complete = header + 2
+            i = data.find(b"\x00\x00\x01", header)
+        self._tail = data[max(last_complete, len(data) - 5):] if i == -1 else data[i:]
+        return data, nals
+
+
+class H264Subscriber:
+    """Per-viewer queue of Annex-B chunks, filled from the encoder's reader thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: deque[bytes] = deque()
+        self._event = asyncio.Event()
+        self.synced = False
+        self.resyncs = 0
+
+    def push(self, data: bytes) -> None:
+        """Queue a chunk (reader thread); on overflow drop everything and wait for a keyframe."""
+        if len(self._queue) >= SUBSCRIBER_MAX_QUEUED:
+            self._queue.clear()
+            self.synced = False
+            self.resyncs += 1
+            return
+        self._queue.append(data)
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # Viewer's event loop already closed; it is about to unsubscribe
+            pass
+
+    async def next_chunk(self, timeout: float = 5.0) -> bytes | None:
+        """Wait for queued output and return all of it coalesced (None on timeout)."""
+        while not self._queue:
+            self._event.clear()
+            if self._queue:
+                break
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        parts = []
+        while self._queue:
+            parts.append(self._queue.popleft())
+        return b"".join(parts)
+
+
+class H264Encoder:
+    """ffmpeg/libx264 subprocess fed with raw frames of one camera rendition."""
+
+    def __init__(self, key: str, rendition: str, width: int, height: int, fps: int, bitrate_kbps: int):
+        self.key = key
+        self.rendition = rendition
+        self.width = width - width % 2
+        self.height = height - height % 2
+        self.fps = fps
+        self.bitrate_kbps = bitrate_kbps
+
+        self._proc: subprocess.Popen | None = None
+        self._input = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._input_ready = Event()
+        self._writer_busy = False
+        self._stop = Event()
+        self._threads: list[Thread] = []
+
+        self._subscribers: list[H264Subscriber] = []
+        self._sub_lock = Lock()
+        self._scanner = NalScanner()
+
+        # Metrics
+        self._feed_times: deque[float] = deque(maxlen=4 * fps)
+        self._bytes_window: deque[tuple[float, int]] = deque()
+        self.latency_ms: deque[float] = deque(maxlen=100)
+        self.frames_in = 0
+        self.frames_dropped = 0
+        self.frames_out = 0
+
+    def command(self) -> list[str]:
+        """ffmpeg command line: raw BGR on stdin, Annex-B H.264 on stdout."""
+        kbps = self.bitrate_kbps
+        return [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{self.width}x{self.height}", "-r", str(self.fps),
+            "-i", "pipe:0",
+            "-an", "-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency",
+            "-pix_fmt", "yuv420p",
+            "-b:v", f"{kbps}k", "-maxrate", f"{kbps}k", "-bufsize", f"{max(kbps // 2, 1)}k",
+            "-g", str(self.fps * KEYFRAME_INTERVAL_S), "-bf", "0",
+            "-x264-params", "repeat-headers=1",
+            "-flush_packets", "1",
+            "-f", "h264", "pipe:1",
+        ]
+
+    def start(self) -> None:
+        """Spawn ffmpeg and the writer/reader threads."""
+        self._proc = subprocess.Popen(
+            self.command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        for target, name in ((self._write_loop, "writer"), (self._read_loop, "reader")):
+            thread = Thread(target=target, daemon=True, name=f"H264-{self.key}-{self.rendition}-{name}")
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"H.264 encoder started for {self.key}/{self.rendition} ({self.width}x{self.height}@{self.fps}, {self.bitrate_kbps} kbps)")
+
+    def stop(self) -> None:
+        """Stop ffmpeg and the worker threads."""
+        self._stop.set()
+        self._input_ready.set()
+        if self._proc:
+            try:
+                if self._proc.stdin:
+                    self._proc.stdin.close()
+            except Exception:
+                pass
+            try:
+                self._proc.terminate()
+                self._proc.wait(timeout=2)
+            except Exception:
+                self._proc.kill()
+            self._proc = None
+        logger.info(f"H.264 encoder stopped for {self.key}/{self.rendition}")
+
+    def feed(self, img: np.ndarray, captured_at: float) -> None:
+        """Frame sink for the capture thread: copy/scale into the input buffer, or drop if ffmpeg is busy."""
+        if self._writer_busy:
+            self.frames_dropped += 1
+            return
+        if img.shape[:2] == self._input.shape[:2]:
+            np.copyto(self._input, img)
+        else:
+            cv2.resize(img, (self.width, self.height), dst=self._input, interpolation=cv2.INTER_AREA)
+        self._writer_busy = True
+        self.frames_in += 1
+        self._feed_times.append(time.monotonic())
+        self._input_ready.set()
+
+    def _write_loop(self) -> None:
+        while not self._stop.is_set():
+            self._input_ready.wait()
+            self._input_ready.clear()
+            if self._stop.is_set() or self._proc is None or self._proc.stdin is None:
+                break
+            try:
+                self._proc.stdin.write(memoryview(self._input).cast("B"))
+            except Exception as e:
+                logger.warning(f"H.264 encoder {self.key}/{self.rendition} input closed: {e}")
+                break
+            finally:
+                self._writer_busy = False
+
+    def _read_loop(self) -> None:
+        proc = self._proc
+        if proc is None or proc.stdout is None:
+            return
+        fd = proc.stdout.fileno()
+        while not self._stop.is_set():
+            try:
+                chunk = os.read(fd, READ_CHUNK)
+            except Exception:
+                break
+            if not chunk:
+                break
+            self._handle_output(chunk)
+        if not self._stop.is_set():
+            logger.warning(f"H.264 encoder {self.key}/{self.rendition} exited (ffmpeg code {proc.poll()})")
+
+    @property
+    def exited(self) -> bool:
+        """True once ffmpeg has died or the encoder was stopped (false before start())."""
+        if self._stop.is_set():
+            return True
+        proc = self._proc
+        return proc is not None and proc.poll() is not None
+
+    def _handle_output(self, chunk: bytes) -> None:
+        """Account metrics for a chunk of encoder output and distribute it to subscribers."""
+        now = time.monotonic()
+        self._bytes_window.append((now, len(chunk)))
+        while self._bytes_window and now - self._bytes_window[0][0] > METRICS_WINDOW_S:
+            self._bytes_window.popleft()
+
+        data, nals = self._scanner.scan(chunk)
+        sps_index = None
+        for header, nal_type, first_slice in nals:
+            if nal_type == NAL_SPS and sps_index is None:
+                sps_index = header
+            if first_slice:
+                self.frames_out += 1
+                if self._feed_times:
+                    self.latency_ms.append((now - self._feed_times.popleft()) * 1000)
+
+        with self._sub_lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.synced:
+                sub.push(chunk)
+            elif sps_index is not None:
+                # Start at the SPS; `data` may begin with tail bytes of the previous chunk,
+                # which this subscriber has not received yet
+                sub.synced = True
+                sub.push(ANNEXB_START + data[sps_index:])
+
+    def subscribe(self, subscriber: H264Subscriber) -> None:
+        """Add a subscriber; it receives output from the next SPS on."""
+        with self._sub_lock:
+            self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: H264Subscriber) -> int:
+        """Remove a subscriber; returns how many remain."""
+        with self._sub_lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+            return len(self._subscribers)
+
+    def stats(self) -> dict[str, Any]:
+        """Bitrate, encode latency and frame counters."""
+        window = list(self._bytes_window)
+        span = (window[-1][0] - window[0][0]) if len(window) > 1 else 0.0
+        total = sum(n for _, n in window[1:]) if len(window) > 1 else 0
+        latencies = sorted(self.latency_ms)
+        return {
+            "camera": self.key,
+            "rendition": self.rendition,
+            "resolution": [self.width, self.height],
+            "fps": self.fps,
+            "target_kbps": self.bitrate_kbps,
+            "bitrate_kbps": round(total * 8 / span / 1000, 1) if span > 0 else 0.0,
+            "encode_latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 1) if latencies else None,
+            },
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "frames_dropped": self.frames_dropped,
+            "subscribers": len(self._subscribers),
+        }
+
+
+class H264Hub:
+    """One shared encoder per (camera, rendition), started on first subscriber, stopped after the last.
+
+    ffmpeg is started and the frame sink attached/detached outside the hub
+    lock: those take the camera manager's lock, which is held while
+    CameraManager.shutdown_all() runs.
+    """
+
+    def __init__(self):
+        self._encoders: dict[tuple[str, str], H264Encoder] = {}
+        # Detaches each encoder's frame sink from its camera
+        self._detach: dict[tuple[str, str], Callable[[Callable[[np.ndarray, float], None]], None]] = {}
+        self._lock = Lock()
+
+    def subscribe(
+        self,
+        key: str,
+        rendition: str,
+        size: tuple[int, int],
+        fps: int,
+        bitrate_kbps: int,
+        attach: Callable[[Callable[[np.ndarray, float], None]], None],
+        detach: Callable[[Callable[[np.ndarray, float], None]], None],
+        subscriber: H264Subscriber,
+    ) -> H264Encoder:
+        """Subscribe to a camera rendition, starting its encoder if needed.
+
+        An encoder whose ffmpeg has exited is dropped and replaced.
+
+        Args:
+            key: Camera key
+            rendition: Rendition name (only used to share encoders)
+            size: Encoded (width, height)
+            fps: Camera frame rate
+            bitrate_kbps: Target bitrate for a newly started encoder
+            attach: Registers the encoder's frame sink with the camera
+            detach: Unregisters it again when the encoder stops
+            subscriber: The viewer's queue
+        """
+        stale = None
+        created = False
+        with self._lock:
+            encoder = self._encoders.get((key, rendition))
+            if encoder is not None and encoder.exited:
+                stale = (encoder, self._detach.pop((key, rendition)))
+                encoder = None
+            if encoder is None:
+                encoder = H264Encoder(key, rendition, size[0], size[1], fps, bitrate_kbps)
+                self._encoders[(key, rendition)] = encoder
+                self._detach[(key, rendition)] = detach
+                created = True
+            encoder.subscribe(subscriber)
+        if stale is not None:
+            self._stop_encoder(*stale)
+        if created:
+            try:
+                encoder.start()
+            except Exception:
+                # Viewers that joined while ffmpeg was starting see the encoder exited and close
+                encoder.stop()
+                self._take(encoder)
+                raise
+            attach(encoder.feed)
+        return encoder
+
+    def unsubscribe(self, encoder: H264Encoder, subscriber: H264Subscriber) -> None:
+        """Unsubscribe; stops and detaches the encoder when nobody is left."""
+        if encoder.unsubscribe(subscriber) == 0:
+            self._remove(encoder)
+
+    def _remove(self, encoder: H264Encoder) -> None:
+        """Drop `encoder` from the hub (if still current) and stop it."""
+        detach = self._take(encoder)
+        if detach is not None:
+            self._stop_encoder(encoder, detach)
+
+    def _take(self, encoder: H264Encoder) -> Callable[[Callable[[np.ndarray, float], None]], None] | None:
+        """Drop `encoder` from the hub if it is still current; returns its detach callback."""
+        with self._lock:
+            if self._encoders.get((encoder.key, encoder.rendition)) is not encoder:
+                return None
+            del self._encoders[(encoder.key, encoder.rendition)]
+            return self._detach.pop((encoder.key, encoder.rendition))
+
+    @staticmethod
+    def _stop_encoder(encoder: H264Encoder, detach: Callable[[Callable[[np.ndarray, float], None]], None]) -> None:
+        try:
+            detach(encoder.feed)
+        finally:
+            encoder.stop()
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Stats of every running encoder."""
+        with self._lock:
+            encoders = list(self._encoders.values())
+        return [e.stats() for e in encoders]
+
+    def stop_all(self) -> None:
+        """Stop and detach every encoder (on shutdown); don't call with the camera manager's lock held."""
+        with self._lock:
+            encoders = [(encoder, self._detach[k]) for k, encoder in self._encoders.items()]
+            self._encoders.clear()
+            self._detach.clear()
+        for encoder, detach in encoders:
+            self._stop_encoder(encoder, detach)
@@ -0,0 +1,661 @@
+"""Persistent queue of lerobot jobs, scheduled by resource class.
+
+The interactive ProcessManager runs one process at a time and replaces it
+on every start. Jobs submitted here instead wait their turn, so training
+runs (and sweeps of them) can be lined up to keep the machine busy
+unattended. Every job has a resource class:
+
+- robot: drives the arms (replay). Robot jobs run one at a time and never
+  while an interactive teleop/record/replay process holds a robot on any
+  station. An interactive start reserves the robot with claim("robot")
+  under the queue's lock until its process is registered, so the two
+  cannot both start.
+- gpu: uses a CUDA device (training). At most `gpu_slots` at once, counting
+  interactive training runs of every station. An interactive training
+  start reserves a slot with claim("gpu") the same way, and is refused
+  while GPU jobs hold every slot.
+- cpu: CPU-only (training with device=cpu). Run concurrently while the sum
+  of their `cores` fits the core budget.
+
+Queued jobs start by priority (higher first), then submission order. A job
+that does not fit yet holds back lower-priority jobs of its own class, but
+jobs of other classes still start. The queue is saved to `jobs.json` after
+every change; jobs that were running when the backend went away are marked
+failed on the next start. Each job's output goes to its own log file and,
+while it runs, to an in-memory LogRing.
+"""
+
+import itertools
+import json
+import logging
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable
+
+from app.config import TrainConfig, load_config
+from app.services.error_rules import DEFAULT_RULES, ErrorRuleEngine
+from app.services.launch_cache import LaunchCache
+from app.services.log_buffer import LogRing
+from app.services.log_ingest import LineAssembler, pump
+from app.services.process_manager import (
+    KILL_WAIT_S,
+    LEROBOT_TROSSEN_PATH,
+    STOP_GRACE_S,
+    ProcessManager,
+    ProcessMode,
+    lerobot_env,
+    replay_command,
+    train_command,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("train", "replay")
+RESOURCE_CLASSES = ("robot", "gpu", "cpu")
+FINISHED_STATES = ("succeeded", "failed", "cancelled")
+# Output lines of a running job kept in memory (the full output is in its log file)
+JOB_LOG_CAPACITY = 2000
+# Lines a finished job's log read returns by default
+JOB_LOG_TAIL = 500
+# Scheduler poll interval (it is also woken on every submit/cancel/exit)
+SCHEDULE_INTERVAL_S = 1.0
+# Largest sweep accepted in one request
+MAX_SWEEP_JOBS = 64
+# TrainConfig fields plus the per-job device, the parameters a sweep may vary
+SWEEP_FIELDS = tuple(TrainConfig.model_fields) + ("device",)
+
+# Interactive modes that hold each resource class
+_ROBOT_MODES = (ProcessMode.TELEOPERATE, ProcessMode.RECORD, ProcessMode.REPLAY)
+_GPU_MODES = (ProcessMode.TRAIN,)
+
+
+@dataclass
+class Job:
+    """One queued, running or finished lerobot run."""
+
+    id: str
+    kind: str
+    params: dict[str, Any]
+    resource_class: str
+    cores: int = 1
+    priority: int = 0
+    state: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    pid: int | None = None
+    exit_code: int | None = None
+    error: str | None = None
+    sweep_id: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Job":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+def default_resource_class(kind: str, params: dict[str, Any]) -> str:
+    """Resource class a job of `kind` needs: replay drives the robot, training a GPU unless device=cpu."""
+    if kind == "replay":
+        return "robot"
+    return "cpu" if params.get("device") == "cpu" else "gpu"
+
+
+def build_command(job: Job) -> list[str]:
+    """lerobot command line of a job."""
+    if job.kind == "train":
+        return train_command(job.params)
+    return replay_command(job.params, job.params)
+
+
+def _slug(value: Any) -> str:
+    return re.sub(r"[^A-Za-z0-9.]+", "-", str(value)).strip("-") or "x"
+
+
+def expand_sweep(base: dict[str, Any], grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Train parameters for every combination of the `grid` values over `base`.
+
+    Unless the grid sets them itself, job_name and output_dir get a suffix
+    naming the combination, so runs do not overwrite each other.
+
+    Raises:
+        ValueError: unknown field, empty value list, or more than MAX_SWEEP_JOBS combinations
+    """
+    if not grid:
+        raise ValueError("Sweep grid is empty")
+    unknown = sorted(set(grid) - set(SWEEP_FIELDS))
+    if unknown:
+        raise ValueError(f"Cannot sweep over {', '.join(unknown)}; sweepable fields: {', '.join(SWEEP_FIELDS)}")
+    for name, values in grid.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Sweep values for '{name}' must be a non-empty list")
+    total = 1
+    for values in grid.values():
+        total *= len(values)
+    if total > MAX_SWEEP_JOBS:
+        raise ValueError(f"Sweep has {total} combinations; at most {MAX_SWEEP_JOBS} are allowed")
+
+    names = list(grid)
+    runs = []
+    for combination in itertools.product(*(grid[name] for name in names)):
+        params = {**base, **dict(zip(names, combination))}
+        suffix = "_".join(f"{name}-{_slug(value)}" for name, value in zip(names, combination))
+        if "job_name" not in grid:
+            params["job_name"] = f"{base.get('job_name', 'job')}_{suffix}"
+        if "output_dir" not in grid:
+            params["output_dir"] = f"{base.get('output_dir', 'outputs/train/job')}_{suffix}"
+        runs.append(params)
+    return runs
+
+
+def _interactive_modes() -> list[ProcessMode]:
+    """Modes of the interactive processes holding hardware, across every station."""
+    return [mode for mode in (pm.active_mode for pm in ProcessManager.all_stations()) if mode is not None]
+
+
+@dataclass
+class _Run:
+    """Live state of a running job."""
+
+    process: subprocess.Popen
+    ring: LogRing
+    errors: ErrorRuleEngine
+
+
+class JobQueue:
+    """Persistent job queue with a background scheduler thread."""
+
+    _instance: "JobQueue | None" = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        directory: Path,
+        cpu_core_budget: int = 4,
+        gpu_slots: int = 1,
+        interactive_modes: Callable[[], list[ProcessMode]] = _interactive_modes,
+    ):
+        """Load the queue saved in `directory` (use get_instance() outside tests).
+
+        Args:
+            directory: Holds jobs.json and one log file per job
+            cpu_core_budget: Cores shared by concurrently running cpu jobs
+            gpu_slots: gpu jobs (including interactive training runs) allowed at once
+            interactive_modes: Returns the modes of the interactive processes holding hardware, one per busy station
+        """
+        self.directory = Path(directory)
+        self.cpu_core_budget = cpu_core_budget
+        self.gpu_slots = gpu_slots
+        self.lerobot_path = LEROBOT_TROSSEN_PATH
+        self._interactive_modes = interactive_modes
+        self._state_lock = threading.RLock()
+        self._jobs: dict[str, Job] = {}
+        self._runs: dict[str, _Run] = {}
+        # Jobs picked by the scheduler whose process is being spawned (outside the lock)
+        self._launching: dict[str, Job] = {}
+        # Interactive starts between claim() and release(), by resource class
+        self._claims = {"robot": 0, "gpu": 0}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._load()
+
+    @classmethod
+    def get_instance(cls) -> "JobQueue":
+        """Get the singleton JobQueue, configured from the `jobs` config section (thread-safe)."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    config = load_config()
+                    queue = JobQueue(Path(config.jobs.directory))
+                    queue.configure(config.jobs.cpu_core_budget, config.jobs.gpu_slots, Path(config.lerobot_trossen_path))
+                    cls._instance = queue
+        return cls._instance
+
+    def configure(self, cpu_core_budget: int, gpu_slots: int, lerobot_path: Path) -> None:
+        """Apply changed limits; they take effect for jobs not yet started."""
+        with self._state_lock:
+            self.cpu_core_budget = cpu_core_budget
+            self.gpu_slots = gpu_slots
+            self.lerobot_path = Path(lerobot_path)
+        self._wake.set()
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / "jobs.json"
+
+    def log_path(self, job_id: str) -> Path:
+        return self.directory / "logs" / f"{job_id}.log"
+
+    # Persistence
+
+    def _load(self) -> None:
+        """Read the saved queue; jobs that were running when the backend stopped are failed."""
+        try:
+            data = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read job queue {self.state_path}: {e}")
+            return
+        for item in data.get("jobs", []):
+            try:
+                job = Job.from_dict(item)
+            except TypeError as e:
+                logger.warning(f"Skipping invalid saved job: {e}")
+                continue
+            if job.state not in FINISHED_STATES and job.state != "queued":
+                job.state = "failed"
+                job.error = "Interrupted by backend restart"
+                job.finished_at = job.finished_at or time.time()
+                job.pid = None
+            self._jobs[job.id] = job
+
+    def _save(self) -> None:
+        """Write the queue atomically (caller holds the state lock)."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps({"jobs": [job.to_dict() for job in self._jobs.values()]}, indent=2))
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save job queue {self.state_path}: {e}")
+
+    # Queue operations
+
+    def submit(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        priority: int = 0,
+        resource_class: str | None = None,
+        cores: int = 1,
+        sweep_id: str | None = None,
+    ) -> Job:
+        """Queue a job.
+
+        Raises:
+            ValueError: unknown kind or resource class, or cores outside 1..cpu_core_budget
+        """
+        return self._submit_many(kind, [params], priority, resource_class, cores, sweep_id)[0]
+
+    def submit_sweep(
+        self,
+        base: dict[str, Any],
+        grid: dict[str, list[Any]],
+        priority: int = 0,
+        resource_class: str | None = None,
+        cores: int = 1,
+    ) -> list[Job]:
+        """Queue one train job per combination of `grid` values (see expand_sweep)."""
+        runs = expand_sweep(base, grid)
+        return self._submit_many("train", runs, priority, resource_class, cores, uuid.uuid4().hex[:12])
+
+    def _submit_many(
+        self,
+        kind: str,
+        runs: list[dict[str, Any]],
+        priority: int,
+        resource_class: str | None,
+        cores: int,
+        sweep_id: str | None,
+    ) -> list[Job]:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        if resource_class is not None and resource_class not in RESOURCE_CLASSES:
+            raise ValueError(f"Unknown resource class '{resource_class}'")
+        if cores < 1 or cores > self.cpu_core_budget:
+            raise ValueError(f"cores must be between 1 and the core budget ({self.cpu_core_budget})")
+        jobs = [
+            Job(
+                id=uuid.uuid4().hex[:12],
+                kind=kind,
+                params=dict(params),
+                resource_class=resource_class or default_resource_class(kind, params),
+                cores=cores,
+                priority=priority,
+                sweep_id=sweep_id,
+            )
+            for params in runs
+        ]
+        with self._state_lock:
+            for job in jobs:
+                self._jobs[job.id] = job
+            self._save()
+        logger.info(f"Queued {len(jobs)} {kind} job(s)")
+        self._wake.set()
+        return jobs
+
+    def get(self, job_id: str) -> Job:
+        """Raises KeyError for an unknown id."""
+        with self._state_lock:
+            return self._jobs[job_id]
+
+    def jobs(self) -> list[Job]:
+        """All jobs, in submission order."""
+        with self._state_lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at)
+
+    def running_robot_job(self) -> Job | None:
+        """The robot job currently running or starting, if any (interactive robot starts must wait for it)."""
+        with self._state_lock:
+            for job in self._active_jobs():
+                if job.resource_class == "robot":
+                    return job
+        return None
+
+    def claim(self, resource_class: str) -> Job | None:
+        """Reserve the robot or a GPU slot for an interactive start; pair with release().
+
+        The robot is free while no robot job runs; a GPU slot while the GPU
+        jobs leave one of `gpu_slots` unused.
+
+        Args:
+            resource_class: "robot" or "gpu"
+
+        Returns:
+            A job holding the resource (nothing is reserved then), or None once reserved
+        """
+        with self._state_lock:
+            if resource_class == "robot":
+                job = self.running_robot_job()
+            else:
+                gpu_jobs = [j for j in self._active_jobs() if j.resource_class == "gpu"]
+                job = gpu_jobs[0] if gpu_jobs and len(gpu_jobs) >= self.gpu_slots else None
+            if job is None:
+                self._claims[resource_class] += 1
+            return job
+
+    def release(self, resource_class: str) -> None:
+        """End a claim() reservation, once the interactive process is registered (or failed to start)."""
+        with self._state_lock:
+            self._claims[resource_class] = max(0, self._claims[resource_class] - 1)
+        self._wake.set()
+
+    def _active_jobs(self) -> list[Job]:
+        """Running jobs, including those being spawned (caller holds the state lock)."""
+        return [self._jobs[job_id] for job_id in self._runs] + list(self._launching.values())
+
+    def cancel(self, job_id: str) -> Job:
+        """Cancel a queued job, or stop a running one (SIGINT, SIGKILL after STOP_GRACE_S).
+
+        Raises:
+            KeyError: unknown id
+        """
+        with self._state_lock:
+            job = self._jobs[job_id]
+            if job.state == "queued":
+                job.state = "cancelled"
+                job.finished_at = time.time()
+                self._save()
+            elif job.state == "running":
+                job.state = "cancelling"
+                self._save()
+                run = self._runs.get(job_id)
+                # A job still being spawned is stopped by _launch once its process exists
+                if run is not None:
+                    run.ring.append("[Studio] Cancelling job...")
+                    self._stop_run(job_id, run.process)
+        self._wake.set()
+        return job
+
+    def remove(self, job_id: str) -> None:
+        """Delete a finished job and its log.
+
+        Raises:
+            KeyError: unknown id
+            ValueError: the job has not finished
+        """
+        with self._state_lock:
+            job = self._jobs[job_id]
+            if job.state not in FINISHED_STATES:
+                raise ValueError(f"Job {job_id} is {job.state}; cancel it first")
+            del self._jobs[job_id]
+            self._save()
+        self.log_path(job_id).unlink(missing_ok=True)
+
+    def read_logs(self, job_id: str, since: int | None = None, limit: int = JOB_LOG_TAIL) -> dict[str, Any]:
+        """Output of a job: live from its ring while it runs, else the tail of its log file.
+
+        Raises:
+            KeyError: unknown id
+        """
+        with self._state_lock:
+            job = self._jobs[job_id]
+            run = self._runs.get(job_id)
+        if run is not None:
+            batch = run.ring.read(since, limit)
+            return {
+                "state": job.state,
+                "live": True,
+                "lines": batch.lines,
+                "log_seq": batch.last_seq,
+                "log_start_seq": batch.run_start_seq,
+                "progress": batch.progress,
+            }
+        try:
+            with open(self.log_path(job_id), encoding="utf-8", errors="replace") as f:
+                lines = [line.rstrip("\n") for line in deque(f, maxlen=limit)]
+        except FileNotFoundError:
+            lines = []
+        return {"state": job.state, "live": False, "lines": lines, "log_seq": None, "log_start_seq": None, "progress": None}
+
+    # Scheduling
+
+    def start(self) -> None:
+        """Start the scheduler thread (idempotent)."""
+        with self._state_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="job-scheduler")
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        """Stop the scheduler and the running jobs (backend shutdown)."""
+        self._stop.set()
+        self._wake.set()
+        with self._state_lock:
+            runs = list(self._runs.items())
+            for job_id, run in runs:
+                job = self._jobs[job_id]
+                job.state = "failed"
+                job.error = "Interrupted by backend shutdown"
+                job.finished_at = time.time()
+                self._signal(run.process)
+            self._save()
+        deadline = time.monotonic() + STOP_GRACE_S
+        for _, run in runs:
+            try:
+                run.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                run.process.kill()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.schedule()
+            except Exception as e:
+                logger.exception(f"Job scheduler error: {e}")
+            self._wake.wait(SCHEDULE_INTERVAL_S)
+            self._wake.clear()
+
+    def schedule(self) -> list[Job]:
+        """Start every queued job that fits now (one scheduler pass).
+
+        Jobs are picked and marked running under the state lock; their
+        processes are spawned after it is released, so API reads are not held
+        up by command resolution and fork/exec.
+
+        Returns:
+            The jobs started
+        """
+        picked = []
+        with self._state_lock:
+            interactive = self._interactive_modes()
+            blocked: set[str] = set()
+            queued = sorted(
+                (j for j in self._jobs.values() if j.state == "queued"),
+                key=lambda j: (-j.priority, j.created_at),
+            )
+            for job in queued:
+                if job.resource_class in blocked:
+                    continue
+                if not self._fits(job, interactive):
+                    # Keep the resources for this job rather than letting smaller, lower-priority ones starve it
+                    blocked.add(job.resource_class)
+                    continue
+                job.state = "running"
+                job.started_at = time.time()
+                self._launching[job.id] = job
+                picked.append(job)
+            if picked:
+                self._save()
+        return [job for job in picked if self._launch(job)]
+
+    def _fits(self, job: Job, interactive: list[ProcessMode]) -> bool:
+        """Whether `job` can start next to the running jobs (caller holds the state lock)."""
+        running = self._active_jobs()
+        if job.resource_class == "robot":
+            return (
+                self._claims["robot"] == 0
+                and not any(mode in _ROBOT_MODES for mode in interactive)
+                and not any(j.resource_class == "robot" for j in running)
+            )
+        if job.resource_class == "gpu":
+            in_use = sum(j.resource_class == "gpu" for j in running) + self._claims["gpu"]
+            in_use += sum(mode in _GPU_MODES for mode in interactive)
+            return in_use < self.gpu_slots
+        cores = sum(j.cores for j in running if j.resource_class == "cpu")
+        return cores + job.cores <= self.cpu_core_budget
+
+    def _launch(self, job: Job) -> bool:
+        """Spawn a picked job's process and its output reader (without the state lock).
+
+        Returns:
+            True if the process was started
+        """
+        lerobot_path = self.lerobot_path
+        launch = LaunchCache.get_instance().resolve(build_command(job), lerobot_path)
+        env = {**lerobot_env(), **launch.env}
+        if job.resource_class == "cpu":
+            # Keep torch/BLAS thread pools within the job's share of the core budget
+            env["OMP_NUM_THREADS"] = env["MKL_NUM_THREADS"] = str(job.cores)
+        log_path = self.log_path(job.id)
+        try:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            log_file = open(log_path, "a", encoding="utf-8", buffering=1)
+        except OSError as e:
+            self._launch_failed(job, f"Could not open log file: {e}")
+            return False
+        try:
+            process = subprocess.Popen(
+                launch.cmd,
+                cwd=str(lerobot_path),
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+            )
+        except Exception as e:
+            log_file.write(f"Error: {e}\n")
+            log_file.close()
+            self._launch_failed(job, str(e))
+            return False
+        run = _Run(process, LogRing(JOB_LOG_CAPACITY), ErrorRuleEngine(DEFAULT_RULES))
+        with self._state_lock:
+            self._launching.pop(job.id, None)
+            self._runs[job.id] = run
+            job.pid = process.pid
+            if self._stop.is_set() and job.state == "running":
+                # Backend shut down while this job was being spawned
+                job.state = "failed"
+                job.error = "Interrupted by backend shutdown"
+            if job.state != "running":
+                self._stop_run(job.id, process)
+            self._save()
+        logger.info(f"Started {job.kind} job {job.id} (pid {process.pid}, {job.resource_class})")
+        threading.Thread(
+            target=self._watch, args=(job, run, log_file), daemon=True, name=f"job-{job.id}"
+        ).start()
+        return True
+
+    def _launch_failed(self, job: Job, error: str) -> None:
+        with self._state_lock:
+            self._launching.pop(job.id, None)
+            self._finish(job, "cancelled" if job.state == "cancelling" else None, error)
+            self._save()
+        self._wake.set()
+
+    def _stop_run(self, job_id: str, process: subprocess.Popen) -> None:
+        """SIGINT a job's process, with SIGKILL after STOP_GRACE_S in the background."""
+        self._signal(process)
+        threading.Thread(
+            target=self._kill_after_grace, args=(process,), daemon=True, name=f"job-cancel-{job_id}"
+        ).start()
+
+    def _watch(self, job: Job, run: _Run, log_file) -> None:
+        """Read a job's output into its ring and log file, then record how it ended."""
+
+        def on_line(line: str) -> None:
+            seq = run.ring.append(line)
+            run.errors.observe(line, seq)
+            log_file.write(line + "\n")
+
+        try:
+            if run.process.stdout:
+                pump(run.process.stdout.fileno(), LineAssembler(on_line, run.ring.set_progress))
+        except Exception as e:
+            logger.warning(f"Job {job.id} output reader failed: {e}")
+        exit_code = run.process.wait()
+        log_file.close()
+        with self._state_lock:
+            self._runs.pop(job.id, None)
+            job.exit_code = exit_code
+            if job.state == "cancelling":
+                self._finish(job, "cancelled")
+            elif job.state == "running":
+                if exit_code == 0:
+                    self._finish(job, "succeeded")
+                else:
+                    self._finish(job, None, run.errors.diagnosis() or f"Exited with code {exit_code}")
+            self._save()
+        self._wake.set()
+
+    def _finish(self, job: Job, state: str | None, error: str | None = None) -> None:
+        """Mark a job finished; state None means failed with `error` (caller holds the state lock)."""
+        job.state = state or "failed"
+        job.error = error
+        job.finished_at = time.time()
+        job.pid = None
+        logger.info(f"Job {job.id} {job.state}" + (f": {error}" if error else ""))
+
+    @staticmethod
+    def _signal(process: subprocess.Popen) -> None:
+        """SIGINT, so lerobot stops the way Ctrl+C would (saving state, parking the robot)."""
+        try:
+            process.send_signal(signal.SIGINT)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _kill_after_grace(process: subprocess.Popen) -> None:
+        try:
+            process.wait(timeout=STOP_GRACE_S)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            try:
+                process.wait(timeout=KILL_WAIT_S)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Job process {process.pid} did not exit after SIGKILL")
@@ -0,0 +1,206 @@
+"""Direct launch of lerobot console scripts, skipping `uv run` while the lockfile is unchanged.
+
+`uv run lerobot-teleoperate ...` checks lerobot_trossen's lockfile and syncs
+its virtualenv on every call before it execs the console script, which
+delays every start. Once a `uv run` start has shown the environment works
+(its process printed something other than uv's own sync output), the venv
+is remembered under a hash of uv.lock and pyproject.toml. Later starts
+with the same hash exec `<venv>/bin/<script>` directly, with the
+environment `uv run` would have set up. When the lock changes, the next
+start goes through `uv run` again and refreshes the entry. The entry is
+dropped only when the direct exec itself fails: the script cannot be
+executed, or it dies on an ImportError. lerobot's own failures (robot not
+reachable, unknown dataset) keep it, as `uv run` would not fix them.
+
+The cache also keeps how long each script took to print its first line
+via `uv run`, so a direct start can report the time it saved.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path.home() / ".tensi_trossen_studio" / "lerobot_launch.json"
+LOCK_FILES = ("uv.lock", "pyproject.toml")
+# Line prefixes of uv's own output while it syncs, before lerobot runs
+_UV_OUTPUT_PREFIXES = (
+    "Using CPython",
+    "Creating virtual environment",
+    "Resolved ",
+    "Prepared ",
+    "Installed ",
+    "Uninstalled ",
+    "Audited ",
+    "Building ",
+    "Built ",
+    "Downloading ",
+    "Downloaded ",
+    "Bytecode compiled",
+    " + ",
+    " - ",
+    " ~ ",
+    "warning:",
+    "error:",
+)
+# Last line of a traceback when the environment cannot import the entry point's modules
+_IMPORT_FAILURE_PREFIXES = ("ImportError:", "ModuleNotFoundError:")
+
+
+def is_uv_output(line: str) -> bool:
+    """True for lines printed by uv itself (sync progress), not by the lerobot process."""
+    return not line.strip() or line.startswith(_UV_OUTPUT_PREFIXES)
+
+
+def is_import_failure(line: str) -> bool:
+    """True for the exception line of a failed import (a broken or half-synced venv)."""
+    return line.startswith(_IMPORT_FAILURE_PREFIXES)
+
+
+@dataclass
+class Launch:
+    """How one command will be started."""
+
+    cmd: list[str]
+    direct: bool = False
+    script: str | None = None
+    project: str | None = None
+    lock_hash: str | None = None
+    venv: str | None = None
+    # Time to first lerobot output of this script through `uv run`, from an earlier start
+    uv_boot_ms: float | None = None
+    env: dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mode": "direct" if self.direct else "uv run",
+            "script": self.script,
+            "lock_hash": self.lock_hash[:12] if self.lock_hash else None,
+            "uv_boot_ms": self.uv_boot_ms,
+        }
+
+
+class LaunchCache:
+    """Resolved lerobot virtualenvs by project path and lockfile hash, persisted to disk."""
+
+    _instance: "LaunchCache | None" = None
+    _lock = threading.Lock()
+
+    def __init__(self, path: Path = CACHE_PATH):
+        """Load the cache file at `path` (use get_instance() outside tests)."""
+        self.path = Path(path)
+        self._state_lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._hash_memo: dict[str, tuple[tuple, str]] = {}
+        try:
+            self._entries = json.loads(self.path.read_text()).get("projects", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable launch cache {self.path}: {e}")
+
+    @classmethod
+    def get_instance(cls) -> "LaunchCache":
+        """Get the singleton LaunchCache (thread-safe)."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = LaunchCache()
+        return cls._instance
+
+    @staticmethod
+    def venv_dir(project: Path) -> Path:
+        """Virtualenv `uv run` uses for `project` (UV_PROJECT_ENVIRONMENT or .venv)."""
+        configured = os.environ.get("UV_PROJECT_ENVIRONMENT")
+        return project / configured if configured else project / ".venv"
+
+    def lock_hash(self, project: Path) -> str | None:
+        """Hash of the project's lock files; None when there is no uv.lock (nothing to key on)."""
+        if not (project / LOCK_FILES[0]).exists():
+            return None
+        stats = []
+        for name in LOCK_FILES:
+            try:
+                st = (project / name).stat()
+                stats.append((name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                stats.append((name, None, None))
+        key = str(project)
+        memo = self._hash_memo.get(key)
+        if memo is not None and memo[0] == tuple(stats):
+            return memo[1]
+        digest = hashlib.sha256()
+        for name in LOCK_FILES:
+            try:
+                digest.update((project / name).read_bytes())
+            except OSError:
+                pass
+            digest.update(b"\0")
+        value = digest.hexdigest()
+        self._hash_memo[key] = (tuple(stats), value)
+        return value
+
+    def resolve(self, cmd: list[str], project: Path) -> Launch:
+        """The command to exec for `cmd`: the console script directly if the cache is valid, else `cmd`."""
+        if len(cmd) < 3 or cmd[:2] != ["uv", "run"]:
+            return Launch(cmd)
+        script = cmd[2]
+        project = Path(project)
+        lock_hash = self.lock_hash(project)
+        with self._state_lock:
+            entry = dict(self._entries.get(str(project), {}))
+        launch = Launch(cmd, script=script, project=str(project), lock_hash=lock_hash)
+        if lock_hash is None or entry.get("lock_hash") != lock_hash:
+            return launch
+        launch.uv_boot_ms = entry.get("uv_boot_ms", {}).get(script)
+        venv = Path(entry["venv"])
+        executable = venv / "bin" / script
+        if not os.access(executable, os.X_OK):
+            return launch
+        launch.cmd = [str(executable), *cmd[3:]]
+        launch.direct = True
+        launch.venv = str(venv)
+        # What `uv run` sets up before exec'ing the script
+        launch.env = {
+            "VIRTUAL_ENV": str(venv),
+            "PATH": f"{venv / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}",
+        }
+        return launch
+
+    def record(self, launch: Launch, boot_ms: float | None) -> None:
+        """Remember the env after a `uv run` start got lerobot running (so the venv is synced)."""
+        if launch.direct or launch.lock_hash is None or launch.project is None:
+            return
+        venv = self.venv_dir(Path(launch.project))
+        if not os.access(venv / "bin" / launch.script, os.X_OK):
+            return
+        with self._state_lock:
+            entry = self._entries.get(launch.project)
+            if entry is None or entry.get("lock_hash") != launch.lock_hash:
+                entry = self._entries[launch.project] = {"lock_hash": launch.lock_hash, "uv_boot_ms": {}}
+            entry["venv"] = str(venv)
+            if boot_ms is not None:
+                entry["uv_boot_ms"][launch.script] = boot_ms
+            self._save()
+        logger.info(f"Cached lerobot environment {venv} for lock {launch.lock_hash[:12]}")
+
+    def invalidate(self, project: str) -> None:
+        """Forget a project's env (a direct start failed); the next start uses `uv run`."""
+        with self._state_lock:
+            if self._entries.pop(project, None) is not None:
+                logger.warning(f"Direct lerobot start failed; dropped cached environment of {project}")
+                self._save()
+
+    def _save(self) -> None:
+        """Write the cache (caller holds the state lock)."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"projects": self._entries}, indent=2))
+        except OSError as e:
+            logger.warning(f"Could not save launch cache {self.path}: {e}")
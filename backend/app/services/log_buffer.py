@@ -0,0 +1,161 @@
+"""Fixed-capacity ring buffer of process output lines with sequence numbers.
+
+Every appended line gets the next sequence number; the numbers keep
+increasing across runs (clear() only starts a new run), so a client that
+remembers the last number it saw can ask for just the lines after it. Once
+the buffer is full the oldest lines are overwritten, so memory stays
+constant however long the process runs. Progress-bar output is not stored
+as lines but kept in a single "current progress" slot.
+
+Live readers (SSE streams) register a LogSubscriber and are woken from the
+reader thread; they then read everything after their cursor in one batch,
+so a slow client gets fewer, larger batches instead of a growing queue.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+
+# Lines kept per process run
+DEFAULT_CAPACITY = 5000
+
+
+@dataclass
+class LogBatch:
+    """Lines after a cursor, as returned by LogRing.read()."""
+
+    lines: list[str] = field(default_factory=list)
+    last_seq: int = 0
+    run_start_seq: int = 1
+    # Lines after the cursor that were not returned (overwritten or over the limit)
+    skipped: int = 0
+    progress: str | None = None
+
+
+class LogSubscriber:
+    """Wakes one asyncio reader when lines are appended (called from the reader thread)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._pending = False
+
+    def notify(self) -> None:
+        """Schedule a wake-up; further lines before the reader runs add no extra work."""
+        if self._pending:
+            return
+        self._pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # Reader's event loop already closed; it is about to unsubscribe
+            pass
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for new lines; False on timeout."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        self._pending = False
+        return True
+
+
+class LogRing:
+    """Thread-safe ring of the most recent output lines."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Create an empty buffer holding at most `capacity` lines."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._lines: list[str] = [""] * capacity
+        self._count = 0
+        self._next_seq = 1
+        self.run_start_seq = 1
+        self.progress: str | None = None
+        self._lock = threading.Lock()
+        self._subscribers: set[LogSubscriber] = set()
+
+    def subscribe(self, subscriber: LogSubscriber) -> None:
+        with self._lock:
+            self._subscribers.add(subscriber)
+
+    def unsubscribe(self, subscriber: LogSubscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _notify(self) -> None:
+        for subscriber in list(self._subscribers):
+            subscriber.notify()
+
+    def append(self, line: str) -> int:
+        """Store a line, overwriting the oldest one when full.
+
+        Returns:
+            Sequence number of the line
+        """
+        with self._lock:
+            seq = self._next_seq
+            self._lines[seq % self.capacity] = line
+            self._next_seq = seq + 1
+            if self._count < self.capacity:
+                self._count += 1
+        self._notify()
+        return seq
+
+    def set_progress(self, text: str | None) -> None:
+        """Replace the current progress text (None when no progress bar is active)."""
+        with self._lock:
+            self.progress = text
+        self._notify()
+
+    def clear(self) -> None:
+        """Drop all lines and start a new run (sequence numbers keep increasing)."""
+        with self._lock:
+            self._count = 0
+            self.run_start_seq = self._next_seq
+            self.progress = None
+        self._notify()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest line (run_start_seq - 1 if the run has no output yet)."""
+        return self._next_seq - 1
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest line still held."""
+        with self._lock:
+            return self._next_seq - self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _slice(self, first: int, end: int) -> list[str]:
+        """Lines with first <= seq < end (caller holds the lock)."""
+        return [self._lines[seq % self.capacity] for seq in range(first, end)]
+
+    def read(self, since: int | None = None, limit: int | None = None) -> LogBatch:
+        """Lines of the current run newer than `since`, at most the newest `limit` of them.
+
+        A cursor that is missing or does not belong to the current run (from
+        an earlier run, or ahead of the buffer after a backend restart) reads
+        from the start of the run.
+        """
+        with self._lock:
+            start = self.run_start_seq
+            last = self._next_seq - 1
+            if since is None or since < start - 1 or since > last:
+                since = start - 1
+            first = max(since + 1, self._next_seq - self._count)
+            if limit is not None:
+                first = max(first, self._next_seq - limit)
+            return LogBatch(self._slice(first, self._next_seq), last, start, first - since - 1, self.progress)
+
+    def tail(self, n: int) -> list[str]:
+        """The newest `n` lines, oldest first."""
+        with self._lock:
+            count = min(n, self._count)
+            return self._slice(self._next_seq - count, self._next_seq)
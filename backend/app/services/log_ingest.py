@@ -0,0 +1,88 @@
+"""Byte-level ingestion of subprocess output.
+
+The process's stdout is read as raw bytes in large chunks and decoded
+incrementally (a multi-byte character split across reads is completed on
+the next one). Text is then split into lines; carriage-return rewrites, as
+printed by tqdm-style progress bars, update a single "current progress"
+value instead of becoming log lines. A bar's final state, terminated by a
+newline, is kept as one ordinary line.
+"""
+
+import codecs
+import os
+import select
+from typing import Callable
+
+# Bytes requested per read, and longest line kept before it is split
+READ_CHUNK_BYTES = 64 * 1024
+MAX_LINE_CHARS = 16 * 1024
+
+
+class LineAssembler:
+    """Turns decoded text chunks into log lines and progress updates."""
+
+    def __init__(self, on_line: Callable[[str], None], on_progress: Callable[[str | None], None]):
+        self._on_line = on_line
+        self._on_progress = on_progress
+        self._partial = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # Last progress text reported (None: no progress bar active)
+        self._progress: str | None = None
+
+    def feed_bytes(self, data: bytes) -> None:
+        """Decode a chunk of raw output and process it."""
+        self.feed(self._decoder.decode(data))
+
+    def feed(self, text: str) -> None:
+        """Process a chunk of decoded output."""
+        segments = (self._partial + text).split("\n")
+        self._partial = segments.pop()
+        for segment in segments:
+            self._line(segment)
+        if "\r" in self._partial:
+            # Progress bars redraw as "\r<bar>"; the newest non-blank state is the progress
+            pieces = self._partial.split("\r")
+            self._partial = "\r" + pieces[-1]
+            update = next((p.rstrip() for p in reversed(pieces) if p.strip()), None)
+            if update is not None and update != self._progress:
+                self._progress = update
+                self._on_progress(update)
+        if len(self._partial) > MAX_LINE_CHARS:
+            self._line(self._partial)
+            self._partial = ""
+
+    def _line(self, segment: str) -> None:
+        """A newline-terminated segment; after \\r rewrites only its final state is a line."""
+        if "\r" in segment:
+            segment = next((p for p in reversed(segment.split("\r")) if p.strip()), "")
+            if self._progress is not None:
+                self._progress = None
+                self._on_progress(None)
+        self._on_line(segment.rstrip())
+
+    def flush(self) -> None:
+        """Emit whatever is left at end of stream."""
+        self.feed(self._decoder.decode(b"", final=True))
+        if self._partial.strip("\r"):
+            self._line(self._partial)
+        elif self._progress is not None:
+            self._progress = None
+            self._on_progress(None)
+        self._partial = ""
+
+
+def pump(fd: int, assembler: LineAssembler, poll_s: float = 0.5) -> None:
+    """Read `fd` until EOF in large non-blocking chunks, feeding the assembler."""
+    os.set_blocking(fd, False)
+    while True:
+        ready, _, _ = select.select([fd], [], [], poll_s)
+        if not ready:
+            continue
+        try:
+            data = os.read(fd, READ_CHUNK_BYTES)
+        except BlockingIOError:
+            continue
+        if not data:
+            break
+        assembler.feed_bytes(data)
+    assembler.flush()
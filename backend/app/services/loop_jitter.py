@@ -0,0 +1,126 @@
+"""Control-loop timing of teleop/record runs, from the process output.
+
+lerobot-teleoperate prints the duration of every loop iteration
+("time: 16.71ms (60 Hz)"), and RemoteLeaderTeleop logs how long each
+get_action took ("remote action: 0.4ms") at debug level. LoopJitterMonitor
+collects those samples over a rolling window, reports p50/p95/p99 and
+counts iterations that overran the target period. When too many recent
+iterations overrun, it raises a warning: a late loop makes the follower
+jump to catch up, which is when it trips "velocity limit exceeded".
+"""
+
+import re
+import threading
+from collections import deque
+from typing import Any
+
+# Samples in the rolling window (10 s at 60 Hz)
+WINDOW_SAMPLES = 600
+# An iteration overruns when it takes longer than the period by this fraction
+OVERRUN_TOLERANCE = 0.1
+# Warn when this fraction of the window overran (and at least MIN_SAMPLES were seen);
+# the warning clears once the fraction is below half of it
+WARN_OVERRUN_FRACTION = 0.05
+MIN_SAMPLES = 60
+
+_LOOP_TIME = re.compile(r"(?<![a-z_])(?:time|dt):\s*([\d.]+)\s*ms")
+_ACTION_LATENCY = re.compile(r"remote action:\s*([\d.]+)\s*ms")
+
+
+def _percentiles(samples: list[float]) -> dict[str, float | None]:
+    """p50/p95/p99 (nearest rank) of `samples`."""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {f"p{q}": round(ordered[min(last, int(q / 100 * len(ordered)))], 2) for q in (50, 95, 99)}
+
+
+class LoopJitterMonitor:
+    """Rolling loop-period and action-latency statistics of one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset(None)
+
+    def reset(self, target_fps: float | None) -> None:
+        """Start a new run; `target_fps` None disables the monitor (e.g. training)."""
+        with self._lock:
+            self.target_fps = target_fps
+            self._loop_ms: deque[float] = deque(maxlen=WINDOW_SAMPLES)
+            self._overrun_flags: deque[bool] = deque(maxlen=WINDOW_SAMPLES)
+            self._latency_ms: deque[float] = deque(maxlen=WINDOW_SAMPLES)
+            self._recent_overruns = 0
+            self.samples = 0
+            self.overruns = 0
+            self.worst_ms = 0.0
+            self.warning: str | None = None
+
+    @property
+    def budget_ms(self) -> float | None:
+        return 1000.0 / self.target_fps if self.target_fps else None
+
+    def observe(self, line: str) -> tuple[bool, str | None]:
+        """Take a timing sample from an output line (reader thread).
+
+        Returns:
+            (True if the line was a loop-timing line, new warning text if one was just raised)
+        """
+        if self.target_fps is None or "ms" not in line:
+            return False, None
+        match = _LOOP_TIME.search(line)
+        if match is None:
+            match = _ACTION_LATENCY.search(line)
+            if match is not None:
+                with self._lock:
+                    self._latency_ms.append(float(match.group(1)))
+            return False, None
+        loop_ms = float(match.group(1))
+        budget = self.budget_ms
+        with self._lock:
+            overrun = loop_ms > budget * (1 + OVERRUN_TOLERANCE)
+            if len(self._overrun_flags) == WINDOW_SAMPLES:
+                self._recent_overruns -= self._overrun_flags[0]
+            self._loop_ms.append(loop_ms)
+            self._overrun_flags.append(overrun)
+            self._recent_overruns += overrun
+            self.samples += 1
+            self.overruns += overrun
+            self.worst_ms = max(self.worst_ms, loop_ms)
+            return True, self._update_warning(budget)
+
+    def _update_warning(self, budget: float) -> str | None:
+        """Raise or clear the warning (caller holds the lock); returns newly raised text."""
+        if len(self._loop_ms) < MIN_SAMPLES:
+            return None
+        fraction = self._recent_overruns / len(self._overrun_flags)
+        if fraction < WARN_OVERRUN_FRACTION:
+            if fraction < WARN_OVERRUN_FRACTION / 2:
+                self.warning = None
+            return None
+        raised = self.warning is None
+        self.warning = (
+            f"Control loop missing its {budget:.1f} ms budget ({self.target_fps:g} Hz): "
+            f"{fraction:.0%} of recent iterations overran. The follower may trip its velocity limit."
+        )
+        return self.warning if raised else None
+
+    def to_dict(self) -> dict[str, Any] | None:
+        """Live statistics, or None when the monitor is disabled."""
+        if self.target_fps is None:
+            return None
+        with self._lock:
+            loop = list(self._loop_ms)
+            latency = list(self._latency_ms)
+            recent_overruns = self._recent_overruns
+            return {
+                "target_fps": self.target_fps,
+                "budget_ms": round(self.budget_ms, 2),
+                "samples": self.samples,
+                "overruns": self.overruns,
+                "recent_overrun_fraction": round(recent_overruns / len(loop), 3) if loop else 0.0,
+                "worst_ms": round(self.worst_ms, 2),
+                "loop_ms": _percentiles(loop),
+                "action_latency_ms": _percentiles(latency),
+                "warning": self.warning,
+            }
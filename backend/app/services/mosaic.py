@@ -0,0 +1,140 @@
+"""Multi-camera grid mosaic, composited and encoded once for all overview viewers.
+
+Each camera's capture thread downscales its frame into a per-camera tile
+buffer and slice-assigns it into a preallocated canvas, at most at the
+mosaic rate. An encoder thread snapshots the canvas at that rate and
+publishes one JPEG into a frame pool shared by every mosaic viewer.
+"""
+
+import logging
+import math
+import time
+from threading import Event, Lock, Thread
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from app.services.frame_buffer import FrameBufferPool
+
+logger = logging.getLogger(__name__)
+
+JPEG_QUALITY = 80
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_SCALE = 0.45
+
+FrameSink = Callable[[np.ndarray, float], None]
+
+
+class MosaicCompositor:
+    """Grid of camera tiles for a fixed camera set, tile size and rate."""
+
+    def __init__(self, keys: list[str], tile_size: tuple[int, int], fps: float):
+        """Preallocate the canvas.
+
+        Args:
+            keys: Cameras in grid order (row-major)
+            tile_size: (width, height) of one tile
+            fps: Compositing and encode rate
+        """
+        self.keys = list(keys)
+        self.tile_size = tile_size
+        self.fps = max(0.5, float(fps))
+        self.columns = max(1, math.ceil(math.sqrt(len(self.keys))))
+        self.rows = max(1, math.ceil(len(self.keys) / self.columns))
+        tile_w, tile_h = tile_size
+        shape = (self.rows * tile_h, self.columns * tile_w, 3)
+        self.canvas = np.zeros(shape, dtype=np.uint8)
+        # Encoder's copy of the canvas, so tiles never wait for an encode
+        self._snapshot = np.empty_like(self.canvas)
+        self._canvas_lock = Lock()
+        self._tiles: dict[str, np.ndarray] = {}
+        self._last_tile_at: dict[str, float] = {}
+        self._sinks: dict[str, FrameSink] = {}
+        self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+
+        self.frames = FrameBufferPool()
+        self.viewers = 0
+        self._thread: Thread | None = None
+        self._stop = Event()
+        self.encode_ms = 0.0
+
+        for i, key in enumerate(self.keys):
+            x, y = self._origin(i)
+            cv2.putText(self.canvas, key, (x + 6, y + 16), LABEL_FONT, LABEL_SCALE, (160, 160, 160), 1, cv2.LINE_AA)
+
+    def _origin(self, index: int) -> tuple[int, int]:
+        """Top-left canvas pixel of a tile."""
+        tile_w, tile_h = self.tile_size
+        return (index % self.columns) * tile_w, (index // self.columns) * tile_h
+
+    def matches(self, keys: list[str], tile_size: tuple[int, int], fps: float) -> bool:
+        """True if this compositor was built for the same layout and rate."""
+        return self.keys == list(keys) and self.tile_size == tile_size and self.fps == max(0.5, float(fps))
+
+    def _make_sink(self, index: int, key: str) -> FrameSink:
+        """Frame sink that fits a camera's frame into its tile (aspect kept, centered)."""
+        tile_w, tile_h = self.tile_size
+        x0, y0 = self._origin(index)
+        interval = 1.0 / self.fps
+
+        def sink(img: np.ndarray, captured_at: float) -> None:
+            now = time.monotonic()
+            if now - self._last_tile_at.get(key, float("-inf")) < interval:
+                return
+            self._last_tile_at[key] = now
+            h, w = img.shape[:2]
+            scale = min(tile_w / w, tile_h / h)
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            tile = self._tiles.get(key)
+            if tile is None or tile.shape[1::-1] != size:
+                tile = self._tiles[key] = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            cv2.resize(img, size, dst=tile, interpolation=cv2.INTER_AREA)
+            cv2.putText(tile, key, (6, 16), LABEL_FONT, LABEL_SCALE, (255, 255, 255), 1, cv2.LINE_AA)
+            x = x0 + (tile_w - size[0]) // 2
+            y = y0 + (tile_h - size[1]) // 2
+            with self._canvas_lock:
+                self.canvas[y:y + size[1], x:x + size[0]] = tile
+
+        return sink
+
+    def start(self, add_sink: Callable[[str, FrameSink], None]) -> None:
+        """Register tile sinks on every camera and start the encoder thread."""
+        for i, key in enumerate(self.keys):
+            self._sinks[key] = self._make_sink(i, key)
+            add_sink(key, self._sinks[key])
+        self._stop.clear()
+        self._thread = Thread(target=self._encode_loop, daemon=True, name="Camera-mosaic")
+        self._thread.start()
+        logger.info(f"Mosaic started: {self.columns}x{self.rows} tiles of {self.tile_size} at {self.fps} fps")
+
+    def stop(self, remove_sink: Callable[[str, FrameSink], None]) -> None:
+        """Unregister tile sinks and stop the encoder thread."""
+        for key, sink in self._sinks.items():
+            remove_sink(key, sink)
+        self._sinks.clear()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        logger.info("Mosaic stopped")
+
+    def _encode_loop(self) -> None:
+        """Copy the canvas and encode it once per mosaic frame."""
+        interval = 1.0 / self.fps
+        next_at = time.monotonic()
+        while not self._stop.is_set():
+            with self._canvas_lock:
+                np.copyto(self._snapshot, self.canvas)
+            start = time.perf_counter()
+            jpeg = cv2.imencode(".jpg", self._snapshot, self._encode_params)[1]
+            self.encode_ms = (time.perf_counter() - start) * 1000
+            self.frames.publish(jpeg, time.time(), self.encode_ms)
+            del jpeg
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay < 0:
+                # Fell behind (slow encode): skip ahead rather than burst
+                next_at = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
@@ -1,16 +1,40 @@
 """Process manager for spawning and controlling LeRobot CLI subprocesses."""
 
 import json
+import logging
 import os
 import subprocess
 import threading
 import time
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
+
+from app.config import DEFAULT_STATION
+from app.services.error_rules import DEFAULT_RULES, ErrorRule, ErrorRuleEngine, merge_rules
+from app.services.frame_quality import RecordedFrameTap, lerobot_dataset_root
+from app.services.launch_cache import Launch, LaunchCache, is_import_failure, is_uv_output
+from app.services.log_buffer import LogRing
+from app.services.log_ingest import LineAssembler, pump
+from app.services.loop_jitter import LoopJitterMonitor
+from app.services.process_metrics import DEFAULT_MAX_POINTS, ProcessMetrics
+from app.services.resource_monitor import ResourceMonitor
+from app.services.startup_trace import StartupTrace
+
+logger = logging.getLogger(__name__)
 
 LEROBOT_TROSSEN_PATH = Path.home() / "lerobot_trossen"
+# Output lines kept per run, and how many a status without a cursor returns
+LOG_CAPACITY = 5000
+STATUS_LOG_LINES = 500
+# Control-loop rate of the runs Studio starts (lerobot's defaults; no --fps is passed)
+CONTROL_LOOP_FPS = {"teleoperate": 60.0, "record": 30.0}
+# Time lerobot gets after SIGINT to return the robots to rest before SIGKILL,
+# and how long to wait for the process to die after SIGKILL
+STOP_GRACE_S = 15.0
+KILL_WAIT_S = 5.0
 DEBUG_LOG_PATH = Path(__file__).resolve().parents[3] / ".cursor" / "debug.log"
 _FALLBACK_LOG_PATH = Path.home() / ".tensi_trossen_studio" / "debug.log"
 
@@ -48,12 +72,76 @@ class ProcessStatus:
     pid: int | None = None
     logs: list[str] = field(default_factory=list)
     error: str | None = None
+    startup: dict[str, Any] | None = None
+    log_seq: int = 0
+    log_start_seq: int = 1
+    progress: str | None = None
+    diagnostics: list[dict[str, Any]] = field(default_factory=list)
+    control_loop: dict[str, Any] | None = None
+    stopping: bool = False
+    stop: dict[str, Any] | None = None
+    resources: dict[str, Any] | None = None
+
+
+def lerobot_env() -> dict[str, str]:
+    """Environment for lerobot commands: Studio's own venv settings removed so `uv run` uses lerobot's."""
+    env = dict(os.environ)
+    env.pop("VIRTUAL_ENV", None)
+    env.pop("PYTHONPATH", None)
+    return env
+
+
+def train_command(train_config: dict) -> list[str]:
+    """lerobot-train command line for a TrainConfig dict (`device` defaults to cuda)."""
+    return [
+        "uv",
+        "run",
+        "lerobot-train",
+        f"--dataset.repo_id={train_config.get('dataset_repo_id', 'tensi/test_dataset')}",
+        f"--policy.type={train_config.get('policy_type', 'act')}",
+        f"--output_dir={train_config.get('output_dir', 'outputs/train/act_trossen')}",
+        f"--job_name={train_config.get('job_name', 'act_trossen')}",
+        f"--policy.device={train_config.get('device', 'cuda')}",
+        "--wandb.enable=false",
+        f"--policy.repo_id={train_config.get('policy_repo_id', 'tensi/my_policy')}",
+    ]
+
+
+def replay_command(robot_config: dict, replay_config: dict) -> list[str]:
+    """lerobot-replay command line for one dataset episode."""
+    return [
+        "uv",
+        "run",
+        "lerobot-replay",
+        "--robot.type=widowxai_follower_robot",
+        f"--robot.ip_address={robot_config.get('follower_ip', '192.168.1.5')}",
+        "--robot.id=follower",
+        f"--dataset.repo_id={replay_config.get('repo_id', 'tensi/test_dataset')}",
+        f"--dataset.episode={replay_config.get('episode', 0)}",
+    ]
+
+
+@dataclass
+class _StartRequest:
+    """One process start, possibly waiting for the previous process to stop."""
+
+    cmd: list[str]
+    mode: ProcessMode
+    trace: StartupTrace | None = None
+    frame_tap: RecordedFrameTap | None = None
+    # Runs right before the spawn, outside the state lock (camera handover); for a
+    # start queued behind a stop, only once the old process has exited
+    prepare: Callable[[], None] | None = None
+    # "wait_for_stop" span of the trace while queued
+    waiting: dict[str, Any] | None = None
 
 
 class ProcessManager:
     """Singleton process manager."""
 
     _instance: "ProcessManager | None" = None
+    # Process slots of the non-default stations, by station id
+    _stations: dict[str, "ProcessManager"] = {}
     _lock = threading.Lock()
 
     def __new__(cls) -> "ProcessManager":
@@ -63,13 +151,53 @@ class ProcessManager:
                     cls._instance = super().__new__(cls)
         return cls._instance
 
+    @classmethod
+    def for_station(cls, station_id: str) -> "ProcessManager":
+        """Process slot of a station; ProcessManager() is the default station's.
+
+        Each station runs its own lerobot process, independent of the others.
+        """
+        if station_id == DEFAULT_STATION:
+            return cls()
+        with cls._lock:
+            manager = cls._stations.get(station_id)
+            if manager is None:
+                manager = super().__new__(cls)
+                manager.__init__()
+                cls._stations[station_id] = manager
+        return manager
+
+    @classmethod
+    def all_stations(cls) -> list["ProcessManager"]:
+        """Process slots of every station, the default station's first."""
+        default = cls()
+        with cls._lock:
+            return [default, *cls._stations.values()]
+
     def __init__(self) -> None:
         if hasattr(self, "_initialized") and self._initialized:
             return
         self._process: subprocess.Popen | None = None
         self._status = ProcessStatus()
-        self._log_buffer: list[str] = []
+        self._log_buffer = LogRing(LOG_CAPACITY)
         self._reader_thread: threading.Thread | None = None
+        self._trace: StartupTrace | None = None
+        self._launch: Launch | None = None
+        self._frame_tap: RecordedFrameTap | None = None
+        self._spawned_at = 0.0
+        self._boot_ms: float | None = None
+        # Set when a direct start printed an import failure (its cached venv is broken)
+        self._import_failed = False
+        self._errors = ErrorRuleEngine()
+        self._metrics = ProcessMetrics()
+        self._jitter = LoopJitterMonitor()
+        self._resources = ResourceMonitor()
+        # Stop runs in the background; a start requested meanwhile waits in _pending_start
+        self._state_lock = threading.RLock()
+        self._stop_info: dict[str, Any] | None = None
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._pending_start: _StartRequest | None = None
         self._lerobot_path = LEROBOT_TROSSEN_PATH
         self._initialized = True
 
@@ -77,23 +205,77 @@ class ProcessManager:
         """Set path to lerobot_trossen repository."""
         self._lerobot_path = Path(path)
 
+    def set_error_rules(self, rules: list[ErrorRule]) -> None:
+        """Use the built-in error rules plus `rules` (same id replaces a built-in rule)."""
+        self._errors.set_rules(merge_rules(DEFAULT_RULES, rules))
+
+    def set_resource_interval(self, interval_s: float) -> None:
+        """Set how often the process tree's CPU/memory/I/O usage is sampled."""
+        self._resources.set_interval(interval_s)
+
+    def _on_line(self, line: str, callback: Callable[[str], None] | None = None) -> None:
+        """Store one output line (reader thread).
+
+        Per-iteration loop timing lines only feed the jitter monitor; at 60 Hz
+        they would otherwise push everything else out of the log.
+        """
+        trace = self._trace
+        if trace is not None and not trace.done:
+            trace.observe_line(line)
+        if self._boot_ms is None and not is_uv_output(line):
+            self._on_first_lerobot_line(trace)
+        if is_import_failure(line):
+            self._import_failed = True
+        is_timing, warning = self._jitter.observe(line)
+        if warning:
+            logger.warning(warning)
+            self._log_buffer.append(f"[Studio] {warning}")
+        if not is_timing:
+            seq = self._log_buffer.append(line)
+            self._errors.observe(line, seq)
+            self._metrics.observe(line)
+        if callback:
+            callback(line)
+
+    def _on_first_lerobot_line(self, trace: StartupTrace | None) -> None:
+        """Time the launcher to lerobot's first line; after a `uv run` start, cache the synced env."""
+        self._boot_ms = round((time.monotonic() - self._spawned_at) * 1000, 1)
+        launch = self._launch
+        if launch is None or launch.script is None:
+            return
+        if not launch.direct:
+            LaunchCache.get_instance().record(launch, self._boot_ms)
+        if trace is not None and trace.launcher is not None:
+            trace.launcher["boot_ms"] = self._boot_ms
+            if launch.direct and launch.uv_boot_ms is not None:
+                trace.launcher["saved_ms"] = round(launch.uv_boot_ms - self._boot_ms, 1)
+
     def _read_output(self, pipe, callback: Callable[[str], None] | None = None) -> None:
-        """Read from pipe and append to log buffer."""
+        """Read the binary pipe into the log buffer; progress-bar rewrites go to its progress slot."""
+        assembler = LineAssembler(lambda line: self._on_line(line, callback), self._log_buffer.set_progress)
         try:
-            for line in iter(pipe.readline, ""):
-                if line:
-                    self._log_buffer.append(line.rstrip())
-                    if callback:
-                        callback(line.rstrip())
+            pump(pipe.fileno(), assembler)
         except Exception:
             pass
 
-    def start_teleoperate(self, robot_config: dict, display_data: bool = True) -> None:
-        """Start lerobot-teleoperate subprocess."""
+    def start_teleoperate(
+        self,
+        robot_config: dict,
+        display_data: bool = True,
+        trace: StartupTrace | None = None,
+        prepare: Callable[[], None] | None = None,
+    ) -> None:
+        """Start lerobot-teleoperate subprocess.
+
+        Args:
+            robot_config: Arms and cameras
+            display_data: Pass --display_data to lerobot
+            trace: Records the start's stages and time to first action
+            prepare: Hands the cameras over; runs right before the spawn (after a running process has stopped)
+        """
         # #region agent log
         _debug_log("process_manager.py:start_teleoperate:entry", "entry", {"hit": True}, "H2")
         # #endregion
-        self.stop()
         cameras = robot_config.get("cameras", {})
         # #region agent log
         _debug_log("process_manager.py:start_teleoperate", "teleoperate params", {"cameras_keys": list(cameras.keys()), "cameras_json_len": len(json.dumps(cameras))}, "H2")
@@ -123,16 +305,17 @@ class ProcessManager:
             *teleop_args,
             f"--display_data={str(display_data).lower()}",
         ]
-        self._spawn(cmd, ProcessMode.TELEOPERATE)
+        self._start(_StartRequest(cmd, ProcessMode.TELEOPERATE, trace, prepare=prepare))
 
     def start_record(
         self,
         robot_config: dict,
         dataset_config: dict,
         display_data: bool = True,
+        trace: StartupTrace | None = None,
+        prepare: Callable[[], None] | None = None,
     ) -> None:
-        """Start lerobot-record subprocess."""
-        self.stop()
+        """Start lerobot-record subprocess (`trace` and `prepare` as for start_teleoperate)."""
         cameras = robot_config.get("cameras", {})
         is_remote = robot_config.get("remote_leader", False)
         if is_remote:
@@ -165,74 +348,103 @@ class ProcessManager:
             f"--dataset.single_task={dataset_config.get('single_task', 'Grab the cube')!r}",
             f"--dataset.push_to_hub={str(dataset_config.get('push_to_hub', False)).lower()}",
         ]
-        self._spawn(cmd, ProcessMode.RECORD)
+        tap = RecordedFrameTap(lerobot_dataset_root(dataset_config.get("repo_id", "tensi/test_dataset")), list(cameras))
+        self._start(_StartRequest(cmd, ProcessMode.RECORD, trace, tap, prepare))
 
     def start_train(
         self,
         train_config: dict,
     ) -> None:
         """Start lerobot-train subprocess."""
-        self.stop()
-        cmd = [
-            "uv",
-            "run",
-            "lerobot-train",
-            f"--dataset.repo_id={train_config.get('dataset_repo_id', 'tensi/test_dataset')}",
-            f"--policy.type={train_config.get('policy_type', 'act')}",
-            f"--output_dir={train_config.get('output_dir', 'outputs/train/act_trossen')}",
-            f"--job_name={train_config.get('job_name', 'act_trossen')}",
-            "--policy.device=cuda",
-            "--wandb.enable=false",
-            f"--policy.repo_id={train_config.get('policy_repo_id', 'tensi/my_policy')}",
-        ]
-        self._spawn(cmd, ProcessMode.TRAIN)
+        self._start(_StartRequest(train_command(train_config), ProcessMode.TRAIN))
 
     def start_replay(self, robot_config: dict, replay_config: dict) -> None:
         """Start lerobot-replay subprocess."""
-        self.stop()
-        cmd = [
-            "uv",
-            "run",
-            "lerobot-replay",
-            "--robot.type=widowxai_follower_robot",
-            f"--robot.ip_address={robot_config.get('follower_ip', '192.168.1.5')}",
-            "--robot.id=follower",
-            f"--dataset.repo_id={replay_config.get('repo_id', 'tensi/test_dataset')}",
-            f"--dataset.episode={replay_config.get('episode', 0)}",
-        ]
-        self._spawn(cmd, ProcessMode.REPLAY)
+        self._start(_StartRequest(replay_command(robot_config, replay_config), ProcessMode.REPLAY))
+
+    def _start(self, request: _StartRequest) -> None:
+        """Spawn now, or stop the running process and spawn once it has exited (without blocking)."""
+        with self._state_lock:
+            if self._queue_behind_stop(request):
+                return
+        if request.prepare is not None:
+            request.prepare()
+        with self._state_lock:
+            # Another start may have spawned while this one was preparing; prepare runs again later
+            if not self._queue_behind_stop(request):
+                self._spawn(request)
+
+    def _queue_behind_stop(self, request: _StartRequest) -> bool:
+        """Stop a running process and queue `request` behind it; False if the slot is free (caller holds the lock)."""
+        if self._process is not None and self._process.poll() is None:
+            self._begin_stop()
+        if self._stopped.is_set():
+            return False
+        if self._pending_start is not None:
+            self._log_buffer.append(f"[Studio] Replacing queued {self._pending_start.mode.value} start.")
+        if request.trace is not None and request.waiting is None:
+            request.waiting = request.trace.begin("wait_for_stop")
+        self._pending_start = request
+        self._log_buffer.append(f"[Studio] {request.mode.value} will start once the current process has stopped.")
+        return True
+
+    @property
+    def stopping(self) -> bool:
+        """True while a stop is in progress."""
+        return not self._stopped.is_set()
 
-    def _spawn(self, cmd: list[str], mode: ProcessMode) -> None:
-        """Spawn subprocess with cwd set to lerobot_trossen."""
-        self._log_buffer = []
+    def _spawn(self, request: _StartRequest) -> None:
+        """Spawn subprocess with cwd set to lerobot_trossen (caller holds the state lock)."""
+        cmd, mode, trace, frame_tap = request.cmd, request.mode, request.trace, request.frame_tap
+        self._log_buffer.clear()
+        self._errors.reset()
+        self._metrics.reset()
+        self._jitter.reset(CONTROL_LOOP_FPS.get(mode.value))
+        self._trace = trace
+        if self._frame_tap is not None:
+            self._frame_tap.stop()
+        self._frame_tap = frame_tap
         self._status = ProcessStatus(mode=mode, running=True, logs=[])
 
         cwd = str(self._lerobot_path)
+        launch = LaunchCache.get_instance().resolve(cmd, self._lerobot_path)
+        self._launch = launch
+        self._boot_ms = None
+        self._import_failed = False
+        if trace is not None:
+            trace.launcher = launch.to_dict()
+        if launch.direct:
+            logger.info(f"Starting {launch.script} from cached environment {launch.venv} (lock unchanged)")
         # #region agent log
         env_before = dict(os.environ)
         _debug_log("process_manager.py:_spawn", "pre-spawn env and cwd", {"VIRTUAL_ENV": env_before.get("VIRTUAL_ENV"), "PYTHONPATH": env_before.get("PYTHONPATH"), "LD_LIBRARY_PATH": env_before.get("LD_LIBRARY_PATH"), "cwd": cwd, "cmd": cmd, "lerobot_path_exists": Path(self._lerobot_path).exists()}, "H1,H3,H5")
         # #endregion
 
-        env = dict(os.environ)
-        env.pop("VIRTUAL_ENV", None)
-        env.pop("PYTHONPATH", None)
-
         try:
-            self._process = subprocess.Popen(
-                cmd,
-                cwd=cwd,
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-            )
+            with trace.span("spawn") if trace is not None else nullcontext():
+                self._spawned_at = time.monotonic()
+                self._process = subprocess.Popen(
+                    launch.cmd,
+                    cwd=cwd,
+                    env={**lerobot_env(), **launch.env},
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    bufsize=0,
+                )
             self._status.pid = self._process.pid
+            self._resources.track(self._process.pid)
+            if frame_tap is not None:
+                frame_tap.start()
+
+            process = self._process
 
             def read_loop() -> None:
-                if self._process and self._process.stdout:
-                    self._read_output(self._process.stdout)
-                    self._process.wait()
+                if process.stdout:
+                    self._read_output(process.stdout)
+                    process.wait()
+                    if frame_tap is not None:
+                        frame_tap.stop()
+                    self._check_direct_exit(process, launch)
 
             self._reader_thread = threading.Thread(target=read_loop, daemon=True)
             self._reader_thread.start()
@@ -240,57 +452,180 @@ class ProcessManager:
             self._status.running = False
             self._status.error = str(e)
             self._log_buffer.append(f"Error: {e}")
+            if launch.direct and isinstance(e, OSError):
+                # The cached script could not be exec'd (venv removed or moved)
+                LaunchCache.get_instance().invalidate(launch.project)
+
+    def _check_direct_exit(self, process: subprocess.Popen, launch: Launch) -> None:
+        """Drop the cached env if a direct start died on an ImportError (reader thread).
+
+        That is a broken or half-synced venv; the next start goes through
+        `uv run`, which repairs it. Other failures are lerobot's own and keep
+        the cache.
+        """
+        if not launch.direct or process.returncode in (0, None) or not self._stopped.is_set():
+            return
+        if self._process is process and self._import_failed:
+            LaunchCache.get_instance().invalidate(launch.project)
 
     def stop(self) -> None:
-        """Stop current process if running.
+        """Stop current process if running, without waiting for it to exit.
 
-        Sends SIGINT first so lerobot's KeyboardInterrupt handler runs the
-        graceful disconnect (follower returns to staged → sleep position).
-        Allows up to 15 seconds for the robot to complete its shutdown
-        sequence before force-killing.
+        Sends SIGINT so lerobot's KeyboardInterrupt handler runs the graceful
+        disconnect (follower returns to staged → sleep position). A background
+        thread gives the robot STOP_GRACE_S to finish its shutdown sequence
+        before force-killing; status reports `stopping` meanwhile. Cancels a
+        start that was queued behind an earlier stop.
         """
-        if self._process and self._process.poll() is None:
-            import signal
+        with self._state_lock:
+            if self._pending_start is not None:
+                self._log_buffer.append(f"[Studio] Cancelled queued {self._pending_start.mode.value} start.")
+                self._pending_start = None
+            if self._process is not None and self._process.poll() is None:
+                self._begin_stop()
+            elif self._stopped.is_set():
+                self._process = None
+                if self._status.running:
+                    self._status.running = False
+                    self._status.pid = None
+
+    def _begin_stop(self) -> None:
+        """Send SIGINT and hand the wait to a background thread (caller holds the state lock)."""
+        if not self._stopped.is_set():
+            return
+        import signal
 
-            self._log_buffer.append("[Studio] Stopping - returning robots to rest position...")
-            self._process.send_signal(signal.SIGINT)
+        process = self._process
+        self._stopped.clear()
+        self._stop_info = {"phase": "graceful", "started_at": time.time(), "grace_s": STOP_GRACE_S}
+        self._log_buffer.append("[Studio] Stopping - returning robots to rest position...")
+        try:
+            process.send_signal(signal.SIGINT)
+        except OSError:
+            pass
+        threading.Thread(target=self._finish_stop, args=(process,), daemon=True, name="process-stop").start()
+
+    def _finish_stop(self, process: subprocess.Popen) -> None:
+        """Wait for the process to exit, escalating to SIGKILL, then run a queued start.
+
+        The queued start's camera handover (`prepare`) only runs now, once the
+        old process has released the devices. It runs outside the state lock;
+        the start stays in _pending_start meanwhile, so stop() can still cancel
+        it and a newer start can still replace it.
+        """
+        try:
+            process.wait(timeout=STOP_GRACE_S)
+        except subprocess.TimeoutExpired:
+            self._stop_info["phase"] = "killing"
+            self._log_buffer.append("[Studio] Graceful stop timed out, force killing.")
+            process.kill()
             try:
-                self._process.wait(timeout=15)
+                process.wait(timeout=KILL_WAIT_S)
             except subprocess.TimeoutExpired:
-                self._log_buffer.append("[Studio] Graceful stop timed out, force killing.")
-                self._process.kill()
-            self._log_buffer.append("[Studio] Process stopped.")
-        self._process = None
-        if self._status.running:
-            self._status.running = False
-            self._status.pid = None
+                logger.warning(f"Process {process.pid} did not exit after SIGKILL")
+        self._log_buffer.append("[Studio] Process stopped.")
+        with self._state_lock:
+            if self._process is process:
+                self._process = None
+                self._status.running = False
+                self._status.pid = None
+            info = self._stop_info
+            info["phase"] = "stopped"
+            info["duration_s"] = round(time.time() - info["started_at"], 2)
+            pending = self._pending_start
+        while pending is not None:
+            if pending.waiting is not None:
+                pending.trace.end(pending.waiting)
+                pending.waiting = None
+            try:
+                if pending.prepare is not None:
+                    pending.prepare()
+            except Exception as e:
+                logger.warning(f"Queued {pending.mode.value} start failed to prepare: {e}")
+                with self._state_lock:
+                    if self._pending_start is pending:
+                        self._log_buffer.append(f"[Studio] Queued {pending.mode.value} start cancelled: {e}")
+                        self._pending_start = None
+                    pending = self._pending_start
+                continue
+            with self._state_lock:
+                if self._pending_start is not pending:
+                    # Cancelled or replaced while preparing
+                    pending = self._pending_start
+                    continue
+                self._pending_start = None
+                self._spawn(pending)
+                pending = None
+        self._stopped.set()
 
-    def _infer_error_from_log(self) -> str | None:
-        """If the process log indicates a known failure, return a short user-facing message."""
-        recent = "\n".join(self._log_buffer[-80:])
-        if "Timed out waiting for frame" in recent or "TimeoutError" in recent and "camera" in recent.lower():
-            return (
-                "Teleoperation stopped: camera timed out. "
-                "Try Settings -> Use top camera only to reduce USB load, or use different USB ports for each camera."
-            )
-        if "TimeoutError" in recent:
-            return "Process stopped due to a timeout. Check the log for details."
-        if "Joint limit exceeded" in recent or "velocity limit exceeded" in recent.lower():
-            return (
-                "Teleoperation stopped: joint/velocity limit exceeded on the follower arm. "
-                "Move leader and follower to a similar rest pose before starting, then Start Teleoperation again."
-            )
+    @property
+    def active_mode(self) -> ProcessMode | None:
+        """Mode of the process that holds the hardware (running, stopping or queued), None when idle."""
+        with self._state_lock:
+            if self._process is not None and (self._process.poll() is None or not self._stopped.is_set()):
+                return self._status.mode
+            if self._pending_start is not None:
+                return self._pending_start.mode
         return None
 
-    def get_status(self) -> ProcessStatus:
-        """Get current process status and latest logs."""
-        if self._process and self._process.poll() is not None:
+    def wait_stopped(self, timeout: float | None = None) -> bool:
+        """Block until no stop is in progress (shutdown paths and tests)."""
+        return self._stopped.wait(timeout)
+
+    @property
+    def logs(self) -> LogRing:
+        """Output lines of the current run (read live by the log stream)."""
+        return self._log_buffer
+
+    def get_metrics(self, max_points: int = DEFAULT_MAX_POINTS) -> dict[str, Any]:
+        """Train/record metrics parsed from the current run's output, downsampled to `max_points`."""
+        return {"mode": self._status.mode.value, **self._metrics.to_dict(max_points)}
+
+    def get_resources(self, max_points: int = DEFAULT_MAX_POINTS) -> dict[str, Any] | None:
+        """CPU/memory/I/O series of the current run's process tree and of the backend (None without procfs)."""
+        return self._resources.to_dict(max_points)
+
+    def get_status(self, since: int | None = None) -> ProcessStatus:
+        """Get current process status and latest logs.
+
+        Args:
+            since: Last log sequence number the caller has; only newer lines of
+                the current run are returned (None: the last STATUS_LOG_LINES lines
+                of the run)
+        """
+        if self._stopped.is_set() and self._process and self._process.poll() is not None:
             if self._status.error is None:
-                inferred = self._infer_error_from_log()
+                inferred = self._errors.diagnosis()
                 if inferred:
                     self._status.error = inferred
             self._status.running = False
             self._status.pid = None
             self._process = None
-        self._status.logs = self._log_buffer[-500:]  # Keep last 500 lines
+        batch = self._log_buffer.read(since, limit=STATUS_LOG_LINES)
+        self._status.logs = batch.lines
+        self._status.log_seq = batch.last_seq
+        self._status.log_start_seq = batch.run_start_seq
+        self._status.progress = batch.progress
+        self._status.diagnostics = self._errors.hits()
+        self._status.control_loop = self._jitter.to_dict()
+        self._status.startup = self._trace.to_dict() if self._trace is not None else None
+        self._status.stopping = self.stopping
+        self._status.stop = self._stop_progress()
+        self._status.resources = self._resources.to_dict(max_points=None)
         return self._status
+
+    def get_recorded_quality(self) -> dict[str, dict[str, Any]] | None:
+        """Quality metrics and flags of the frames the current recording writes, per camera."""
+        tap = self._frame_tap
+        return tap.summary() if tap is not None else None
+
+    def _stop_progress(self) -> dict[str, Any] | None:
+        """Phase and elapsed time of the current or last stop, and any start queued behind it."""
+        with self._state_lock:
+            if self._stop_info is None:
+                return None
+            info = dict(self._stop_info)
+            if info["phase"] != "stopped":
+                info["elapsed_s"] = round(time.time() - info["started_at"], 1)
+            info["queued_start"] = self._pending_start.mode.value if self._pending_start else None
+            return info
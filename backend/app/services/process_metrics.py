@@ -0,0 +1,195 @@
+"""Metrics parsed from lerobot output, kept as compact time series.
+
+lerobot-train logs a metrics line every `log_freq` steps, e.g.
+
+    INFO ... step:2K smpl:64K ep:40 epch:0.50 loss:0.512 grdn:12.3 lr:1.0e-05 updt_s:0.150 data_s:0.004
+
+and lerobot-record announces its phases ("Recording episode 3", "Reset the
+environment", "Stop recording"). ProcessMetrics turns those lines into
+time series backed by `array('d')` columns. When a series is full it drops
+every other point, so a run of any length fits in fixed memory at
+progressively coarser resolution.
+"""
+
+import math
+import re
+import threading
+import time
+from array import array
+from typing import Any
+
+# Points kept per series before it is halved
+SERIES_CAPACITY = 4096
+# Points returned by default by to_dict()
+DEFAULT_MAX_POINTS = 500
+
+_TRAIN_FIELD = re.compile(r"\b([a-z_]+):(-?\d+(?:\.\d+)?(?:e[-+]?\d+)?)([KMBT]?)(?=\s|$)")
+_SUFFIX = {"": 1.0, "K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+# lerobot's log prefix time ("INFO 2024-05-01 12:00:00 ..."); output can arrive in bursts
+_LOG_TIME = re.compile(r"\b(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\b")
+# Shortest interval between metrics lines used for a samples/s estimate
+MIN_RATE_INTERVAL_S = 0.5
+# lerobot's short metric names -> series fields
+_TRAIN_NAMES = {
+    "step": "step",
+    "smpl": "samples",
+    "ep": "episodes",
+    "epch": "epochs",
+    "loss": "loss",
+    "grdn": "grad_norm",
+    "lr": "lr",
+    "updt_s": "update_s",
+    "data_s": "data_s",
+}
+
+RECORD_PHASES = ["recording", "reset", "stopped", "pushing"]
+_RECORD_EVENTS = [
+    (re.compile(r"Recording episode (\d+)"), "recording"),
+    (re.compile(r"Re-record episode"), "recording"),
+    (re.compile(r"Reset the environment"), "reset"),
+    (re.compile(r"Stop recording"), "stopped"),
+    (re.compile(r"(?i:push(?:ing)?\b.* to (?:the )?hub)"), "pushing"),
+]
+
+
+class TimeSeries:
+    """Fixed-memory time series with one float column per field (NaN = missing)."""
+
+    def __init__(self, fields: tuple[str, ...], capacity: int = SERIES_CAPACITY):
+        self.fields = fields
+        self.capacity = capacity
+        self._t = array("d")
+        self._columns = {f: array("d") for f in fields}
+        # Each stored point stands for this many appended points
+        self.stride = 1
+        self._skip = 0
+
+    def __len__(self) -> int:
+        return len(self._t)
+
+    def append(self, t: float, values: dict[str, float]) -> None:
+        """Add a point; after a halving only every `stride`-th point is stored."""
+        if self._skip:
+            self._skip -= 1
+            return
+        self._skip = self.stride - 1
+        self._t.append(t)
+        for name, column in self._columns.items():
+            column.append(values.get(name, math.nan))
+        if len(self._t) >= self.capacity:
+            self._halve()
+
+    def _halve(self) -> None:
+        """Keep every other point and double the stride."""
+        self._t = self._t[::2]
+        self._columns = {name: column[::2] for name, column in self._columns.items()}
+        self.stride *= 2
+
+    def last(self) -> dict[str, float | None]:
+        if not self._t:
+            return {}
+        values = {name: _json_float(column[-1]) for name, column in self._columns.items()}
+        return {"t": self._t[-1], **values}
+
+    def to_dict(self, max_points: int = DEFAULT_MAX_POINTS) -> dict[str, Any]:
+        """Columns downsampled to at most `max_points` (evenly spaced, newest point kept)."""
+        n = len(self._t)
+        step = max(1, math.ceil(n / max_points)) if max_points > 0 else 1
+        indices = list(range((n - 1) % step, n, step))
+        return {
+            "t": [self._t[i] for i in indices],
+            **{name: [_json_float(column[i]) for i in indices] for name, column in self._columns.items()},
+        }
+
+
+def _json_float(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+def _line_time(line: str, default: float) -> float:
+    """Time printed in a log line's prefix, or `default`."""
+    match = _LOG_TIME.search(line)
+    if match is None:
+        return default
+    try:
+        return time.mktime(time.strptime(match.group(1), "%Y-%m-%d %H:%M:%S"))
+    except ValueError:
+        return default
+
+
+def parse_train_line(line: str) -> dict[str, float] | None:
+    """Metrics of a lerobot-train log line, or None if the line has none."""
+    if "loss:" not in line or "step:" not in line:
+        return None
+    values = {}
+    for name, number, suffix in _TRAIN_FIELD.findall(line):
+        field = _TRAIN_NAMES.get(name)
+        if field is not None:
+            values[field] = float(number) * _SUFFIX[suffix]
+    return values if "step" in values else None
+
+
+class ProcessMetrics:
+    """Train and record time series of the current run, fed line by line."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start empty series for a new run."""
+        with self._lock:
+            self.started_at = time.time()
+            self.train = TimeSeries(tuple(_TRAIN_NAMES.values()) + ("samples_per_s",))
+            self.record = TimeSeries(("episode", "phase"))
+            self._last_train: tuple[float, float] | None = None
+            self._episode: int | None = None
+            self._phase: str | None = None
+            self._phase_at = 0.0
+
+    def observe(self, line: str) -> None:
+        """Parse one output line (reader thread)."""
+        now = time.time()
+        values = parse_train_line(line)
+        if values is not None:
+            t = _line_time(line, now)
+            with self._lock:
+                samples = values.get("samples")
+                if samples is not None:
+                    last = self._last_train
+                    if last is not None and t - last[0] >= MIN_RATE_INTERVAL_S and samples > last[1]:
+                        values["samples_per_s"] = (samples - last[1]) / (t - last[0])
+                    self._last_train = (t, samples)
+                self.train.append(t, values)
+            return
+        for pattern, phase in _RECORD_EVENTS:
+            match = pattern.search(line)
+            if match is None:
+                continue
+            with self._lock:
+                if match.groups():
+                    self._episode = int(match.group(1))
+                self._phase = phase
+                self._phase_at = now
+                episode = math.nan if self._episode is None else float(self._episode)
+                self.record.append(now, {"episode": episode, "phase": float(RECORD_PHASES.index(phase))})
+            return
+
+    def to_dict(self, max_points: int = DEFAULT_MAX_POINTS) -> dict[str, Any]:
+        """Downsampled series plus the latest values."""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "train": {
+                    "latest": self.train.last(),
+                    "stride": self.train.stride,
+                    "series": self.train.to_dict(max_points),
+                },
+                "record": {
+                    "episode": self._episode,
+                    "phase": self._phase,
+                    "phase_elapsed_s": round(time.time() - self._phase_at, 1) if self._phase else None,
+                    "phases": RECORD_PHASES,
+                    "series": self.record.to_dict(max_points),
+                },
+            }
@@ -0,0 +1,167 @@
+"""Health-aware RealSense hardware reset.
+
+Instead of resetting every attached RealSense and sleeping a fixed time,
+each candidate device is classified first:
+
+- devices Studio streamed cleanly moments ago are trusted without a probe;
+- the others are probed with a short pipeline start and one frame grab;
+- only devices that fail the probe are hardware-reset.
+
+Probes and resets run in parallel, and instead of sleeping, the reset
+devices are polled until they have dropped off the bus and re-enumerated.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyrealsense2 as rs
+    HAS_REALSENSE = True
+except ImportError:
+    HAS_REALSENSE = False
+
+# Probe: lowest-bandwidth color mode and how long to wait for its first frame
+PROBE_MODE = (424, 240, 15)
+PROBE_TIMEOUT_MS = 1500
+# How long a reset device may take to drop off the bus, and to come back
+DISCONNECT_TIMEOUT_S = 2.0
+REENUMERATE_TIMEOUT_S = 10.0
+ENUMERATION_POLL_S = 0.1
+
+
+def _attached(ctx) -> dict[str, Any]:
+    """Attached RealSense devices by serial number."""
+    return {dev.get_info(rs.camera_info.serial_number): dev for dev in ctx.query_devices()}
+
+
+def probe_device(serial: str) -> str | None:
+    """Grab one color frame from a device.
+
+    Returns:
+        None if the device streamed, else a short description of the failure
+    """
+    pipeline = rs.pipeline()
+    config = rs.config()
+    config.enable_device(serial)
+    width, height, fps = PROBE_MODE
+    config.enable_stream(rs.stream.color, width, height, rs.format.bgr8, fps)
+    try:
+        pipeline.start(config)
+    except Exception as e:
+        return f"start failed: {e}"
+    try:
+        frames = pipeline.wait_for_frames(timeout_ms=PROBE_TIMEOUT_MS)
+        if not frames.get_color_frame():
+            return "no color frame"
+        return None
+    except Exception as e:
+        return f"no frame: {e}"
+    finally:
+        try:
+            pipeline.stop()
+        except Exception:
+            pass
+
+
+def wait_for_reenumeration(ctx, serials: set[str], timeout_s: float = REENUMERATE_TIMEOUT_S) -> set[str]:
+    """Poll until reset devices have disconnected and come back.
+
+    A device that never seems to disconnect within DISCONNECT_TIMEOUT_S is
+    treated as back as soon as it is listed.
+
+    Returns:
+        Serials that are attached again
+    """
+    start = time.monotonic()
+    gone: set[str] = set()
+    back: set[str] = set()
+    while back != serials and time.monotonic() - start < timeout_s:
+        try:
+            attached = set(_attached(ctx))
+        except Exception:
+            attached = set()
+        elapsed = time.monotonic() - start
+        for serial in serials - back:
+            if serial not in attached:
+                gone.add(serial)
+            elif serial in gone or elapsed >= DISCONNECT_TIMEOUT_S:
+                back.add(serial)
+        if back != serials:
+            time.sleep(ENUMERATION_POLL_S)
+    return back
+
+
+def hardware_reset(serials: set[str], ctx=None) -> set[str]:
+    """Hardware-reset devices in parallel and wait for them to re-enumerate.
+
+    Returns:
+        Serials that came back after the reset
+    """
+    if not HAS_REALSENSE or not serials:
+        return set()
+    ctx = ctx or rs.context()
+    devices = _attached(ctx)
+    targets = {s for s in serials if s in devices}
+    for serial in targets:
+        try:
+            # hardware_reset() only sends the command; the device drops off the bus shortly after
+            devices[serial].hardware_reset()
+            logger.info(f"Hardware-reset RealSense {serial}")
+        except Exception as e:
+            logger.warning(f"Hardware reset failed for {serial}: {e}")
+            targets.discard(serial)
+    back = wait_for_reenumeration(ctx, targets)
+    for serial in targets - back:
+        logger.warning(f"RealSense {serial} did not re-enumerate after reset")
+    return back
+
+
+def reset_wedged_devices(serials: set[str] | None = None, known_healthy: set[str] | None = None) -> dict[str, Any]:
+    """Probe RealSense devices and reset only the wedged ones.
+
+    Args:
+        serials: Devices to consider (None: every attached RealSense)
+        known_healthy: Devices that streamed cleanly just now; they are not probed
+
+    Returns:
+        Report with the serials in each outcome and the time taken
+    """
+    start = time.monotonic()
+    report: dict[str, Any] = {"trusted": [], "healthy": [], "wedged": {}, "recovered": [], "missing": []}
+    if not HAS_REALSENSE:
+        report["duration_s"] = 0.0
+        return report
+    try:
+        ctx = rs.context()
+        attached = set(_attached(ctx))
+    except Exception as e:
+        logger.warning(f"RealSense query failed, skipping reset: {e}")
+        report["error"] = str(e)
+        report["duration_s"] = round(time.monotonic() - start, 3)
+        return report
+
+    candidates = attached if serials is None else set(serials)
+    report["missing"] = sorted(candidates - attached)
+    trusted = candidates & attached & (known_healthy or set())
+    to_probe = sorted((candidates & attached) - trusted)
+    report["trusted"] = sorted(trusted)
+
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=len(to_probe)) as pool:
+            results = dict(zip(to_probe, pool.map(probe_device, to_probe)))
+        report["healthy"] = sorted(s for s, failure in results.items() if failure is None)
+        report["wedged"] = {s: failure for s, failure in results.items() if failure is not None}
+
+    if report["wedged"]:
+        logger.info(f"Resetting wedged RealSense devices: {report['wedged']}")
+        report["recovered"] = sorted(hardware_reset(set(report["wedged"]), ctx))
+    report["duration_s"] = round(time.monotonic() - start, 3)
+    logger.info(
+        f"RealSense reset policy: {len(trusted)} trusted, {len(report['healthy'])} healthy, "
+        f"{len(report['wedged'])} reset in {report['duration_s']}s"
+    )
+    return report
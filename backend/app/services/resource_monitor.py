@@ -0,0 +1,321 @@
+"""CPU, memory, I/O and scheduling usage of a process tree, read from /proc.
+
+`uv run lerobot-...` is a launcher: the real work happens in its child
+(and whatever that spawns), so the whole tree under the spawned pid is
+summed. ResourceMonitor samples the current run's tree and the backend
+itself on a background thread and keeps both in fixed-memory TimeSeries,
+so Studio can tell whether lerobot is CPU-bound (cpu_percent near
+100 x threads doing work, many involuntary context switches), short of
+memory (swap, major faults) or waiting on disk (read/write rates).
+
+Counters are turned into rates per sample interval, per pid, so processes
+that exit between samples do not make the totals jump backwards. Only
+Linux (procfs) is supported; elsewhere the monitor reports nothing.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.services.process_metrics import DEFAULT_MAX_POINTS, TimeSeries
+
+logger = logging.getLogger(__name__)
+
+PROC_ROOT = Path("/proc")
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+DEFAULT_INTERVAL_S = 1.0
+MIN_INTERVAL_S = 0.1
+# Points kept per series before it is halved (about an hour at 1 Hz)
+SERIES_CAPACITY = 3600
+# With no run to sample, the thread stops when nobody has read the data for this long
+IDLE_STOP_S = 30.0
+
+RESOURCE_FIELDS = (
+    "cpu_percent",
+    "rss_mb",
+    "swap_mb",
+    "major_faults_ps",
+    "read_bps",
+    "write_bps",
+    "ctx_voluntary_ps",
+    "ctx_involuntary_ps",
+    "threads",
+    "processes",
+)
+
+
+@dataclass
+class ProcCounters:
+    """Raw /proc counters of one process."""
+
+    cpu_ticks: int
+    major_faults: int
+    threads: int
+    rss_pages: int
+    swap_kb: int = 0
+    read_bytes: int = 0
+    write_bytes: int = 0
+    ctx_voluntary: int = 0
+    ctx_involuntary: int = 0
+
+
+def read_counters(pid: int, root: Path = PROC_ROOT) -> ProcCounters | None:
+    """Counters of `pid`, or None if it has exited.
+
+    /proc/<pid>/io may be unreadable (other users' processes); its counters stay 0.
+    """
+    base = root / str(pid)
+    try:
+        stat = (base / "stat").read_text()
+        status = (base / "status").read_text()
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        return None
+    # Fields after "(comm)"; comm may contain spaces or parentheses
+    fields = stat[stat.rfind(")") + 2:].split()
+    try:
+        counters = ProcCounters(
+            cpu_ticks=int(fields[11]) + int(fields[12]),
+            major_faults=int(fields[9]),
+            threads=int(fields[17]),
+            rss_pages=int(fields[21]),
+        )
+    except (IndexError, ValueError):
+        return None
+    for line in status.splitlines():
+        name, _, value = line.partition(":")
+        if name == "VmSwap":
+            counters.swap_kb = int(value.split()[0])
+        elif name == "voluntary_ctxt_switches":
+            counters.ctx_voluntary = int(value)
+        elif name == "nonvoluntary_ctxt_switches":
+            counters.ctx_involuntary = int(value)
+    try:
+        for line in (base / "io").read_text().splitlines():
+            name, _, value = line.partition(":")
+            if name == "read_bytes":
+                counters.read_bytes = int(value)
+            elif name == "write_bytes":
+                counters.write_bytes = int(value)
+    except OSError:
+        pass
+    return counters
+
+
+def _children(pid: int, root: Path) -> list[int] | None:
+    """Direct children of `pid` from /proc/<pid>/task/*/children (None if the kernel lacks it)."""
+    children: list[int] = []
+    try:
+        tasks = list((root / str(pid) / "task").iterdir())
+    except OSError:
+        return []
+    for task in tasks:
+        try:
+            children.extend(int(c) for c in (task / "children").read_text().split())
+        except FileNotFoundError:
+            if not task.exists():
+                continue
+            return None
+        except OSError:
+            continue
+    return children
+
+
+def _children_by_scan(root: Path) -> dict[int, list[int]]:
+    """Children of every process, from the ppid field of each /proc/<pid>/stat."""
+    children: dict[int, list[int]] = {}
+    for entry in root.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            ppid = int(stat[stat.rfind(")") + 2:].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry.name))
+    return children
+
+
+def process_tree(pid: int, root: Path = PROC_ROOT) -> list[int]:
+    """`pid` and all its descendants."""
+    tree = [pid]
+    scanned: dict[int, list[int]] | None = None
+    i = 0
+    while i < len(tree):
+        kids = _children(tree[i], root) if scanned is None else scanned.get(tree[i], [])
+        if kids is None:
+            scanned = _children_by_scan(root)
+            kids = scanned.get(tree[i], [])
+        tree.extend(k for k in kids if k not in tree)
+        i += 1
+    return tree
+
+
+class TreeSampler:
+    """Usage rates of a process (and optionally its descendants) between consecutive samples."""
+
+    def __init__(self, pid: int, include_children: bool = True, root: Path = PROC_ROOT):
+        self.pid = pid
+        self.include_children = include_children
+        self.root = root
+        self._previous: dict[int, ProcCounters] = {}
+        self._previous_at: float | None = None
+
+    def sample(self, now: float | None = None) -> dict[str, float] | None:
+        """Current usage, or None once the root process has exited.
+
+        Rates (per second) are 0 on the first sample.
+        """
+        now = time.monotonic() if now is None else now
+        pids = process_tree(self.pid, self.root) if self.include_children else [self.pid]
+        current = {}
+        for pid in pids:
+            counters = read_counters(pid, self.root)
+            if counters is not None:
+                current[pid] = counters
+        if self.pid not in current:
+            return None
+        dt = now - self._previous_at if self._previous_at is not None else 0.0
+
+        def rate(attr: str) -> float:
+            if dt <= 0:
+                return 0.0
+            total = 0
+            for pid, counters in current.items():
+                before = self._previous.get(pid)
+                # A process born since the last sample did all its work within the interval
+                total += getattr(counters, attr) - (getattr(before, attr) if before else 0)
+            return max(0, total) / dt
+
+        values = {
+            "cpu_percent": round(rate("cpu_ticks") / _CLK_TCK * 100, 1),
+            "rss_mb": round(sum(c.rss_pages for c in current.values()) * _PAGE_SIZE / 1e6, 1),
+            "swap_mb": round(sum(c.swap_kb for c in current.values()) / 1e3, 1),
+            "major_faults_ps": round(rate("major_faults"), 1),
+            "read_bps": round(rate("read_bytes")),
+            "write_bps": round(rate("write_bytes")),
+            "ctx_voluntary_ps": round(rate("ctx_voluntary"), 1),
+            "ctx_involuntary_ps": round(rate("ctx_involuntary"), 1),
+            "threads": float(sum(c.threads for c in current.values())),
+            "processes": float(len(current)),
+        }
+        self._previous = current
+        self._previous_at = now
+        return values
+
+
+def read_system_memory(root: Path = PROC_ROOT) -> dict[str, float] | None:
+    """Available memory and used swap of the machine, in MB."""
+    try:
+        info = {}
+        for line in (root / "meminfo").read_text().splitlines():
+            name, _, value = line.partition(":")
+            info[name] = int(value.split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    return {
+        "mem_total_mb": round(info.get("MemTotal", 0) / 1e3, 1),
+        "mem_available_mb": round(info.get("MemAvailable", 0) / 1e3, 1),
+        "swap_used_mb": round((info.get("SwapTotal", 0) - info.get("SwapFree", 0)) / 1e3, 1),
+    }
+
+
+class ResourceMonitor:
+    """Samples the current run's process tree and the backend itself on a background thread."""
+
+    def __init__(self, interval_s: float = DEFAULT_INTERVAL_S, root: Path = PROC_ROOT):
+        self.root = root
+        self.interval_s = max(MIN_INTERVAL_S, interval_s)
+        self.enabled = (root / "self" / "stat").exists()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._tree: TreeSampler | None = None
+        self._process = TimeSeries(RESOURCE_FIELDS, SERIES_CAPACITY)
+        self._process_alive = False
+        self._backend_sampler = TreeSampler(os.getpid(), include_children=False, root=root)
+        self._backend = TimeSeries(RESOURCE_FIELDS, SERIES_CAPACITY)
+        self._system: dict[str, float] | None = None
+        self._last_read = time.monotonic()
+
+    def set_interval(self, interval_s: float) -> None:
+        self.interval_s = max(MIN_INTERVAL_S, interval_s)
+        self._wake.set()
+
+    def track(self, pid: int) -> None:
+        """Sample the tree under `pid` from now on, in a new series."""
+        with self._lock:
+            self._tree = TreeSampler(pid, root=self.root)
+            self._process = TimeSeries(RESOURCE_FIELDS, SERIES_CAPACITY)
+            self._process_alive = True
+        self._ensure_thread()
+        self._wake.set()
+
+    def _ensure_thread(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, daemon=True, name="resource-monitor")
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.sample_once()
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            with self._lock:
+                if not self._process_alive and time.monotonic() - self._last_read > IDLE_STOP_S:
+                    self._thread = None
+                    return
+
+    def sample_once(self) -> None:
+        """Take one sample of the tracked tree, the backend and system memory."""
+        t = time.time()
+        with self._lock:
+            tree = self._tree if self._process_alive else None
+        values = tree.sample() if tree is not None else None
+        backend = self._backend_sampler.sample()
+        system = read_system_memory(self.root)
+        with self._lock:
+            if tree is not None and tree is self._tree:
+                if values is None:
+                    # The run's root process exited; keep its series for the status
+                    self._process_alive = False
+                else:
+                    self._process.append(t, values)
+            if backend is not None:
+                self._backend.append(t, backend)
+            self._system = system
+
+    def to_dict(self, max_points: int | None = DEFAULT_MAX_POINTS) -> dict[str, Any] | None:
+        """Latest values (and series unless `max_points` is None), or None without procfs."""
+        if not self.enabled:
+            return None
+        self._last_read = time.monotonic()
+        self._ensure_thread()
+        with self._lock:
+            result = {
+                "interval_s": self.interval_s,
+                "system": self._system,
+                "process": {
+                    "pid": self._tree.pid if self._tree is not None else None,
+                    "alive": self._process_alive,
+                    "latest": self._process.last(),
+                },
+                "backend": {"pid": self._backend_sampler.pid, "latest": self._backend.last()},
+            }
+            if max_points is not None:
+                result["process"]["stride"] = self._process.stride
+                result["process"]["series"] = self._process.to_dict(max_points)
+                result["backend"]["stride"] = self._backend.stride
+                result["backend"]["series"] = self._backend.to_dict(max_points)
+            return result
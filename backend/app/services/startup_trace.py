@@ -0,0 +1,102 @@
+"""Timing trace of a teleop/record start, from the API request to the first robot action.
+
+Each start stage records a span (offset and duration from the start of the
+request); stages that run in parallel simply overlap. After the subprocess is
+spawned, its output is watched for the first line and for the first line
+that shows the control loop is running, which gives time-to-first-action.
+`launcher` says whether the lerobot script ran through `uv run` or directly
+from the cached environment, and for direct starts the time that saved.
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+# Output lines showing the teleop/record loop is moving the robot:
+# lerobot-teleoperate prints the loop time every iteration, lerobot-record announces episodes
+FIRST_ACTION_PATTERNS = [
+    re.compile(r"\btime:\s*[\d.]+\s*ms"),
+    re.compile(r"Recording episode"),
+]
+
+
+class StartupTrace:
+    """Spans and marks of one process start."""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.started_at = time.time()
+        self._t0 = time.monotonic()
+        self._lock = threading.Lock()
+        self.spans: list[dict[str, Any]] = []
+        self.marks: dict[str, float] = {}
+        # How the process was launched (see launch_cache), set at spawn
+        self.launcher: dict[str, Any] | None = None
+
+    def _ms(self) -> float:
+        return round((time.monotonic() - self._t0) * 1000, 1)
+
+    def begin(self, name: str) -> dict[str, Any]:
+        """Open a span that ends in another call (or thread); close it with end()."""
+        return {"name": name, "start_ms": self._ms(), "thread": threading.current_thread().name}
+
+    def end(self, span: dict[str, Any]) -> None:
+        """Close a span opened with begin()."""
+        span["duration_ms"] = round(self._ms() - span["start_ms"], 1)
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[dict[str, Any]]:
+        """Time a stage; the yielded dict is the span, so callers can attach details."""
+        span = self.begin(name)
+        try:
+            yield span
+        except Exception as e:
+            span["error"] = str(e)
+            raise
+        finally:
+            self.end(span)
+
+    def mark(self, name: str) -> None:
+        """Record the first occurrence of an event."""
+        with self._lock:
+            self.marks.setdefault(name, self._ms())
+
+    @property
+    def done(self) -> bool:
+        """True once the first action has been seen."""
+        return "first_action" in self.marks
+
+    def observe_line(self, line: str) -> None:
+        """Feed one subprocess output line (reader thread)."""
+        if "first_output" not in self.marks:
+            self.mark("first_output")
+        if any(p.search(line) for p in FIRST_ACTION_PATTERNS):
+            self.mark("first_action")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Spans in start order, marks, and derived durations."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ms"])
+            marks = dict(self.marks)
+        spawned = next((s["start_ms"] + s["duration_ms"] for s in spans if s["name"] == "spawn"), None)
+        derived: dict[str, float | None] = {
+            "time_to_first_action_ms": marks.get("first_action"),
+            "process_boot_ms": None,
+            "connect_ms": None,
+        }
+        if spawned is not None and "first_output" in marks:
+            derived["process_boot_ms"] = round(marks["first_output"] - spawned, 1)
+            if "first_action" in marks:
+                derived["connect_ms"] = round(marks["first_action"] - marks["first_output"], 1)
+        return {
+            "mode": self.mode,
+            "started_at": self.started_at,
+            "spans": spans,
+            "marks": marks,
+            "launcher": dict(self.launcher) if self.launcher is not None else None,
+            **derived,
+        }
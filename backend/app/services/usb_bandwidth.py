@@ -0,0 +1,240 @@
+"""USB bandwidth planning for multi-RealSense setups.
+
+Maps each RealSense device to its USB bus and host controller via sysfs and
+estimates the bandwidth each color stream needs, so cameras that share a bus
+are started at the best mode the bus actually supports.
+"""
+
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.services.device_inventory import DeviceInventory
+
+logger = logging.getLogger(__name__)
+
+# Color frames travel over USB as YUYV (2 bytes/pixel); librealsense converts to BGR on the host.
+WIRE_BYTES_PER_PIXEL = 2
+
+# Fraction of the nominal link speed that is usable for video after protocol overhead.
+USABLE_BUS_FRACTION = 0.6
+
+# Assumed bus speed (Mbit/s) when sysfs does not report one.
+DEFAULT_BUS_SPEED_MBPS = 5000
+
+# Minimum gap between two pipeline starts on the same bus, so their USB
+# bandwidth negotiations do not collide.
+STAGGER_DELAY_S = 1.0
+
+# Candidate color modes, best first. The planner only picks modes that are
+# no larger than what the camera config requests.
+RESOLUTION_LADDER: list[tuple[int, int]] = [
+    (1920, 1080),
+    (1280, 720),
+    (848, 480),
+    (640, 480),
+    (640, 360),
+    (424, 240),
+    (320, 240),
+]
+FPS_LADDER: list[int] = [60, 30, 15, 6]
+
+_PCI_ADDR_RE = re.compile(r"^[0-9a-f]{4}:[0-9a-f]{2}:[0-9a-f]{2}\.[0-9a-f]$")
+_USB_BUS_RE = re.compile(r"^usb\d+$")
+_USB_PORT_RE = re.compile(r"^\d+-[\d.]+$")
+
+
+@dataclass
+class UsbTopology:
+    """Where a device sits on the USB tree."""
+
+    bus: str | None = None
+    controller: str | None = None
+    port: str | None = None
+    link_speed_mbps: int | None = None
+    bus_speed_mbps: int | None = None
+
+
+@dataclass
+class CameraPlan:
+    """Planned color mode for one camera."""
+
+    key: str
+    serial: str
+    requested: tuple[int, int, int]
+    assigned: tuple[int, int, int]
+    bandwidth_mbps: float
+    bus: str | None = None
+    controller: str | None = None
+    link_speed_mbps: int | None = None
+    downgraded: bool = False
+
+
+@dataclass
+class BusPlan:
+    """Aggregate bandwidth for one USB bus."""
+
+    bus: str
+    controller: str | None
+    budget_mbps: float
+    planned_mbps: float = 0.0
+    cameras: list[str] = field(default_factory=list)
+    feasible: bool = True
+
+
+def stream_bandwidth_mbps(
+    width: int,
+    height: int,
+    fps: int,
+    bytes_per_pixel: int = WIRE_BYTES_PER_PIXEL,
+) -> float:
+    """Estimate the USB bandwidth of one color stream in Mbit/s (width x height x bpp x fps)."""
+    return width * height * bytes_per_pixel * 8 * fps / 1_000_000
+
+
+def _read_speed(path: Path) -> int | None:
+    """Read a sysfs `speed` file (Mbit/s); returns None if missing or unparsable."""
+    try:
+        return int(float(path.read_text().strip()))
+    except Exception:
+        return None
+
+
+def topology_from_physical_port(physical_port: str, sysfs_root: Path = Path("/sys")) -> UsbTopology:
+    """Resolve bus, controller and link speeds from a librealsense physical port path.
+
+    Args:
+        physical_port: sysfs device path as reported by `rs.camera_info.physical_port`,
+            e.g. "/sys/devices/pci0000:00/0000:00:14.0/usb2/2-3/2-3:1.0/video4linux/video2"
+        sysfs_root: Root of sysfs (overridable for tests)
+
+    Returns:
+        UsbTopology with whatever could be resolved (fields are None otherwise)
+    """
+    topo = UsbTopology()
+    parts = [p for p in physical_port.split("/") if p]
+    for i, part in enumerate(parts):
+        if _USB_BUS_RE.match(part):
+            topo.bus = part
+            if i > 0 and _PCI_ADDR_RE.match(parts[i - 1]):
+                topo.controller = parts[i - 1]
+            if i + 1 < len(parts) and _USB_PORT_RE.match(parts[i + 1]):
+                topo.port = parts[i + 1]
+            break
+    devices = sysfs_root / "bus" / "usb" / "devices"
+    if topo.bus:
+        topo.bus_speed_mbps = _read_speed(devices / topo.bus / "speed")
+    if topo.port:
+        topo.link_speed_mbps = _read_speed(devices / topo.port / "speed")
+    return topo
+
+
+def discover_realsense_topology() -> dict[str, UsbTopology]:
+    """Map each attached RealSense serial number to its USB topology (from the device inventory)."""
+    return {
+        dev["serial"]: topology_from_physical_port(dev.get("physical_port", ""))
+        for dev in DeviceInventory.get_instance().realsense_devices()
+    }
+
+
+def candidate_modes(width: int, height: int, fps: int) -> list[tuple[int, int, int]]:
+    """Return modes no larger than the requested one, highest bandwidth first.
+
+    Modes with the requested aspect ratio are preferred; the requested mode is always first.
+    """
+    modes = {
+        (w, h, f)
+        for (w, h) in RESOLUTION_LADDER
+        for f in FPS_LADDER
+        if w <= width and h <= height and f <= fps
+    }
+    same_aspect = {m for m in modes if m[0] * height == m[1] * width}
+    if same_aspect:
+        modes = same_aspect
+    modes.discard((width, height, fps))
+    ordered = sorted(modes, key=lambda m: (m[0] * m[1] * m[2], m[2]), reverse=True)
+    return [(width, height, fps), *ordered]
+
+
+def plan_bandwidth(
+    cameras: dict[str, dict[str, Any]],
+    topology: dict[str, UsbTopology],
+) -> dict[str, Any]:
+    """Pick the best feasible color mode per camera given the shared USB buses.
+
+    Each camera is first capped by its own link speed (e.g. a USB 3 camera on a
+    USB 2 cable), then, per bus, the camera using the most bandwidth is stepped
+    down until the bus fits its budget. Cameras whose bus cannot be resolved
+    keep their requested mode.
+
+    Args:
+        cameras: Camera config dicts keyed by camera key (RealSense only)
+        topology: USB topology keyed by serial number
+
+    Returns:
+        JSON-serializable dict with "cameras" and "buses" entries
+    """
+    plans: dict[str, CameraPlan] = {}
+    ladders: dict[str, list[tuple[int, int, int]]] = {}
+    steps: dict[str, int] = {}
+
+    for key, cfg in cameras.items():
+        serial = str(cfg.get("serial_number_or_name", ""))
+        requested = (int(cfg.get("width", 640)), int(cfg.get("height", 480)), int(cfg.get("fps", 30)))
+        topo = topology.get(serial, UsbTopology())
+        ladder = candidate_modes(*requested)
+        step = 0
+        if topo.link_speed_mbps:
+            link_budget = topo.link_speed_mbps * USABLE_BUS_FRACTION
+            while step + 1 < len(ladder) and stream_bandwidth_mbps(*ladder[step]) > link_budget:
+                step += 1
+        ladders[key] = ladder
+        steps[key] = step
+        plans[key] = CameraPlan(
+            key=key,
+            serial=serial,
+            requested=requested,
+            assigned=ladder[step],
+            bandwidth_mbps=stream_bandwidth_mbps(*ladder[step]),
+            bus=topo.bus,
+            controller=topo.controller,
+            link_speed_mbps=topo.link_speed_mbps,
+        )
+
+    buses: dict[str, BusPlan] = {}
+    for key, plan in plans.items():
+        if plan.bus is None:
+            continue
+        if plan.bus not in buses:
+            speed = topology[plan.serial].bus_speed_mbps or DEFAULT_BUS_SPEED_MBPS
+            buses[plan.bus] = BusPlan(
+                bus=plan.bus,
+                controller=plan.controller,
+                budget_mbps=speed * USABLE_BUS_FRACTION,
+            )
+        buses[plan.bus].cameras.append(key)
+
+    for bus in buses.values():
+        while sum(plans[k].bandwidth_mbps for k in bus.cameras) > bus.budget_mbps:
+            reducible = [k for k in bus.cameras if steps[k] + 1 < len(ladders[k])]
+            if not reducible:
+                bus.feasible = False
+                break
+            worst = max(reducible, key=lambda k: plans[k].bandwidth_mbps)
+            steps[worst] += 1
+            plans[worst].assigned = ladders[worst][steps[worst]]
+            plans[worst].bandwidth_mbps = stream_bandwidth_mbps(*plans[worst].assigned)
+        bus.planned_mbps = round(sum(plans[k].bandwidth_mbps for k in bus.cameras), 1)
+        bus.budget_mbps = round(bus.budget_mbps, 1)
+
+    for plan in plans.values():
+        plan.downgraded = plan.assigned != plan.requested
+        plan.bandwidth_mbps = round(plan.bandwidth_mbps, 1)
+
+    return {
+        "cameras": {k: asdict(p) for k, p in plans.items()},
+        "buses": {b: asdict(p) for b, p in buses.items()},
+        "stagger_s": STAGGER_DELAY_S,
+    }
@@ -0,0 +1,146 @@
+"""Admission control and priorities for camera stream viewers.
+
+Caps how many clients may watch each camera and all cameras together. When a
+cap is reached, a more important viewer displaces the least important one;
+under load, lower-priority viewers are moved to a smaller rendition and a
+lower frame rate so the operator page keeps full quality.
+"""
+
+import itertools
+import logging
+import time
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ViewerPriority(IntEnum):
+    """Viewer importance; lower value wins."""
+
+    OPERATOR = 0
+    STUDIO = 1
+    REMOTE = 2
+
+
+@dataclass
+class Viewer:
+    """One admitted stream client and its current assignment."""
+
+    id: int
+    camera: str
+    priority: ViewerPriority
+    client: str
+    admitted_at: float
+    rendition: str = "full"
+    fps_divisor: int = 1
+    evicted: bool = False
+
+
+class ViewerRegistry:
+    """Tracks stream viewers and decides admission, eviction and degradation."""
+
+    def __init__(
+        self,
+        max_per_camera: int = 4,
+        max_total: int = 12,
+        degrade_fraction: float = 0.5,
+    ):
+        """Create an empty registry.
+
+        Args:
+            max_per_camera: Maximum concurrent viewers of one camera
+            max_total: Maximum concurrent viewers across all cameras
+            degrade_fraction: Load (viewers / cap) from which lower-priority viewers are degraded
+        """
+        self._lock = Lock()
+        self._viewers: dict[int, Viewer] = {}
+        self._ids = itertools.count(1)
+        self.configure(max_per_camera, max_total, degrade_fraction)
+
+    def configure(self, max_per_camera: int, max_total: int, degrade_fraction: float) -> None:
+        """Update limits; current viewers are re-assigned but never evicted by a config change."""
+        with self._lock:
+            self.max_per_camera = max(1, max_per_camera)
+            self.max_total = max(1, max_total)
+            self.degrade_fraction = degrade_fraction
+            self._rebalance()
+
+    @staticmethod
+    def _pick_victim(candidates: list[Viewer], priority: ViewerPriority) -> Viewer | None:
+        """Least important (then newest) viewer strictly less important than `priority`."""
+        lower = [v for v in candidates if v.priority > priority]
+        if not lower:
+            return None
+        return max(lower, key=lambda v: (v.priority, v.admitted_at))
+
+    def admit(self, camera: str, priority: ViewerPriority, client: str = "") -> Viewer | None:
+        """Admit a viewer, displacing a less important one if a cap is reached.
+
+        Returns:
+            The admitted Viewer, or None if the caps are full of equally or more important viewers
+        """
+        with self._lock:
+            victims: list[Viewer] = []
+            same_camera = [v for v in self._viewers.values() if v.camera == camera]
+            if len(same_camera) >= self.max_per_camera:
+                victim = self._pick_victim(same_camera, priority)
+                if victim is None:
+                    return None
+                victims.append(victim)
+            if len(self._viewers) - len(victims) >= self.max_total:
+                others = [v for v in self._viewers.values() if v not in victims]
+                victim = self._pick_victim(others, priority)
+                if victim is None:
+                    return None
+                victims.append(victim)
+            for victim in victims:
+                victim.evicted = True
+                del self._viewers[victim.id]
+                logger.info(f"Evicted {victim.priority.name.lower()} viewer {victim.client} of {victim.camera}")
+
+            viewer = Viewer(
+                id=next(self._ids),
+                camera=camera,
+                priority=priority,
+                client=client,
+                admitted_at=time.monotonic(),
+            )
+            self._viewers[viewer.id] = viewer
+            self._rebalance()
+            return viewer
+
+    def release(self, viewer: Viewer) -> None:
+        """Remove a viewer (no-op if it was already evicted)."""
+        with self._lock:
+            if self._viewers.pop(viewer.id, None) is not None:
+                self._rebalance()
+
+    def _rebalance(self) -> None:
+        """Assign rendition and fps divisor from current load (caller holds the lock)."""
+        global_load = len(self._viewers) / self.max_total
+        per_camera: dict[str, int] = {}
+        for v in self._viewers.values():
+            per_camera[v.camera] = per_camera.get(v.camera, 0) + 1
+        for v in self._viewers.values():
+            load = max(global_load, per_camera[v.camera] / self.max_per_camera)
+            if v.priority == ViewerPriority.OPERATOR or load < self.degrade_fraction:
+                v.rendition, v.fps_divisor = "full", 1
+            elif v.priority == ViewerPriority.STUDIO:
+                v.rendition, v.fps_divisor = "low", 1
+            else:
+                v.rendition, v.fps_divisor = "low", 2
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """Current viewers grouped by camera, with their assignments."""
+        with self._lock:
+            viewers = list(self._viewers.values())
+        result: dict[str, list[dict[str, Any]]] = {}
+        for v in viewers:
+            entry = asdict(v)
+            entry["priority"] = v.priority.name.lower()
+            entry.pop("evicted")
+            result.setdefault(v.camera, []).append(entry)
+        return result
@@ -94,8 +94,10 @@ def reset_process_manager_singleton():
     from app.services.process_manager import ProcessManager
 
     ProcessManager._instance = None
+    ProcessManager._stations = {}
     yield
     ProcessManager._instance = None
+    ProcessManager._stations = {}
 
 
 @pytest.fixture()
@@ -111,3 +113,25 @@ def mock_popen():
     with patch("app.services.process_manager.subprocess.Popen", return_value=mock_proc) as popen_cls:
         popen_cls._mock_proc = mock_proc
         yield popen_cls
+
+
+@pytest.fixture(autouse=True)
+def tmp_job_queue(tmp_path: Path):
+    """Give each test its own JobQueue singleton saving into a temp directory."""
+    from app.services.job_queue import JobQueue
+
+    queue = JobQueue(tmp_path / "jobs", interactive_modes=lambda: [])
+    JobQueue._instance = queue
+    yield queue
+    queue.shutdown()
+    JobQueue._instance = None
+
+
+@pytest.fixture(autouse=True)
+def tmp_launch_cache(tmp_path: Path):
+    """Keep the resolved-environment cache out of the real home directory."""
+    from app.services.launch_cache import LaunchCache
+
+    LaunchCache._instance = LaunchCache(tmp_path / "lerobot_launch.json")
+    yield LaunchCache._instance
+    LaunchCache._instance = None
@@ -1,5 +1,6 @@
 """Integration tests using FastAPI TestClient — full request/response cycles."""
 
+import inspect
 import json
 from unittest.mock import MagicMock, patch
 
@@ -26,6 +27,7 @@ def client(tmp_config_path, tmp_launcher_path, sample_config):
         mock_cam_routes.get_instance.return_value = mock_cam_inst
         mock_cam_inst.cameras = {}
         mock_cam_inst.get_camera_status.return_value = {"status": "not_initialized"}
+        mock_cam_inst.viewers.snapshot.return_value = {}
 
         from app.main import app
 
@@ -96,10 +98,26 @@ class TestProcessEndpoints:
         assert data["mode"] == "idle"
         assert data["running"] is False
 
+    def test_process_status_since(self, client):
+        from app.services.process_manager import ProcessManager
+
+        ProcessManager()._log_buffer.append("hello")
+        seq = client.get("/api/process/status").json()["log_seq"]
+        ProcessManager()._log_buffer.append("world")
+        data = client.get(f"/api/process/status?since={seq}").json()
+        assert data["logs"] == ["world"]
+        assert data["log_seq"] == seq + 1
+
+    def test_process_resources(self, client):
+        data = client.get("/api/process/resources?max_points=10").json()
+        assert data["process"]["pid"] is None
+        assert set(data["backend"]) >= {"pid", "latest", "series"}
+        assert "resources" in client.get("/api/process/status").json()
+
     @patch("app.routes.process_routes.ProcessManager")
     def test_teleoperate_start(self, MockPM, client):
-        mock_pm = MagicMock()
-        MockPM.return_value = mock_pm
+        mock_pm = MagicMock(stopping=False)
+        MockPM.for_station.return_value = mock_pm
 
         resp = client.post("/api/teleoperate/start?display_data=true")
         assert resp.status_code == 200
@@ -108,18 +126,26 @@ class TestProcessEndpoints:
 
     @patch("app.routes.process_routes.ProcessManager")
     def test_process_stop(self, MockPM, client):
-        mock_pm = MagicMock()
-        MockPM.return_value = mock_pm
+        mock_pm = MagicMock(stopping=False)
+        MockPM.for_station.return_value = mock_pm
 
         resp = client.post("/api/process/stop")
         assert resp.status_code == 200
         assert resp.json()["status"] == "stopped"
         mock_pm.stop.assert_called_once()
 
+    @patch("app.routes.process_routes.ProcessManager")
+    def test_stop_and_start_while_stopping(self, MockPM, client):
+        MockPM.for_station.return_value = MagicMock(stopping=True)
+
+        assert client.post("/api/process/stop").json()["status"] == "stopping"
+        resp = client.post("/api/train/start")
+        assert resp.json() == {"status": "queued", "mode": "train"}
+
     @patch("app.routes.process_routes.ProcessManager")
     def test_record_start(self, MockPM, client):
         mock_pm = MagicMock()
-        MockPM.return_value = mock_pm
+        MockPM.for_station.return_value = mock_pm
 
         resp = client.post("/api/record/start?repo_id=test/data&num_episodes=3")
         assert resp.status_code == 200
@@ -128,7 +154,7 @@ class TestProcessEndpoints:
     @patch("app.routes.process_routes.ProcessManager")
     def test_train_start(self, MockPM, client):
         mock_pm = MagicMock()
-        MockPM.return_value = mock_pm
+        MockPM.for_station.return_value = mock_pm
 
         resp = client.post("/api/train/start?dataset_repo_id=test/data")
         assert resp.status_code == 200
@@ -137,13 +163,150 @@ class TestProcessEndpoints:
     @patch("app.routes.process_routes.ProcessManager")
     def test_replay_start(self, MockPM, client):
         mock_pm = MagicMock()
-        MockPM.return_value = mock_pm
+        MockPM.for_station.return_value = mock_pm
 
         resp = client.post("/api/replay/start?repo_id=test/data&episode=5")
         assert resp.status_code == 200
         assert resp.json()["mode"] == "replay"
 
 
+class TestStationEndpoints:
+    """Station-scoped routes use the station's config, process slot and camera namespace."""
+
+    @pytest.fixture()
+    def station_client(self, tmp_config_path, tmp_launcher_path, sample_config):
+        from app.config import RobotConfig, StationConfig, save_config
+
+        sample_config.stations["cell2"] = StationConfig(
+            name="Cell 2",
+            robot=RobotConfig(
+                leader_ip="10.0.2.1",
+                follower_ip="10.0.2.2",
+                use_top_camera_only=False,
+                cameras={"top": {"type": "intelrealsense", "serial_number_or_name": "C2TOP"}},
+            ),
+        )
+        save_config(sample_config)
+        with patch("app.routes.process_routes.CameraManager") as mock_cam_routes:
+            manager = MagicMock()
+            mock_cam_routes.get_instance.return_value = manager
+            from app.main import app
+
+            with TestClient(app) as c:
+                yield c, manager
+
+    def test_list_stations(self, station_client):
+        client, _ = station_client
+        stations = client.get("/api/stations").json()["stations"]
+        assert [s["id"] for s in stations] == ["default", "cell2"]
+        assert stations[1]["cameras"] == {"top": "cell2.top"}
+        assert stations[1]["process"]["running"] is False
+
+    def test_station_start_uses_own_slot_and_cameras(self, station_client):
+        client, manager = station_client
+        pm = MagicMock(stopping=False)
+        with (
+            patch("app.routes.process_routes._reset_realsense_cameras", return_value={}),
+            patch.object(ProcessManager, "for_station", return_value=pm) as for_station,
+        ):
+            resp = client.post("/api/stations/cell2/teleoperate/start")
+        assert resp.status_code == 200
+        for_station.assert_called_with("cell2")
+        robot_cfg = pm.start_teleoperate.call_args.args[0]
+        assert robot_cfg["follower_ip"] == "10.0.2.2"
+        # The handover runs when the process manager is ready to spawn
+        manager.shutdown_cameras_for_teleop.assert_not_called()
+        with patch("app.routes.process_routes._reset_realsense_cameras", return_value={}):
+            pm.start_teleoperate.call_args.kwargs["prepare"]()
+        manager.shutdown_cameras_for_teleop.assert_called_once_with({"cell2.top"})
+
+    def test_stations_have_independent_status(self, station_client):
+        client, _ = station_client
+        ProcessManager.for_station("cell2").logs.append("cell2 line")
+        assert client.get("/api/stations/cell2/process/status").json()["logs"] == ["cell2 line"]
+        assert client.get("/api/process/status").json()["logs"] == []
+
+    def test_station_cameras_are_namespaced(self, station_client):
+        client, manager = station_client
+        manager.get_camera_status.return_value = {"status": "not_initialized"}
+        with patch("app.routes.camera_routes.CameraManager.get_instance", return_value=manager):
+            cameras = client.get("/api/stations/cell2/cameras").json()["cameras"]
+        assert cameras == {"top": {"status": "not_initialized", "stream_key": "cell2.top"}}
+        manager.get_camera_status.assert_called_with("cell2.top")
+
+    def test_unknown_station_404(self, station_client):
+        client, _ = station_client
+        assert client.get("/api/stations/nope/process/status").status_code == 404
+        assert client.post("/api/stations/nope/replay/start").status_code == 404
+        assert client.get("/api/stations/nope/cameras").status_code == 404
+
+    def test_replay_job_drives_its_station_arm(self, station_client, tmp_job_queue):
+        client, _ = station_client
+        tmp_job_queue.claim("robot")  # keep the job queued
+        with patch.object(tmp_job_queue, "configure"):
+            resp = client.post("/api/jobs", json={"kind": "replay", "station": "cell2"})
+            assert client.post("/api/jobs", json={"kind": "replay", "station": "nope"}).status_code == 404
+        assert resp.status_code == 200
+        assert resp.json()["params"]["follower_ip"] == "10.0.2.2"
+
+    def test_every_process_route_is_station_scoped(self):
+        from app.main import app
+        from app.routes import process_routes
+
+        for route in process_routes.router.routes:
+            assert "station_id" in inspect.signature(route.endpoint).parameters, route.path
+        paths = app.openapi()["paths"]
+        for route in process_routes.router.routes:
+            for method in route.methods:
+                scoped = paths[f"/api/stations/{{station_id}}{route.path}"][method.lower()]
+                assert {"name": "station_id", "in": "path"}.items() <= scoped["parameters"][0].items()
+
+
+class TestJobEndpoints:
+    """Job queue routes fill parameters from config and validate them."""
+
+    def test_submit_uses_config_defaults(self, client, tmp_job_queue):
+        tmp_job_queue.gpu_slots = 0
+        with patch.object(tmp_job_queue, "configure"):
+            resp = client.post("/api/jobs", json={"kind": "train", "params": {"policy_type": "diffusion"}, "priority": 2})
+        assert resp.status_code == 200
+        job = resp.json()
+        assert job["state"] == "queued"
+        assert job["resource_class"] == "gpu"
+        assert job["params"]["policy_type"] == "diffusion"
+        assert job["params"]["dataset_repo_id"] == "test/dataset"
+        assert client.get(f"/api/jobs/{job['id']}").json()["priority"] == 2
+
+    def test_rejects_unknown_params(self, client):
+        resp = client.post("/api/jobs", json={"kind": "train", "params": {"steps": 10}})
+        assert resp.status_code == 400
+        assert "steps" in resp.json()["detail"]
+
+    def test_sweep(self, client):
+        resp = client.post("/api/jobs/sweep", json={"grid": {"policy_type": ["act", "diffusion"]}})
+        assert resp.status_code == 200
+        jobs = resp.json()["jobs"]
+        assert [j["params"]["job_name"] for j in jobs] == ["test_job_policy_type-act", "test_job_policy_type-diffusion"]
+        assert {j["sweep_id"] for j in jobs} == {resp.json()["sweep_id"]}
+
+    def test_unknown_job_404(self, client):
+        assert client.post("/api/jobs/nope/cancel").status_code == 404
+
+    def test_robot_job_blocks_interactive_start(self, client, tmp_job_queue):
+        job = MagicMock(kind="replay", id="abc")
+        with patch.object(tmp_job_queue, "running_robot_job", return_value=job):
+            resp = client.post("/api/replay/start")
+        assert resp.status_code == 409
+
+    def test_gpu_jobs_filling_the_slots_block_interactive_training(self, client, tmp_job_queue):
+        tmp_job_queue.gpu_slots = 1
+        job = MagicMock(kind="train", id="abc", resource_class="gpu")
+        with patch.object(tmp_job_queue, "_active_jobs", return_value=[job]):
+            resp = client.post("/api/train/start")
+        assert resp.status_code == 409
+        assert "The GPU is in use" in resp.json()["detail"]
+
+
 class TestCameraEndpoints:
     """Camera endpoints with mocked CameraManager."""
 
@@ -156,3 +319,165 @@ class TestCameraEndpoints:
         resp = client.post("/api/cameras/shutdown")
         assert resp.status_code == 200
         assert resp.json()["status"] == "shutdown"
+
+    def test_operator_cameras_of_every_station_are_served_locally(self):
+        from app.routes.camera_routes import _is_operator_camera
+
+        assert _is_operator_camera("operator")
+        assert _is_operator_camera("cell2.operator")
+        assert not _is_operator_camera("cell2.top")
+
+    def test_bandwidth_plan(self, client):
+        from app.services.camera_manager import CameraManager
+
+        CameraManager.get_instance().plan_bandwidth.return_value = {"cameras": {}, "buses": {}, "stagger_s": 1.0}
+        resp = client.get("/api/cameras/bandwidth-plan")
+        assert resp.status_code == 200
+        assert resp.json()["buses"] == {}
+
+
+class TestCameraWebSocket:
+    """WS /api/cameras/ws/{key} sends header + JPEG only while the client holds credit."""
+
+    @pytest.fixture()
+    def ws_client(self, tmp_config_path, sample_config):
+        from app.config import save_config
+        from app.services.camera_manager import CameraManager, ManagedCamera
+
+        save_config(sample_config)
+        manager = CameraManager()
+        camera = ManagedCamera("top", "TOP_SERIAL", 640, 480, 30)
+        camera.is_running = True
+        camera.frames.publish(b"jpeg-1", captured_at=100.0, encode_ms=2.5)
+        manager.cameras["top"] = camera
+
+        with patch("app.routes.camera_routes.CameraManager.get_instance", return_value=manager):
+            from app.main import app
+
+            with TestClient(app) as c:
+                yield c, camera
+
+    def test_frames_flow_with_credits(self, ws_client):
+        from app.routes.camera_routes import WS_FRAME_HEADER
+
+        client, camera = ws_client
+        with client.websocket_connect("/api/cameras/ws/top?credits=1") as ws:
+            message = ws.receive_bytes()
+            version, seq, captured_at, encode_ms = WS_FRAME_HEADER.unpack_from(message)
+            assert (version, seq, captured_at) == (1, 1, 100.0)
+            assert encode_ms == pytest.approx(2.5)
+            assert message[WS_FRAME_HEADER.size:] == b"jpeg-1"
+
+            camera.frames.publish(b"jpeg-2", captured_at=101.0)
+            ws.send_json({"ack": seq})
+            message = ws.receive_bytes()
+            assert WS_FRAME_HEADER.unpack_from(message)[1] == 2
+            assert message[WS_FRAME_HEADER.size:] == b"jpeg-2"
+
+    def test_negative_credits_count_as_zero(self, ws_client):
+        from app.routes.camera_routes import WS_FRAME_HEADER
+
+        client, camera = ws_client
+        with client.websocket_connect("/api/cameras/ws/top?credits=1") as ws:
+            assert WS_FRAME_HEADER.unpack_from(ws.receive_bytes())[1] == 1
+            ws.send_json({"credits": -5})
+            ws.send_json({"credits": 1})
+            camera.frames.publish(b"jpeg-2", captured_at=101.0)
+            assert WS_FRAME_HEADER.unpack_from(ws.receive_bytes())[1] == 2
+
+    def test_non_integer_credits_close_the_socket(self, ws_client):
+        from starlette.websockets import WebSocketDisconnect
+
+        client, _ = ws_client
+        with client.websocket_connect("/api/cameras/ws/top?credits=0") as ws:
+            ws.send_json({"credits": "many"})
+            with pytest.raises(WebSocketDisconnect) as closed:
+                ws.receive_bytes()
+        assert closed.value.code == 1008
+
+    def test_failed_camera_start_frees_viewer_slot(self, ws_client):
+        from starlette.websockets import WebSocketDisconnect
+
+        from app.services.camera_manager import CameraManager
+
+        client, camera = ws_client
+        manager = CameraManager.get_instance()
+        camera.is_running = False
+        with patch.object(manager, "initialize_camera", side_effect=RuntimeError("no device")):
+            with pytest.raises(RuntimeError):
+                client.get("/api/cameras/stream/top")
+            with pytest.raises((RuntimeError, WebSocketDisconnect)):
+                with client.websocket_connect("/api/cameras/ws/top") as ws:
+                    ws.receive_bytes()
+        assert manager.viewers.snapshot() == {}
+
+    def test_unknown_camera_rejected(self, ws_client):
+        from starlette.websockets import WebSocketDisconnect
+
+        client, _ = ws_client
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/api/cameras/ws/nope") as ws:
+                ws.receive_bytes()
+
+
+class TestCameraSnapshot:
+    """GET /api/cameras/snapshot/{key} serves the latest frame with seq-based ETags."""
+
+    @pytest.fixture()
+    def snap_client(self, tmp_config_path, sample_config):
+        from app.config import save_config
+        from app.services.camera_manager import CameraManager, ManagedCamera
+
+        save_config(sample_config)
+        manager = CameraManager()
+        camera = ManagedCamera("top", "TOP_SERIAL", 640, 480, 30)
+        camera.is_running = True
+        camera.frames.publish(b"jpeg-1", captured_at=100.0)
+        manager.cameras["top"] = camera
+
+        with patch("app.routes.camera_routes.CameraManager.get_instance", return_value=manager):
+            from app.main import app
+
+            with TestClient(app) as c:
+                yield c, camera
+
+    def test_returns_frame_with_etag(self, snap_client):
+        client, camera = snap_client
+        resp = client.get("/api/cameras/snapshot/top")
+        assert resp.status_code == 200
+        assert resp.content == b"jpeg-1"
+        assert resp.headers["content-type"] == "image/jpeg"
+        assert resp.headers["x-frame-seq"] == "1"
+        assert resp.headers["etag"] == f'"{camera.frames.epoch}-1"'
+
+    def test_if_none_match_returns_304_until_new_frame(self, snap_client):
+        client, camera = snap_client
+        etag = client.get("/api/cameras/snapshot/top").headers["etag"]
+
+        resp = client.get("/api/cameras/snapshot/top", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+        camera.frames.publish(b"jpeg-2")
+        resp = client.get("/api/cameras/snapshot/top", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.content == b"jpeg-2"
+
+    def test_long_poll_waits_for_newer_frame(self, snap_client):
+        import threading
+
+        client, camera = snap_client
+        threading.Timer(0.1, camera.frames.publish, args=(b"jpeg-2",)).start()
+        resp = client.get("/api/cameras/snapshot/top?wait_newer_than=1&timeout=5")
+        assert resp.status_code == 200
+        assert resp.headers["x-frame-seq"] == "2"
+
+    def test_long_poll_times_out_with_current_frame(self, snap_client):
+        client, _ = snap_client
+        resp = client.get("/api/cameras/snapshot/top?wait_newer_than=1&timeout=0.05")
+        assert resp.status_code == 200
+        assert resp.headers["x-frame-seq"] == "1"
+
+    def test_unknown_camera_404(self, snap_client):
+        client, _ = snap_client
+        assert client.get("/api/cameras/snapshot/nope").status_code == 404
@@ -0,0 +1,229 @@
+"""Tests for app.services.camera_manager — supervisor restarts with backoff."""
+
+from threading import Event
+from unittest.mock import patch
+
+import pytest
+
+from app.services import camera_manager as cm
+from app.services.camera_manager import CameraManager, ManagedCamera
+
+
+class FakeCamera:
+    """Stand-in for ManagedCamera that never touches hardware."""
+
+    instances: list["FakeCamera"] = []
+    start_ok = True
+
+    def __init__(self, key, serial, width, height, fps):
+        self.key = key
+        self.serial = serial
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.stop_event = Event()
+        self.is_running = False
+        self.error = None
+        self.frame = None
+        FakeCamera.instances.append(self)
+
+    def start(self):
+        if FakeCamera.start_ok:
+            self.is_running = True
+            self.frame = b"jpeg"
+        else:
+            self.error = "start failed"
+
+    def stop(self):
+        self.stop_event.set()
+        self.is_running = False
+
+    def get_error(self):
+        return self.error
+
+    def get_latest_frame(self):
+        return self.frame
+
+    def has_frame(self):
+        return self.frame is not None
+
+    def is_healthy(self):
+        return self.is_running and not self.error and self.has_frame()
+
+
+@pytest.fixture()
+def manager():
+    FakeCamera.instances = []
+    FakeCamera.start_ok = True
+    mgr = CameraManager()
+    with (
+        patch.object(cm, "ManagedCamera", FakeCamera),
+        patch.object(CameraManager, "_hardware_reset_device") as reset,
+    ):
+        mgr.reset_mock = reset
+        yield mgr
+
+
+def _kill(camera: FakeCamera) -> None:
+    camera.is_running = False
+    camera.error = "No color frames after 10 attempts"
+
+
+class TestSupervisor:
+    """_supervise_once() restarts dead cameras with exponential backoff."""
+
+    def test_healthy_camera_untouched(self, manager):
+        cam = FakeCamera("top", "S", 640, 480, 30)
+        cam.start()
+        manager.cameras["top"] = cam
+
+        manager._supervise_once()
+        assert manager.cameras["top"] is cam
+        assert manager.get_supervisor_status()["active"] == {}
+
+    def test_intentionally_stopped_camera_not_restarted(self, manager):
+        cam = FakeCamera("top", "S", 640, 480, 30)
+        cam.error = "boom"
+        cam.stop()
+        manager.cameras["top"] = cam
+
+        manager._supervise_once()
+        assert manager.cameras["top"] is cam
+
+    def test_dead_camera_restarted_after_backoff_and_recovery_recorded(self, manager):
+        cam = FakeCamera("top", "S", 640, 480, 30)
+        manager.cameras["top"] = cam
+        _kill(cam)
+
+        with patch.object(cm.time, "monotonic", return_value=100.0):
+            manager._supervise_once()
+        assert manager.cameras["top"] is cam  # waits for first backoff
+        with patch.object(cm.time, "monotonic", return_value=101.5):
+            manager._supervise_once()
+        assert manager.cameras["top"] is not cam
+        assert manager.cameras["top"].is_running
+        with patch.object(cm.time, "monotonic", return_value=102.0):
+            manager._supervise_once()
+
+        status = manager.get_supervisor_status()
+        assert status["active"] == {}
+        assert status["incidents"][0]["camera"] == "top"
+        assert status["incidents"][0]["restarts"] == 1
+        assert status["incidents"][0]["time_to_recover_s"] == pytest.approx(2.0)
+
+    def test_backoff_doubles_and_hardware_reset_kicks_in(self, manager):
+        FakeCamera.start_ok = False
+        cam = FakeCamera("top", "S", 640, 480, 30)
+        manager.cameras["top"] = cam
+        _kill(cam)
+
+        t = 0.0
+        for _ in range(40):
+            with patch.object(cm.time, "monotonic", return_value=t):
+                manager._supervise_once()
+            t += 0.5
+
+        state = manager._restart_state["top"]
+        # Attempts at t=1, 3, 7, 15 (backoff 2 s, 4 s, 8 s) within 20 s
+        assert state.attempts == 4
+        assert manager.reset_mock.call_count == 3
+
+    def test_gives_up_after_max_restarts(self, manager):
+        FakeCamera.start_ok = False
+        cam = FakeCamera("top", "S", 640, 480, 30)
+        manager.cameras["top"] = cam
+        _kill(cam)
+
+        t = 0.0
+        for _ in range(400):
+            with patch.object(cm.time, "monotonic", return_value=t):
+                manager._supervise_once()
+            t += 1.0
+
+        status = manager.get_supervisor_status()["active"]["top"]
+        assert status["gave_up"] is True
+        assert status["restarts"] == cm.MAX_RESTARTS_PER_INCIDENT
+        assert manager.get_camera_status("top")["details"]["gave_up"] is True
+
+    def test_camera_replaced_mid_check_keeps_no_restart_state(self, manager):
+        cam = FakeCamera("top", "S", 640, 480, 30)
+        manager.cameras["top"] = cam
+        _kill(cam)
+        fresh = FakeCamera("top", "S", 640, 480, 30)
+        fresh.start()
+
+        def reinitialize(camera):
+            # initialize_camera() swaps the camera in after the supervisor took its snapshot
+            manager.cameras["top"] = fresh
+
+        with patch.object(manager, "_record_health", reinitialize):
+            manager._supervise_once()
+        assert manager.cameras["top"] is fresh
+        assert manager.get_supervisor_status()["active"] == {}
+
+    def test_shutdown_clears_incident(self, manager):
+        cam = FakeCamera("top", "S", 640, 480, 30)
+        manager.cameras["top"] = cam
+        _kill(cam)
+        manager._supervise_once()
+
+        manager.shutdown_camera("top")
+        assert manager.get_supervisor_status()["active"] == {}
+
+
+class TestStagger:
+    """Starts on one USB bus are spaced apart without holding the manager lock."""
+
+    def test_second_start_on_a_bus_waits_outside_the_lock(self, manager):
+        manager.bandwidth_plan = {"cameras": {
+            key: {"serial": key.upper(), "requested": [640, 480, 30], "assigned": [640, 480, 30], "bus": "2-1"}
+            for key in ("top", "wrist")
+        }}
+        waits = []
+
+        def sleep(seconds):
+            waits.append((seconds, manager.manager_lock.locked()))
+
+        with patch.object(cm.time, "sleep", sleep), patch.object(CameraManager, "_ensure_supervisor"):
+            manager.initialize_camera("top", "TOP", 640, 480, 30)
+            manager.initialize_camera("wrist", "WRIST", 640, 480, 30)
+        assert len(waits) == 1
+        assert 0 < waits[0][0] <= cm.STAGGER_DELAY_S
+        assert waits[0][1] is False
+        assert manager.cameras["wrist"].is_running
+
+
+class TestManagedCameraStop:
+    """stop() releases the pipeline even after the capture loop died on its own."""
+
+    def test_stop_closes_pipeline_when_not_running(self):
+        camera = ManagedCamera("top", "S", 640, 480, 30)
+        pipeline = camera.pipeline = type("P", (), {"stopped": False, "stop": lambda self: setattr(self, "stopped", True)})()
+        camera.is_running = False
+
+        camera.stop()
+        assert pipeline.stopped is True
+        assert camera.pipeline is None
+
+
+class TestRenditions:
+    """_publish_image() encodes downscaled renditions only while they are requested."""
+
+    def test_low_rendition_on_demand(self):
+        import cv2
+        import numpy as np
+
+        camera = ManagedCamera("top", "S", 640, 480, 30)
+        img = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        camera._publish_image(img)
+        assert camera.rendition_frames["low"].has_frame() is False
+
+        camera.get_frames("low")
+        camera._publish_image(img)
+        low = cv2.imdecode(np.frombuffer(camera.rendition_frames["low"].latest_bytes(), np.uint8), cv2.IMREAD_COLOR)
+        assert low.shape == (240, 320, 3)
+
+    def test_unknown_rendition_falls_back_to_full(self):
+        camera = ManagedCamera("top", "S", 640, 480, 30)
+        assert camera.get_frames("huge") is camera.frames
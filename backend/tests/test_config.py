@@ -11,9 +11,15 @@ from app.config import (
     DatasetConfig,
     ReplayConfig,
     RobotConfig,
+    StationConfig,
     TrainConfig,
+    all_cameras,
     load_config,
     save_config,
+    split_camera_key,
+    station_camera_key,
+    station_config,
+    station_ids,
 )
 
 
@@ -191,3 +197,42 @@ class TestSaveConfig:
         assert loaded.robot.remote_leader is True
         assert loaded.dataset.repo_id == "rt/test"
         assert loaded.dataset.num_episodes == 42
+
+
+class TestStations:
+    """Extra stations reuse the robot/dataset/replay sections with namespaced camera keys."""
+
+    @pytest.fixture()
+    def config(self):
+        return AppConfig(
+            stations={
+                "cell2": StationConfig(
+                    name="Cell 2",
+                    robot=RobotConfig(follower_ip="10.0.2.5", cameras={"top": {"serial_number_or_name": "C2TOP"}}),
+                    dataset=DatasetConfig(repo_id="tensi/cell2"),
+                )
+            }
+        )
+
+    def test_station_config_swaps_sections(self, config):
+        cell2 = station_config(config, "cell2")
+        assert cell2.robot.follower_ip == "10.0.2.5"
+        assert cell2.dataset.repo_id == "tensi/cell2"
+        assert cell2.train == config.train
+        assert station_config(config, "default") is config
+        with pytest.raises(KeyError):
+            station_config(config, "nope")
+
+    def test_camera_keys(self, config):
+        assert station_ids(config) == ["default", "cell2"]
+        assert station_camera_key("default", "top") == "top"
+        assert station_camera_key("cell2", "top") == "cell2.top"
+        assert split_camera_key("cell2.top") == ("cell2", "top")
+        assert split_camera_key("top") == ("default", "top")
+        assert all_cameras(config)["cell2.top"] == {"serial_number_or_name": "C2TOP"}
+        assert "top" in all_cameras(config)
+
+    @pytest.mark.parametrize("station_id", ["default", "a.b", "", "cell 2"])
+    def test_rejects_invalid_station_ids(self, station_id):
+        with pytest.raises(ValidationError):
+            AppConfig.model_validate({"stations": {station_id: {"robot": {}}}})
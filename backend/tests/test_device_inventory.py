@@ -0,0 +1,107 @@
+"""Tests for app.services.device_inventory — cached device lists with hot-plug updates."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import device_inventory
+from app.services.device_inventory import DeviceInventory, scan_video_devices
+
+
+@pytest.fixture()
+def roots(tmp_path):
+    dev = tmp_path / "dev"
+    sysfs = tmp_path / "sys"
+    dev.mkdir()
+    for name, label in (("video0", "HD Webcam"), ("video10", "")):
+        (dev / name).touch()
+        if label:
+            (sysfs / "class" / "video4linux" / name).mkdir(parents=True)
+            (sysfs / "class" / "video4linux" / name / "name").write_text(label + "\n")
+    (dev / "video-misc").touch()
+    (dev / "null").touch()
+    return dev, sysfs
+
+
+def _plug(dev, sysfs, name, label):
+    (sysfs / "class" / "video4linux" / name).mkdir(parents=True)
+    (sysfs / "class" / "video4linux" / name / "name").write_text(label)
+    (dev / name).touch()
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_scan_video_devices(roots):
+    dev, sysfs = roots
+    devices = scan_video_devices(dev, sysfs)
+    assert devices == [
+        {"index": 0, "path": str(dev / "video0"), "name": "HD Webcam"},
+        {"index": 10, "path": str(dev / "video10"), "name": str(dev / "video10")},
+    ]
+
+
+class TestHotPlug:
+    """Plugging and unplugging updates the cached list without a rescan."""
+
+    @pytest.mark.parametrize("mode", ["inotify", "poll"])
+    def test_add_and_remove(self, roots, mode, monkeypatch):
+        dev, sysfs = roots
+        monkeypatch.setattr(device_inventory, "POLL_INTERVAL_S", 0.05)
+        inventory = DeviceInventory(dev, sysfs)
+        if mode == "poll":
+            monkeypatch.setattr(inventory, "_inotify_open", lambda: None)
+        inventory.start()
+        try:
+            assert _wait_for(lambda: inventory.watch_mode == mode)
+            assert [d["index"] for d in inventory.video_devices()] == [0, 10]
+
+            with patch.object(device_inventory, "scan_video_devices", side_effect=AssertionError("rescanned")):
+                _plug(dev, sysfs, "video2", "Operator Cam")
+                assert _wait_for(lambda: len(inventory.video_devices()) == 3)
+                assert inventory.video_devices()[1]["name"] == "Operator Cam"
+
+                (dev / "video0").unlink()
+                assert _wait_for(lambda: [d["index"] for d in inventory.video_devices()] == [2, 10])
+        finally:
+            inventory.stop()
+
+
+class TestRealSense:
+    """RealSense entries follow the devices-changed callback."""
+
+    def _device(self, serial):
+        dev = MagicMock()
+        dev.get_info.side_effect = lambda field: {"serial": serial, "name": "Intel RealSense D405"}[field]
+        dev.supports.return_value = False
+        return dev
+
+    def test_callback_adds_and_removes(self, roots, monkeypatch):
+        fake_rs = MagicMock()
+        fake_rs.camera_info.serial_number = "serial"
+        fake_rs.camera_info.name = "name"
+        monkeypatch.setattr(device_inventory, "rs", fake_rs, raising=False)
+        monkeypatch.setattr(device_inventory, "HAS_REALSENSE", True)
+        first = self._device("111")
+        fake_rs.context.return_value.query_devices.return_value = [first]
+
+        inventory = DeviceInventory(*roots)
+        inventory.refresh()
+        assert [d["serial"] for d in inventory.realsense_devices()] == ["111"]
+
+        event = MagicMock()
+        event.was_removed.side_effect = lambda dev: dev is first
+        event.get_new_devices.return_value = [self._device("222")]
+        generation = inventory.generation
+        inventory._on_realsense_changed(event)
+
+        assert [d["serial"] for d in inventory.realsense_devices()] == ["222"]
+        assert inventory.generation == generation + 1
+        fake_rs.context.return_value.query_devices.assert_called_once()
@@ -0,0 +1,132 @@
+"""Tests for app.services.dvr_recorder — segment files, index, rollover and retention."""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app.services import dvr_recorder
+from app.services.camera_manager import ManagedUSBCamera
+from app.services.dvr_recorder import INDEX_SUFFIX, DvrRecorder, RetentionPolicy, read_index
+
+BASE = 1_700_000_040.0  # multiple of 60 s: start of a segment
+
+
+def _jpeg(tag: int, size: int = 100) -> np.ndarray:
+    return np.full(size, tag, dtype=np.uint8)
+
+
+@pytest.fixture()
+def recorder(tmp_path):
+    rec = DvrRecorder()
+    rec.start(tmp_path, 60, RetentionPolicy(max_age_s=1e12, max_total_bytes=1 << 40, min_free_bytes=0))
+    yield rec
+    rec.stop()
+
+
+class TestSegments:
+    """Frames land in per-camera segment files with a matching index."""
+
+    def test_index_points_at_frames(self, recorder, tmp_path):
+        for i in range(3):
+            recorder.record("top", _jpeg(i, 100 + i), BASE + i * 0.1)
+        recorder.stop()
+
+        (segment,) = (tmp_path / "top").glob("*.mjpeg")
+        records = read_index(segment.with_suffix(INDEX_SUFFIX))
+        assert [r[0] for r in records] == pytest.approx([BASE, BASE + 0.1, BASE + 0.2])
+        assert [(r[1], r[2]) for r in records] == [(0, 100), (100, 101), (201, 102)]
+        data = segment.read_bytes()
+        assert data[100:201] == bytes([1]) * 101
+        assert recorder.frames_written == 3
+
+    def test_rolls_over_on_segment_boundary(self, recorder, tmp_path):
+        recorder.record("top", _jpeg(1), BASE + 59.9)
+        recorder.record("top", _jpeg(2), BASE + 60.0)
+        recorder.record("left_wrist", _jpeg(3), BASE + 60.5)
+        recorder.stop()
+
+        assert len(list((tmp_path / "top").glob("*.mjpeg"))) == 2
+        assert len(list((tmp_path / "left_wrist").glob("*.mjpeg"))) == 1
+        segments = recorder.list_segments()
+        assert [s["start"] for s in segments["top"]] == [BASE, BASE + 60]
+        assert not any(s["open"] for s in segments["top"])
+
+    def test_frame_at(self, recorder):
+        recorder.record("top", _jpeg(1), BASE + 1)
+        recorder.record("top", _jpeg(2), BASE + 61)
+        recorder.stop()
+
+        data, captured_at = recorder.frame_at("top", BASE + 30)
+        assert (data[0], captured_at) == (1, BASE + 1)
+        data, captured_at = recorder.frame_at("top", BASE + 99)
+        assert (data[0], captured_at) == (2, BASE + 61)
+        assert recorder.frame_at("top", BASE) is None
+
+    def test_drops_when_writer_falls_behind(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(dvr_recorder, "MAX_QUEUED_FRAMES", 2)
+        rec = DvrRecorder()
+        rec.running = True  # queue only, no writer thread
+        for i in range(5):
+            rec.record("top", _jpeg(i), BASE)
+        assert (len(rec._queue), rec.frames_dropped) == (2, 3)
+
+    def test_not_running_ignores_frames(self):
+        rec = DvrRecorder()
+        rec.record("top", _jpeg(1), BASE)
+        assert len(rec._queue) == 0
+
+
+class TestRetention:
+    """Finished segments are removed by age and total size, oldest first."""
+
+    def _make_segment(self, directory, name, size, mtime):
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{name}.mjpeg"
+        path.write_bytes(b"x" * size)
+        path.with_suffix(INDEX_SUFFIX).write_bytes(b"")
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_age_limit(self, tmp_path):
+        now = time.time()
+        old = self._make_segment(tmp_path / "top", "20200101-000000", 10, now - 7200)
+        new = self._make_segment(tmp_path / "top", "20200101-000100", 10, now - 60)
+        rec = DvrRecorder()
+        rec.directory = tmp_path
+        rec.retention = RetentionPolicy(max_age_s=3600, max_total_bytes=1 << 40, min_free_bytes=0)
+
+        rec._apply_retention()
+        assert not old.exists() and not old.with_suffix(INDEX_SUFFIX).exists()
+        assert new.exists()
+
+    def test_size_limit_deletes_oldest_across_cameras(self, tmp_path):
+        now = time.time()
+        a = self._make_segment(tmp_path / "top", "20200101-000000", 100, now - 30)
+        b = self._make_segment(tmp_path / "left_wrist", "20200101-000000", 100, now - 20)
+        c = self._make_segment(tmp_path / "top", "20200101-000100", 100, now - 10)
+        rec = DvrRecorder()
+        rec.directory = tmp_path
+        rec.retention = RetentionPolicy(max_age_s=1e12, max_total_bytes=250, min_free_bytes=0)
+
+        rec._apply_retention()
+        assert [a.exists(), b.exists(), c.exists()] == [False, True, True]
+        assert rec.segments_deleted == 1
+
+
+class TestCaptureHook:
+    """The camera hands its already-encoded full frame to the recorder."""
+
+    def test_publish_records_encoded_frame(self):
+        recorded = []
+
+        class FakeRecorder:
+            def record(self, key, jpeg, captured_at):
+                recorded.append((key, bytes(jpeg), captured_at))
+
+        camera = ManagedUSBCamera("operator", 0, 64, 48, 30)
+        camera.recorder = FakeRecorder()
+        camera._publish_image(np.zeros((48, 64, 3), dtype=np.uint8), captured_at=BASE)
+
+        assert recorded == [("operator", camera.frames.latest_bytes(), BASE)]
@@ -0,0 +1,65 @@
+"""Tests for app.services.error_rules — incremental log diagnosis."""
+
+from pathlib import Path
+
+from app.services.error_rules import DEFAULT_RULES, ErrorRule, ErrorRuleEngine, merge_rules
+from app.services.process_manager import ProcessManager
+
+
+def _feed(engine, lines):
+    for seq, line in enumerate(lines, start=1):
+        engine.observe(line, seq)
+
+
+class TestDiagnosis:
+    """The highest-priority hit of the run is the diagnosis, wherever it occurred."""
+
+    def test_camera_timeout_beats_generic_timeout(self):
+        engine = ErrorRuleEngine()
+        _feed(engine, ["start", "Timed out waiting for frame from camera top", "TimeoutError"])
+        assert engine.diagnosis().startswith("Teleoperation stopped: camera timed out")
+        hits = {h["rule"]: h for h in engine.hits()}
+        assert hits["camera_timeout"]["first_seq"] == 2
+        assert hits["timeout"]["last_seq"] == 3
+
+    def test_not_limited_to_recent_window(self):
+        engine = ErrorRuleEngine()
+        _feed(engine, ["torch.OutOfMemoryError: CUDA out of memory."] + ["step"] * 5000)
+        assert "GPU memory" in engine.diagnosis()
+
+    def test_message_uses_named_groups(self):
+        engine = ErrorRuleEngine()
+        _feed(engine, ["ModuleNotFoundError: No module named 'pyrealsense2'"])
+        assert "'pyrealsense2'" in engine.diagnosis()
+
+    def test_reset_forgets_previous_run(self):
+        engine = ErrorRuleEngine()
+        _feed(engine, ["ConnectionRefusedError: [Errno 111] Connection refused"])
+        assert engine.diagnosis() is not None
+        engine.reset()
+        assert engine.diagnosis() is None
+        assert engine.hits() == []
+
+
+def test_config_rules_override_and_extend():
+    rules = merge_rules(DEFAULT_RULES, [
+        ErrorRule("timeout", r"TimeoutError", "Custom timeout", priority=10),
+        ErrorRule("estop", r"E-STOP pressed", "Emergency stop", priority=90, ignore_case=True),
+        ErrorRule("broken", r"(unclosed", "never"),
+    ])
+    engine = ErrorRuleEngine(rules)
+    _feed(engine, ["TimeoutError", "e-stop PRESSED"])
+    assert engine.diagnosis() == "Emergency stop"
+    assert {h["rule"] for h in engine.hits()} == {"timeout", "estop"}
+
+
+def test_process_error_inferred_on_exit(mock_popen):
+    pm = ProcessManager()
+    pm.set_lerobot_path(Path("/tmp/fake"))
+    pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
+    pm._on_line("RuntimeError: Joint limit exceeded on joint 3")
+    mock_popen._mock_proc.poll.return_value = 1
+
+    status = pm.get_status()
+    assert status.error.startswith("Teleoperation stopped: joint/velocity limit")
+    assert status.diagnostics[0]["rule"] == "joint_limit"
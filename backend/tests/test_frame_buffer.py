@@ -0,0 +1,145 @@
+"""Tests for app.services.frame_buffer — pooled encoded-frame buffers."""
+
+import asyncio
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from app.services.camera_manager import ManagedUSBCamera
+from app.services.frame_buffer import FrameBufferPool
+
+
+class TestFrameBufferPool:
+    """publish()/acquire() reuse slots and respect reader pins."""
+
+    def test_empty_pool(self):
+        pool = FrameBufferPool()
+        assert pool.seq == 0
+        assert pool.has_frame() is False
+        assert pool.latest_bytes() is None
+        with pool.acquire() as frame:
+            assert frame is None
+
+    def test_publish_and_read(self):
+        pool = FrameBufferPool(capacity=4)
+        seq = pool.publish(np.frombuffer(b"jpeg-data", dtype=np.uint8), captured_at=12.5, encode_ms=3.0)
+        assert seq == 1
+        with pool.acquire() as frame:
+            assert bytes(frame.data) == b"jpeg-data"
+            assert frame.data.readonly
+            assert (frame.seq, frame.captured_at, frame.encode_ms) == (1, 12.5, 3.0)
+        assert pool.latest_bytes() == b"jpeg-data"
+
+    def test_pinned_frame_not_overwritten(self):
+        pool = FrameBufferPool(slots=2, capacity=16)
+        pool.publish(b"first")
+        with pool.acquire() as pinned:
+            for i in range(10):
+                pool.publish(f"frame-{i}".encode())
+            assert bytes(pinned.data) == b"first"
+        assert pool.latest_bytes() == b"frame-9"
+
+    def test_grows_when_all_slots_pinned(self):
+        pool = FrameBufferPool(slots=2, capacity=16)
+        pool.publish(b"a")
+        with pool.acquire():
+            pool.publish(b"b")
+            with pool.acquire():
+                pool.publish(b"c")
+        assert pool.slot_count == 3
+
+    def test_slot_grows_for_large_frame(self):
+        pool = FrameBufferPool(slots=2, capacity=4)
+        pool.publish(b"x" * 100)
+        assert pool.latest_bytes() == b"x" * 100
+
+    def test_wait_newer_woken_by_publish(self):
+        pool = FrameBufferPool()
+        pool.publish(b"a")
+
+        async def wait():
+            threading.Timer(0.05, pool.publish, args=(b"b",)).start()
+            return await pool.wait_newer(1, timeout=5.0)
+
+        assert asyncio.run(wait()) is True
+        assert pool.seq == 2
+        assert pool._waiters == []
+
+    def test_wait_newer_times_out_or_returns_at_once(self):
+        pool = FrameBufferPool()
+        pool.publish(b"a")
+        assert asyncio.run(pool.wait_newer(1, timeout=0.02)) is False
+        assert asyncio.run(pool.wait_newer(7, timeout=5.0)) is True
+        assert pool._waiters == []
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in that fills the caller's buffer like OpenCV does."""
+
+    def __init__(self, camera: ManagedUSBCamera):
+        self.camera = camera
+        self.remaining = 0
+        self.source = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        if image is None:
+            image = np.empty_like(self.source)
+        np.copyto(image, self.source)
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.camera.stop_event.set()
+        return True, image
+
+
+def _run_frames(camera: ManagedUSBCamera, frames: int) -> None:
+    if camera.cap is None:
+        camera.cap = FakeCapture(camera)
+    camera.cap.remaining = frames
+    camera.stop_event.clear()
+    camera._capture_loop()
+
+
+class TestCaptureLoopAllocations:
+    """Steady-state capture/encode does not allocate new retained buffers."""
+
+    def test_steady_state_allocations_are_flat(self):
+        camera = ManagedUSBCamera("operator", 0, 640, 480, 30)
+        _run_frames(camera, 20)  # warm up pool slots and the reusable capture buffer
+        slot_ids = [id(slot.buf) for slot in camera.frames._slots]
+        frame_buf = camera._frame_buf
+
+        tracemalloc.start()
+        try:
+            _run_frames(camera, 10)
+            baseline, _ = tracemalloc.get_traced_memory()
+            _run_frames(camera, 200)
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert current - baseline < 16 * 1024
+        assert camera._frame_buf is frame_buf
+        assert [id(slot.buf) for slot in camera.frames._slots] == slot_ids
+        assert camera.frames.seq == 230
+
+    def test_no_per_frame_bytes_copy(self):
+        camera = ManagedUSBCamera("operator", 0, 640, 480, 30)
+        _run_frames(camera, 5)
+        jpeg_size = camera.frames._latest.size
+
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            _run_frames(camera, 50)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Peak holds at most the transient imencode output, never a second tobytes() copy
+        assert peak - base < jpeg_size * 1.5 + 16 * 1024
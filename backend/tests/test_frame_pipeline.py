@@ -0,0 +1,93 @@
+"""Tests for app.services.frame_pipeline — crop/rotate/flip/overlay stages."""
+
+import numpy as np
+import pytest
+
+from app.services.camera_manager import CameraManager, ManagedUSBCamera
+from app.services.frame_pipeline import FramePipeline, build_pipeline
+
+
+def _frame(h=4, w=6):
+    """BGR frame whose blue channel encodes the pixel index."""
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    img[..., 0] = np.arange(h * w, dtype=np.uint8).reshape(h, w)
+    return img
+
+
+class TestStages:
+    """Each stage matches the equivalent NumPy operation."""
+
+    def test_crop_is_a_view(self):
+        img = _frame()
+        out = FramePipeline("top", {"crop": [1, 2, 3, 2]}).process(img, 0.0)
+        assert np.shares_memory(out, img)
+        np.testing.assert_array_equal(out, img[2:4, 1:4])
+
+    def test_crop_outside_frame_keeps_frame(self):
+        img = _frame()
+        out = FramePipeline("top", {"crop": [50, 50, 10, 10]}).process(img, 0.0)
+        assert out.shape == img.shape
+
+    @pytest.mark.parametrize("degrees,k", [(90, -1), (180, 2), (270, 1)])
+    def test_rotate(self, degrees, k):
+        img = _frame()
+        out = FramePipeline("top", {"rotate": degrees}).process(img, 0.0)
+        np.testing.assert_array_equal(out, np.rot90(img, k))
+
+    def test_crop_rotate_flip_order(self):
+        img = _frame()
+        pipeline = FramePipeline("top", {"crop": [0, 0, 4, 2], "rotate": 90, "flip": "horizontal"})
+        out = pipeline.process(img, 0.0)
+        np.testing.assert_array_equal(out, np.fliplr(np.rot90(img[0:2, 0:4], -1)))
+        assert pipeline.stages == ["crop", "rotate", "flip"]
+
+    def test_buffers_reused_between_frames(self):
+        pipeline = FramePipeline("top", {"rotate": 90, "flip": "vertical"})
+        first = pipeline.process(_frame(), 0.0)
+        second = pipeline.process(_frame(), 0.0)
+        assert first is second
+
+    def test_overlay_never_draws_into_input(self):
+        img = np.zeros((60, 200, 3), dtype=np.uint8)
+        out = FramePipeline("top", {"overlay": "{key} {time}"}).process(img, 1_700_000_000.0)
+        assert not img.any()
+        assert out.any()
+
+    def test_stage_timings_recorded(self):
+        pipeline = FramePipeline("top", {"rotate": 180, "overlay": "x"})
+        pipeline.process(np.zeros((40, 80, 3), dtype=np.uint8), 0.0)
+        assert set(pipeline.stage_ms) == {"rotate", "overlay"}
+
+
+class TestConfig:
+    """Invalid or empty specs build no pipeline."""
+
+    @pytest.mark.parametrize("spec", [None, {}, {"rotate": 0}, {"rotate": 45}, {"flip": "sideways"}, {"crop": [0, 0, 0, 5]}])
+    def test_no_pipeline(self, spec):
+        assert build_pipeline("top", spec) is None
+
+
+class TestCameraIntegration:
+    """The processed frame is what gets encoded, once, for every consumer."""
+
+    def test_processed_frame_published_and_timed(self):
+        manager = CameraManager()
+        camera = ManagedUSBCamera("operator", 0, 64, 48, 30)
+        manager.cameras["operator"] = camera
+        manager.set_processing("operator", {"rotate": 90})
+        seen = []
+        camera.frame_sinks.append(lambda img, _: seen.append(img.shape))
+
+        camera._publish_image(np.zeros((48, 64, 3), dtype=np.uint8), 0.0)
+
+        assert seen == [(64, 48, 3)]
+        assert set(camera.stage_timings()) == {"rotate", "encode"}
+
+    def test_unchanged_spec_keeps_pipeline(self):
+        manager = CameraManager()
+        manager.set_processing("top", {"flip": "both"})
+        pipeline = manager.processing["top"]
+        manager.set_processing("top", {"flip": "both"})
+        assert manager.processing["top"] is pipeline
+        manager.set_processing("top", None)
+        assert "top" not in manager.processing
@@ -0,0 +1,138 @@
+"""Tests for app.services.frame_quality — exposure, blur and frozen-feed metrics."""
+
+import os
+import statistics
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.frame_quality import FROZEN_AFTER_S, FrameQualityMonitor, RecordedFrameTap, lerobot_dataset_root
+
+
+def _textured(seed=0, h=480, w=640):
+    rng = np.random.default_rng(seed)
+    return rng.integers(30, 220, size=(h, w, 3), dtype=np.uint8)
+
+
+class TestMetrics:
+    """Exposure and blur metrics respond to the image content."""
+
+    def test_overexposed(self):
+        mon = FrameQualityMonitor()
+        mon.update(np.full((480, 640, 3), 255, dtype=np.uint8), time.time())
+        assert mon.latest["clipped_high"] == pytest.approx(1.0)
+        assert "overexposed" in mon.flags()
+
+    def test_underexposed(self):
+        mon = FrameQualityMonitor()
+        mon.update(np.zeros((480, 640, 3), dtype=np.uint8), time.time())
+        assert mon.latest["clipped_low"] == pytest.approx(1.0)
+        assert "underexposed" in mon.flags()
+
+    def test_blur_score_drops_when_blurred(self):
+        sharp = _textured()
+        blurred = cv2.GaussianBlur(sharp, (0, 0), 8)
+        a, b = FrameQualityMonitor(), FrameQualityMonitor()
+        a.update(sharp, time.time())
+        b.update(blurred, time.time())
+        assert b.latest["blur"] < a.latest["blur"] / 10
+        assert "blurry" in b.flags()
+        assert a.flags() == []
+
+
+class TestFrozen:
+    """Identical frames for FROZEN_AFTER_S raise the frozen flag; sensor noise does not."""
+
+    def test_identical_frames_flag_frozen(self):
+        mon = FrameQualityMonitor()
+        img = _textured()
+        now = time.time()
+        mon.update(img, now - 2.0)
+        mon.update(img, now - 1.5)
+        assert "frozen" not in mon.flags()
+        mon.update(img, now - 1.5 + FROZEN_AFTER_S)
+        assert "frozen" in mon.flags()
+
+    def test_changing_frames_not_frozen(self):
+        mon = FrameQualityMonitor()
+        now = time.time()
+        for i in range(5):
+            mon.update(_textured(seed=i), now - 2.0 + i * 0.5)
+        assert "frozen" not in mon.flags()
+
+    def test_stalled_when_no_new_frames(self):
+        mon = FrameQualityMonitor()
+        mon.update(_textured(), time.time() - 5.0)
+        assert "stalled" in mon.flags()
+
+
+class TestSeries:
+    """History is a bounded ring returned oldest first."""
+
+    def test_ring_wraps(self):
+        mon = FrameQualityMonitor(history=4)
+        img = np.full((48, 64, 3), 100, dtype=np.uint8)
+        for t in range(6):
+            mon.update(img, float(t))
+        series = mon.series()
+        assert series["t"] == [2.0, 3.0, 4.0, 5.0]
+        assert series["diff"][0] == 0.0
+
+    def test_first_diff_is_none_and_window(self):
+        mon = FrameQualityMonitor()
+        img = np.full((48, 64, 3), 100, dtype=np.uint8)
+        for t in range(5):
+            mon.update(img, float(t))
+        assert mon.series()["diff"][0] is None
+        assert mon.series(seconds=1.5)["t"] == [3.0, 4.0]
+
+
+def test_cost_per_frame_is_small():
+    mon = FrameQualityMonitor()
+    frames = [_textured(seed=i) for i in range(2)]
+    costs = []
+    for i in range(60):
+        mon.update(frames[i % 2], float(i))
+        costs.append(mon.compute_ms)
+    assert statistics.median(costs) < 1.0
+
+
+class TestRecordedFrameTap:
+    """Frames lerobot-record writes into the dataset are sampled per camera."""
+
+    def _write(self, root, camera, episode, frame, img):
+        path = root / "images" / f"observation.images.{camera}" / f"episode_{episode:06d}" / f"frame_{frame:06d}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(path), img)
+        return path
+
+    def test_samples_newest_complete_frame(self, tmp_path):
+        tap = RecordedFrameTap(tmp_path, ["top", "left_wrist"])
+        assert tap.summary()["top"]["flags"] == []
+        self._write(tmp_path, "top", 0, 0, _textured())
+        self._write(tmp_path, "top", 0, 1, np.zeros((480, 640, 3), dtype=np.uint8))
+        self._write(tmp_path, "top", 1, 0, np.zeros((480, 640, 3), dtype=np.uint8))
+        self._write(tmp_path, "top", 1, 1, _textured(1))
+        tap.sample_once()
+        summary = tap.summary()
+        # Episode 1, second-newest file (the newest may still be being written)
+        assert summary["top"]["frame"] == "frame_000000.png"
+        assert "underexposed" in summary["top"]["flags"]
+        assert summary["left_wrist"]["frame"] is None
+
+    def test_ignores_frames_from_earlier_sessions(self, tmp_path):
+        path = self._write(tmp_path, "top", 0, 0, _textured())
+        old = time.time() - 60
+        os.utime(path, (old, old))
+        tap = RecordedFrameTap(tmp_path, ["top"])
+        tap.sample_once()
+        assert tap.summary()["top"]["frame"] is None
+
+    def test_dataset_root_follows_hf_env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("HF_LEROBOT_HOME", raising=False)
+        monkeypatch.setenv("HF_HOME", str(tmp_path))
+        assert lerobot_dataset_root("tensi/ds") == tmp_path / "lerobot" / "tensi" / "ds"
+        monkeypatch.setenv("HF_LEROBOT_HOME", str(tmp_path / "lr"))
+        assert lerobot_dataset_root("tensi/ds") == tmp_path / "lr" / "tensi" / "ds"
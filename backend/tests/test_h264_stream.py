@@ -0,0 +1,185 @@
+"""Tests for app.services.h264_stream — Annex-B scanning, fan-out and metrics (no ffmpeg needed)."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services import h264_stream
+from app.services.h264_stream import H264Encoder, H264Hub, H264Subscriber, NalScanner
+
+SPS = b"\x00\x00\x00\x01\x67\x42\x00\x1e"
+PPS = b"\x00\x00\x00\x01\x68\xce\x38\x80"
+IDR = b"\x00\x00\x00\x01\x65\x88\x84\x00\x33"  # first_mb_in_slice = 0
+P_FRAME = b"\x00\x00\x00\x01\x41\x9a\x02\x04"  # first_mb_in_slice = 0
+P_SLICE2 = b"\x00\x00\x00\x01\x41\x1a\x02\x04"  # later slice of the same picture
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class TestNalScanner:
+    """NalScanner finds NAL headers even when start codes straddle chunks."""
+
+    def test_whole_stream(self):
+        data, nals = NalScanner().scan(SPS + PPS + IDR + P_FRAME + P_SLICE2)
+        assert [t for _, t, _ in nals] == [7, 8, 5, 1, 1]
+        assert [f for _, _, f in nals] == [False, False, True, True, False]
+        assert data[nals[0][0]] == 0x67
+
+    def test_split_chunks_report_each_nal_once(self):
+        stream = SPS + PPS + IDR + P_FRAME
+        scanner = NalScanner()
+        types = []
+        for i in range(0, len(stream), 3):
+            _, nals = scanner.scan(stream[i:i + 3])
+            types += [t for _, t, _ in nals]
+        assert types == [7, 8, 5, 1]
+
+    def test_pending_start_code_completed_later(self):
+        scanner = NalScanner()
+        _, nals = scanner.scan(b"\x00\x00")
+        assert nals == []
+        _, nals = scanner.scan(b"\x01\x65\x88")
+        assert [(t, f) for _, t, f in nals] == [(5, True)]
+
+
+class TestEncoderFanOut:
+    """_handle_output() syncs new subscribers at an SPS and shares output."""
+
+    def _encoder(self):
+        return H264Encoder("top", "low", 320, 240, 30, 600)
+
+    def test_new_subscriber_waits_for_sps(self, loop):
+        enc = self._encoder()
+        sub = H264Subscriber(loop)
+        enc.subscribe(sub)
+
+        enc._handle_output(P_FRAME)
+        assert sub.synced is False
+
+        enc._handle_output(P_FRAME + SPS + PPS + IDR)
+        assert sub.synced is True
+        chunk = loop.run_until_complete(sub.next_chunk(timeout=0.1))
+        assert chunk.startswith(h264_stream.ANNEXB_START + b"\x67")
+        assert chunk.endswith(IDR)
+
+        enc._handle_output(P_FRAME)
+        assert loop.run_until_complete(sub.next_chunk(timeout=0.1)) == P_FRAME
+
+    def test_overflow_resyncs_at_next_keyframe(self, loop, monkeypatch):
+        monkeypatch.setattr(h264_stream, "SUBSCRIBER_MAX_QUEUED", 2)
+        enc = self._encoder()
+        sub = H264Subscriber(loop)
+        enc.subscribe(sub)
+        enc._handle_output(SPS + PPS + IDR)
+        enc._handle_output(P_FRAME)
+        enc._handle_output(P_FRAME)
+
+        assert sub.synced is False
+        assert sub.resyncs == 1
+
+    def test_frame_counting_and_latency(self):
+        enc = self._encoder()
+        enc._feed_times.extend([0.0, 0.0])
+        enc._handle_output(SPS + PPS + IDR + P_SLICE2)
+        enc._handle_output(P_FRAME)
+
+        stats = enc.stats()
+        assert stats["frames_out"] == 2
+        assert stats["encode_latency_ms"]["avg"] is not None
+        assert stats["resolution"] == [320, 240]
+
+
+class TestEncoderFeed:
+    """feed() scales into the reusable input buffer and drops while ffmpeg is busy."""
+
+    def test_scales_and_drops(self):
+        enc = H264Encoder("top", "low", 320, 240, 30, 600)
+        img = np.full((480, 640, 3), 7, dtype=np.uint8)
+
+        enc.feed(img, 0.0)
+        assert enc._input.shape == (240, 320, 3)
+        assert int(enc._input[0, 0, 0]) == 7
+
+        enc.feed(img, 0.0)  # writer has not consumed the first frame yet
+        assert (enc.frames_in, enc.frames_dropped) == (1, 1)
+
+    def test_command_is_zerolatency_annexb(self):
+        cmd = H264Encoder("top", "full", 641, 481, 30, 500).command()
+        assert "zerolatency" in cmd
+        assert cmd[cmd.index("-f", cmd.index("pipe:0")) + 1] == "h264"
+        assert "640x480" in cmd
+
+
+class _FakeProc:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+class TestHub:
+    """H264Hub shares encoders and always detaches the ones it stops."""
+
+    @pytest.fixture(autouse=True)
+    def fake_ffmpeg(self, monkeypatch):
+        def start(encoder):
+            encoder._proc = _FakeProc()
+
+        def stop(encoder):
+            encoder._stop.set()
+
+        monkeypatch.setattr(H264Encoder, "start", start)
+        monkeypatch.setattr(H264Encoder, "stop", stop)
+
+    def _subscribe(self, hub, sinks, loop):
+        sub = H264Subscriber(loop)
+        encoder = hub.subscribe("top", "low", (320, 240), 30, 600, sinks.append, sinks.remove, sub)
+        return encoder, sub
+
+    def test_shared_until_last_unsubscribe(self, loop):
+        hub, sinks = H264Hub(), []
+        first, sub1 = self._subscribe(hub, sinks, loop)
+        second, sub2 = self._subscribe(hub, sinks, loop)
+        assert first is second and sinks == [first.feed]
+        hub.unsubscribe(first, sub1)
+        assert sinks == [first.feed]
+        hub.unsubscribe(second, sub2)
+        assert sinks == [] and first.exited
+
+    def test_stop_all_detaches(self, loop):
+        hub, sinks = H264Hub(), []
+        encoder, sub = self._subscribe(hub, sinks, loop)
+        hub.stop_all()
+        assert sinks == [] and encoder.exited
+        hub.unsubscribe(encoder, sub)
+        assert hub.stats() == []
+
+    def test_dead_encoder_is_replaced(self, loop):
+        hub, sinks = H264Hub(), []
+        dead, _ = self._subscribe(hub, sinks, loop)
+        dead._proc.returncode = 1
+        assert dead.exited
+        fresh, _ = self._subscribe(hub, sinks, loop)
+        assert fresh is not dead
+        assert sinks == [fresh.feed]
+
+    def test_failed_start_ends_viewers_that_joined_meanwhile(self, loop, monkeypatch):
+        hub, sinks, joined = H264Hub(), [], []
+
+        def start(encoder):
+            # A second viewer subscribes while ffmpeg is still starting, then the start fails
+            joined.append(self._subscribe(hub, sinks, loop)[0])
+            raise OSError("ffmpeg not found")
+
+        monkeypatch.setattr(H264Encoder, "start", start)
+        with pytest.raises(OSError):
+            self._subscribe(hub, sinks, loop)
+        assert joined[0].exited
+        assert sinks == [] and hub.stats() == []
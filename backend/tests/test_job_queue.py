@@ -0,0 +1,215 @@
+"""Tests for the persistent job queue and its scheduler."""
+
+import json
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services import job_queue
+from app.services.job_queue import JobQueue, expand_sweep
+from app.services.process_manager import ProcessManager, ProcessMode, _StartRequest
+
+
+def _script_command(job):
+    """Run the job's `script` param with this interpreter instead of lerobot."""
+    return [sys.executable, "-c", job.params.get("script", "")]
+
+
+@pytest.fixture(autouse=True)
+def python_jobs():
+    with patch.object(job_queue, "build_command", _script_command):
+        yield
+
+
+def _wait(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+SLEEP = "import time; time.sleep(30)"
+
+
+def _queue(tmp_path, **kwargs) -> JobQueue:
+    kwargs.setdefault("interactive_modes", lambda: [])
+    queue = JobQueue(tmp_path / "jobs", **kwargs)
+    queue.lerobot_path = tmp_path
+    return queue
+
+
+class TestExpandSweep:
+    def test_cartesian_product_with_distinct_names(self):
+        runs = expand_sweep(
+            {"job_name": "act", "output_dir": "outputs/act", "policy_type": "act"},
+            {"policy_type": ["act", "diffusion"], "dataset_repo_id": ["tensi/a", "tensi/b"]},
+        )
+        assert len(runs) == 4
+        assert {(r["policy_type"], r["dataset_repo_id"]) for r in runs} == {
+            ("act", "tensi/a"), ("act", "tensi/b"), ("diffusion", "tensi/a"), ("diffusion", "tensi/b"),
+        }
+        assert runs[0]["job_name"] == "act_policy_type-act_dataset_repo_id-tensi-a"
+        assert runs[0]["output_dir"] == "outputs/act_policy_type-act_dataset_repo_id-tensi-a"
+        assert len({r["output_dir"] for r in runs}) == 4
+
+    def test_rejects_unknown_field_and_empty_values(self):
+        with pytest.raises(ValueError, match="Cannot sweep"):
+            expand_sweep({}, {"batch_size": [8, 16]})
+        with pytest.raises(ValueError, match="non-empty"):
+            expand_sweep({}, {"policy_type": []})
+
+    def test_rejects_oversized_sweep(self):
+        values = list(range(job_queue.MAX_SWEEP_JOBS + 1))
+        with pytest.raises(ValueError, match="combinations"):
+            expand_sweep({}, {"job_name": values})
+
+
+class TestScheduling:
+    def test_cpu_jobs_share_core_budget(self, tmp_path):
+        queue = _queue(tmp_path, cpu_core_budget=3)
+        jobs = [queue.submit("train", {"device": "cpu", "script": SLEEP}, cores=c) for c in (2, 1, 1)]
+        try:
+            started = queue.schedule()
+            assert [j.id for j in started] == [jobs[0].id, jobs[1].id]
+            assert jobs[2].state == "queued"
+        finally:
+            queue.shutdown()
+
+    def test_priority_first_and_blocked_job_holds_its_class(self, tmp_path):
+        queue = _queue(tmp_path, cpu_core_budget=2)
+        running = queue.submit("train", {"device": "cpu", "script": SLEEP}, cores=1)
+        try:
+            queue.schedule()
+            big = queue.submit("train", {"device": "cpu", "script": SLEEP}, cores=2, priority=5)
+            small = queue.submit("train", {"device": "cpu", "script": SLEEP}, cores=1)
+            gpu = queue.submit("train", {"script": SLEEP})
+            started = queue.schedule()
+            # The 2-core job does not fit; the 1-core job must not jump it, but the GPU job may start
+            assert [j.id for j in started] == [gpu.id]
+            assert (running.state, big.state, small.state) == ("running", "queued", "queued")
+        finally:
+            queue.shutdown()
+
+    def test_robot_jobs_wait_for_interactive_robot_process(self, tmp_path):
+        modes = [ProcessMode.TELEOPERATE]
+        queue = _queue(tmp_path, interactive_modes=lambda: modes)
+        first = queue.submit("replay", {"script": SLEEP})
+        second = queue.submit("replay", {"script": SLEEP})
+        try:
+            assert first.resource_class == "robot"
+            assert queue.schedule() == []
+            modes.clear()
+            assert queue.schedule() == [first]
+            assert queue.running_robot_job() is first
+            assert queue.schedule() == []
+            assert second.state == "queued"
+        finally:
+            queue.shutdown()
+
+    def test_claimed_robot_holds_robot_jobs(self, tmp_path):
+        queue = _queue(tmp_path)
+        replay = queue.submit("replay", {"script": SLEEP})
+        try:
+            assert queue.claim("robot") is None
+            assert queue.schedule() == []
+            queue.release("robot")
+            assert queue.schedule() == [replay]
+            # The robot job now owns the robot, so an interactive claim is refused
+            assert queue.claim("robot") is replay
+        finally:
+            queue.shutdown()
+
+    def test_interactive_training_uses_a_gpu_slot(self, tmp_path):
+        queue = _queue(tmp_path, gpu_slots=1, interactive_modes=lambda: [ProcessMode.TRAIN])
+        queue.submit("train", {"script": SLEEP})
+        assert queue.schedule() == []
+
+    def test_gpu_claim_respects_slots_held_by_jobs(self, tmp_path):
+        queue = _queue(tmp_path, gpu_slots=1)
+        train = queue.submit("train", {"script": SLEEP})
+        try:
+            assert queue.claim("gpu") is None
+            assert queue.schedule() == []
+            queue.release("gpu")
+            assert queue.schedule() == [train]
+            # The job fills the only slot, so an interactive training start is refused
+            assert queue.claim("gpu") is train
+        finally:
+            queue.shutdown()
+
+    def test_counts_interactive_processes_of_every_station(self, tmp_path):
+        ProcessManager.for_station("cell2")._pending_start = _StartRequest([], ProcessMode.TRAIN)
+        ProcessManager.for_station("cell3")._pending_start = _StartRequest([], ProcessMode.REPLAY)
+        assert job_queue._interactive_modes() == [ProcessMode.TRAIN, ProcessMode.REPLAY]
+        queue = _queue(tmp_path, gpu_slots=1, interactive_modes=job_queue._interactive_modes)
+        queue.submit("train", {"script": SLEEP})
+        queue.submit("replay", {"script": SLEEP})
+        assert queue.schedule() == []
+
+    def test_rejects_cores_over_budget(self, tmp_path):
+        queue = _queue(tmp_path, cpu_core_budget=2)
+        with pytest.raises(ValueError, match="core budget"):
+            queue.submit("train", {"device": "cpu"}, cores=3)
+        with pytest.raises(ValueError, match="kind"):
+            queue.submit("record", {})
+
+
+class TestLifecycle:
+    def test_success_and_failure_with_logs(self, tmp_path):
+        queue = _queue(tmp_path)
+        ok = queue.submit("train", {"script": "print('step:1 loss:0.5')"})
+        queue.start()
+        try:
+            _wait(lambda: ok.state == "succeeded")
+            bad = queue.submit("train", {"script": "import sys; print('CUDA out of memory'); sys.exit(3)"})
+            _wait(lambda: bad.state == "failed")
+        finally:
+            queue.shutdown()
+        assert ok.exit_code == 0
+        assert queue.read_logs(ok.id)["lines"] == ["step:1 loss:0.5"]
+        assert bad.exit_code == 3
+        assert "out of GPU memory" in bad.error
+
+    def test_live_logs_while_running(self, tmp_path):
+        queue = _queue(tmp_path)
+        job = queue.submit("train", {"script": "import time; print('hello', flush=True); time.sleep(30)"})
+        try:
+            queue.schedule()
+            _wait(lambda: queue.read_logs(job.id)["lines"] == ["hello"])
+            logs = queue.read_logs(job.id)
+            assert logs["live"] is True
+            assert queue.read_logs(job.id, since=logs["log_seq"])["lines"] == []
+        finally:
+            queue.shutdown()
+
+    def test_cancel_queued_and_running(self, tmp_path):
+        queue = _queue(tmp_path, cpu_core_budget=1)
+        running = queue.submit("train", {"device": "cpu", "script": SLEEP})
+        queued = queue.submit("train", {"device": "cpu", "script": SLEEP})
+        queue.schedule()
+        assert queue.cancel(queued.id).state == "cancelled"
+        queue.cancel(running.id)
+        _wait(lambda: running.state == "cancelled")
+        assert queue.jobs()[1].state == "cancelled"
+        queue.remove(queued.id)
+        assert [j.id for j in queue.jobs()] == [running.id]
+        with pytest.raises(KeyError):
+            queue.get(queued.id)
+
+    def test_persists_and_fails_interrupted_jobs(self, tmp_path):
+        queue = _queue(tmp_path)
+        running = queue.submit("train", {"script": SLEEP})
+        queued = queue.submit("train", {"script": SLEEP}, priority=-1)
+        queue.schedule()
+        # Simulate the backend going away with the job still running
+        saved = json.loads((tmp_path / "jobs" / "jobs.json").read_text())
+        assert {j["id"]: j["state"] for j in saved["jobs"]} == {running.id: "running", queued.id: "queued"}
+
+        reloaded = JobQueue(tmp_path / "jobs")
+        queue.shutdown()
+        assert reloaded.get(running.id).state == "failed"
+        assert reloaded.get(running.id).error == "Interrupted by backend restart"
+        assert reloaded.get(queued.id).state == "queued"
+        assert reloaded.get(queued.id).priority == -1
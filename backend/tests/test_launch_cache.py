@@ -0,0 +1,150 @@
+"""Tests for direct launch of lerobot scripts from the cached environment."""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.launch_cache import LaunchCache, is_import_failure, is_uv_output
+from app.services.process_manager import ProcessManager, ProcessMode, _StartRequest
+from app.services.startup_trace import StartupTrace
+
+CMD = ["uv", "run", "lerobot-teleoperate", "--robot.type=widowxai_follower_robot"]
+
+
+@pytest.fixture()
+def project(tmp_path: Path) -> Path:
+    """A lerobot checkout with a lockfile and a synced venv holding two console scripts."""
+    root = tmp_path / "lerobot_trossen"
+    (root / ".venv" / "bin").mkdir(parents=True)
+    (root / "uv.lock").write_text("version = 1\n")
+    (root / "pyproject.toml").write_text("[project]\nname = 'lerobot'\n")
+    for name in ("lerobot-teleoperate", "lerobot-record"):
+        script = root / ".venv" / "bin" / name
+        script.write_text(f"#!{sys.executable}\nimport os, sys\nprint('started', os.environ['VIRTUAL_ENV'], *sys.argv[1:])\n")
+        script.chmod(0o755)
+    return root
+
+
+def _record(cache: LaunchCache, project: Path, boot_ms: float = 900.0) -> None:
+    cache.record(cache.resolve(CMD, project), boot_ms)
+
+
+class TestResolve:
+    def test_uv_run_until_recorded(self, tmp_path, project):
+        launch = LaunchCache(tmp_path / "cache.json").resolve(CMD, project)
+        assert launch.cmd == CMD
+        assert launch.direct is False
+        assert launch.to_dict()["mode"] == "uv run"
+
+    def test_direct_after_record_and_reload(self, tmp_path, project):
+        _record(LaunchCache(tmp_path / "cache.json"), project)
+        launch = LaunchCache(tmp_path / "cache.json").resolve(CMD, project)
+        assert launch.direct is True
+        assert launch.cmd == [str(project / ".venv" / "bin" / "lerobot-teleoperate"), *CMD[3:]]
+        assert launch.env["VIRTUAL_ENV"] == str(project / ".venv")
+        assert launch.env["PATH"].startswith(str(project / ".venv" / "bin"))
+        assert launch.uv_boot_ms == 900.0
+
+    def test_other_scripts_of_the_synced_env_run_directly(self, tmp_path, project):
+        cache = LaunchCache(tmp_path / "cache.json")
+        _record(cache, project)
+        launch = cache.resolve(["uv", "run", "lerobot-record", "--x"], project)
+        assert launch.direct is True
+        assert launch.uv_boot_ms is None
+
+    def test_lock_change_falls_back_to_uv_run(self, tmp_path, project):
+        cache = LaunchCache(tmp_path / "cache.json")
+        _record(cache, project)
+        (project / "uv.lock").write_text("version = 1\n# bumped\n")
+        assert cache.resolve(CMD, project).direct is False
+        (project / "uv.lock").write_text("version = 1\n")
+        assert cache.resolve(CMD, project).direct is True
+
+    def test_missing_script_or_lock(self, tmp_path, project):
+        cache = LaunchCache(tmp_path / "cache.json")
+        _record(cache, project)
+        assert cache.resolve(["uv", "run", "lerobot-train"], project).direct is False
+        assert cache.resolve(["python", "-m", "x"], project).script is None
+        (project / "uv.lock").unlink()
+        assert cache.resolve(CMD, project).direct is False
+
+    def test_invalidate(self, tmp_path, project):
+        cache = LaunchCache(tmp_path / "cache.json")
+        _record(cache, project)
+        cache.invalidate(str(project))
+        assert LaunchCache(tmp_path / "cache.json").resolve(CMD, project).direct is False
+
+
+def test_uv_output_lines():
+    assert is_uv_output("Resolved 212 packages in 3ms")
+    assert is_uv_output(" + torch==2.5.1")
+    assert not is_uv_output("INFO 2025-01-01 teleoperate.py:99 connected")
+    assert is_import_failure("ModuleNotFoundError: No module named 'lerobot'")
+    assert not is_import_failure("ConnectionError: robot at 10.0.0.1 not reachable")
+
+
+class TestProcessManagerLaunch:
+    def _run(self, project: Path, trace: StartupTrace | None = None) -> ProcessManager:
+        pm = ProcessManager()
+        pm.set_lerobot_path(project)
+        pm._start(_StartRequest(list(CMD), ProcessMode.TELEOPERATE, trace))
+        pm._reader_thread.join(timeout=10)
+        return pm
+
+    def test_direct_start_reports_saved_time(self, tmp_launch_cache, project):
+        _record(tmp_launch_cache, project, boot_ms=60_000.0)
+        trace = StartupTrace("teleoperate")
+        pm = self._run(project, trace)
+        assert f"started {project / '.venv'} --robot.type=widowxai_follower_robot" in pm.logs.read().lines[-1]
+        launcher = trace.to_dict()["launcher"]
+        assert launcher["mode"] == "direct"
+        assert 0 < launcher["saved_ms"] < 60_000.0
+
+    def test_uv_run_start_records_the_env(self, tmp_launch_cache, project, tmp_path, monkeypatch):
+        # Stand-in for uv: prints a sync line, then runs the venv's script like `uv run` would
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        uv = bin_dir / "uv"
+        uv.write_text(
+            f"#!{sys.executable}\nimport os, sys\nprint('Resolved 3 packages in 1ms', flush=True)\n"
+            "os.environ['VIRTUAL_ENV'] = os.path.abspath('.venv')\n"
+            "os.execv(os.path.join('.venv', 'bin', sys.argv[2]), sys.argv[2:])\n"
+        )
+        uv.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        trace = StartupTrace("teleoperate")
+        self._run(project, trace)
+        assert trace.to_dict()["launcher"]["mode"] == "uv run"
+        assert tmp_launch_cache.resolve(CMD, project).direct is True
+
+    def test_early_direct_failure_drops_the_cache(self, tmp_launch_cache, project):
+        _record(tmp_launch_cache, project)
+        script = project / ".venv" / "bin" / "lerobot-teleoperate"
+        script.write_text(f"#!{sys.executable}\nraise ImportError('broken env')\n")
+        self._run(project)
+        deadline = time.monotonic() + 5
+        while tmp_launch_cache.resolve(CMD, project).direct:
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+
+    def test_unexecutable_script_drops_the_cache(self, tmp_launch_cache, project, tmp_path):
+        _record(tmp_launch_cache, project)
+        script = project / ".venv" / "bin" / "lerobot-teleoperate"
+        script.write_text(f"#!{tmp_path / 'gone' / 'python'}\n")
+        pm = ProcessManager()
+        pm.set_lerobot_path(project)
+        pm._start(_StartRequest(list(CMD), ProcessMode.TELEOPERATE))
+        assert pm.get_status().running is False
+        assert tmp_launch_cache.resolve(CMD, project).direct is False
+
+    def test_lerobot_failure_keeps_the_cache(self, tmp_launch_cache, project):
+        _record(tmp_launch_cache, project)
+        script = project / ".venv" / "bin" / "lerobot-teleoperate"
+        script.write_text(f"#!{sys.executable}\nraise ConnectionError('robot at 10.0.0.1 not reachable')\n")
+        pm = self._run(project)
+        pm._process.wait(timeout=5)
+        assert "ConnectionError: robot at 10.0.0.1 not reachable" in pm.logs.read().lines
+        assert tmp_launch_cache.resolve(CMD, project).direct is True
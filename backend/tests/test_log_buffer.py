@@ -0,0 +1,69 @@
+"""Tests for app.services.log_buffer — bounded log ring with sequence cursors."""
+
+import asyncio
+
+import pytest
+
+from app.services.log_buffer import LogRing, LogSubscriber
+
+
+def test_read_returns_only_new_lines():
+    ring = LogRing(capacity=10)
+    for i in range(3):
+        ring.append(f"l{i}")
+    batch = ring.read(0)
+    assert batch.lines == ["l0", "l1", "l2"]
+    assert batch.last_seq == 3
+    assert ring.append("l3") == 4
+    assert ring.read(batch.last_seq).lines == ["l3"]
+    assert ring.read(4).lines == []
+
+
+def test_wraps_at_capacity():
+    ring = LogRing(capacity=4)
+    for i in range(10):
+        ring.append(f"l{i}")
+    assert len(ring) == 4
+    assert ring.first_seq == 7
+    assert ring.tail(100) == ["l6", "l7", "l8", "l9"]
+    # A cursor older than the buffer gets what is left, and is told how much it missed
+    batch = ring.read(2)
+    assert batch.lines == ["l6", "l7", "l8", "l9"]
+    assert batch.skipped == 4
+    assert ring.read(0, limit=2).lines == ["l8", "l9"]
+
+
+def test_clear_starts_new_run():
+    ring = LogRing(capacity=4)
+    ring.append("old")
+    ring.clear()
+    assert len(ring) == 0
+    assert ring.run_start_seq == 2
+    assert ring.append("new") == 2
+    batch = ring.read(1)
+    assert (batch.lines, batch.run_start_seq) == (["new"], 2)
+    # Cursors from an earlier run or a previous backend read the whole run
+    assert ring.read(0).lines == ["new"]
+    assert ring.read(999).lines == ["new"]
+
+
+def test_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        LogRing(capacity=0)
+
+
+def test_subscriber_wakes_once_per_batch():
+    async def run():
+        ring = LogRing(capacity=10)
+        subscriber = LogSubscriber(asyncio.get_running_loop())
+        ring.subscribe(subscriber)
+        assert not await subscriber.wait(timeout=0.01)
+        for i in range(5):
+            ring.append(f"l{i}")
+        assert await subscriber.wait(timeout=1.0)
+        assert not await subscriber.wait(timeout=0.01)
+        ring.unsubscribe(subscriber)
+        ring.append("after")
+        assert not await subscriber.wait(timeout=0.01)
+
+    asyncio.run(run())
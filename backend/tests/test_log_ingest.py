@@ -0,0 +1,64 @@
+"""Tests for app.services.log_ingest — chunked byte ingestion with progress-bar compaction."""
+
+import os
+import threading
+
+from app.services.log_ingest import LineAssembler, pump
+
+
+class Collector:
+    def __init__(self):
+        self.lines: list[str] = []
+        self.progress: list[str | None] = []
+        self.assembler = LineAssembler(self.lines.append, self.progress.append)
+
+
+def test_lines_split_across_chunks():
+    c = Collector()
+    c.assembler.feed("first li")
+    c.assembler.feed("ne\nsecond\n\nthird")
+    assert c.lines == ["first line", "second", ""]
+    c.assembler.flush()
+    assert c.lines[-1] == "third"
+
+
+def test_carriage_return_updates_progress_slot():
+    c = Collector()
+    c.assembler.feed("Training\n")
+    for step in range(1, 100):
+        c.assembler.feed(f"\r{step:3d}%|{'#' * (step // 10)}")
+    assert c.lines == ["Training"]
+    assert c.progress[-1].startswith(" 99%")
+    # The bar's final state becomes one ordinary line and the slot clears
+    c.assembler.feed("\r100%|##########\nDone\n")
+    assert c.lines == ["Training", "100%|##########", "Done"]
+    assert c.progress[-1] is None
+
+
+def test_multibyte_character_split_between_reads():
+    c = Collector()
+    data = "temp 25°C\n".encode()
+    split = data.index(b"\xb0")
+    c.assembler.feed_bytes(data[:split])
+    c.assembler.feed_bytes(data[split:])
+    assert c.lines == ["temp 25°C"]
+
+
+def test_crlf_line_endings():
+    c = Collector()
+    c.assembler.feed("a\r\nb\r\n")
+    assert c.lines == ["a", "b"]
+    assert c.progress == []
+
+
+def test_pump_reads_pipe_to_eof():
+    c = Collector()
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=pump, args=(read_fd, c.assembler, 0.05))
+    reader.start()
+    os.write(write_fd, b"epoch 1\n" + b"".join(b"\rstep %d" % i for i in range(500)) + b"\n")
+    os.close(write_fd)
+    reader.join(timeout=5.0)
+    os.close(read_fd)
+    assert c.lines == ["epoch 1", "step 499"]
+    assert len(c.progress) < 500
@@ -0,0 +1,51 @@
+"""Tests for app.services.loop_jitter — control-loop timing from teleop output."""
+
+from pathlib import Path
+
+from app.services.loop_jitter import MIN_SAMPLES, LoopJitterMonitor
+from app.services.process_manager import ProcessManager
+
+
+def test_percentiles_and_overruns():
+    monitor = LoopJitterMonitor()
+    monitor.reset(60.0)
+    for i in range(100):
+        ms = 30.0 if i % 50 == 0 else 16.7
+        assert monitor.observe(f"\x1b[8Atime: {ms:.2f}ms ({1000 / ms:.0f} Hz)")[0]
+    monitor.observe("RemoteLeaderTeleop remote action: 0.4ms")
+
+    stats = monitor.to_dict()
+    assert stats["samples"] == 100
+    assert stats["overruns"] == 2
+    assert stats["loop_ms"]["p50"] == 16.7
+    assert stats["loop_ms"]["p99"] == 30.0
+    assert stats["action_latency_ms"]["p50"] == 0.4
+    assert stats["warning"] is None
+
+
+def test_warns_once_when_budget_missed():
+    monitor = LoopJitterMonitor()
+    monitor.reset(30.0)
+    raised = [monitor.observe("time: 45.00ms (22 Hz)")[1] for _ in range(MIN_SAMPLES)]
+    assert [w for w in raised if w] == [monitor.to_dict()["warning"]]
+    assert "33.3 ms budget" in monitor.to_dict()["warning"]
+
+
+def test_disabled_without_target():
+    monitor = LoopJitterMonitor()
+    assert monitor.observe("time: 16.70ms (60 Hz)") == (False, None)
+    assert monitor.to_dict() is None
+
+
+def test_timing_lines_stay_out_of_log(mock_popen):
+    pm = ProcessManager()
+    pm.set_lerobot_path(Path("/tmp/fake"))
+    pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
+    pm._on_line("Connected follower")
+    for _ in range(10):
+        pm._on_line("time: 16.70ms (60 Hz)")
+
+    status = pm.get_status()
+    assert status.logs == ["Connected follower"]
+    assert status.control_loop["samples"] == 10
+    assert status.control_loop["target_fps"] == 60.0
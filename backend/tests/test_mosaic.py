@@ -0,0 +1,76 @@
+"""Tests for app.services.mosaic — tile compositing and the shared mosaic lifecycle."""
+
+import time
+
+import numpy as np
+
+from app.services.camera_manager import CameraManager
+from app.services.mosaic import MosaicCompositor
+
+
+class TestLayout:
+    """Tiles are arranged in a near-square grid on a preallocated canvas."""
+
+    def test_grid_for_four_cameras(self):
+        mosaic = MosaicCompositor(["left_wrist", "right_wrist", "top", "operator"], (32, 24), 10)
+        assert (mosaic.columns, mosaic.rows) == (2, 2)
+        assert mosaic.canvas.shape == (48, 64, 3)
+
+    def test_grid_for_three_cameras(self):
+        mosaic = MosaicCompositor(["a", "b", "c"], (32, 24), 10)
+        assert (mosaic.columns, mosaic.rows) == (2, 2)
+
+
+class TestTiles:
+    """Frame sinks downscale into their tile, keeping aspect ratio, at most at the mosaic rate."""
+
+    def test_tile_lands_in_its_cell(self):
+        mosaic = MosaicCompositor(["a", "b"], (40, 30), 10)
+        canvas = mosaic.canvas
+        sink = mosaic._make_sink(1, "b")
+        sink(np.full((60, 80, 3), 200, dtype=np.uint8), 0.0)
+
+        assert canvas is mosaic.canvas
+        assert int(canvas[25, 60, 0]) == 200  # inside tile 1 (x 40..80)
+        assert int(canvas[25, 20, 0]) == 0  # tile 0 untouched
+
+    def test_aspect_kept_and_centered(self):
+        mosaic = MosaicCompositor(["a"], (40, 30), 10)
+        sink = mosaic._make_sink(0, "a")
+        sink(np.full((80, 40, 3), 200, dtype=np.uint8), 0.0)  # portrait -> 15x30 tile
+
+        assert int(mosaic.canvas[20, 20, 0]) == 200
+        assert int(mosaic.canvas[20, 5, 0]) == 0
+        assert int(mosaic.canvas[20, 35, 0]) == 0
+
+    def test_rate_limited(self):
+        mosaic = MosaicCompositor(["a"], (40, 30), 1)
+        sink = mosaic._make_sink(0, "a")
+        sink(np.full((30, 40, 3), 100, dtype=np.uint8), 0.0)
+        sink(np.full((30, 40, 3), 250, dtype=np.uint8), 0.0)
+        assert int(mosaic.canvas[20, 20, 0]) == 100
+
+
+class TestSharedMosaic:
+    """CameraManager shares one compositor per layout and tears it down with the last viewer."""
+
+    def test_open_close(self):
+        manager = CameraManager()
+        first = manager.open_mosaic(["top"], (32, 24), 20)
+        second = manager.open_mosaic(["top"], (32, 24), 20)
+        try:
+            assert first is second
+            assert len(manager.frame_sinks["top"]) == 1
+
+            deadline = time.monotonic() + 2.0
+            while not first.frames.has_frame() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert first.frames.has_frame()
+        finally:
+            manager.close_mosaic(first)
+            assert manager.frame_sinks["top"]  # one viewer left
+            manager.close_mosaic(second)
+
+        assert manager.frame_sinks["top"] == []
+        assert manager.mosaics == []
+        assert first._thread is None
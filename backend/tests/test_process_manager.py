@@ -2,6 +2,7 @@
 
 import json
 import subprocess
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -117,6 +118,16 @@ class TestRecordArgs:
         assert "--dataset.episode_time_s=30" in cmd
         assert "--dataset.push_to_hub=true" in cmd
 
+    def test_record_samples_recorded_frames(self, mock_popen, monkeypatch, tmp_path):
+        monkeypatch.setenv("HF_LEROBOT_HOME", str(tmp_path))
+        pm = ProcessManager()
+        pm.set_lerobot_path(Path("/tmp/fake"))
+        robot_cfg = {"leader_ip": "10.0.0.1", "follower_ip": "10.0.0.2", "cameras": {"top": {}, "left_wrist": {}}}
+        pm.start_record(robot_cfg, {"repo_id": "user/data"})
+
+        assert pm._frame_tap.dataset_root == tmp_path / "user" / "data"
+        assert set(pm.get_recorded_quality()) == {"top", "left_wrist"}
+
     def test_record_remote_mode(self, mock_popen):
         pm = ProcessManager()
         pm.set_lerobot_path(Path("/tmp/fake"))
@@ -175,7 +186,7 @@ class TestReplayArgs:
 
 
 class TestStopLogic:
-    """stop() sends SIGINT and escalates to SIGKILL."""
+    """stop() sends SIGINT and escalates to SIGKILL in the background."""
 
     def test_stop_calls_send_signal(self, mock_popen):
         pm = ProcessManager()
@@ -199,7 +210,81 @@ class TestStopLogic:
 
         pm.stop()
         proc.send_signal.assert_called_once()
+        assert pm.wait_stopped(timeout=2.0)
         proc.kill.assert_called_once()
+        assert pm.get_status().stop["phase"] == "stopped"
+
+    def test_stop_does_not_block(self, mock_popen, monkeypatch):
+        pm = ProcessManager()
+        pm.set_lerobot_path(Path("/tmp/fake"))
+        pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
+
+        proc = mock_popen._mock_proc
+        exited = threading.Event()
+        proc.wait.side_effect = lambda timeout=None: exited.wait(timeout) or (_ for _ in ()).throw(
+            subprocess.TimeoutExpired(cmd="test", timeout=timeout)
+        )
+
+        pm.stop()
+        status = pm.get_status()
+        assert status.stopping and status.running
+        assert status.stop["phase"] == "graceful"
+
+        # A start requested meanwhile is queued, then runs once the process has exited
+        pm.start_train({})
+        assert mock_popen.call_count == 1
+        assert pm.get_status().stop["queued_start"] == "train"
+        exited.set()
+        assert pm.wait_stopped(timeout=2.0)
+        assert mock_popen.call_count == 2
+        assert pm.get_status().mode == ProcessMode.TRAIN
+
+    def test_queued_start_prepares_after_exit(self, mock_popen):
+        from app.services.startup_trace import StartupTrace
+
+        pm = ProcessManager()
+        pm.set_lerobot_path(Path("/tmp/fake"))
+        pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
+
+        proc = mock_popen._mock_proc
+        exited = threading.Event()
+        proc.wait.side_effect = lambda timeout=None: exited.wait(timeout) or (_ for _ in ()).throw(
+            subprocess.TimeoutExpired(cmd="test", timeout=timeout)
+        )
+        handed_over = []
+        trace = StartupTrace("record")
+        pm.start_record(
+            {"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}},
+            {},
+            trace=trace,
+            prepare=lambda: handed_over.append(proc.wait.call_count),
+        )
+        # Cameras stay with the old process until it has exited
+        assert pm.stopping and handed_over == []
+        exited.set()
+        assert pm.wait_stopped(timeout=2.0)
+        assert len(handed_over) == 1
+        assert mock_popen.call_count == 2
+        spans = [span["name"] for span in trace.to_dict()["spans"]]
+        assert spans == ["wait_for_stop", "spawn"]
+
+    def test_stop_cancels_queued_start_before_prepare(self, mock_popen):
+        pm = ProcessManager()
+        pm.set_lerobot_path(Path("/tmp/fake"))
+        pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
+
+        proc = mock_popen._mock_proc
+        exited = threading.Event()
+        proc.wait.side_effect = lambda timeout=None: exited.wait(timeout) or (_ for _ in ()).throw(
+            subprocess.TimeoutExpired(cmd="test", timeout=timeout)
+        )
+        prepared = []
+        pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}}, prepare=lambda: prepared.append(1))
+        pm.stop()
+        exited.set()
+        assert pm.wait_stopped(timeout=2.0)
+        assert prepared == []
+        assert mock_popen.call_count == 1
 
     def test_stop_on_idle_is_noop(self):
         pm = ProcessManager()
@@ -220,12 +305,36 @@ class TestGetStatus:
         pm = ProcessManager()
         pm.set_lerobot_path(Path("/tmp/fake"))
         pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
-        pm._log_buffer = [f"line_{i}" for i in range(600)]
+        for i in range(600):
+            pm._log_buffer.append(f"line_{i}")
 
         s = pm.get_status()
         assert len(s.logs) == 500
         assert s.logs[0] == "line_100"
 
+    def test_status_since_cursor(self, mock_popen):
+        pm = ProcessManager()
+        pm.set_lerobot_path(Path("/tmp/fake"))
+        pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
+        for i in range(3):
+            pm._log_buffer.append(f"line_{i}")
+        first = pm.get_status()
+        assert first.logs == ["line_0", "line_1", "line_2"]
+
+        pm._log_buffer.append("line_3")
+        s = pm.get_status(since=first.log_seq)
+        assert s.logs == ["line_3"]
+        assert pm.get_status(since=s.log_seq).logs == []
+
+        # A new run: the old cursor gets the new run's lines under a new start seq
+        pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}})
+        pm.wait_stopped(timeout=2.0)
+        pm._log_buffer.append("new_run")
+        s2 = pm.get_status(since=s.log_seq)
+        assert s2.log_start_seq != first.log_start_seq
+        assert s2.logs[-1] == "new_run"
+        assert all(not line.startswith("line_") for line in s2.logs)
+
     def test_start_stops_existing_process(self, mock_popen):
         pm = ProcessManager()
         pm.set_lerobot_path(Path("/tmp/fake"))
@@ -236,3 +345,5 @@ class TestGetStatus:
 
         pm.start_teleoperate({"leader_ip": "10.0.0.2", "follower_ip": "y", "cameras": {}})
         proc.send_signal.assert_called()
+        assert pm.wait_stopped(timeout=2.0)
+        assert mock_popen.call_count == 2
@@ -0,0 +1,57 @@
+"""Tests for app.services.process_metrics — lerobot output parsed into time series."""
+
+import pytest
+
+from app.services.process_metrics import ProcessMetrics, TimeSeries, parse_train_line
+
+TRAIN_LINE = (
+    "INFO 2025-03-01 10:00:{sec:02d} ts/train.py:232 step:{step} smpl:{smpl} ep:40 epch:0.50 "
+    "loss:{loss} grdn:12.345 lr:1.0e-05 updt_s:0.150 data_s:0.004"
+)
+
+
+def test_parse_train_line():
+    values = parse_train_line(TRAIN_LINE.format(sec=0, step="2K", smpl="64K", loss="0.512"))
+    assert values == {
+        "step": 2000.0,
+        "samples": 64000.0,
+        "episodes": 40.0,
+        "epochs": 0.5,
+        "loss": 0.512,
+        "grad_norm": 12.345,
+        "lr": 1e-05,
+        "update_s": 0.15,
+        "data_s": 0.004,
+    }
+    assert parse_train_line("INFO Creating dataset") is None
+
+
+def test_train_series_and_throughput():
+    metrics = ProcessMetrics()
+    metrics.observe(TRAIN_LINE.format(sec=0, step=200, smpl=6400, loss="0.9"))
+    metrics.observe(TRAIN_LINE.format(sec=10, step=400, smpl=12800, loss="0.7"))
+    train = metrics.to_dict()["train"]
+    assert train["series"]["loss"] == [0.9, 0.7]
+    assert train["series"]["samples_per_s"] == [None, pytest.approx(640.0)]
+    assert train["latest"]["step"] == 400
+
+
+def test_record_phases():
+    metrics = ProcessMetrics()
+    for line in ["INFO Recording episode 0", "INFO Reset the environment", "INFO Recording episode 1"]:
+        metrics.observe(line)
+    record = metrics.to_dict()["record"]
+    assert (record["episode"], record["phase"]) == (1, "recording")
+    assert record["series"]["episode"] == [0, 0, 1]
+    assert [record["phases"][int(p)] for p in record["series"]["phase"]] == ["recording", "reset", "recording"]
+
+
+def test_series_memory_is_bounded_and_downsampled():
+    series = TimeSeries(("v",), capacity=64)
+    for i in range(10_000):
+        series.append(float(i), {"v": float(i)})
+    assert len(series) < 64
+    assert series.stride >= 128
+    out = series.to_dict(max_points=10)
+    assert len(out["t"]) <= 10
+    assert out["v"] == sorted(out["v"])
@@ -0,0 +1,133 @@
+"""Tests for app.services.realsense_reset — probe, selective reset and re-enumeration polling."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import realsense_reset
+from app.services.realsense_reset import reset_wedged_devices, wait_for_reenumeration
+
+
+class FakeDevice:
+    def __init__(self, serial, bus):
+        self.serial = serial
+        self.bus = bus
+
+    def get_info(self, _field):
+        return self.serial
+
+    def hardware_reset(self):
+        self.bus.resetting[self.serial] = 2  # absent for the next two polls
+
+
+class FakeContext:
+    """Attached devices; a reset device disappears for a couple of polls and comes back."""
+
+    def __init__(self, serials):
+        self.serials = list(serials)
+        self.resetting: dict[str, int] = {}
+        self.polls = 0
+
+    def query_devices(self):
+        self.polls += 1
+        present = []
+        for serial in self.serials:
+            left = self.resetting.get(serial, 0)
+            if left:
+                self.resetting[serial] = left - 1
+                continue
+            present.append(FakeDevice(serial, self))
+        return present
+
+
+@pytest.fixture()
+def fake_rs(monkeypatch):
+    rs = MagicMock()
+    monkeypatch.setattr(realsense_reset, "rs", rs, raising=False)
+    monkeypatch.setattr(realsense_reset, "HAS_REALSENSE", True)
+    monkeypatch.setattr(realsense_reset, "ENUMERATION_POLL_S", 0.0)
+    return rs
+
+
+class TestPolicy:
+    """Only devices that fail the probe are reset; trusted devices are not probed."""
+
+    def test_resets_only_wedged(self, fake_rs):
+        ctx = FakeContext(["A", "B", "C"])
+        fake_rs.context.return_value = ctx
+        probed = []
+
+        def probe(serial):
+            probed.append(serial)
+            return "no frame: timeout" if serial == "C" else None
+
+        with patch.object(realsense_reset, "probe_device", side_effect=probe):
+            report = reset_wedged_devices({"A", "B", "C", "D"}, known_healthy={"A"})
+
+        assert sorted(probed) == ["B", "C"]
+        assert report["trusted"] == ["A"]
+        assert report["healthy"] == ["B"]
+        assert report["wedged"] == {"C": "no frame: timeout"}
+        assert report["recovered"] == ["C"]
+        assert report["missing"] == ["D"]
+
+    def test_all_trusted_is_instant(self, fake_rs):
+        fake_rs.context.return_value = FakeContext(["A"])
+        with patch.object(realsense_reset, "probe_device") as probe:
+            report = reset_wedged_devices(None, known_healthy={"A"})
+        probe.assert_not_called()
+        assert report["wedged"] == {}
+
+    def test_without_realsense(self, monkeypatch):
+        monkeypatch.setattr(realsense_reset, "HAS_REALSENSE", False)
+        assert reset_wedged_devices()["wedged"] == {}
+
+
+class TestReenumeration:
+    """Polling waits for the device to drop off and come back instead of sleeping."""
+
+    def test_waits_for_disconnect_then_return(self, fake_rs):
+        ctx = FakeContext(["A"])
+        ctx.resetting["A"] = 3
+        assert wait_for_reenumeration(ctx, {"A"}, timeout_s=5.0) == {"A"}
+        assert ctx.polls == 4
+
+    def test_never_returning_device_times_out(self, fake_rs):
+        ctx = FakeContext([])
+        assert wait_for_reenumeration(ctx, {"A"}, timeout_s=0.05) == set()
+
+
+class TestManagerHealth:
+    """CameraManager remembers which RealSense cameras were streaming cleanly."""
+
+    def test_healthy_shutdown_is_trusted(self):
+        from app.services.camera_manager import CameraManager
+
+        manager = CameraManager()
+        camera = MagicMock()
+        camera.serial = "A"
+        camera.is_healthy.return_value = True
+        manager.cameras["top"] = camera
+        manager.shutdown_cameras_for_teleop({"top"})
+
+        assert manager.known_healthy_serials() == {"A"}
+        assert manager.known_healthy_serials(max_age_s=-1) == set()
+
+    def test_initialize_resets_only_known_wedged(self):
+        from app.services import camera_manager as cm
+        from app.services.camera_manager import CameraManager
+
+        manager = CameraManager()
+        with (
+            patch.object(cm, "ManagedCamera") as camera_cls,
+            patch.object(CameraManager, "_hardware_reset_device") as reset,
+            patch.object(cm, "discover_realsense_topology", return_value={}),
+        ):
+            camera_cls.return_value.frame_sinks = []
+            manager.initialize_camera("top", "A", 640, 480, 30)
+            reset.assert_not_called()
+
+            manager.device_health["A"] = (False, cm.time.monotonic())
+            manager.initialize_camera("top", "A", 640, 480, 30)
+            reset.assert_called_once_with("A")
+        manager._supervisor_stop.set()
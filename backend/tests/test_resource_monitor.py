@@ -0,0 +1,168 @@
+"""Tests for the /proc resource sampler."""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services import resource_monitor
+from app.services.resource_monitor import (
+    ResourceMonitor,
+    TreeSampler,
+    process_tree,
+    read_counters,
+    read_system_memory,
+)
+
+TCK = resource_monitor._CLK_TCK
+PAGE = resource_monitor._PAGE_SIZE
+
+
+def _write_proc(
+    root: Path,
+    pid: int,
+    ppid: int = 1,
+    ticks: int = 0,
+    rss_pages: int = 0,
+    threads: int = 1,
+    read_bytes: int = 0,
+    ctx: int = 0,
+    children: list[int] | None = None,
+) -> None:
+    """Fake /proc/<pid> with the fields the sampler reads."""
+    base = root / str(pid)
+    (base / "task" / str(pid)).mkdir(parents=True, exist_ok=True)
+    rest = ["0"] * 50
+    rest[0] = "S"
+    rest[1] = str(ppid)
+    rest[11] = str(ticks)
+    rest[17] = str(threads)
+    rest[21] = str(rss_pages)
+    (base / "stat").write_text(f"{pid} (python (x)) {' '.join(rest)}\n")
+    (base / "status").write_text(
+        f"Name:\tpython\nVmSwap:\t    2048 kB\nvoluntary_ctxt_switches:\t{ctx}\nnonvoluntary_ctxt_switches:\t{ctx // 2}\n"
+    )
+    (base / "io").write_text(f"rchar: 1\nread_bytes: {read_bytes}\nwrite_bytes: 0\n")
+    if children is not None:
+        (base / "task" / str(pid) / "children").write_text(" ".join(map(str, children)) + " ")
+
+
+@pytest.fixture()
+def proc(tmp_path):
+    root = tmp_path / "proc"
+    _write_proc(root, 100, children=[101])
+    _write_proc(root, 101, ppid=100, children=[])
+    (root / "self").mkdir()
+    (root / "self" / "stat").write_text("")
+    (root / "meminfo").write_text(
+        "MemTotal:       16000000 kB\nMemAvailable:    4000000 kB\nSwapTotal:       2000000 kB\nSwapFree:        1500000 kB\n"
+    )
+    return root
+
+
+class TestReadCounters:
+    def test_parses_stat_status_and_io(self, proc):
+        _write_proc(proc, 100, ticks=7, rss_pages=10, threads=4, read_bytes=4096, ctx=10, children=[101])
+        counters = read_counters(100, proc)
+        assert counters.cpu_ticks == 7
+        assert counters.rss_pages == 10
+        assert counters.threads == 4
+        assert counters.swap_kb == 2048
+        assert counters.read_bytes == 4096
+        assert (counters.ctx_voluntary, counters.ctx_involuntary) == (10, 5)
+        assert read_counters(999, proc) is None
+
+    def test_system_memory(self, proc):
+        assert read_system_memory(proc) == {"mem_total_mb": 16000.0, "mem_available_mb": 4000.0, "swap_used_mb": 500.0}
+
+
+class TestTreeSampler:
+    def test_rates_over_the_whole_tree(self, proc):
+        sampler = TreeSampler(100, root=proc)
+        first = sampler.sample(now=0.0)
+        assert first["processes"] == 2
+        assert first["cpu_percent"] == 0
+        _write_proc(proc, 100, ticks=TCK, children=[101])
+        _write_proc(proc, 101, ppid=100, ticks=TCK, rss_pages=1000, read_bytes=2_000_000, ctx=40, children=[])
+        values = sampler.sample(now=2.0)
+        # Two CPU-seconds over two seconds
+        assert values["cpu_percent"] == 100.0
+        assert values["rss_mb"] == round(1000 * PAGE / 1e6, 1)
+        assert values["read_bps"] == 1_000_000
+        assert values["ctx_voluntary_ps"] == 20.0
+        assert values["swap_mb"] == pytest.approx(4.1, abs=0.1)
+
+    def test_exited_child_does_not_go_negative(self, proc):
+        _write_proc(proc, 101, ppid=100, ticks=500, children=[])
+        sampler = TreeSampler(100, root=proc)
+        sampler.sample(now=0.0)
+        _write_proc(proc, 100, children=[])
+        values = sampler.sample(now=1.0)
+        assert values["processes"] == 1
+        assert values["cpu_percent"] == 0
+
+    def test_root_exit_ends_sampling(self, proc):
+        sampler = TreeSampler(101, root=proc)
+        assert sampler.sample(now=0.0) is not None
+        for name in ("stat", "status", "io"):
+            (proc / "101" / name).unlink()
+        assert sampler.sample(now=1.0) is None
+
+    def test_scans_ppids_without_children_files(self, proc):
+        (proc / "100" / "task" / "100" / "children").unlink()
+        _write_proc(proc, 102, ppid=101)
+        assert sorted(process_tree(100, proc)) == [100, 101, 102]
+
+    def test_real_descendants(self):
+        script = "import subprocess, sys, time; subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); time.sleep(30)"
+        process = subprocess.Popen([sys.executable, "-c", script])
+        try:
+            deadline = time.monotonic() + 5
+            while len(process_tree(process.pid)) < 2:
+                assert time.monotonic() < deadline
+                time.sleep(0.02)
+            values = TreeSampler(process.pid).sample()
+            assert values["processes"] == 2
+            assert values["threads"] >= 2
+            assert values["rss_mb"] > 0
+        finally:
+            for pid in process_tree(process.pid)[1:]:
+                os.kill(pid, signal.SIGKILL)
+            process.kill()
+            process.wait()
+
+
+class TestResourceMonitor:
+    def test_series_for_tracked_run_and_backend(self, proc, monkeypatch):
+        monitor = ResourceMonitor(root=proc)
+        monkeypatch.setattr(monitor, "_ensure_thread", lambda: None)
+        monkeypatch.setattr(monitor._backend_sampler, "pid", 101)
+        monitor.track(100)
+        monitor.sample_once()
+        monitor.sample_once()
+        data = monitor.to_dict(max_points=10)
+        assert data["process"]["pid"] == 100
+        assert data["process"]["alive"] is True
+        assert len(data["process"]["series"]["cpu_percent"]) == 2
+        assert data["backend"]["latest"]["processes"] == 1
+        assert data["system"]["mem_available_mb"] == 4000.0
+        assert "series" not in monitor.to_dict(max_points=None)["process"]
+
+    def test_run_exit_keeps_series(self, proc, monkeypatch):
+        monitor = ResourceMonitor(root=proc)
+        monkeypatch.setattr(monitor, "_ensure_thread", lambda: None)
+        monitor.track(100)
+        monitor.sample_once()
+        for name in ("stat", "status", "io"):
+            (proc / "100" / name).unlink()
+        monitor.sample_once()
+        data = monitor.to_dict()
+        assert data["process"]["alive"] is False
+        assert len(data["process"]["series"]["t"]) == 1
+
+    def test_disabled_without_procfs(self, tmp_path):
+        assert ResourceMonitor(root=tmp_path).to_dict() is None
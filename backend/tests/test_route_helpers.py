@@ -1,11 +1,16 @@
 """Tests for route helper functions in app.routes.process_routes."""
 
+import asyncio
+import json
+import threading
 from unittest.mock import patch
 
 import pytest
 
 from app.config import AppConfig
-from app.routes.process_routes import _robot_config, _dataset_config, _train_config, _replay_config
+from app.routes import process_routes
+from app.routes.process_routes import _robot_config, _dataset_config, _train_config, _replay_config, _log_events
+from app.services.log_buffer import LogRing
 
 
 class TestRobotConfig:
@@ -63,6 +68,13 @@ class TestRobotConfig:
         assert set(result["cameras"].keys()) == {"left_wrist", "top"}
         assert "use_in_teleop" not in result["cameras"]["top"]
 
+    def test_processing_not_sent_to_lerobot(self, sample_config):
+        sample_config.robot.cameras["top"]["processing"] = {"rotate": 90}
+        with patch("app.routes.process_routes.load_config", return_value=sample_config):
+            result = _robot_config(use_top_camera_only=False)
+
+        assert "processing" not in result["cameras"]["top"]
+
     def test_use_in_teleop_false_all_gives_empty_cameras(self, sample_config):
         sample_config.robot.cameras["left_wrist"]["use_in_teleop"] = False
         sample_config.robot.cameras["right_wrist"]["use_in_teleop"] = False
@@ -132,3 +144,50 @@ class TestReplayConfig:
 
         assert result["repo_id"] == "a/b"
         assert result["episode"] == 0
+
+
+class TestLogEvents:
+    """_log_events() streams new lines as SSE, resuming from a cursor and coalescing."""
+
+    @staticmethod
+    def _collect(ring, since, count, feed=None):
+        async def run():
+            async def connected():
+                return False
+
+            events = []
+            stream = _log_events(ring, since, connected)
+            async for event in stream:
+                events.append(event)
+                if len(events) == 1 and feed:
+                    threading.Thread(target=feed).start()
+                if len(events) == count:
+                    break
+            await stream.aclose()
+            return [json.loads(e.split("data: ", 1)[1]) for e in events]
+
+        return asyncio.run(asyncio.wait_for(run(), timeout=5.0))
+
+    def test_resume_and_live_lines(self):
+        ring = LogRing(capacity=100)
+        for i in range(3):
+            ring.append(f"l{i}")
+
+        def feed():
+            for i in range(3, 6):
+                ring.append(f"l{i}")
+
+        events = self._collect(ring, 1, 2, feed)
+        assert events[0]["lines"] == ["l1", "l2"]
+        later = [line for e in events[1:] for line in e["lines"]]
+        assert later[0] == "l3"
+        assert events[-1]["log_seq"] >= 4
+
+    def test_slow_client_skips_old_lines(self, monkeypatch):
+        monkeypatch.setattr(process_routes, "LOG_STREAM_MAX_BATCH", 2)
+        ring = LogRing(capacity=100)
+        for i in range(10):
+            ring.append(f"l{i}")
+        event = self._collect(ring, 0, 1)[0]
+        assert event["lines"] == ["l8", "l9"]
+        assert event["skipped"] == 8
@@ -0,0 +1,71 @@
+"""Tests for app.services.startup_trace — start stage spans and time to first action."""
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.services.process_manager import ProcessManager
+from app.services.startup_trace import StartupTrace
+
+
+class TestSpans:
+    """Spans time each stage; parallel stages overlap."""
+
+    def test_spans_and_marks(self):
+        trace = StartupTrace("teleoperate")
+        with trace.span("robot_config") as span:
+            span["cameras"] = 3
+        with trace.span("spawn"):
+            pass
+        trace.observe_line("Connecting to follower...")
+        assert not trace.done
+        trace.observe_line("time: 16.7ms (60 Hz)")
+        assert trace.done
+
+        d = trace.to_dict()
+        assert [s["name"] for s in d["spans"]] == ["robot_config", "spawn"]
+        assert d["spans"][0]["cameras"] == 3
+        assert d["marks"]["first_output"] <= d["marks"]["first_action"]
+        assert d["time_to_first_action_ms"] == d["marks"]["first_action"]
+        assert d["process_boot_ms"] >= 0
+        assert d["connect_ms"] >= 0
+
+    def test_failed_span_records_error(self):
+        trace = StartupTrace("record")
+        with pytest.raises(RuntimeError):
+            with trace.span("realsense_reset"):
+                raise RuntimeError("usb gone")
+        assert trace.to_dict()["spans"][0]["error"] == "usb gone"
+
+    def test_spans_from_threads(self):
+        trace = StartupTrace("record")
+
+        def remote():
+            with trace.span("remote_camera_shutdown"):
+                pass
+
+        with trace.span("local_camera_shutdown"):
+            thread = threading.Thread(target=remote, name="remote-cameras")
+            thread.start()
+            thread.join()
+        spans = {s["name"]: s for s in trace.to_dict()["spans"]}
+        assert spans["remote_camera_shutdown"]["thread"] == "remote-cameras"
+        assert spans["remote_camera_shutdown"]["start_ms"] >= spans["local_camera_shutdown"]["start_ms"]
+
+
+def test_process_status_reports_trace(mock_popen):
+    read_fd, write_fd = os.pipe()
+    mock_popen._mock_proc.stdout = os.fdopen(read_fd, "rb", buffering=0)
+    os.write(write_fd, b"Connected\nRecording episode 0\n")
+    os.close(write_fd)
+    pm = ProcessManager()
+    pm.set_lerobot_path(Path("/tmp/fake"))
+    trace = StartupTrace("record")
+    pm.start_teleoperate({"leader_ip": "10.0.0.1", "follower_ip": "x", "cameras": {}}, trace=trace)
+    pm._reader_thread.join(timeout=2.0)
+
+    startup = pm.get_status().startup
+    assert startup["mode"] == "record"
+    assert set(startup["marks"]) == {"first_output", "first_action"}
@@ -0,0 +1,104 @@
+"""Tests for app.services.usb_bandwidth — sysfs topology parsing and mode planning."""
+
+from pathlib import Path
+
+import pytest
+
+from app.services.usb_bandwidth import (
+    UsbTopology,
+    candidate_modes,
+    plan_bandwidth,
+    stream_bandwidth_mbps,
+    topology_from_physical_port,
+)
+
+
+def _cam(serial: str, width: int = 640, height: int = 480, fps: int = 30) -> dict:
+    return {"type": "intelrealsense", "serial_number_or_name": serial, "width": width, "height": height, "fps": fps}
+
+
+class TestStreamBandwidth:
+    """stream_bandwidth_mbps() is width x height x bpp x fps."""
+
+    def test_vga_30fps(self):
+        assert stream_bandwidth_mbps(640, 480, 30) == pytest.approx(147.456)
+
+    def test_custom_bpp(self):
+        assert stream_bandwidth_mbps(640, 480, 30, bytes_per_pixel=3) == pytest.approx(221.184)
+
+
+class TestTopologyFromPhysicalPort:
+    """topology_from_physical_port() resolves bus, controller and speeds from sysfs."""
+
+    def test_parses_path_and_reads_speeds(self, tmp_path: Path):
+        devices = tmp_path / "bus" / "usb" / "devices"
+        (devices / "usb2").mkdir(parents=True)
+        (devices / "usb2" / "speed").write_text("5000\n")
+        (devices / "2-3").mkdir()
+        (devices / "2-3" / "speed").write_text("480\n")
+
+        port = "/sys/devices/pci0000:00/0000:00:14.0/usb2/2-3/2-3:1.0/video4linux/video2"
+        topo = topology_from_physical_port(port, sysfs_root=tmp_path)
+
+        assert topo.bus == "usb2"
+        assert topo.controller == "0000:00:14.0"
+        assert topo.port == "2-3"
+        assert topo.bus_speed_mbps == 5000
+        assert topo.link_speed_mbps == 480
+
+    def test_unknown_path(self, tmp_path: Path):
+        topo = topology_from_physical_port("", sysfs_root=tmp_path)
+        assert topo == UsbTopology()
+
+
+class TestCandidateModes:
+    """candidate_modes() never exceeds the requested mode."""
+
+    def test_requested_first_and_bounded(self):
+        modes = candidate_modes(640, 480, 30)
+        assert modes[0] == (640, 480, 30)
+        assert all(w <= 640 and h <= 480 and f <= 30 for w, h, f in modes)
+
+    def test_prefers_same_aspect(self):
+        modes = candidate_modes(640, 480, 30)
+        assert all(w * 480 == h * 640 for w, h, _ in modes)
+
+
+class TestPlanBandwidth:
+    """plan_bandwidth() fits cameras on a shared bus into its budget."""
+
+    def test_usb3_bus_keeps_requested_modes(self):
+        topo = {s: UsbTopology(bus="usb2", bus_speed_mbps=5000) for s in ("A", "B", "C")}
+        plan = plan_bandwidth({"a": _cam("A"), "b": _cam("B"), "c": _cam("C")}, topo)
+
+        assert all(not c["downgraded"] for c in plan["cameras"].values())
+        assert plan["buses"]["usb2"]["feasible"] is True
+
+    def test_usb2_bus_downgrades_to_fit(self):
+        topo = {s: UsbTopology(bus="usb1", bus_speed_mbps=480) for s in ("A", "B")}
+        plan = plan_bandwidth({"a": _cam("A"), "b": _cam("B")}, topo)
+
+        bus = plan["buses"]["usb1"]
+        assert bus["planned_mbps"] <= bus["budget_mbps"]
+        assert any(c["downgraded"] for c in plan["cameras"].values())
+        assert sorted(bus["cameras"]) == ["a", "b"]
+
+    def test_slow_link_caps_single_camera(self):
+        topo = {"A": UsbTopology(bus="usb2", bus_speed_mbps=5000, link_speed_mbps=480)}
+        plan = plan_bandwidth({"a": _cam("A", 1280, 720, 30)}, topo)
+
+        cam = plan["cameras"]["a"]
+        assert cam["downgraded"] is True
+        assert cam["bandwidth_mbps"] <= 480 * 0.6
+
+    def test_unresolved_camera_keeps_requested(self):
+        plan = plan_bandwidth({"a": _cam("A")}, {})
+
+        assert tuple(plan["cameras"]["a"]["assigned"]) == (640, 480, 30)
+        assert plan["buses"] == {}
+
+    def test_infeasible_bus_is_flagged(self):
+        topo = {s: UsbTopology(bus="usb1", bus_speed_mbps=12) for s in ("A", "B")}
+        plan = plan_bandwidth({"a": _cam("A"), "b": _cam("B")}, topo)
+
+        assert plan["buses"]["usb1"]["feasible"] is False
@@ -0,0 +1,108 @@
+"""Tests for app.services.viewer_registry — admission caps, eviction and degradation."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.routes.camera_routes import _viewer_priority
+from app.services.viewer_registry import ViewerPriority, ViewerRegistry
+
+OPERATOR = ViewerPriority.OPERATOR
+STUDIO = ViewerPriority.STUDIO
+REMOTE = ViewerPriority.REMOTE
+
+
+class TestAdmission:
+    """admit() enforces per-camera and global caps with priorities."""
+
+    def test_admits_under_cap(self):
+        reg = ViewerRegistry(max_per_camera=2, max_total=4)
+        assert reg.admit("top", REMOTE) is not None
+        assert reg.admit("top", REMOTE) is not None
+
+    def test_rejects_equal_priority_over_camera_cap(self):
+        reg = ViewerRegistry(max_per_camera=2, max_total=4)
+        reg.admit("top", STUDIO)
+        reg.admit("top", STUDIO)
+        assert reg.admit("top", STUDIO) is None
+
+    def test_higher_priority_evicts_newest_lowest(self):
+        reg = ViewerRegistry(max_per_camera=2, max_total=4)
+        studio = reg.admit("top", STUDIO)
+        remote = reg.admit("top", REMOTE)
+
+        op = reg.admit("top", OPERATOR)
+        assert op is not None
+        assert remote.evicted is True
+        assert studio.evicted is False
+
+    def test_global_cap_evicts_across_cameras(self):
+        reg = ViewerRegistry(max_per_camera=4, max_total=2)
+        remote = reg.admit("left_wrist", REMOTE)
+        reg.admit("top", STUDIO)
+
+        assert reg.admit("right_wrist", STUDIO) is not None
+        assert remote.evicted is True
+
+    def test_rejection_does_not_evict(self):
+        reg = ViewerRegistry(max_per_camera=1, max_total=1)
+        op = reg.admit("top", OPERATOR)
+        assert reg.admit("left_wrist", STUDIO) is None
+        assert op.evicted is False
+
+    def test_release_frees_slot(self):
+        reg = ViewerRegistry(max_per_camera=1, max_total=4)
+        v = reg.admit("top", STUDIO)
+        reg.release(v)
+        assert reg.admit("top", STUDIO) is not None
+
+
+class TestDegradation:
+    """Under load, studio and remote viewers get the low rendition; remote also halves fps."""
+
+    def test_light_load_is_full_quality(self):
+        reg = ViewerRegistry(max_per_camera=4, max_total=12, degrade_fraction=0.5)
+        v = reg.admit("top", REMOTE)
+        assert (v.rendition, v.fps_divisor) == ("full", 1)
+
+    def test_heavy_load_degrades_by_priority(self):
+        reg = ViewerRegistry(max_per_camera=4, max_total=12, degrade_fraction=0.5)
+        op = reg.admit("top", OPERATOR)
+        studio = reg.admit("top", STUDIO)
+        remote = reg.admit("top", REMOTE)
+
+        assert (op.rendition, op.fps_divisor) == ("full", 1)
+        assert (studio.rendition, studio.fps_divisor) == ("low", 1)
+        assert (remote.rendition, remote.fps_divisor) == ("low", 2)
+
+    def test_release_restores_quality(self):
+        reg = ViewerRegistry(max_per_camera=4, max_total=12, degrade_fraction=0.5)
+        studio = reg.admit("top", STUDIO)
+        other = reg.admit("top", REMOTE)
+        assert studio.rendition == "low"
+        reg.release(other)
+        assert studio.rendition == "full"
+
+    def test_snapshot_groups_by_camera(self):
+        reg = ViewerRegistry()
+        reg.admit("top", OPERATOR, client="10.0.0.5")
+        snap = reg.snapshot()
+        assert snap["top"][0]["priority"] == "operator"
+        assert snap["top"][0]["client"] == "10.0.0.5"
+        assert "evicted" not in snap["top"][0]
+
+
+class TestViewerPriority:
+    """_viewer_priority() resolves explicit and inferred viewer classes."""
+
+    def test_explicit(self):
+        assert _viewer_priority("operator", "10.1.1.1") == OPERATOR
+
+    def test_local_defaults_to_studio(self):
+        assert _viewer_priority(None, "127.0.0.1") == STUDIO
+
+    def test_other_hosts_are_remote(self):
+        assert _viewer_priority(None, "192.168.2.40") == REMOTE
+
+    def test_unknown_viewer_rejected(self):
+        with pytest.raises(HTTPException):
+            _viewer_priority("boss", None)
@@ -1,11 +1,11 @@
-import { useCallback, useEffect, useState } from 'react'
+import { useCallback, useEffect, useRef, useState } from 'react'
 import { StatusBar } from './components/StatusBar'
 import { ActionPanel } from './components/ActionPanel'
 import { CameraViewer } from './components/CameraViewer'
 import { ConfigForm } from './components/ConfigForm'
 import { ProcessLog } from './components/ProcessLog'
-import { getConfig, getProcessStatus } from './api/client'
-import type { AppConfig, ProcessStatus } from './api/client'
+import { getConfig, getProcessLogStreamUrl, getProcessStatus, mergeProcessLogs } from './api/client'
+import type { AppConfig, ProcessLogUpdate, ProcessStatus } from './api/client'
 
 function App() {
   const [config, setConfig] = useState<AppConfig | null>(null)
@@ -26,14 +26,38 @@ function App() {
       .catch((e) => setConfigError(e instanceof Error ? e.message : 'Failed to load config'))
   }, [])
 
+  const lastStatus = useRef<ProcessStatus | null>(null)
+
+  const applyStatus = useCallback((next: ProcessStatus) => {
+    const prev = lastStatus.current
+    const merged = prev ? { ...next, logs: mergeProcessLogs(prev, next) } : next
+    if (prev && next.log_start_seq === prev.log_start_seq) {
+      merged.log_seq = Math.max(prev.log_seq ?? 0, next.log_seq ?? 0)
+    }
+    lastStatus.current = merged
+    setStatus(merged)
+  }, [])
+
   const refreshStatus = useCallback(async () => {
     try {
-      const s = await getProcessStatus()
-      setStatus(s)
+      // Ask only for log lines newer than the ones already shown
+      applyStatus(await getProcessStatus(lastStatus.current?.log_seq))
     } catch {
       // Backend may be down
     }
-  }, [])
+  }, [applyStatus])
+
+  // Live log lines; the status poll still fills in if the stream is down
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return
+    const source = new EventSource(getProcessLogStreamUrl())
+    source.addEventListener('log', (event) => {
+      const update: ProcessLogUpdate = JSON.parse((event as MessageEvent).data)
+      const prev = lastStatus.current
+      if (prev) applyStatus({ ...prev, ...update })
+    })
+    return () => source.close()
+  }, [applyStatus])
 
   useEffect(() => {
     refreshStatus()
@@ -12,6 +12,7 @@ import {
   stopReplay,
   stopProcess,
   getProcessStatus,
+  mergeProcessLogs,
   detectCameras,
   getCameraStatus,
   shutdownCameras,
@@ -165,6 +166,33 @@ describe('getProcessStatus', () => {
     expect(result.mode).toBe('idle')
     expect(result.running).toBe(false)
   })
+
+  it('passes the log cursor', async () => {
+    mockFetch.mockReturnValueOnce(jsonResponse({ mode: 'idle', running: false, pid: null, logs: [], error: null }))
+    await getProcessStatus(42)
+    const url = mockFetch.mock.calls[0][0] as string
+    expect(url).toContain('/process/status?since=42')
+  })
+})
+
+describe('mergeProcessLogs', () => {
+  const base = { mode: 'train', running: true, pid: 1, error: null }
+
+  it('appends lines of the same run', () => {
+    const prev = { ...base, logs: ['a'], log_seq: 1, log_start_seq: 1 }
+    expect(mergeProcessLogs(prev, { ...base, logs: ['b'], log_seq: 2, log_start_seq: 1 })).toEqual(['a', 'b'])
+  })
+
+  it('drops lines already received from the other source', () => {
+    const prev = { ...base, logs: ['a', 'b'], log_seq: 2, log_start_seq: 1 }
+    expect(mergeProcessLogs(prev, { ...base, logs: ['a', 'b', 'c'], log_seq: 3, log_start_seq: 1 })).toEqual(['a', 'b', 'c'])
+    expect(mergeProcessLogs(prev, { ...base, logs: ['b'], log_seq: 2, log_start_seq: 1 })).toEqual(['a', 'b'])
+  })
+
+  it('replaces lines when a new run starts', () => {
+    const prev = { ...base, logs: ['a'], log_seq: 1, log_start_seq: 1 }
+    expect(mergeProcessLogs(prev, { ...base, logs: ['x'], log_seq: 3, log_start_seq: 3 })).toEqual(['x'])
+  })
 })
 
 describe('camera APIs', () => {
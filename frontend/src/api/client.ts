@@ -40,8 +40,16 @@ async function fetchCameraApi(path: string, options?: RequestInit) {
   return res.json();
 }
 
-export function getCameraStreamUrl(cameraKey: string): string {
-  return `${getCameraApiBase()}/cameras/stream/${cameraKey}`;
+export type StreamViewer = 'operator' | 'studio' | 'remote';
+
+export function getCameraStreamUrl(cameraKey: string, viewer?: StreamViewer): string {
+  const url = `${getCameraApiBase()}/cameras/stream/${cameraKey}`;
+  return viewer ? `${url}?viewer=${viewer}` : url;
+}
+
+export function getCameraMosaicUrl(viewer?: StreamViewer): string {
+  const url = `${getCameraApiBase()}/cameras/mosaic`;
+  return viewer ? `${url}?viewer=${viewer}` : url;
 }
 
 export interface LauncherConfig {
@@ -87,6 +95,8 @@ export interface AppConfig {
     repo_id: string;
     episode: number;
   };
+  /** Additional stations by id; robot/dataset/replay above are the "default" station */
+  stations?: Record<string, { name: string; robot: AppConfig['robot']; dataset: AppConfig['dataset']; replay: AppConfig['replay'] }>;
   lerobot_trossen_path: string;
   /** Launcher config (PC2 WiFi IP etc.) - from launcher.json, used for Leader Service Host */
   launcher?: LauncherConfig;
@@ -98,6 +108,60 @@ export interface ProcessStatus {
   pid: number | null;
   logs: string[];
   error: string | null;
+  /** Sequence number of the newest log line; pass back as `since` to get only newer lines */
+  log_seq?: number;
+  /** First sequence number of the current run; changes when a new process starts */
+  log_start_seq?: number;
+  /** Current progress-bar line of the process (rewritten in place, not part of logs) */
+  progress?: string | null;
+  /** Teleop/record control-loop timing (null for other modes) */
+  control_loop?: ControlLoopStats | null;
+  /** True while the process is being stopped in the background */
+  stopping?: boolean;
+  /** Current or last stop: phase (graceful, killing, stopped), timing and a start queued behind it */
+  stop?: {
+    phase: string;
+    started_at: number;
+    grace_s: number;
+    elapsed_s?: number;
+    duration_s?: number;
+    queued_start: string | null;
+  } | null;
+  /** Latest CPU/memory/I/O usage of the process tree and the backend (null without /proc) */
+  resources?: ProcessResources | null;
+}
+
+export interface ResourceSample {
+  t?: number;
+  cpu_percent?: number | null;
+  rss_mb?: number | null;
+  swap_mb?: number | null;
+  major_faults_ps?: number | null;
+  read_bps?: number | null;
+  write_bps?: number | null;
+  ctx_voluntary_ps?: number | null;
+  ctx_involuntary_ps?: number | null;
+  threads?: number | null;
+  processes?: number | null;
+}
+
+export interface ProcessResources {
+  interval_s: number;
+  system: { mem_total_mb: number; mem_available_mb: number; swap_used_mb: number } | null;
+  process: { pid: number | null; alive: boolean; latest: ResourceSample; stride?: number; series?: MetricSeries };
+  backend: { pid: number; latest: ResourceSample; stride?: number; series?: MetricSeries };
+}
+
+export interface ControlLoopStats {
+  target_fps: number;
+  budget_ms: number;
+  samples: number;
+  overruns: number;
+  recent_overrun_fraction: number;
+  worst_ms: number;
+  loop_ms: { p50: number | null; p95: number | null; p99: number | null };
+  action_latency_ms: { p50: number | null; p95: number | null; p99: number | null };
+  warning: string | null;
 }
 
 export async function getConfig(): Promise<AppConfig> {
@@ -177,8 +241,162 @@ export async function stopProcess(): Promise<{ status: string }> {
   return fetchApi('/process/stop', { method: 'POST' });
 }
 
-export async function getProcessStatus(): Promise<ProcessStatus> {
-  return fetchApi('/process/status');
+export async function getProcessStatus(since?: number): Promise<ProcessStatus> {
+  return fetchApi(since === undefined ? '/process/status' : `/process/status?since=${since}`);
+}
+
+/** Max log lines kept in the UI */
+export const MAX_LOG_LINES = 500;
+
+/** Log lines with their cursor, from a status poll or a log stream event */
+export type ProcessLogUpdate = Pick<ProcessStatus, 'logs' | 'log_seq' | 'log_start_seq' | 'progress'>;
+
+/**
+ * Combine new log lines with the ones already shown. `next.logs` ends at
+ * `next.log_seq`, so lines the client already has (delivered by both the
+ * poll and the stream) are dropped.
+ */
+export function mergeProcessLogs(prev: ProcessLogUpdate, next: ProcessLogUpdate): string[] {
+  let logs = next.logs;
+  if (next.log_start_seq === prev.log_start_seq) {
+    // Same run: keep only lines past our cursor (a late response may add nothing)
+    const fresh = Math.max(0, Math.min(next.logs.length, (next.log_seq ?? 0) - (prev.log_seq ?? 0)));
+    logs = prev.logs.concat(next.logs.slice(next.logs.length - fresh));
+  }
+  return logs.length > MAX_LOG_LINES ? logs.slice(-MAX_LOG_LINES) : logs;
+}
+
+export interface MetricSeries {
+  t: number[];
+  [field: string]: (number | null)[];
+}
+
+export interface ProcessMetrics {
+  mode: string;
+  started_at: number;
+  train: {
+    latest: Record<string, number | null>;
+    stride: number;
+    series: MetricSeries;
+  };
+  record: {
+    episode: number | null;
+    phase: string | null;
+    phase_elapsed_s: number | null;
+    phases: string[];
+    series: MetricSeries;
+  };
+}
+
+/** Train/record metrics of the current run, downsampled to at most `maxPoints` per series. */
+export async function getProcessMetrics(maxPoints = 500): Promise<ProcessMetrics> {
+  return fetchApi(`/process/metrics?max_points=${maxPoints}`);
+}
+
+/** CPU/memory/I/O series of the running process tree and of the backend. */
+export async function getProcessResources(maxPoints = 500): Promise<ProcessResources> {
+  return fetchApi(`/process/resources?max_points=${maxPoints}`);
+}
+
+/** Server-Sent Events URL streaming process output (`log` events). */
+export function getProcessLogStreamUrl(): string {
+  return `${getApiBase()}/process/logs/stream`;
+}
+
+export interface Station {
+  id: string;
+  name: string;
+  leader_ip: string;
+  follower_ip: string;
+  /** Camera key within the station -> key for the /cameras stream routes (e.g. "cell2.top") */
+  cameras: Record<string, string>;
+  process: { mode: string; running: boolean; stopping: boolean };
+}
+
+export async function listStations(): Promise<{ stations: Station[] }> {
+  return fetchApi('/stations');
+}
+
+/** API path of a process route for a station; the default station uses the unscoped routes. */
+export function stationPath(stationId: string, path: string): string {
+  return stationId === 'default' ? path : `/stations/${encodeURIComponent(stationId)}${path}`;
+}
+
+export async function getStationProcessStatus(stationId: string, since?: number): Promise<ProcessStatus> {
+  const path = stationPath(stationId, '/process/status');
+  return fetchApi(since === undefined ? path : `${path}?since=${since}`);
+}
+
+export async function stopStationProcess(stationId: string): Promise<{ status: string }> {
+  return fetchApi(stationPath(stationId, '/process/stop'), { method: 'POST' });
+}
+
+export type JobState = 'queued' | 'running' | 'cancelling' | 'succeeded' | 'failed' | 'cancelled';
+
+export interface Job {
+  id: string;
+  kind: 'train' | 'replay';
+  params: Record<string, string | number | boolean>;
+  resource_class: 'robot' | 'gpu' | 'cpu';
+  cores: number;
+  priority: number;
+  state: JobState;
+  created_at: number;
+  started_at: number | null;
+  finished_at: number | null;
+  pid: number | null;
+  exit_code: number | null;
+  error: string | null;
+  sweep_id: string | null;
+}
+
+export interface JobOptions {
+  priority?: number;
+  resource_class?: Job['resource_class'];
+  cores?: number;
+}
+
+export interface JobLogs {
+  state: JobState;
+  live: boolean;
+  lines: string[];
+  log_seq: number | null;
+  log_start_seq: number | null;
+  progress: string | null;
+}
+
+export async function listJobs(): Promise<{ jobs: Job[]; cpu_core_budget: number; gpu_slots: number }> {
+  return fetchApi('/jobs');
+}
+
+/** Queue a train or replay job; `params` override the Settings values. */
+export async function submitJob(
+  kind: Job['kind'],
+  params: Record<string, string | number | boolean> = {},
+  options: JobOptions = {},
+): Promise<Job> {
+  return fetchApi('/jobs', { method: 'POST', body: JSON.stringify({ kind, params, ...options }) });
+}
+
+/** Queue one training job per combination of the `grid` values (TrainConfig fields or `device`). */
+export async function submitSweep(
+  grid: Record<string, (string | number)[]>,
+  params: Record<string, string | number | boolean> = {},
+  options: JobOptions = {},
+): Promise<{ sweep_id: string; jobs: Job[] }> {
+  return fetchApi('/jobs/sweep', { method: 'POST', body: JSON.stringify({ grid, params, ...options }) });
+}
+
+export async function cancelJob(id: string): Promise<Job> {
+  return fetchApi(`/jobs/${id}/cancel`, { method: 'POST' });
+}
+
+export async function deleteJob(id: string): Promise<{ status: string }> {
+  return fetchApi(`/jobs/${id}`, { method: 'DELETE' });
+}
+
+export async function getJobLogs(id: string, since?: number): Promise<JobLogs> {
+  return fetchApi(since === undefined ? `/jobs/${id}/logs` : `/jobs/${id}/logs?since=${since}`);
 }
 
 export interface CameraDetectResult {
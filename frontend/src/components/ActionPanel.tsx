@@ -171,14 +171,21 @@ function RunningCard({ status, busy, onStop }: { status: ProcessStatus; busy: bo
         <div>
           <span className="text-base font-semibold text-white">{labels[status.mode] || status.mode}</span>
           {status.pid && <span className="ml-2 font-mono text-xs text-gray-500">PID {status.pid}</span>}
+          {status.stopping && status.stop && (
+            <p className="text-xs text-gray-400">
+              {status.stop.phase === 'killing' ? 'Force stopping' : 'Returning to rest'}
+              {status.stop.elapsed_s !== undefined && ` (${Math.round(status.stop.elapsed_s)}s / ${status.stop.grace_s}s)`}
+              {status.stop.queued_start && `, then starting ${status.stop.queued_start}`}
+            </p>
+          )}
         </div>
       </div>
       <button
         onClick={onStop}
-        disabled={busy}
+        disabled={busy || status.stopping}
         className="rounded-lg bg-red-600 px-5 py-2.5 text-sm font-semibold text-white shadow-lg shadow-red-900/30 transition hover:bg-red-500 disabled:opacity-50"
       >
-        {busy ? 'Stopping...' : 'Stop'}
+        {busy || status.stopping ? 'Stopping...' : 'Stop'}
       </button>
     </div>
   )
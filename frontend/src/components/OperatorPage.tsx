@@ -62,7 +62,7 @@ export function OperatorPage() {
   }
 
   const hasOperatorCamera = Boolean(config?.robot?.operator_camera)
-  const streamUrl = getCameraStreamUrl('operator')
+  const streamUrl = getCameraStreamUrl('operator', 'operator')
   const cameras = config?.robot?.cameras ?? {}
   const wristKey = cameras.right_wrist ? 'right_wrist' : cameras.left_wrist ? 'left_wrist' : null
   const wristLabel = wristKey === 'right_wrist' ? 'Right wrist' : wristKey === 'left_wrist' ? 'Left wrist' : ''
@@ -137,7 +137,7 @@ export function OperatorPage() {
                   {wristLabel}
                 </div>
                 <img
-                  src={getCameraStreamUrl(wristKey)}
+                  src={getCameraStreamUrl(wristKey, 'operator')}
                   alt={wristLabel}
                   className="h-[220px] w-full object-contain bg-black"
                 />
@@ -28,4 +28,25 @@ describe('ProcessLog', () => {
     render(<ProcessLog status={status} />)
     expect(screen.getByText(/Process crashed/)).toBeInTheDocument()
   })
+
+  it('shows the current progress line', () => {
+    const status = { ...idle, logs: ['Training'], progress: ' 42%|####      | 420/1000' }
+    render(<ProcessLog status={status} />)
+    expect(screen.getByText(/42%/)).toBeInTheDocument()
+  })
+
+  it('shows process tree usage while running', () => {
+    const status = {
+      ...idle,
+      running: true,
+      resources: {
+        interval_s: 1,
+        system: null,
+        process: { pid: 42, alive: true, latest: { cpu_percent: 231.4, rss_mb: 1530, threads: 48 } },
+        backend: { pid: 1, latest: {} },
+      },
+    }
+    render(<ProcessLog status={status} />)
+    expect(screen.getByText('CPU 231% · 1.5 GB · 48 threads')).toBeInTheDocument()
+  })
 })
@@ -5,9 +5,18 @@ interface ProcessLogProps {
   status: ProcessStatus
 }
 
+function formatUsage(status: ProcessStatus): string | null {
+  const usage = status.resources?.process
+  if (!status.running || !usage?.alive || usage.latest.cpu_percent == null) return null
+  const { cpu_percent, rss_mb, threads } = usage.latest
+  const rss = rss_mb == null ? '' : rss_mb >= 1000 ? ` · ${(rss_mb / 1000).toFixed(1)} GB` : ` · ${Math.round(rss_mb)} MB`
+  return `CPU ${Math.round(cpu_percent)}%${rss}${threads != null ? ` · ${threads} threads` : ''}`
+}
+
 export function ProcessLog({ status }: ProcessLogProps) {
   const preRef = useRef<HTMLPreElement>(null)
   const [autoScroll, setAutoScroll] = useState(true)
+  const usage = formatUsage(status)
 
   useEffect(() => {
     if (preRef.current && autoScroll) {
@@ -30,6 +39,7 @@ export function ProcessLog({ status }: ProcessLogProps) {
           </svg>
           <span className="text-sm font-medium text-gray-300">Process Log</span>
           <span className="font-mono text-xs text-gray-600">{status.logs.length} lines</span>
+          {usage && <span className="font-mono text-xs text-gray-500" title="lerobot process tree">{usage}</span>}
         </div>
         {!autoScroll && (
           <button
@@ -53,6 +63,16 @@ export function ProcessLog({ status }: ProcessLogProps) {
           ? status.logs.join('\n')
           : <span className="text-gray-600 italic">No output yet. Start a process to see logs.</span>}
       </pre>
+      {status.progress && (
+        <div className="border-t border-gray-700/40 bg-gray-950/50 px-3 py-1.5">
+          <p className="truncate font-mono text-xs text-sky-400" title={status.progress}>{status.progress}</p>
+        </div>
+      )}
+      {status.control_loop?.warning && (
+        <div className="border-t border-amber-900/30 bg-amber-950/20 px-4 py-2">
+          <p className="text-xs text-amber-400">{status.control_loop.warning}</p>
+        </div>
+      )}
       {status.error && (
         <div className="border-t border-red-900/30 bg-red-950/20 px-4 py-2">
           <p className="text-xs text-red-400">Error: {status.error}</p>
@@ -103,31 +103,14 @@ def detect_pc1_ips():
 
 def scan_usb_video_devices():
     """List USB video devices (Linux /dev/video*). Returns list of {index, path, name}."""
-    import glob
-    devices = []
+    # Same scan the backend's device inventory uses; only needs the standard library
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
     try:
-        for path in sorted(glob.glob("/dev/video*"), key=lambda p: (len(p), p)):
-            try:
-                base = os.path.basename(path)
-                if not base.startswith("video"):
-                    continue
-                idx_str = base.replace("video", "")
-                if not idx_str.isdigit():
-                    continue
-                index = int(idx_str)
-                name = ""
-                sys_name = f"/sys/class/video4linux/{base}/name"
-                if os.path.exists(sys_name):
-                    try:
-                        name = open(sys_name).read().strip()
-                    except Exception:
-                        pass
-                devices.append({"index": index, "path": path, "name": name or path})
-            except Exception:
-                continue
+        from app.services.device_inventory import scan_video_devices
     except Exception:
-        pass
-    return devices
+        return []
+    return scan_video_devices()
 
 
 def _port_in_use(port: int) -> bool: